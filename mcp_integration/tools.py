@@ -10,6 +10,8 @@ from decimal import Decimal
 from fastmcp import FastMCP
 from asgiref.sync import sync_to_async
 
+from mimir.query_budget import query_budget
+
 logger = logging.getLogger(__name__)
 
 # Initialize FastMCP server
@@ -74,20 +76,23 @@ async def create_playbook(name: str, description: str, category: str) -> dict:
     return result
 
 
-async def list_playbooks(status: Literal["draft", "released", "active", "all"] = "all") -> list:
+@query_budget(3)
+async def list_playbooks(status: Literal["draft", "released", "active", "all"] = "all",
+                         tag: str = None) -> list:
     """
-    List playbooks filtered by status.
+    List playbooks filtered by status and optionally by tag.
     
     :param status: Filter by status or "all". Example: "draft"
+    :param tag: Only playbooks carrying this tag (case-insensitive). Example: "agile"
     :return: List of playbook dicts
     """
-    logger.info(f'MCP Tool: list_playbooks called - status={status}')
+    logger.info(f'MCP Tool: list_playbooks called - status={status}, tag={tag}')
     
     user = await sync_to_async(get_current_user)()
     
     from methodology.services.playbook_service import PlaybookService
     status_filter = None if status == "all" else status
-    playbooks = await sync_to_async(PlaybookService.list_playbooks)(user, status=status_filter)
+    playbooks = await sync_to_async(PlaybookService.list_playbooks)(user, status=status_filter, tag=tag)
     
     result = [
         {
@@ -97,6 +102,7 @@ async def list_playbooks(status: Literal["draft", "released", "active", "all"] =
             'category': p.category,
             'status': p.status,
             'version': str(p.version),
+            'tags': p.tags,
         }
         for p in playbooks
     ]
@@ -104,6 +110,7 @@ async def list_playbooks(status: Literal["draft", "released", "active", "all"] =
     return result
 
 
+@query_budget(4)
 async def get_playbook(playbook_id: int) -> dict:
     """
     Get playbook details with workflows.
@@ -295,6 +302,7 @@ async def create_workflow(playbook_id: int, name: str, description: str = "") ->
     }
 
 
+@query_budget(4)
 async def list_workflows(playbook_id: int) -> list:
     """
     List workflows for playbook.
@@ -331,6 +339,7 @@ async def list_workflows(playbook_id: int) -> list:
     return result
 
 
+@query_budget(4)
 async def get_workflow(workflow_id: int) -> dict:
     """
     Get workflow details with activities.
@@ -554,6 +563,7 @@ async def create_activity(workflow_id: int, name: str, guidance: str = "",
     }
 
 
+@query_budget(4)
 async def list_activities(workflow_id: int) -> list:
     """
     List activities for workflow.
@@ -574,7 +584,7 @@ async def list_activities(workflow_id: int) -> list:
         raise ValueError(f'Workflow {workflow_id} not found')
     
     from methodology.services.activity_service import ActivityService
-    activities = await sync_to_async(ActivityService.get_activities_for_workflow)(workflow_id)
+    activities = await sync_to_async(list)(ActivityService.get_activities_for_workflow(workflow_id))
     
     result = [
         {
@@ -593,6 +603,7 @@ async def list_activities(workflow_id: int) -> list:
     return result
 
 
+@query_budget(10)
 async def get_activity(activity_id: int) -> dict:
     """
     Get activity details with dependencies.
@@ -6,70 +6,97 @@ within workflows.
 """
 
 import logging
-from django.shortcuts import render, redirect, get_object_or_404
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.exceptions import ValidationError
+from django.http import HttpResponseBadRequest
+from django.utils.safestring import mark_safe
 
+from methodology.conditional import conditional_page, activity_detail_validator
 from methodology.models import Playbook, Workflow, Activity
 from methodology.services.activity_service import ActivityService
+from methodology.utils.keyset import decode_cursor
+from methodology.utils.markdown_renderer import render_markdown
+from mimir.async_render import arender, run_in_render_pool
+from mimir.query_budget import query_budget
 
 logger = logging.getLogger(__name__)
 
 
 # ==================== GLOBAL LIST ====================
 
+GLOBAL_LIST_PAGE_SIZE = 50
+
+
 @login_required
+@query_budget(8)
 def activity_global_list(request):
     """
     Global activities overview - all activities across all workflows and playbooks.
     
-    Shows activities from all workflows in playbooks owned by the user.
-    Useful for seeing all tasks and managing across entire methodology.
+    Shows activities from all workflows in playbooks owned by the user,
+    grouped by phase. Rows are keyset-paginated: the first request renders
+    the page with totals; HTMX requests with ?after=<cursor> return the
+    next rows only (infinite scroll), so page cost stays flat.
     
-    Template: activities/global_list.html
+    Template: activities/global_list.html (partial: activities/partials/global_list_rows.html)
     Template Context:
-        - activities: QuerySet of all activities
+        - activities: Activities on this page (starts_phase/phase_count mark group headers)
+        - next_cursor: Cursor for the next page or None
+        - activity_count: Total activities
         - workflow_count: Count of unique workflows
         - playbook_count: Count of unique playbooks
-        - phase_groups: Dict of activities grouped by phase
+        - phase_counts: Dict of phase label → activity count
     
     :param request: Django request object
-    :return: Rendered global list template
+    :return: Rendered global list template, or rows partial for HTMX
     """
-    # Get all activities from user's owned playbooks
-    activities = Activity.objects.filter(
-        workflow__playbook__author=request.user,
-        workflow__playbook__source='owned'
-    ).select_related('workflow', 'workflow__playbook').order_by(
-        'workflow__playbook__name', 'workflow__order', 'order'
-    )
-    
-    # Count unique workflows and playbooks
-    workflow_count = activities.values('workflow').distinct().count()
-    playbook_count = activities.values('workflow__playbook').distinct().count()
+    after = request.GET.get('after')
+    try:
+        activities, next_cursor = ActivityService.get_global_activity_page(
+            request.user, after=after, limit=GLOBAL_LIST_PAGE_SIZE
+        )
+        previous_phase = decode_cursor(after, len(ActivityService.GLOBAL_LIST_ORDERING))[0] if after else None
+    except ValueError as e:
+        logger.warning(f"User {request.user.username} sent bad activity list cursor: {e}")
+        return HttpResponseBadRequest("Invalid cursor")
     
-    # Group by phase for overview
-    phase_groups = {}
     for activity in activities:
-        phase = activity.phase or 'Unassigned'
-        if phase not in phase_groups:
-            phase_groups[phase] = []
-        phase_groups[phase].append(activity)
-    
-    logger.info(f"User {request.user.username} viewing global activities list ({activities.count()} activities)")
+        activity.starts_phase = activity.phase_label != previous_phase
+        previous_phase = activity.phase_label
+    new_phases = [a.phase_label for a in activities if a.starts_phase]
+    
+    if after:
+        # Continuation page - only rows, appended by HTMX
+        _set_phase_counts(activities, ActivityService.get_phase_counts(request.user, new_phases) if new_phases else {})
+        return render(request, 'activities/partials/global_list_rows.html', {
+            'activities': activities,
+            'next_cursor': next_cursor,
+        })
+    
+    stats = ActivityService.get_global_activity_stats(request.user)
+    _set_phase_counts(activities, stats['phase_counts'])
+    logger.info(f"User {request.user.username} viewing global activities list ({stats['activity_count']} activities)")
     
     return render(request, 'activities/global_list.html', {
         'activities': activities,
-        'workflow_count': workflow_count,
-        'playbook_count': playbook_count,
-        'phase_groups': phase_groups,
+        'next_cursor': next_cursor,
+        **stats,
     })
 
 
+def _set_phase_counts(activities, phase_counts):
+    """Attach phase totals to the activities that open a phase group."""
+    for activity in activities:
+        if activity.starts_phase:
+            activity.phase_count = phase_counts.get(activity.phase_label, 0)
+
+
 # ==================== LIST ====================
 
 @login_required
+@query_budget(12)
 def activity_list(request, playbook_pk, workflow_pk):
     """
     List all activities in a workflow.
@@ -246,18 +273,22 @@ def _render_create_form(request, playbook, workflow, form_data, errors):
 # ==================== VIEW ====================
 
 @login_required
-def activity_detail(request, playbook_pk, workflow_pk, activity_pk):
+@query_budget(18)
+@conditional_page(activity_detail_validator)
+async def activity_detail(request, playbook_pk, workflow_pk, activity_pk):
     """
     View activity details.
     
     Displays full activity information including name, guidance (rich Markdown), phase,
-    dependencies, order, and timestamps.
+    dependencies, order, and timestamps. Guidance is converted on the render
+    pool so large Markdown documents do not block the event loop.
     
     Template: activities/detail.html
     Template Context:
         - playbook: Playbook instance
         - workflow: Workflow instance
         - activity: Activity instance
+        - guidance_html: Sanitized HTML of the guidance Markdown
         - can_edit: Boolean indicating if user can edit
     
     :param request: Django request object
@@ -267,20 +298,21 @@ def activity_detail(request, playbook_pk, workflow_pk, activity_pk):
     :return: Rendered detail template
     :raises Http404: If playbook, workflow, or activity not found
     """
-    logger.info(f"User {request.user.username} viewing activity {activity_pk}")
+    user = await request.auser()
+    logger.info(f"User {user.username} viewing activity {activity_pk}")
     
     # Get instances with permission check
-    playbook = get_object_or_404(Playbook, pk=playbook_pk)
-    workflow = get_object_or_404(Workflow, pk=workflow_pk, playbook=playbook)
-    activity = get_object_or_404(
+    playbook = await aget_object_or_404(Playbook, pk=playbook_pk)
+    workflow = await aget_object_or_404(Workflow, pk=workflow_pk, playbook=playbook)
+    activity = await aget_object_or_404(
         Activity.objects.select_related('predecessor', 'successor'),
         pk=activity_pk,
         workflow=workflow
     )
     
     # Check if user has access
-    if playbook.source == 'owned' and playbook.author != request.user:
-        logger.warning(f"User {request.user.username} attempted to access activity {activity_pk} they don't own")
+    if playbook.source == 'owned' and not playbook.is_owned_by(user):
+        logger.warning(f"User {user.username} attempted to access activity {activity_pk} they don't own")
         messages.error(request, "You don't have permission to view this activity.")
         return redirect('playbook_list')
     
@@ -288,11 +320,12 @@ def activity_detail(request, playbook_pk, workflow_pk, activity_pk):
         'playbook': playbook,
         'workflow': workflow,
         'activity': activity,
-        'can_edit': workflow.can_edit(request.user),
+        'guidance_html': mark_safe(await run_in_render_pool(render_markdown, activity.guidance)),
+        'can_edit': playbook.can_edit(user),
     }
     
-    logger.info(f"Activity detail rendered for user {request.user.username}")
-    return render(request, 'activities/detail.html', context)
+    logger.info(f"Activity detail rendered for user {user.username}")
+    return await arender(request, 'activities/detail.html', context)
 
 
 # ==================== EDIT ====================
@@ -1,7 +1,7 @@
 """Admin configuration for methodology models."""
 
 from django.contrib import admin
-from methodology.models import Playbook, PlaybookVersion, Workflow, Activity, Artifact, ArtifactInput
+from methodology.models import Playbook, PlaybookVersion, Workflow, Activity, Artifact, ArtifactInput, TemplateBlob
 
 
 @admin.register(Playbook)
@@ -10,16 +10,16 @@ class PlaybookAdmin(admin.ModelAdmin):
     list_display = ('name', 'author', 'category', 'status', 'source', 'version', 'created_at')
     list_filter = ('status', 'category', 'source', 'visibility')
     search_fields = ('name', 'description', 'tags')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'deleted_at')
 
 
 @admin.register(PlaybookVersion)
 class PlaybookVersionAdmin(admin.ModelAdmin):
     """Admin configuration for PlaybookVersion model."""
-    list_display = ('playbook', 'version_number', 'created_at')
-    list_filter = ('created_at',)
+    list_display = ('playbook', 'version_number', 'storage', 'chain_length', 'raw_size', 'created_at')
+    list_filter = ('created_at', 'storage')
     search_fields = ('playbook__name', 'change_summary')
-    readonly_fields = ('created_at',)
+    readonly_fields = ('created_at', 'storage', 'payload', 'chain_length', 'raw_size')
 
 
 @admin.register(Workflow)
@@ -72,3 +72,12 @@ class ArtifactInputAdmin(admin.ModelAdmin):
     list_display = ('artifact', 'activity', 'is_required', 'created_at')
     list_filter = ('is_required',)
     search_fields = ('artifact__name', 'activity__name')
+
+
+@admin.register(TemplateBlob)
+class TemplateBlobAdmin(admin.ModelAdmin):
+    """Admin configuration for TemplateBlob model."""
+    list_display = ('digest', 'size', 'ref_count', 'created_at')
+    list_filter = ('created_at',)
+    search_fields = ('digest',)
+    readonly_fields = ('digest', 'size', 'ref_count', 'created_at')
@@ -6,5 +6,6 @@ class MethodologyConfig(AppConfig):
     name = "methodology"
     
     def ready(self):
-        """Import signals when app is ready."""
+        """Import signals and the query recorder when app is ready."""
         import methodology.signals  # noqa: F401
+        import mimir.query_budget  # noqa: F401
@@ -14,4 +14,9 @@ urlpatterns = [
     path(
         "artifacts/<int:pk>/edit/", artifact_views.artifact_edit, name="artifact_edit"
     ),
+    path(
+        "artifacts/<int:pk>/template/",
+        artifact_views.artifact_template_download,
+        name="artifact_template_download",
+    ),
 ]
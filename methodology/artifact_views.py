@@ -5,13 +5,19 @@ Provides views for creating, viewing, and editing artifacts within playbooks.
 """
 
 import logging
+import mimetypes
+from django.http import Http404
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.exceptions import ValidationError
 
+from methodology.conditional import conditional_page, artifact_detail_validator
 from methodology.models import Playbook, Activity, Artifact
 from methodology.services.artifact_service import ArtifactService
+from methodology.storage import parse_cas_name
+from methodology.utils.file_responses import ranged_file_response
+from mimir.query_budget import query_budget
 
 logger = logging.getLogger(__name__)
 
@@ -131,6 +137,8 @@ def _render_create_form(request, playbook, form_data, errors):
 
 
 @login_required
+@query_budget(15)
+@conditional_page(artifact_detail_validator)
 def artifact_detail(request, pk):
     """
     Display artifact details.
@@ -184,6 +192,50 @@ def artifact_detail(request, pk):
     return render(request, "artifacts/detail.html", context)
 
 
+@login_required
+def artifact_template_download(request, pk):
+    """
+    Stream an artifact's template file with HTTP Range support.
+
+    Content-addressed templates use their SHA-256 digest as a strong ETag,
+    so repeat downloads revalidate with 304 and partial requests get 206.
+
+    :param request: Django request object
+    :param pk: Artifact primary key
+    :return: Streaming file response
+    :raises Http404: If artifact or template file not found
+    """
+    artifact = get_object_or_404(Artifact.objects.select_related("playbook"), pk=pk)
+
+    if artifact.playbook.source == "owned" and artifact.playbook.author != request.user:
+        logger.warning(
+            f"User {request.user.username} attempted to download template of artifact {pk} they don't own"
+        )
+        raise Http404("Template not found")
+
+    if not artifact.template_file:
+        raise Http404("Artifact has no template file")
+
+    name = artifact.template_file.name
+    storage = artifact.template_file.storage
+    try:
+        size = storage.size(name)
+        file_obj = storage.open(name, "rb")
+    except FileNotFoundError:
+        logger.error(f"Template file '{name}' for artifact {pk} missing from storage")
+        raise Http404("Template file missing")
+
+    digest, _ = parse_cas_name(name)
+    filename = artifact.get_template_filename()
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    logger.info(
+        f"User {request.user.username} downloading template '{filename}' of artifact {pk} "
+        f"(range={request.headers.get('Range', 'full')})"
+    )
+    return ranged_file_response(request, file_obj, size, filename, content_type, etag=digest)
+
+
 # ==================== EDIT ====================
 
 
@@ -0,0 +1,246 @@
+"""
+Conditional GET support for detail pages.
+
+Each page gets a validator computed from indexed columns (``updated_at``,
+``Playbook.version``, child counts) plus the request's user, CSRF secret
+and pending flash messages. Unchanged pages short-circuit to 304 before
+the view runs, so Graphviz and Markdown rendering are skipped.
+
+Usage:
+    @login_required
+    @conditional_page(playbook_detail_validator)
+    async def playbook_detail(request, pk): ...
+"""
+
+import hashlib
+import logging
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib import messages
+from django.middleware.csrf import get_token
+from django.db.models import Count, Max
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from methodology.models import Playbook, PlaybookVersion, Workflow, Activity, Artifact
+
+logger = logging.getLogger(__name__)
+
+
+def _latest(*timestamps):
+    """
+    Get the newest non-empty timestamp.
+
+    :param timestamps: datetimes or None. Example: (dt1, None, dt2)
+    :return: newest datetime or None
+    """
+    present = [ts for ts in timestamps if ts is not None]
+    return max(present) if present else None
+
+
+def _request_parts(request):
+    """
+    Per-request inputs that change what a page renders for the same data.
+
+    :param request: Django request object
+    :return: tuple of user id, CSRF secret digest and pending message count
+    """
+    # get_token() creates the secret on a first visit, so the ETag matches
+    # the cookie the response is about to set
+    get_token(request)
+    csrf_secret = request.META.get('CSRF_COOKIE', '')
+    return (
+        request.user.pk,
+        hashlib.sha256(csrf_secret.encode()).hexdigest()[:16],
+        len(messages.get_messages(request)),
+    )
+
+
+def conditional_page(validator):
+    """
+    Decorate a view with ETag/Last-Modified handling driven by a validator.
+
+    The validator receives the view's arguments and returns
+    ``(parts, last_modified)`` or None when the page has no cacheable
+    content for this user (missing object, permission redirect), in which
+    case the view runs normally.
+
+    Async views are supported: the validator (which queries the database)
+    runs in a worker thread before Django's condition() check reads it.
+
+    A view whose response must not be reused (e.g. a degraded fallback)
+    marks it ``Cache-Control: no-store``; its ETag and Last-Modified are
+    then dropped, so a later request cannot revalidate it with a 304.
+
+    :param validator: callable(request, *args, **kwargs) -> (tuple, datetime) or None
+    :return: view decorator
+    """
+    def compute(request, *args, **kwargs):
+        if not hasattr(request, '_page_validator'):
+            result = validator(request, *args, **kwargs)
+            if result is not None:
+                parts, last_modified = result
+                raw = repr((validator.__name__, parts, _request_parts(request)))
+                result = (hashlib.sha1(raw.encode()).hexdigest(), last_modified)
+            request._page_validator = result
+        return request._page_validator
+
+    def etag_func(request, *args, **kwargs):
+        result = compute(request, *args, **kwargs)
+        return result[0] if result else None
+
+    def last_modified_func(request, *args, **kwargs):
+        result = compute(request, *args, **kwargs)
+        return result[1] if result else None
+
+    def finish(request, response):
+        if 'no-store' in response.get('Cache-Control', ''):
+            del response['ETag']
+            del response['Last-Modified']
+            return response
+        if response.status_code == 304:
+            logger.info(f"Conditional GET hit for {request.path} (user {request.user.pk})")
+        if response.has_header('ETag'):
+            # Browsers must revalidate on every navigation; never shared caches
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def decorator(view_func):
+        conditional_view = condition(etag_func=etag_func, last_modified_func=last_modified_func)(view_func)
+
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                # Cache the validator on the request so condition() does no I/O
+                await sync_to_async(compute)(request, *args, **kwargs)
+                return finish(request, await conditional_view(request, *args, **kwargs))
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            return finish(request, conditional_view(request, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def _owned_playbook_row(request, playbook_pk):
+    """
+    Fetch playbook validator columns if the user may view it.
+
+    :param request: Django request object
+    :param playbook_pk: Playbook primary key. Example: 42
+    :return: dict of playbook columns or None
+    """
+    row = Playbook.objects.filter(pk=playbook_pk).values(
+        'author_id', 'source', 'status', 'version', 'updated_at'
+    ).first()
+    if row is None or (row['source'] == 'owned' and row['author_id'] != request.user.pk):
+        return None
+    return row
+
+
+def playbook_detail_validator(request, pk):
+    """
+    Validator for playbook_detail: playbook row plus workflow and version aggregates.
+
+    :param request: Django request object
+    :param pk: Playbook primary key. Example: 42
+    :return: (parts, last_modified) or None
+    """
+    playbook = _owned_playbook_row(request, pk)
+    if playbook is None:
+        return None
+    workflows = Workflow.objects.filter(playbook_id=pk).aggregate(
+        count=Count('pk'), latest=Max('updated_at')
+    )
+    latest_version = PlaybookVersion.objects.filter(playbook_id=pk).aggregate(
+        latest=Max('version_number')
+    )['latest']
+    parts = (
+        playbook['status'], str(playbook['version']), playbook['updated_at'],
+        workflows['count'], workflows['latest'], latest_version,
+    )
+    return parts, _latest(playbook['updated_at'], workflows['latest'])
+
+
+def workflow_detail_validator(request, playbook_pk, pk):
+    """
+    Validator for workflow_detail (includes the activity graph inputs).
+
+    :param request: Django request object
+    :param playbook_pk: Playbook primary key. Example: 42
+    :param pk: Workflow primary key. Example: 7
+    :return: (parts, last_modified) or None
+    """
+    playbook = _owned_playbook_row(request, playbook_pk)
+    workflow = Workflow.objects.filter(pk=pk, playbook_id=playbook_pk).values('updated_at').first()
+    if playbook is None or workflow is None:
+        return None
+    activities = Activity.objects.filter(workflow_id=pk).aggregate(
+        count=Count('pk'), latest=Max('updated_at')
+    )
+    parts = (
+        playbook['status'], str(playbook['version']), playbook['updated_at'],
+        workflow['updated_at'], activities['count'], activities['latest'],
+    )
+    return parts, _latest(playbook['updated_at'], workflow['updated_at'], activities['latest'])
+
+
+def activity_detail_validator(request, playbook_pk, workflow_pk, activity_pk):
+    """
+    Validator for activity_detail: activity, its neighbours and containers.
+
+    :param request: Django request object
+    :param playbook_pk: Playbook primary key. Example: 42
+    :param workflow_pk: Workflow primary key. Example: 7
+    :param activity_pk: Activity primary key. Example: 120
+    :return: (parts, last_modified) or None
+    """
+    playbook = _owned_playbook_row(request, playbook_pk)
+    activity = Activity.objects.filter(
+        pk=activity_pk, workflow_id=workflow_pk, workflow__playbook_id=playbook_pk
+    ).values(
+        'updated_at', 'workflow__updated_at', 'predecessor__updated_at', 'successor__updated_at'
+    ).first()
+    if playbook is None or activity is None:
+        return None
+    parts = (
+        playbook['status'], str(playbook['version']), playbook['updated_at'],
+        activity['updated_at'], activity['workflow__updated_at'],
+        activity['predecessor__updated_at'], activity['successor__updated_at'],
+    )
+    return parts, _latest(playbook['updated_at'], activity['updated_at'], activity['workflow__updated_at'])
+
+
+def artifact_detail_validator(request, pk):
+    """
+    Validator for artifact_detail: artifact, producer and consumer aggregates.
+
+    :param request: Django request object
+    :param pk: Artifact primary key. Example: 15
+    :return: (parts, last_modified) or None
+    """
+    artifact = Artifact.objects.filter(pk=pk).values(
+        'playbook_id', 'updated_at', 'template_file', 'produced_by__updated_at'
+    ).annotate(
+        input_count=Count('inputs'),
+        inputs_latest=Max('inputs__updated_at'),
+        consumers_latest=Max('inputs__activity__updated_at'),
+    ).order_by('pk').first()
+    if artifact is None:
+        return None
+    playbook = _owned_playbook_row(request, artifact['playbook_id'])
+    if playbook is None:
+        return None
+    parts = (
+        playbook['status'], playbook['updated_at'], artifact['updated_at'], artifact['template_file'],
+        artifact['produced_by__updated_at'], artifact['input_count'],
+        artifact['inputs_latest'], artifact['consumers_latest'],
+    )
+    return parts, _latest(
+        playbook['updated_at'], artifact['updated_at'], artifact['inputs_latest'], artifact['consumers_latest']
+    )
@@ -0,0 +1,96 @@
+"""
+Django management command running background syncs with Homebase.
+
+Usage:
+    python manage.py autosync                          # run due syncs once
+    python manage.py autosync --every [SECONDS]        # scheduler loop (used by supervisord)
+    python manage.py autosync --enable 7 --as fdd      # turn auto-sync of playbook 7 on
+    python manage.py autosync --disable 7
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from methodology.models import Playbook
+from methodology.services.auto_sync_service import AutoSyncService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Sync playbooks that have auto-sync on with Homebase when they are due'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--every',
+            type=int,
+            nargs='?',
+            const=settings.AUTO_SYNC_POLL_SECONDS,
+            metavar='SECONDS',
+            help='Run forever, looking for due syncs every SECONDS seconds (default: AUTO_SYNC_POLL_SECONDS)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Owners synced in parallel (default: AUTO_SYNC_WORKERS)'
+        )
+        parser.add_argument(
+            '--enable',
+            type=int,
+            metavar='PLAYBOOK_ID',
+            help='Turn auto-sync of a playbook on and exit'
+        )
+        parser.add_argument(
+            '--as',
+            dest='remote_name',
+            help='Name of the playbook on Homebase, with --enable (default: the current one)'
+        )
+        parser.add_argument(
+            '--disable',
+            type=int,
+            metavar='PLAYBOOK_ID',
+            help='Turn auto-sync of a playbook off and exit'
+        )
+
+    def handle(self, *args, **options):
+        playbook_id = options['enable'] or options['disable']
+        if playbook_id:
+            self._toggle(playbook_id, options)
+            return
+
+        if not options['every']:
+            self._run_once(options)
+            return
+
+        self.stdout.write(f"Auto-sync scheduler started, polling every {options['every']} seconds")
+        while True:
+            try:
+                self._run_once(options)
+            except Exception as e:
+                # Keep the scheduler alive; the next pass may succeed
+                logger.error(f"Auto-sync pass failed: {e}", exc_info=True)
+                self.stderr.write(f"Auto-sync pass failed: {e}")
+            time.sleep(options['every'])
+
+    def _toggle(self, playbook_id, options):
+        try:
+            playbook = Playbook.objects.get(pk=playbook_id)
+        except Playbook.DoesNotExist:
+            raise CommandError(f"Playbook {playbook_id} does not exist")
+        current = getattr(playbook, 'sync_state', None)
+        remote_name = options['remote_name'] or (current.remote_name if current else None)
+        if not remote_name:
+            raise CommandError("Give the playbook's name on Homebase with --as")
+
+        state = AutoSyncService.enable(playbook, remote_name, auto_sync=bool(options['enable']))
+        self.stdout.write(self.style.SUCCESS(
+            f"Auto-sync of {playbook.name} as {state.remote_name}: {'on' if state.auto_sync else 'off'}"
+        ))
+
+    def _run_once(self, options):
+        outcomes = AutoSyncService.run_due(workers=options['workers'])
+        if outcomes:
+            summary = ', '.join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items()))
+            self.stdout.write(f"Auto-sync: {summary}")
@@ -0,0 +1,83 @@
+"""
+Django management command for online backups of the SQLite database.
+
+Usage:
+    python manage.py backup [--keep=7] [--output-dir=PATH]
+    python manage.py backup --list
+    python manage.py backup --every [MINUTES]   # scheduler loop (used by supervisord)
+"""
+import logging
+import sqlite3
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from methodology.services.backup_service import BackupService, BackupError
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Take a compressed, verified online backup of the SQLite database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            type=str,
+            help='Directory for snapshots (default: BACKUP_DIR setting)'
+        )
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=settings.BACKUP_KEEP,
+            help='Number of snapshots to retain after rotation'
+        )
+        parser.add_argument(
+            '--every',
+            type=int,
+            nargs='?',
+            const=settings.BACKUP_INTERVAL_MINUTES,
+            metavar='MINUTES',
+            help='Run forever, taking a backup every MINUTES minutes (default: BACKUP_INTERVAL_MINUTES)'
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List existing snapshots and exit'
+        )
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for archive in BackupService.list_backups(options['output_dir']):
+                self.stdout.write(f"{archive.name}  {archive.stat().st_size} bytes")
+            return
+
+        if not options['every']:
+            self._run_once(options)
+            return
+
+        interval = options['every'] * 60
+        self.stdout.write(f"Backup scheduler started, interval {options['every']} minutes")
+        while True:
+            try:
+                self._run_once(options)
+            except CommandError as e:
+                # Keep the scheduler alive; the next run may succeed
+                self.stderr.write(str(e))
+            time.sleep(interval)
+
+    def _run_once(self, options):
+        try:
+            manifest = BackupService.create_backup(
+                backup_dir=options['output_dir'],
+                keep=options['keep']
+            )
+        except (BackupError, OSError, sqlite3.Error) as e:
+            logger.error(f"Backup failed: {e}", exc_info=True)
+            raise CommandError(f"Backup failed: {e}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Backup {manifest['file']}: {manifest['pages']} pages, "
+            f"{manifest['db_bytes']} → {manifest['compressed_bytes']} bytes "
+            f"in {manifest['duration_seconds']}s"
+        ))
@@ -0,0 +1,218 @@
+"""
+Django management command benchmarking the .mpb library codec against JSON.
+
+Builds a synthetic library in memory (rows shaped like the deep export,
+no database access) and reports, per format, the encoded size and the
+best encode and decode time over several repeats:
+
+    json (pretty)   one indented JSON document per playbook
+    json            one JSON document per playbook, as the export view writes it
+    zip of json     the bulk export: a deflated zip of JSON documents
+    mpb             the .mpb library (methodology.utils.library_codec)
+
+Usage:
+    python manage.py benchmark_library_codecs [--playbooks 20] [--activities 5000] [--repeat 3] [--level 6]
+"""
+import io
+import json
+import random
+import time
+import zipfile
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from methodology.services.playbook_export_service import EXPORT_FORMAT, EXPORT_FORMAT_VERSION
+from methodology.utils.library_codec import COMPRESS_LEVEL, encode_library, iter_documents
+
+_WORDS = (
+    'domain model feature list build design review code inspect promote plan team client object class '
+    'diagram walk through sequence owner chief programmer iteration release test deploy story estimate'
+).split()
+
+_SECTIONS = ('workflows', 'activities', 'artifacts', 'artifact_inputs', 'versions')
+
+
+def _synthetic_library(playbook_count, activity_count, seed=42):
+    """
+    Build export-shaped playbooks with the given total number of activities.
+
+    Each playbook has 8 workflows, one artifact per two activities and one
+    input per artifact; activities form a dependency chain and carry a few
+    lines of guidance.
+
+    :param playbook_count: number of playbooks. Example: 20
+    :param activity_count: activities across all playbooks. Example: 5000
+    :param seed: random seed, so runs are comparable. Example: 42
+    :return: list of (header dict, list of (section name, list of row dicts))
+    """
+    rnd = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def text(words):
+        return ' '.join(rnd.choice(_WORDS) for _ in range(words))
+
+    def stamp():
+        return start + timedelta(seconds=rnd.randrange(10_000_000))
+
+    library, next_id = [], 1
+    for number in range(playbook_count):
+        created = stamp()
+        header = {
+            'format': EXPORT_FORMAT, 'format_version': EXPORT_FORMAT_VERSION, 'exported_at': start,
+            'name': f"{text(2).title()} {number}", 'description': text(25), 'category': 'development',
+            'tags': [rnd.choice(_WORDS) for _ in range(3)], 'visibility': 'private', 'status': 'active',
+            'version': Decimal(f"{rnd.randrange(1, 5)}.{rnd.randrange(10)}"), 'source': 'owned',
+            'created_at': created, 'updated_at': stamp(),
+        }
+        workflows = []
+        for order in range(1, 9):
+            workflows.append({
+                'id': next_id, 'name': text(2).title(), 'description': text(15), 'abbreviation': text(1)[:3].upper(),
+                'order': order, 'created_at': created, 'updated_at': stamp(),
+            })
+            next_id += 1
+
+        share = activity_count // playbook_count + (number < activity_count % playbook_count)
+        activities = []
+        for order in range(share):
+            activities.append({
+                'id': next_id, 'workflow_id': workflows[order * len(workflows) // max(share, 1)]['id'],
+                'name': text(3).title(), 'guidance': '\n'.join(f"{line}. {text(12)}" for line in range(1, 6)),
+                'order': order + 1, 'phase': rnd.choice([None, 'Plan', 'Build']),
+                'predecessor_id': next_id - 1 if order else None, 'successor_id': next_id + 1 if order < share - 1 else None,
+                'created_at': created, 'updated_at': stamp(),
+            })
+            next_id += 1
+
+        artifacts, inputs = [], []
+        for producer, consumer in zip(activities[::2], activities[1::2]):
+            artifacts.append({
+                'id': next_id, 'produced_by_id': producer['id'], 'name': text(2).title(), 'description': text(10),
+                'type': rnd.choice(['Document', 'Diagram', 'Code']), 'is_required': rnd.random() < 0.7,
+                'template_file': '', 'created_at': created, 'updated_at': stamp(),
+            })
+            inputs.append({'id': next_id, 'artifact_id': next_id, 'activity_id': consumer['id'], 'is_required': True})
+            next_id += 1
+
+        sections = [('workflows', workflows), ('activities', activities), ('artifacts', artifacts),
+                    ('artifact_inputs', inputs), ('versions', [])]
+        library.append((header, sections))
+    return library
+
+
+def _documents(library):
+    """
+    Assemble each synthetic playbook as one export dict.
+
+    :param library: list from _synthetic_library()
+    :return: list of export dicts
+    """
+    return [{**header, **dict(sections)} for header, sections in library]
+
+
+def _encode_json(library, indent=None):
+    return [
+        json.dumps(document, cls=DjangoJSONEncoder, ensure_ascii=False, indent=indent).encode()
+        for document in _documents(library)
+    ]
+
+
+def _decode_json(encoded):
+    return [json.loads(data) for data in encoded]
+
+
+def _encode_zip(library):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for number, data in enumerate(_encode_json(library)):
+            archive.writestr(f"{number}.json", data)
+    return [buffer.getvalue()]
+
+
+def _decode_zip(encoded):
+    with zipfile.ZipFile(io.BytesIO(encoded[0])) as archive:
+        return [json.loads(archive.read(name)) for name in archive.namelist()]
+
+
+def _best_time(function, repeat):
+    """
+    Run a function several times.
+
+    :param function: callable without arguments
+    :param repeat: number of runs. Example: 3
+    :return: (fastest run in seconds, result of the last run)
+    """
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = 'Compare size, encode and decode time of the .mpb library codec and JSON on a synthetic library'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--playbooks',
+            type=int,
+            default=20,
+            help='Playbooks in the synthetic library'
+        )
+        parser.add_argument(
+            '--activities',
+            type=int,
+            default=5000,
+            help='Activities across all playbooks'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per measurement; the fastest is reported'
+        )
+        parser.add_argument(
+            '--level',
+            type=int,
+            choices=range(10),
+            default=COMPRESS_LEVEL,
+            metavar='0-9',
+            help='zlib level of the .mpb library'
+        )
+
+    def handle(self, *args, **options):
+        if options['playbooks'] < 1 or options['activities'] < 0 or options['repeat'] < 1:
+            raise CommandError("--playbooks and --repeat must be positive, --activities not negative")
+
+        library = _synthetic_library(options['playbooks'], options['activities'])
+        codecs = [
+            ('json (pretty)', lambda: _encode_json(library, indent=2), _decode_json),
+            ('json', lambda: _encode_json(library), _decode_json),
+            ('zip of json', lambda: _encode_zip(library), _decode_zip),
+            ('mpb', lambda: list(encode_library(library, level=options['level'])),
+             lambda encoded: list(iter_documents(io.BytesIO(b''.join(encoded))))),
+        ]
+
+        self.stdout.write(
+            f"Synthetic library: {options['playbooks']} playbooks, {options['activities']} activities, "
+            f"best of {options['repeat']} runs, mpb zlib level {options['level']}"
+        )
+        self.stdout.write(f"{'format':<15}{'bytes':>12}{'ratio':>8}{'encode ms':>12}{'decode ms':>12}")
+        expected, baseline = None, None
+        for name, encode, decode in codecs:
+            encode_seconds, encoded = _best_time(encode, options['repeat'])
+            decode_seconds, decoded = _best_time(lambda: decode(encoded), options['repeat'])
+            if expected is None:
+                expected = decoded
+            elif decoded != expected:
+                raise CommandError(f"{name} did not round-trip the library")
+            size = sum(len(data) for data in encoded)
+            baseline = baseline or size
+            self.stdout.write(
+                f"{name:<15}{size:>12}{size / baseline:>8.2f}{encode_seconds * 1000:>12.1f}{decode_seconds * 1000:>12.1f}"
+            )
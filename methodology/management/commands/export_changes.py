@@ -0,0 +1,80 @@
+"""
+Django management command to print the change feed since a cursor.
+
+Writes compacted upserts and deletes for one user's playbooks as JSON,
+following pages until the feed is exhausted (or one page with --once).
+The final cursor is printed to stderr for the next run.
+
+Usage:
+    python manage.py export_changes --user maria [--since 790] [--limit 1000] [--output changes.json] [--once]
+"""
+import json
+import logging
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from methodology.services.change_feed_service import ChangeFeedService, get_page_size
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Print changes to a user\'s playbooks since a cursor'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            required=True,
+            help='Username whose playbooks are synced'
+        )
+        parser.add_argument(
+            '--since',
+            type=int,
+            default=0,
+            help='Last sequence number already applied (default: 0, everything)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=get_page_size(),
+            help='Log entries read per page'
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the changes to this file instead of stdout'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Read a single page instead of following the feed to its end'
+        )
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(username=options['user']).first()
+        if user is None:
+            raise CommandError(f"User '{options['user']}' does not exist")
+
+        cursor, changes = options['since'], []
+        while True:
+            page = ChangeFeedService.changes_since(user.pk, cursor=cursor, limit=options['limit'])
+            changes.extend(page['changes'])
+            cursor = page['cursor']
+            if options['once'] or not page['has_more']:
+                break
+
+        document = json.dumps(
+            {'cursor': cursor, 'has_more': page['has_more'], 'changes': changes},
+            cls=DjangoJSONEncoder, ensure_ascii=False,
+        )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                output.write(document)
+        else:
+            self.stdout.write(document)
+
+        logger.info(f"Exported {len(changes)} changes for {user.username} after {options['since']}")
+        self.stderr.write(self.style.SUCCESS(
+            f"{len(changes)} changes for {user.username} after {options['since']}; next cursor {cursor}"
+        ))
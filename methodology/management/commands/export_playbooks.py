@@ -0,0 +1,85 @@
+"""
+Django management command to bulk export playbooks to a zip file or an .mpb library.
+
+Writes one JSON export per playbook plus a manifest, or with --format mpb
+the compact binary library, streaming it to disk; all playbooks are read
+with one query per table. Progress is printed after each playbook.
+
+Usage:
+    python manage.py export_playbooks --output playbooks.zip [--user maria] [--ids 1 2 3] [--chunk-size=500]
+    python manage.py export_playbooks --output library.mpb --format mpb
+"""
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from methodology.models import Playbook
+from methodology.services.playbook_export_service import get_chunk_size
+from methodology.services.playbook_package_service import PlaybookPackageService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Export playbooks as a zip of JSON files or an .mpb library'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            required=True,
+            help='Path of the zip file to write'
+        )
+        parser.add_argument(
+            '--user',
+            help='Only export playbooks authored by this username'
+        )
+        parser.add_argument(
+            '--ids',
+            type=int,
+            nargs='+',
+            help='Only export playbooks with these IDs'
+        )
+        parser.add_argument(
+            '--format',
+            choices=['zip', 'mpb'],
+            default='zip',
+            help='zip of JSON exports, or the compact binary .mpb library'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=get_chunk_size(),
+            help='Rows fetched per database round trip'
+        )
+
+    def handle(self, *args, **options):
+        playbooks = Playbook.objects.all()
+        if options['user']:
+            playbooks = playbooks.filter(author__username=options['user'])
+        if options['ids']:
+            playbooks = playbooks.filter(pk__in=options['ids'])
+        playbooks = list(playbooks)
+        if not playbooks:
+            raise CommandError("No playbooks match the given filters")
+
+        started = time.monotonic()
+
+        def report(done, total, playbook, size):
+            self.stdout.write(f"[{done}/{total}] {playbook.name} ({size} bytes, {time.monotonic() - started:.1f}s)")
+
+        if options['format'] == 'mpb':
+            export = PlaybookPackageService.iter_library
+        else:
+            export = PlaybookPackageService.iter_bulk_export
+
+        written = 0
+        with open(options['output'], 'wb') as output:
+            for chunk in export(playbooks, chunk_size=options['chunk_size'], progress=report):
+                output.write(chunk)
+                written += len(chunk)
+
+        logger.info(f"Exported {len(playbooks)} playbooks to {options['output']} ({written} bytes)")
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {len(playbooks)} playbooks to {options['output']} ({written} bytes)"
+        ))
@@ -0,0 +1,40 @@
+"""
+Django management command to garbage-collect orphaned template blobs.
+
+Usage:
+    python manage.py gc_template_blobs [--dry-run] [--grace-minutes=60]
+"""
+import logging
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+
+from methodology.services.template_blob_service import TemplateBlobService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Recount template blob references and delete unreferenced blobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report orphaned blobs without deleting them'
+        )
+        parser.add_argument(
+            '--grace-minutes',
+            type=int,
+            default=60,
+            help='Keep orphaned blobs younger than this (protects in-flight uploads)'
+        )
+
+    def handle(self, *args, **options):
+        result = TemplateBlobService.collect_garbage(
+            grace=timedelta(minutes=options['grace_minutes']),
+            dry_run=options['dry_run']
+        )
+        action = 'Would free' if options['dry_run'] else 'Freed'
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {result['bytes']} bytes from {result['blobs']} orphaned template blobs"
+        ))
@@ -0,0 +1,212 @@
+"""
+Django management command running a local stand-in for a Homebase sync server.
+
+Serves every JSON playbook export in a directory, and the Merkle diff
+protocol (see MerkleService) over it, so sync can be exercised against a
+separate process without a real Homebase. A file is re-read when its
+modification time changes; uploads replace it atomically. An upload with
+If-Match: "<root>" is refused with 412 unless the file's Merkle root is
+<root> ("" when there is no file, * for any existing file).
+
+    GET /playbooks/<file stem>/merkle/?op=summary&path=[...]&prefix=
+    GET /playbooks/<file stem>/
+    PUT /playbooks/<file stem>/
+
+Usage:
+    python manage.py homebase_standin --data-dir exports/ [--port 8765]
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+from django.core.management.base import BaseCommand, CommandError
+
+from methodology.services.merkle_service import MerkleTree, MerkleError
+
+logger = logging.getLogger(__name__)
+
+_MERKLE_PATH = re.compile(r'^/playbooks/(?P<name>[\w.-]+)/merkle/$')
+_PLAYBOOK_PATH = re.compile(r'^/playbooks/(?P<name>[\w.-]+)/$')
+
+
+class _PreconditionFailed(Exception):
+    """Raised when an upload's If-Match does not match the stored export."""
+
+
+def _entity_tags(value):
+    """
+    Parse an If-Match header.
+
+    :param value: header value or None. Example: '"9f86d081..."'
+    :returns: set of tags ("*" for any), or None without a header. Example: {"9f86d081..."}
+    """
+    if value is None:
+        return None
+    return {tag.strip().removeprefix('W/').strip('"') for tag in value.split(',')}
+
+
+class _TreeStore:
+    """Merkle trees of the export files in a directory, rebuilt when a file changes."""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self._trees = {}
+        # Makes the If-Match check and the write one step across request threads
+        self._lock = threading.Lock()
+
+    def path(self, name):
+        return os.path.join(self.data_dir, f"{name}.json")
+
+    def read(self, name):
+        """
+        :param name: export file stem. Example: "fdd"
+        :returns: export file content as bytes, or None if there is no such export
+        """
+        try:
+            with open(self.path(name), 'rb') as handle:
+                return handle.read()
+        except OSError:
+            return None
+
+    def write(self, name, data, expected=None):
+        """
+        Replace an export; readers see the old or the new file, never a partial one.
+
+        :param name: export file stem. Example: "fdd"
+        :param data: JSON export as bytes
+        :param expected: set of Merkle roots the current export may have ("" for none,
+            "*" for any), or None to write unconditionally. Example: {"9f86d081..."}
+        :raises ValueError: If data is not a JSON object
+        :raises _PreconditionFailed: If the current export's root is not expected
+        """
+        if not isinstance(json.loads(data), dict):
+            raise ValueError("Playbook export must be a JSON object")
+        with self._lock:
+            if expected is not None:
+                tree = self.get(name)
+                current = tree.hash if tree else ''
+                if current not in expected and not ('*' in expected and tree):
+                    raise _PreconditionFailed(f"{name} has root {current or 'none'}")
+            fd, temp = tempfile.mkstemp(dir=self.data_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as handle:
+                    handle.write(data)
+                os.replace(temp, self.path(name))
+            except BaseException:
+                os.unlink(temp)
+                raise
+            # Two writes within the mtime resolution must not share a cached tree
+            self._trees.pop(name, None)
+        logger.info(f"Homebase stand-in stored {name} ({len(data)} bytes)")
+
+    def get(self, name):
+        """
+        :param name: export file stem. Example: "fdd"
+        :returns: MerkleTree, or None if there is no such export
+        """
+        path = self.path(name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._trees.get(name)
+        if cached is None or cached[0] != mtime:
+            with open(path, encoding='utf-8') as handle:
+                cached = (mtime, MerkleTree.from_document(json.load(handle)))
+            self._trees[name] = cached
+            logger.info(f"Homebase stand-in loaded {path}: root {cached[1].hash[:12]}")
+        return cached[1]
+
+
+class Command(BaseCommand):
+    help = 'Run a local stand-in Homebase serving JSON playbook exports and their Merkle trees'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            required=True,
+            help='Directory of playbook JSON exports, served by file stem'
+        )
+        parser.add_argument(
+            '--host',
+            default='127.0.0.1',
+            help='Address to bind'
+        )
+        parser.add_argument(
+            '--port',
+            type=int,
+            default=8765,
+            help='Port to bind, 0 for any free port'
+        )
+
+    def handle(self, *args, **options):
+        if not os.path.isdir(options['data_dir']):
+            raise CommandError(f"{options['data_dir']} is not a directory")
+        store = _TreeStore(options['data_dir'])
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                match = _PLAYBOOK_PATH.match(url.path)
+                if match:
+                    data = store.read(match['name'])
+                    if data is None:
+                        self._reply(404, {'error': f"No playbook at {url.path}"})
+                    else:
+                        self._send(200, data)
+                    return
+                match = _MERKLE_PATH.match(url.path)
+                tree = store.get(match['name']) if match else None
+                if tree is None:
+                    self._reply(404, {'error': f"No playbook at {url.path}"})
+                    return
+                try:
+                    self._reply(200, tree.query(dict(parse_qsl(url.query, keep_blank_values=True))))
+                except MerkleError as e:
+                    self._reply(400, {'error': str(e)})
+
+            def do_PUT(self):
+                match = _PLAYBOOK_PATH.match(urlsplit(self.path).path)
+                if not match:
+                    self._reply(404, {'error': f"Cannot upload to {self.path}"})
+                    return
+                data = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                try:
+                    store.write(match['name'], data, _entity_tags(self.headers.get('If-Match')))
+                except ValueError as e:
+                    self._reply(400, {'error': str(e)})
+                    return
+                except _PreconditionFailed as e:
+                    self._reply(412, {'error': str(e)})
+                    return
+                self.send_response(204)
+                self.end_headers()
+
+            def _reply(self, status, body):
+                self._send(status, json.dumps(body).encode())
+
+            def _send(self, status, data):
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Homebase stand-in: {format % args}")
+
+        server = ThreadingHTTPServer((options['host'], options['port']), Handler)
+        host, port = server.server_address[:2]
+        self.stdout.write(f"Homebase stand-in listening on http://{host}:{port}/")
+        self.stdout.flush()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
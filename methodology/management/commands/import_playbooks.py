@@ -0,0 +1,80 @@
+"""
+Django management command to import an .mpb playbook library.
+
+Reads the library front to back, one playbook in memory at a time, and
+imports each playbook for a user. The input need not be seekable: "-"
+reads a library piped in on standard input.
+
+Usage:
+    python manage.py import_playbooks --input library.mpb --user maria [--conflict rename]
+    python manage.py import_playbooks --input - --user maria < library.mpb
+"""
+import logging
+import sys
+import time
+from contextlib import nullcontext
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from methodology.services.playbook_import_service import (
+    PlaybookImportService, PlaybookImportError, CONFLICT_MODES, CONFLICT_RENAME,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Import the playbooks of an .mpb library'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--input',
+            required=True,
+            help='Path of the .mpb library, or - for standard input'
+        )
+        parser.add_argument(
+            '--user',
+            required=True,
+            help='Username who will own the imported playbooks'
+        )
+        parser.add_argument(
+            '--conflict',
+            choices=CONFLICT_MODES,
+            default=CONFLICT_RENAME,
+            help='What to do when the user already has a playbook with an imported name'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+
+        started = time.monotonic()
+        imported = skipped = 0
+        if options['input'] == '-':
+            stream = nullcontext(sys.stdin.buffer)
+        else:
+            try:
+                stream = open(options['input'], 'rb')
+            except OSError as e:
+                raise CommandError(f"Cannot read {options['input']}: {e}")
+
+        try:
+            with stream as library:
+                for source in PlaybookImportService.iter_library(library):
+                    playbook = PlaybookImportService.import_playbook(source, user, conflict=options['conflict'])
+                    if playbook is None:
+                        skipped += 1
+                        self.stdout.write(f"Skipped {source.document.get('name')}: name taken")
+                        continue
+                    imported += 1
+                    for warning in source.warnings:
+                        self.stderr.write(f"{playbook.name}: {warning}")
+                    self.stdout.write(f"[{imported}] {playbook.name} ({time.monotonic() - started:.1f}s)")
+        except PlaybookImportError as e:
+            raise CommandError(f"Import stopped after {imported} playbooks: {e}")
+
+        logger.info(f"Imported {imported} playbooks for {user.username} from {options['input']} ({skipped} skipped)")
+        self.stdout.write(self.style.SUCCESS(f"Imported {imported} playbooks, skipped {skipped}"))
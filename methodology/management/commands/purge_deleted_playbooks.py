@@ -0,0 +1,31 @@
+"""
+Django management command to finish purging deleted playbooks.
+
+Deleted playbooks are normally purged by a background thread right after
+the delete commits; this sweeps up any purge interrupted by a restart.
+
+Usage:
+    python manage.py purge_deleted_playbooks [--chunk-size=500]
+"""
+import logging
+from django.core.management.base import BaseCommand
+
+from methodology.services.playbook_purge_service import PlaybookPurgeService, get_chunk_size
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Purge rows of playbooks that are marked deleted'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=get_chunk_size(),
+            help='Rows removed per DELETE statement'
+        )
+
+    def handle(self, *args, **options):
+        purged = PlaybookPurgeService.purge_pending(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Purged {len(purged)} deleted playbooks"))
@@ -0,0 +1,73 @@
+"""
+Django management command to restore the SQLite database from a backup.
+
+Usage:
+    python manage.py restore                      # newest snapshot
+    python manage.py restore mimir-20250101-120000-000000.db.gz
+    python manage.py restore PATH --no-safety-backup --noinput
+"""
+import logging
+import sqlite3
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+
+from methodology.services.backup_service import BackupService, BackupError, get_backup_dir
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Restore the database from a verified backup snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'snapshot',
+            nargs='?',
+            help='Snapshot file name (in BACKUP_DIR) or path; defaults to the newest snapshot'
+        )
+        parser.add_argument(
+            '--no-safety-backup',
+            action='store_true',
+            help='Do not back up the current database before restoring'
+        )
+        parser.add_argument(
+            '--noinput', '--no-input',
+            action='store_false',
+            dest='interactive',
+            help='Do not prompt for confirmation'
+        )
+
+    def handle(self, *args, **options):
+        archive = self._resolve_snapshot(options['snapshot'])
+
+        if options['interactive']:
+            answer = input(f"Overwrite the live database with {archive.name}? [y/N] ")
+            if answer.strip().lower() != 'y':
+                self.stdout.write('Restore cancelled')
+                return
+
+        try:
+            if not options['no_safety_backup']:
+                # Skip rotation so the snapshot being restored cannot be rotated away
+                manifest = BackupService.create_backup(keep=len(BackupService.list_backups()) + 1)
+                self.stdout.write(f"Safety backup written: {manifest['file']}")
+            pages = BackupService.restore_backup(archive)
+        except (BackupError, OSError, sqlite3.Error) as e:
+            logger.error(f"Restore from {archive} failed: {e}", exc_info=True)
+            raise CommandError(f"Restore failed: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"Restored {pages} pages from {archive.name}"))
+
+    def _resolve_snapshot(self, snapshot):
+        if not snapshot:
+            backups = BackupService.list_backups()
+            if not backups:
+                raise CommandError(f"No snapshots found in {get_backup_dir()}")
+            return backups[0]
+
+        path = Path(snapshot)
+        if not path.exists():
+            path = get_backup_dir() / snapshot
+        if not path.exists():
+            raise CommandError(f"Snapshot not found: {snapshot}")
+        return path
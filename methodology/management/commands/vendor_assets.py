@@ -0,0 +1,162 @@
+"""
+Django management command to vendor third-party front-end assets.
+
+Downloads pinned releases of Bootstrap, HTMX, Font Awesome Free and
+Mermaid into static/vendor/ so pages load without any external request.
+Run once at image build time, before collectstatic; existing files are
+kept, so rebuilding offline works once they have been fetched.
+
+Every download is checked against a Subresource Integrity hash. Hashes
+upstream publishes are listed in ASSETS; the others are pinned in
+static/vendor/integrity.json, which is committed. An asset with no hash
+there yet is pinned on its first download and the file is rewritten, so
+the maintainer adding or upgrading it commits the new hash;
+--frozen refuses to pin and fails instead.
+
+Usage:
+    python manage.py vendor_assets [--force] [--frozen]
+"""
+import base64
+import hashlib
+import json
+import logging
+import re
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+logger = logging.getLogger(__name__)
+
+JSDELIVR = 'https://cdn.jsdelivr.net/npm'
+FONTAWESOME = f'{JSDELIVR}/@fortawesome/fontawesome-free@6.7.2'
+
+# (path below static/vendor, source URL, SRI hash or None when it is pinned in INTEGRITY_FILE)
+ASSETS = [
+    ('bootstrap/css/bootstrap.min.css', f'{JSDELIVR}/bootstrap@5.3.8/dist/css/bootstrap.min.css',
+     'sha384-sRIl4kxILFvY47J16cr9ZwB07vP4J8+LH7qKQnuqkuIAvNWLzeN8tE5YBujZqJLB'),
+    ('bootstrap/js/bootstrap.bundle.min.js', f'{JSDELIVR}/bootstrap@5.3.8/dist/js/bootstrap.bundle.min.js',
+     'sha384-FKyoEForCGlyvwx9Hj09JcYn3nv7wiPVlz7YYwJrWVcXK/BmnVDxM+D2scQbITxI'),
+    ('htmx/htmx.min.js', f'{JSDELIVR}/htmx.org@2.0.4/dist/htmx.min.js',
+     'sha384-HGfztofotfshcF7+8n44JQL2oJmowVChPTg48S+jvZoztPfvwD79OC/LTtG6dMp+'),
+    ('mermaid/mermaid.min.js', f'{JSDELIVR}/mermaid@10.9.3/dist/mermaid.min.js', None),
+    ('fontawesome/css/all.min.css', f'{FONTAWESOME}/css/all.min.css', None),
+] + [
+    (f'fontawesome/webfonts/{font}.{ext}', f'{FONTAWESOME}/webfonts/{font}.{ext}', None)
+    for font in ('fa-brands-400', 'fa-regular-400', 'fa-solid-900', 'fa-v4compatibility')
+    for ext in ('woff2', 'ttf')
+]
+
+# Hashes of the assets upstream publishes none for, as {path: SRI hash}
+INTEGRITY_FILE = 'integrity.json'
+INTEGRITY_ALGORITHM = 'sha384'
+
+# Source maps are not shipped; manifest storage would fail on the dangling references
+_SOURCE_MAP_COMMENT = re.compile(rb'\n?(?://|/\*)# sourceMappingURL=\S+(?: \*/)?\s*$')
+
+
+def vendor_dir():
+    """
+    Get the directory vendored assets are written to.
+
+    :return: Path. Example: Path("/app/static/vendor")
+    """
+    return Path(settings.BASE_DIR) / 'static' / 'vendor'
+
+
+def integrity_of(data, algorithm=INTEGRITY_ALGORITHM):
+    """
+    Compute the Subresource Integrity hash of downloaded bytes.
+
+    :param data: file content as bytes
+    :param algorithm: hashlib algorithm name. Example: "sha384"
+    :return: SRI string. Example: "sha384-HGfz..."
+    """
+    return f"{algorithm}-{base64.b64encode(hashlib.new(algorithm, data).digest()).decode()}"
+
+
+def load_pins(target):
+    """
+    Read the hashes pinned for assets without an upstream hash.
+
+    :param target: vendor directory as Path
+    :return: dict of path -> SRI string. Example: {"mermaid/mermaid.min.js": "sha384-..."}
+    """
+    try:
+        return json.loads((target / INTEGRITY_FILE).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def verify_integrity(data, integrity):
+    """
+    Check downloaded bytes against a Subresource Integrity hash.
+
+    :param data: file content as bytes
+    :param integrity: SRI string. Example: "sha384-HGfz..."
+    :return: True if the digest matches
+    """
+    algorithm, _, _ = integrity.partition('-')
+    return integrity_of(data, algorithm) == integrity
+
+
+class Command(BaseCommand):
+    help = 'Download pinned front-end assets into static/vendor for offline serving'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Download again even if the file already exists'
+        )
+        parser.add_argument(
+            '--frozen',
+            action='store_true',
+            help=f'Fail on assets not pinned in {INTEGRITY_FILE} instead of pinning them'
+        )
+
+    def handle(self, *args, **options):
+        target = vendor_dir()
+        pins = load_pins(target)
+        fetched, pinned = 0, []
+        for relative_path, url, integrity in ASSETS:
+            path = target / relative_path
+            if path.exists() and not options['force']:
+                continue
+            integrity = integrity or pins.get(relative_path)
+            if integrity is None and options['frozen']:
+                raise CommandError(f"{relative_path} has no hash in {target / INTEGRITY_FILE}")
+
+            try:
+                with urllib.request.urlopen(url, timeout=60) as response:
+                    data = response.read()
+            except OSError as e:
+                logger.error(f"Failed to download {url}: {e}")
+                raise CommandError(f"Failed to download {url}: {e}")
+
+            if integrity is None:
+                pins[relative_path] = integrity_of(data)
+                pinned.append(relative_path)
+                # Written at once, so a later failure cannot leave a kept file unpinned
+                target.mkdir(parents=True, exist_ok=True)
+                (target / INTEGRITY_FILE).write_text(json.dumps(pins, indent=2, sort_keys=True) + '\n')
+                logger.warning(f"Pinned {relative_path} to {pins[relative_path]} on first download")
+            elif not verify_integrity(data, integrity):
+                raise CommandError(f"Integrity check failed for {url}")
+
+            if path.suffix in ('.css', '.js'):
+                data = _SOURCE_MAP_COMMENT.sub(b'\n', data)
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            fetched += 1
+            self.stdout.write(f"{relative_path}  {len(data)} bytes")
+
+        if pinned:
+            self.stdout.write(self.style.WARNING(
+                f"Pinned {len(pinned)} new hashes in {target / INTEGRITY_FILE}; commit it"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Vendored assets up to date in {target} ({fetched} downloaded, {len(ASSETS) - fetched} present)"
+        ))
@@ -0,0 +1,58 @@
+"""
+Django management command to report playbook version snapshot storage.
+
+Usage:
+    python manage.py version_storage_report
+    python manage.py version_storage_report --compact [--max-chain=16] [--playbook=<id>]
+"""
+import logging
+from django.core.management.base import BaseCommand
+
+from methodology.services.playbook_version_service import PlaybookVersionService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Report bytes saved by delta-compressed version snapshots, optionally re-compacting them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compact',
+            action='store_true',
+            help='Re-encode versions as keyframes plus capped delta chains before reporting'
+        )
+        parser.add_argument(
+            '--max-chain',
+            type=int,
+            default=None,
+            help='Override PLAYBOOK_VERSION_MAX_CHAIN when compacting'
+        )
+        parser.add_argument(
+            '--playbook',
+            type=int,
+            default=None,
+            help='Limit compaction to a single playbook ID'
+        )
+
+    def handle(self, *args, **options):
+        if options['compact']:
+            rewritten = PlaybookVersionService.compact_versions(
+                playbook_id=options['playbook'],
+                max_chain=options['max_chain']
+            )
+            self.stdout.write(self.style.SUCCESS(f'Compacted {rewritten} versions'))
+
+        report = PlaybookVersionService.storage_report()
+        logger.info(f'Version storage report: {report}')
+
+        raw = report['raw_bytes']
+        ratio = (report['stored_bytes'] / raw * 100) if raw else 0.0
+        self.stdout.write(f"Versions:        {report['versions']}")
+        self.stdout.write(f"  keyframes:     {report['keyframes']}")
+        self.stdout.write(f"  deltas:        {report['deltas']}")
+        self.stdout.write(f"  legacy (full): {report['legacy']}")
+        self.stdout.write(f"Longest chain:   {report['max_chain_length']}")
+        self.stdout.write(f"Raw bytes:       {raw}")
+        self.stdout.write(f"Stored bytes:    {report['stored_bytes']} ({ratio:.1f}% of raw)")
+        self.stdout.write(self.style.SUCCESS(f"Bytes saved:     {report['saved_bytes']}"))
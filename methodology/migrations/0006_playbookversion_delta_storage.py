@@ -0,0 +1,124 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:03
+
+from django.db import migrations, models
+
+from methodology.utils.json_patch import apply_patch, decompress_json
+from methodology.utils.snapshot_codec import encode_version, DEFAULT_MAX_CHAIN
+
+
+def compact_existing_versions(apps, schema_editor):
+    """Re-encode legacy full JSON snapshots as keyframes plus delta chains."""
+    PlaybookVersion = apps.get_model("methodology", "PlaybookVersion")
+
+    playbook_ids = (
+        PlaybookVersion.objects.order_by().values_list("playbook_id", flat=True).distinct()
+    )
+    for playbook_id in list(playbook_ids):
+        versions = list(
+            PlaybookVersion.objects.filter(playbook_id=playbook_id).order_by(
+                "version_number"
+            )
+        )
+        previous_snapshot = None
+        previous_chain_length = 0
+        for version in versions:
+            snapshot = version.snapshot_data or {}
+            fields = encode_version(
+                snapshot, previous_snapshot, previous_chain_length, DEFAULT_MAX_CHAIN
+            )
+            for name, value in fields.items():
+                setattr(version, name, value)
+            version.snapshot_data = None
+            previous_snapshot = snapshot
+            previous_chain_length = version.chain_length
+
+        PlaybookVersion.objects.bulk_update(
+            versions,
+            ["storage", "payload", "chain_length", "raw_size", "snapshot_data"],
+            batch_size=500,
+        )
+
+
+def expand_compacted_versions(apps, schema_editor):
+    """Restore full JSON snapshots so the legacy schema can be reinstated."""
+    PlaybookVersion = apps.get_model("methodology", "PlaybookVersion")
+
+    playbook_ids = (
+        PlaybookVersion.objects.order_by().values_list("playbook_id", flat=True).distinct()
+    )
+    for playbook_id in list(playbook_ids):
+        versions = list(
+            PlaybookVersion.objects.filter(playbook_id=playbook_id).order_by(
+                "version_number"
+            )
+        )
+        snapshot = None
+        for version in versions:
+            if version.storage == "full":
+                snapshot = version.snapshot_data
+            elif version.storage == "keyframe":
+                snapshot = decompress_json(version.payload)
+            else:
+                snapshot = apply_patch(snapshot, decompress_json(version.payload))
+            version.snapshot_data = snapshot
+
+        PlaybookVersion.objects.bulk_update(
+            versions, ["snapshot_data"], batch_size=500
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("methodology", "0005_artifact_artifactinput_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="playbookversion",
+            name="chain_length",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Number of deltas between this version and its keyframe (0 for keyframes)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="playbookversion",
+            name="payload",
+            field=models.BinaryField(
+                blank=True,
+                help_text="zlib-compressed snapshot (keyframe) or JSON Patch against previous version (delta)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="playbookversion",
+            name="raw_size",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Size in bytes of the uncompressed snapshot JSON"
+            ),
+        ),
+        migrations.AddField(
+            model_name="playbookversion",
+            name="storage",
+            field=models.CharField(
+                choices=[
+                    ("full", "Full JSON (legacy)"),
+                    ("keyframe", "Compressed keyframe"),
+                    ("delta", "Compressed delta"),
+                ],
+                default="full",
+                max_length=10,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="playbookversion",
+            name="snapshot_data",
+            field=models.JSONField(
+                blank=True,
+                help_text="Legacy uncompressed snapshot (only set when storage is 'full')",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(compact_existing_versions, expand_compacted_versions),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:06
+
+import methodology.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("methodology", "0006_playbookversion_delta_storage"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="artifact",
+            name="template_file",
+            field=models.FileField(
+                blank=True,
+                help_text="Optional template file. Example: 'component_template.tsx'",
+                null=True,
+                storage=methodology.storage.template_storage,
+                upload_to="artifacts/templates/",
+            ),
+        ),
+        migrations.CreateModel(
+            name="TemplateBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "digest",
+                    models.CharField(
+                        help_text="Hex SHA-256 of the file contents. Example: 'e3b0c442...'",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "size",
+                    models.BigIntegerField(
+                        help_text="Blob size in bytes. Example: 2048"
+                    ),
+                ),
+                (
+                    "ref_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of artifacts whose template_file points at this blob",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["ref_count"], name="methodology_ref_cou_680c7f_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("methodology", "0007_templateblob_content_addressed_storage"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="playbook",
+            name="unique_playbook_per_author",
+        ),
+        migrations.AddField(
+            model_name="playbook",
+            name="deleted_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="Set when the playbook is deleted; children are purged in the background",
+                null=True,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="playbook",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("author", "name"),
+                name="unique_playbook_per_author",
+            ),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_tag_index(apps, schema_editor):
+    """Index the tags of every existing playbook."""
+    Playbook = apps.get_model("methodology", "Playbook")
+    PlaybookTag = apps.get_model("methodology", "PlaybookTag")
+
+    rows = []
+    for playbook_id, tags in Playbook.objects.values_list("pk", "tags"):
+        names = {str(tag).strip().lower()[:100] for tag in (tags or [])}
+        rows.extend(
+            PlaybookTag(playbook_id=playbook_id, name=name) for name in names if name
+        )
+    PlaybookTag.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("methodology", "0008_playbook_soft_delete"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlaybookTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Normalized tag. Example: 'agile'", max_length=100
+                    ),
+                ),
+                (
+                    "playbook",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tag_index",
+                        to="methodology.playbook",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["name"],
+                "indexes": [
+                    models.Index(
+                        fields=["name", "playbook"], name="methodology_name_ba02a0_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("playbook", "name"), name="unique_tag_per_playbook"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_tag_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("methodology", "0009_playbook_tag_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLogEntry",
+            fields=[
+                (
+                    "seq",
+                    models.BigAutoField(
+                        help_text="Monotonically increasing sequence number",
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("playbook", "Playbook"),
+                            ("workflow", "Workflow"),
+                            ("activity", "Activity"),
+                            ("artifact", "Artifact"),
+                            ("artifact_input", "Artifact input"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.BigIntegerField(
+                        help_text="Primary key of the changed row. Example: 42"
+                    ),
+                ),
+                (
+                    "op",
+                    models.CharField(
+                        choices=[("upsert", "Upsert"), ("delete", "Delete")],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "playbook_id",
+                    models.BigIntegerField(
+                        help_text="Playbook the row belongs to. Example: 7"
+                    ),
+                ),
+                (
+                    "owner_id",
+                    models.BigIntegerField(
+                        help_text="User ID of the playbook author. Example: 3"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name_plural": "change log entries",
+                "ordering": ["seq"],
+                "indexes": [
+                    models.Index(
+                        fields=["owner_id", "seq"],
+                        name="methodology_owner_i_21e085_idx",
+                    ),
+                    models.Index(
+                        fields=["playbook_id", "seq"],
+                        name="methodology_playboo_90eebe_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("methodology", "0010_change_log"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activity",
+            name="merkle_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Cached hash of the activity's own content, dependencies and inputs; empty when stale",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="playbook",
+            name="merkle_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Cached Merkle root of the playbook content; empty when stale",
+                max_length=64,
+            ),
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("methodology", "0011_merkle_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "remote_name",
+                    models.CharField(
+                        help_text="Name of the playbook on Homebase. Example: fdd",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "auto_sync",
+                    models.BooleanField(
+                        default=False, help_text="Sync in the background every interval"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("never", "Never synced"),
+                            ("up_to_date", "Up to date"),
+                            ("conflicts", "Conflicts"),
+                            ("error", "Sync failed"),
+                        ],
+                        default="never",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "base_data",
+                    models.BinaryField(
+                        blank=True,
+                        help_text="zlib-compressed export of the playbook as of the last sync",
+                        null=True,
+                    ),
+                ),
+                (
+                    "cursor",
+                    models.BigIntegerField(
+                        default=0,
+                        help_text="Change feed sequence covered by the last sync",
+                    ),
+                ),
+                (
+                    "remote_root",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Homebase Merkle root at last sync",
+                        max_length=64,
+                    ),
+                ),
+                ("last_synced_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "last_result",
+                    models.JSONField(
+                        blank=True, default=dict, help_text="Summary of the last run"
+                    ),
+                ),
+                (
+                    "next_run_at",
+                    models.DateTimeField(blank=True, db_index=True, null=True),
+                ),
+                (
+                    "failures",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Consecutive failed runs, drives backoff"
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True, default="")),
+                (
+                    "lease_until",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Set while a scheduler runs this sync",
+                        null=True,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "playbook",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sync_state",
+                        to="methodology.playbook",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Sync state",
+            },
+        ),
+    ]
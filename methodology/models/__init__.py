@@ -4,5 +4,9 @@ from .workflow import Workflow
 from .activity import Activity
 from .artifact import Artifact
 from .artifact_input import ArtifactInput
+from .template_blob import TemplateBlob
+from .playbook_tag import PlaybookTag
+from .change_log import ChangeLogEntry
+from .sync_state import SyncState
 
-__all__ = ['Playbook', 'PlaybookVersion', 'Workflow', 'Activity', 'Artifact', 'ArtifactInput']
+__all__ = ['Playbook', 'PlaybookVersion', 'Workflow', 'Activity', 'Artifact', 'ArtifactInput', 'TemplateBlob', 'PlaybookTag', 'ChangeLogEntry', 'SyncState']
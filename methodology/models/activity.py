@@ -71,6 +71,13 @@ class Activity(models.Model):
         blank=True,
         help_text="Timestamp when activity was last accessed/viewed (for Recent Activity tracking)"
     )
+    merkle_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        editable=False,
+        help_text="Cached hash of the activity's own content, dependencies and inputs; empty when stale"
+    )
     
     class Meta:
         ordering = ['workflow', 'order', 'name']
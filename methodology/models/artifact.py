@@ -8,6 +8,8 @@ by downstream activities in the workflow.
 from django.db import models
 from django.core.exceptions import ValidationError
 
+from methodology.storage import template_storage
+
 
 class Artifact(models.Model):
     """
@@ -61,9 +63,10 @@ class Artifact(models.Model):
         help_text="Playbook containing this artifact (via activity->workflow->playbook)",
     )
 
-    # Template file (optional)
+    # Template file (optional) - stored once per SHA-256 digest
     template_file = models.FileField(
         upload_to="artifacts/templates/",
+        storage=template_storage,
         blank=True,
         null=True,
         help_text="Optional template file. Example: 'component_template.tsx'",
@@ -0,0 +1,54 @@
+"""
+ChangeLogEntry model - append-only change feed of playbook content.
+
+Every save or delete of a Playbook, Workflow, Activity, Artifact or
+ArtifactInput appends one entry in the same transaction as the change.
+The primary key is the sequence number: readers keep the last ``seq``
+they processed as their cursor and ask for everything after it (see
+ChangeFeedService).
+
+Entries name the changed row but do not copy it; the feed reads the
+current row when it is served, so several changes to one row collapse
+into a single upsert.
+"""
+
+from django.db import models
+
+
+class ChangeLogEntry(models.Model):
+    """One upsert or delete of a playbook content row."""
+
+    OP_UPSERT = 'upsert'
+    OP_DELETE = 'delete'
+    OP_CHOICES = [
+        (OP_UPSERT, 'Upsert'),
+        (OP_DELETE, 'Delete'),
+    ]
+
+    KIND_CHOICES = [
+        ('playbook', 'Playbook'),
+        ('workflow', 'Workflow'),
+        ('activity', 'Activity'),
+        ('artifact', 'Artifact'),
+        ('artifact_input', 'Artifact input'),
+    ]
+
+    seq = models.BigAutoField(primary_key=True, help_text="Monotonically increasing sequence number")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField(help_text="Primary key of the changed row. Example: 42")
+    op = models.CharField(max_length=10, choices=OP_CHOICES)
+    # Plain integers: entries outlive the rows they describe
+    playbook_id = models.BigIntegerField(help_text="Playbook the row belongs to. Example: 7")
+    owner_id = models.BigIntegerField(help_text="User ID of the playbook author. Example: 3")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['seq']
+        indexes = [
+            models.Index(fields=['owner_id', 'seq']),
+            models.Index(fields=['playbook_id', 'seq']),
+        ]
+        verbose_name_plural = 'change log entries'
+
+    def __str__(self):
+        return f"#{self.seq} {self.op} {self.kind} {self.object_id}"
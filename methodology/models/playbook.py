@@ -7,11 +7,24 @@ Each playbook can be owned (created by user) or downloaded from families.
 
 from decimal import Decimal
 from django.db import models
+from django.utils.functional import cached_property
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
+class LivePlaybookManager(models.Manager):
+    """
+    Default manager hiding playbooks that are marked deleted.
+
+    Deleted playbooks stay in the table until the background purge removes
+    them and their children; use ``Playbook.all_objects`` to see them.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Playbook(models.Model):
     """
     Playbook represents a methodology with workflows, activities, and artifacts.
@@ -63,18 +76,59 @@ class Playbook(models.Model):
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Set when the playbook is deleted; children are purged in the background"
+    )
+    merkle_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        editable=False,
+        help_text="Cached Merkle root of the playbook content; empty when stale"
+    )
+    
+    # Managers
+    objects = LivePlaybookManager()
+    all_objects = models.Manager()
     
     class Meta:
         ordering = ['-updated_at']
         constraints = [
-            models.UniqueConstraint(fields=['author', 'name'], name='unique_playbook_per_author')
+            models.UniqueConstraint(
+                fields=['author', 'name'],
+                condition=models.Q(deleted_at__isnull=True),
+                name='unique_playbook_per_author'
+            )
         ]
     
     def __str__(self):
         return f"{self.name} (v{self.version})"
     
+    @property
+    def is_deleted(self):
+        """Check if playbook is marked deleted and awaiting purge."""
+        return self.deleted_at is not None
+    
+    @cached_property
+    def change_seq(self):
+        """
+        Newest change feed sequence number of this playbook's content.
+        
+        Every save or delete of the playbook or a row beneath it, including
+        bulk writes, appends to the change feed whatever the status, so this
+        changes on every edit; template fragment cache keys use it.
+        
+        :returns: sequence number as int, 0 if nothing was recorded. Example: 812
+        """
+        from methodology.services.change_feed_service import ChangeFeedService
+        return ChangeFeedService.latest_seq(self.pk)
+    
     def is_owned_by(self, user):
-        return self.author == user
+        # Compare keys so async views can call this without loading author
+        return self.author_id is not None and self.author_id == getattr(user, 'pk', None)
     
     def can_edit(self, user):
         """
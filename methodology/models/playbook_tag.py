@@ -0,0 +1,42 @@
+"""
+PlaybookTag model - normalized index of Playbook.tags.
+
+``Playbook.tags`` stays the source of truth (a JSON list); this table is
+kept in sync by a post_save signal so tag filters and facet counts are
+answered with indexed lookups instead of scanning JSON in Python.
+"""
+
+from django.db import models
+
+
+def normalize_tag(tag):
+    """
+    Normalize a tag for indexing and lookup.
+
+    :param tag: raw tag as str. Example: "  Agile "
+    :return: normalized tag as str. Example: "agile"
+    """
+    return str(tag).strip().lower()[:100]
+
+
+class PlaybookTag(models.Model):
+    """
+    One (playbook, tag) pair from a playbook's tags list.
+
+    Tags are stored lower-cased so filtering is case-insensitive.
+    """
+
+    playbook = models.ForeignKey('Playbook', on_delete=models.CASCADE, related_name='tag_index')
+    name = models.CharField(max_length=100, help_text="Normalized tag. Example: 'agile'")
+
+    class Meta:
+        ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(fields=['playbook', 'name'], name='unique_tag_per_playbook')
+        ]
+        indexes = [
+            models.Index(fields=['name', 'playbook']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} → {self.playbook_id}"
@@ -3,29 +3,98 @@ PlaybookVersion model for tracking version history.
 
 Each save of a playbook creates a new version entry.
 Versions are integer-based (v1, v2, v3...).
+
+Snapshots are stored as a keyframe followed by a bounded chain of
+zlib-compressed JSON Patch deltas (see PlaybookVersionService).
 """
 
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from methodology.utils.json_patch import decompress_json
+
 User = get_user_model()
 
 
 class PlaybookVersion(models.Model):
     """Tracks version history for playbooks."""
-    
+
+    STORAGE_FULL = 'full'
+    STORAGE_KEYFRAME = 'keyframe'
+    STORAGE_DELTA = 'delta'
+
+    STORAGE_CHOICES = [
+        (STORAGE_FULL, 'Full JSON (legacy)'),
+        (STORAGE_KEYFRAME, 'Compressed keyframe'),
+        (STORAGE_DELTA, 'Compressed delta'),
+    ]
+
     playbook = models.ForeignKey('Playbook', on_delete=models.CASCADE, related_name='versions')
     version_number = models.IntegerField()
-    snapshot_data = models.JSONField()
+    snapshot_data = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Legacy uncompressed snapshot (only set when storage is 'full')"
+    )
+    storage = models.CharField(max_length=10, choices=STORAGE_CHOICES, default=STORAGE_FULL)
+    payload = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text="zlib-compressed snapshot (keyframe) or JSON Patch against previous version (delta)"
+    )
+    chain_length = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of deltas between this version and its keyframe (0 for keyframes)"
+    )
+    raw_size = models.PositiveIntegerField(
+        default=0,
+        help_text="Size in bytes of the uncompressed snapshot JSON"
+    )
     change_summary = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
-    
+
     class Meta:
         ordering = ['-version_number']
         constraints = [
             models.UniqueConstraint(fields=['playbook', 'version_number'], name='unique_version_per_playbook')
         ]
-    
+
     def __str__(self):
         return f"{self.playbook.name} v{self.version_number}"
+
+    @property
+    def is_keyframe(self):
+        """Check if this row holds a complete snapshot (keyframe or legacy full)."""
+        return self.storage in (self.STORAGE_FULL, self.STORAGE_KEYFRAME)
+
+    @property
+    def stored_size(self):
+        """
+        Get number of bytes this row uses for snapshot storage.
+
+        :returns: Stored size in bytes as int. Example: 142
+        """
+        if self.storage == self.STORAGE_FULL:
+            return self.raw_size
+        return len(self.payload or b'')
+
+    def decode_payload(self):
+        """
+        Decode the stored keyframe snapshot or delta operations.
+
+        :returns: Snapshot dict for keyframes/full rows, list of patch ops for deltas.
+            Example: [{"op": "replace", "path": "/name", "value": "New"}]
+        """
+        if self.storage == self.STORAGE_FULL:
+            return self.snapshot_data
+        return decompress_json(self.payload)
+
+    def get_snapshot(self):
+        """
+        Reconstruct the full snapshot for this version.
+
+        :returns: Snapshot dict. Example: {"name": "React Dev", "status": "draft", ...}
+        """
+        from methodology.services.playbook_version_service import PlaybookVersionService
+        return PlaybookVersionService.get_snapshot(self.playbook_id, self.version_number)
@@ -0,0 +1,59 @@
+"""
+SyncState model - persisted auto-sync bookkeeping for one playbook (SYNC-05, SYNC-06).
+
+Holds what the scheduler needs to resume after a restart without a full
+re-sync: when the next run is due, how many runs failed in a row, the
+change feed cursor and Homebase Merkle root seen at the last sync, and
+the playbook as it was then (the base of the next three-way merge).
+A lease stops two schedulers from syncing the same playbook at once.
+"""
+
+from django.db import models
+
+from .playbook import Playbook
+
+
+class SyncState(models.Model):
+    """Auto-sync schedule and last-sync snapshot of a playbook."""
+
+    STATUS_NEVER = 'never'
+    STATUS_UP_TO_DATE = 'up_to_date'
+    STATUS_CONFLICTS = 'conflicts'
+    STATUS_ERROR = 'error'
+    STATUS_CHOICES = [
+        (STATUS_NEVER, 'Never synced'),
+        (STATUS_UP_TO_DATE, 'Up to date'),
+        (STATUS_CONFLICTS, 'Conflicts'),
+        (STATUS_ERROR, 'Sync failed'),
+    ]
+
+    playbook = models.OneToOneField(Playbook, on_delete=models.CASCADE, related_name='sync_state')
+    remote_name = models.CharField(max_length=100, help_text="Name of the playbook on Homebase. Example: fdd")
+    auto_sync = models.BooleanField(default=False, help_text="Sync in the background every interval")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_NEVER)
+
+    # Last successful sync
+    base_data = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text="zlib-compressed export of the playbook as of the last sync"
+    )
+    cursor = models.BigIntegerField(default=0, help_text="Change feed sequence covered by the last sync")
+    remote_root = models.CharField(max_length=64, blank=True, default='', help_text="Homebase Merkle root at last sync")
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+    last_result = models.JSONField(default=dict, blank=True, help_text="Summary of the last run")
+
+    # Scheduling
+    next_run_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    failures = models.PositiveIntegerField(default=0, help_text="Consecutive failed runs, drives backoff")
+    last_error = models.TextField(blank=True, default='')
+    lease_until = models.DateTimeField(null=True, blank=True, help_text="Set while a scheduler runs this sync")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Sync state'
+
+    def __str__(self):
+        return f"Sync of playbook {self.playbook_id} as {self.remote_name}: {self.status}"
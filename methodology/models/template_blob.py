@@ -0,0 +1,39 @@
+"""
+TemplateBlob model for content-addressed artifact template storage.
+
+Each distinct template file content is stored once on disk, keyed by its
+SHA-256 digest. Artifacts reference blobs by name; reference counts let
+orphaned blobs be garbage-collected.
+"""
+
+from django.db import models
+
+
+class TemplateBlob(models.Model):
+    """
+    A stored template file body, identified by SHA-256 digest.
+
+    Multiple artifacts (across duplicated or imported playbooks) can
+    reference the same blob, so copying an artifact is metadata-only.
+    """
+
+    digest = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="Hex SHA-256 of the file contents. Example: 'e3b0c442...'"
+    )
+    size = models.BigIntegerField(help_text="Blob size in bytes. Example: 2048")
+    ref_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of artifacts whose template_file points at this blob"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['ref_count']),
+        ]
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.size} bytes, {self.ref_count} refs)"
@@ -11,6 +11,15 @@ urlpatterns = [
     path('create/step2/', playbook_views.playbook_create_step2, name='playbook_create_step2'),
     path('create/step3/', playbook_views.playbook_create_step3, name='playbook_create_step3'),
     
+    # Bulk export of selected playbooks
+    path('export/', playbook_views.playbook_bulk_export, name='playbook_bulk_export'),
+    
+    # Import from JSON export or .mpa package
+    path('import/', playbook_views.playbook_import, name='playbook_import'),
+    
+    # Incremental change feed for sync
+    path('changes/', playbook_views.playbook_changes, name='playbook_changes'),
+    
     # Legacy add endpoint (kept for backwards compatibility)
     path('add/', playbook_views.playbook_add, name='playbook_add'),
     
@@ -20,6 +29,7 @@ urlpatterns = [
     
     # Actions
     path('<int:pk>/export/', playbook_views.playbook_export, name='playbook_export'),
+    path('<int:pk>/merkle/', playbook_views.playbook_merkle, name='playbook_merkle'),
     path('<int:pk>/duplicate/', playbook_views.playbook_duplicate, name='playbook_duplicate'),
     path('<int:pk>/toggle-status/', playbook_views.playbook_toggle_status, name='playbook_toggle_status'),
     path('<int:pk>/delete/', playbook_views.playbook_delete, name='playbook_delete'),
@@ -6,17 +6,36 @@ Implements 3-step wizard for playbook creation.
 
 import logging
 import json
-from django.shortcuts import render, redirect, get_object_or_404
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.core.exceptions import ValidationError
 from django.db import transaction
-
-from methodology.models import Playbook, Workflow, PlaybookVersion
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+
+from methodology.conditional import conditional_page, playbook_detail_validator
+from methodology.models import Playbook, Workflow
+from methodology.services.change_feed_service import ChangeFeedService, get_page_size
+from methodology.services.merkle_service import MerkleService, MerkleError
+from methodology.services.playbook_export_service import PlaybookExportService
+from methodology.services.playbook_import_service import (
+    PlaybookImportService, PlaybookImportError, CONFLICT_MODES, CONFLICT_CANCEL,
+)
+from methodology.services.playbook_package_service import PlaybookPackageService
+from methodology.services.playbook_version_service import PlaybookVersionService
+from methodology.services.playbook_service import PlaybookService
+from methodology.services.playbook_tag_service import PlaybookTagService
 from methodology.forms import (
     PlaybookBasicInfoForm,
     PlaybookWorkflowForm,
     PlaybookPublishingForm
 )
+from mimir.async_render import arender, streaming_response
+from mimir.query_budget import query_budget
 
 logger = logging.getLogger(__name__)
 
@@ -24,18 +43,31 @@ logger = logging.getLogger(__name__)
 # ==================== LIST ====================
 
 @login_required
-def playbook_list(request):
-    """List all playbooks for current user."""
-    logger.info(f"User {request.user.username} accessing playbook list")
+@query_budget(10)
+async def playbook_list(request):
+    """
+    List all playbooks for current user.
+    
+    Supports ?tag=<name> filtering; tag facets with counts come from the
+    PlaybookTag index.
+    """
+    user = await request.auser()
+    logger.info(f"User {user.username} accessing playbook list")
     
-    playbooks = Playbook.objects.filter(author=request.user).order_by('-updated_at')
+    active_tag = request.GET.get('tag', '').strip()
+    queryset = Playbook.objects.filter(author=user).order_by('-updated_at')
+    if active_tag:
+        queryset = PlaybookTagService.filter_by_tag(queryset, active_tag)
+    playbooks = [playbook async for playbook in queryset]
     
     context = {
         'playbooks': playbooks,
-        'total_count': playbooks.count()
+        'total_count': len(playbooks),
+        'tag_facets': await sync_to_async(PlaybookTagService.tag_counts)(user),
+        'active_tag': active_tag.lower(),
     }
     
-    return render(request, 'playbooks/list.html', context)
+    return await arender(request, 'playbooks/list.html', context)
 
 
 # ==================== CREATE WIZARD ====================
@@ -197,12 +229,12 @@ def _create_initial_version(playbook, user):
         'status': playbook.status
     }
     
-    PlaybookVersion.objects.create(
-        playbook=playbook,
-        version_number=1,
-        snapshot_data=snapshot_data,
+    PlaybookVersionService.record_version(
+        playbook,
+        snapshot_data,
         change_summary='Initial version',
-        created_by=user
+        created_by=user,
+        version_number=1
     )
     logger.info(f"Version 1 created for playbook {playbook.pk}")
 
@@ -268,23 +300,29 @@ def playbook_create_step3(request):
 # ==================== DETAIL ====================
 
 @login_required
-def playbook_detail(request, pk):
+@query_budget(14)
+@conditional_page(playbook_detail_validator)
+async def playbook_detail(request, pk):
     """
     View playbook details.
     
+    Workflows and versions stay lazy: the workflows section is a cached
+    template fragment, so they are only queried on a fragment miss.
+    
     Template Context:
         - playbook: Playbook instance
         - workflows: QuerySet of related Workflow instances
         - versions: QuerySet of latest 5 PlaybookVersion instances
         - can_edit: Boolean indicating if user can edit playbook
     """
-    logger.info(f"User {request.user.username} viewing playbook {pk}")
+    user = await request.auser()
+    logger.info(f"User {user.username} viewing playbook {pk}")
     
-    playbook = get_object_or_404(Playbook, pk=pk)
+    playbook = await aget_object_or_404(Playbook, pk=pk)
     
     # Check if user has access
-    if playbook.source == 'owned' and playbook.author != request.user:
-        logger.warning(f"User {request.user.username} attempted to access playbook {pk} they don't own")
+    if playbook.source == 'owned' and not playbook.is_owned_by(user):
+        logger.warning(f"User {user.username} attempted to access playbook {pk} they don't own")
         messages.error(request, "You don't have permission to view this playbook.")
         return redirect('playbook_list')
     
@@ -292,10 +330,10 @@ def playbook_detail(request, pk):
         'playbook': playbook,
         'workflows': playbook.workflows.all(),
         'versions': playbook.versions.all()[:5],  # Latest 5 versions
-        'can_edit': playbook.can_edit(request.user)
+        'can_edit': playbook.can_edit(user)
     }
     
-    return render(request, 'playbooks/detail.html', context)
+    return await arender(request, 'playbooks/detail.html', context)
 
 
 # ==================== LEGACY STUBS ====================
@@ -318,19 +356,19 @@ def playbook_edit(request, pk):
 @login_required
 def playbook_export(request, pk):
     """
-    Export playbook to JSON file.
+    Export playbook to a JSON file, an .mpa package or an .mpb library.
     
-    Downloads playbook metadata as JSON.
-    Shallow export - metadata only, no workflows/activities yet.
+    Streams a deep export: metadata, workflows, activities with their
+    dependencies, artifacts, artifact inputs and version history. The
+    .mpa package (?format=mpa) also carries artifact template files; the
+    .mpb library (?format=mpb) is the compact binary form of the export.
     
     :param request: HTTP request
     :param pk: Playbook primary key
-    :returns: JSON file download response
+    :returns: Streaming file download response
     """
-    import json
-    from django.http import JsonResponse
-    
-    logger.info(f"User {request.user.username} exporting playbook {pk}")
+    export_format = request.GET.get('format', 'json')
+    logger.info(f"User {request.user.username} exporting playbook {pk} as {export_format}")
     
     playbook = get_object_or_404(Playbook, pk=pk)
     
@@ -340,38 +378,203 @@ def playbook_export(request, pk):
         messages.error(request, "You can only export playbooks you own.")
         return redirect('playbook_detail', pk=pk)
     
-    # Build JSON data
-    data = {
-        'name': playbook.name,
-        'description': playbook.description,
-        'category': playbook.category,
-        'tags': playbook.tags,
-        'visibility': playbook.visibility,
-        'status': playbook.status,
-        'version': playbook.version,
-        'created_at': playbook.created_at.isoformat(),
-        'updated_at': playbook.updated_at.isoformat(),
-        'note': 'Shallow export - metadata only'
-    }
+    if export_format == 'mpa':
+        chunks, content_type = PlaybookPackageService.iter_mpa(playbook), 'application/zip'
+    elif export_format == 'mpb':
+        chunks, content_type = PlaybookPackageService.iter_library([playbook]), 'application/octet-stream'
+    else:
+        export_format = 'json'
+        chunks, content_type = PlaybookExportService.iter_json(playbook), 'application/json'
     
-    # Create filename
-    safe_name = playbook.name.lower().replace(' ', '-').replace('_', '-')
-    filename = f"{safe_name}-v{playbook.version}.json"
+    filename = PlaybookExportService.export_filename(playbook, export_format)
+    response = streaming_response(request, chunks, content_type=content_type)
+    response['Content-Disposition'] = content_disposition_header(True, filename)
     
-    response = JsonResponse(data)
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    logger.info(f"Streaming export of playbook {pk} as {filename}")
+    return response
+
+
+@login_required
+def playbook_bulk_export(request):
+    """
+    Export several playbooks as a single zip of JSON files or an .mpb library.
+    
+    Selected via ?ids=1&ids=2; playbooks the user does not own are skipped.
+    ?format=mpb downloads the compact .mpb library instead of the zip.
+    All playbooks are read with one query per table and streamed.
+    
+    :param request: HTTP request
+    :returns: Streaming download response, or redirect if nothing was selected
+    """
+    ids = [value for value in request.GET.getlist('ids') if value.isdigit()]
+    playbooks = list(Playbook.objects.filter(author=request.user, pk__in=ids))
+    logger.info(f"User {request.user.username} bulk exporting {len(playbooks)} of {len(ids)} selected playbooks")
+    
+    if not playbooks:
+        messages.error(request, "Select at least one of your playbooks to export.")
+        return redirect('playbook_list')
+    
+    def log_progress(done, total, playbook, size):
+        logger.info(f"Bulk export for {request.user.username}: {done}/{total} playbook {playbook.pk} ({size} bytes)")
     
-    logger.info(f"Exported playbook {pk} as {filename}")
+    if request.GET.get('format') == 'mpb':
+        extension, content_type = 'mpb', 'application/octet-stream'
+        chunks = PlaybookPackageService.iter_library(playbooks, progress=log_progress)
+    else:
+        extension, content_type = 'zip', 'application/zip'
+        chunks = PlaybookPackageService.iter_bulk_export(playbooks, progress=log_progress)
+    
+    filename = f"mimir-playbooks-{timezone.now():%Y%m%d-%H%M%S}.{extension}"
+    response = streaming_response(request, chunks, content_type=content_type)
+    response['Content-Disposition'] = content_disposition_header(True, filename)
     return response
 
 
+@login_required
+def playbook_changes(request):
+    """
+    Get the changes to the user's playbooks since a cursor as JSON.
+    
+    Query parameters: ``since`` (last applied sequence number, default 0)
+    and ``limit`` (log entries per page, at most CHANGE_FEED_PAGE_SIZE).
+    Callers store the returned cursor and poll again while ``has_more``
+    is true.
+    
+    :param request: HTTP request
+    :returns: JSON response. Example: {"cursor": 812, "has_more": false, "changes": [...]}
+    """
+    since, limit = request.GET.get('since', '0'), request.GET.get('limit', '')
+    if not since.isdigit() or (limit and not limit.isdigit()):
+        return JsonResponse({'error': 'since and limit must be non-negative integers'}, status=400)
+    
+    page = ChangeFeedService.changes_since(
+        request.user.pk, cursor=int(since), limit=min(int(limit), get_page_size()) if limit else None,
+    )
+    logger.info(
+        f"User {request.user.username} read {len(page['changes'])} changes after {since} (cursor {page['cursor']})"
+    )
+    return JsonResponse(page, encoder=DjangoJSONEncoder)
+
+
+@login_required
+def playbook_merkle(request, pk):
+    """
+    Answer a Merkle diff query about one of the user's playbooks as JSON.
+    
+    Query parameters: ``op`` (summary or children), ``path`` (JSON list of
+    names from the root) and ``prefix`` (hex bucket prefix). A peer holding
+    another copy of the playbook uses this to find where the copies differ
+    (see MerkleService.diff).
+    
+    :param request: HTTP request
+    :param pk: Playbook primary key
+    :returns: JSON response. Example: {"hash": "9f86...", "count": 3, "buckets": {...}}
+    """
+    playbook = get_object_or_404(Playbook, pk=pk)
+    if not playbook.is_owned_by(request.user):
+        logger.warning(f"User {request.user.username} attempted to read Merkle tree of playbook {pk} they don't own")
+        return JsonResponse({'error': 'You can only sync playbooks you own'}, status=403)
+    
+    try:
+        answer = MerkleService.tree(playbook).query(request.GET)
+    except MerkleError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse(answer)
+
+
+@login_required
+def playbook_import(request):
+    """
+    Import a playbook from a JSON export or an .mpa package.
+    
+    GET shows the upload form. POST with a file validates it and imports
+    it; validation errors are listed on the form (IMPORT-04). When the
+    user already has a playbook with that name and chose "ask", the upload
+    is stashed and a conflict dialog offers Rename, Replace or Cancel
+    (IMPORT-05), which posts back a resolution without a file.
+    
+    :param request: HTTP request
+    :returns: Rendered import page or redirect to the imported playbook
+    """
+    if request.method != 'POST':
+        return render(request, 'playbooks/import.html', {})
+    
+    uploaded = request.FILES.get('file')
+    if uploaded is None:
+        return _resolve_import_conflict(request)
+    
+    conflict = request.POST.get('conflict')
+    if conflict not in CONFLICT_MODES:
+        conflict = None
+    logger.info(f"User {request.user.username} importing {uploaded.name} (conflict={conflict})")
+    try:
+        source = PlaybookImportService.load(uploaded)
+        PlaybookImportService.validate(source)
+        existing = PlaybookImportService.find_conflict(source, request.user)
+        if existing is not None and conflict is None:
+            token = PlaybookImportService.stash(uploaded)
+            request.session['pending_import'] = {'token': token, 'filename': uploaded.name}
+            return render(request, 'playbooks/import.html', {'existing': existing, 'filename': uploaded.name})
+        playbook = PlaybookImportService.import_playbook(source, request.user, conflict=conflict)
+    except PlaybookImportError as e:
+        logger.warning(f"Import of {uploaded.name} by {request.user.username} failed: {e}")
+        return render(request, 'playbooks/import.html', {'errors': e.errors, 'filename': uploaded.name})
+    return _import_done(request, playbook, source)
+
+
+def _resolve_import_conflict(request):
+    """
+    Finish a stashed import with the conflict resolution the user picked.
+    
+    :param request: HTTP request with POST resolution (rename, replace or cancel)
+    :returns: Redirect to the imported playbook or the playbook list
+    """
+    pending = request.session.pop('pending_import', None) or {}
+    token = pending.get('token')
+    resolution = request.POST.get('resolution')
+    try:
+        if resolution not in CONFLICT_MODES:
+            messages.error(request, "Select a file to import.")
+            return redirect('playbook_import')
+        if resolution == CONFLICT_CANCEL:
+            messages.info(request, "Import cancelled.")
+            return redirect('playbook_list')
+        try:
+            with PlaybookImportService.open_stash(token) as handle:
+                source = PlaybookImportService.load(handle)
+                playbook = PlaybookImportService.import_playbook(source, request.user, conflict=resolution)
+        except PlaybookImportError as e:
+            return render(request, 'playbooks/import.html', {'errors': e.errors, 'filename': pending.get('filename')})
+        return _import_done(request, playbook, source)
+    finally:
+        PlaybookImportService.discard_stash(token)
+
+
+def _import_done(request, playbook, source):
+    """
+    Report a finished import and redirect to the new playbook.
+    
+    :param request: HTTP request
+    :param playbook: imported Playbook or None if cancelled
+    :param source: ImportSource that was imported
+    :returns: Redirect response
+    """
+    if playbook is None:
+        messages.info(request, "Import cancelled.")
+        return redirect('playbook_list')
+    for warning in source.warnings:
+        messages.warning(request, warning)
+    messages.success(request, f'Playbook "{playbook.name}" imported successfully.')
+    return redirect('playbook_detail', pk=playbook.pk)
+
+
 @login_required
 def playbook_duplicate(request, pk):
     """
-    Duplicate playbook (shallow copy).
+    Duplicate playbook (deep copy).
     
-    Creates new playbook with same metadata but marked as owned.
-    Shallow copy - metadata only, no workflows/activities copied yet.
+    Creates a private draft playbook owned by the user with copies of all
+    workflows, activities, artifacts, artifact inputs and dependencies.
     
     :param request: HTTP request
     :param pk: Playbook primary key to duplicate
@@ -384,18 +587,11 @@ def playbook_duplicate(request, pk):
     if request.method == 'POST':
         new_name = request.POST.get('new_name', f"{original.name} (Copy)")
         
-        # Create duplicate
-        duplicate = Playbook.objects.create(
-            name=new_name,
-            description=original.description,
-            category=original.category,
-            tags=original.tags.copy() if original.tags else [],
-            visibility='private',  # Duplicates are always private
-            status='draft',  # Duplicates start as draft
-            version=1,  # New version sequence
-            source='owned',  # Duplicates are always owned
-            author=request.user
-        )
+        try:
+            duplicate = PlaybookService.duplicate_playbook(original.pk, new_name, request.user)
+        except ValidationError as e:
+            messages.error(request, e.messages[0])
+            return redirect('playbook_detail', pk=pk)
         
         logger.info(f"Created duplicate playbook {duplicate.pk} from {pk}")
         messages.success(request, f'Playbook duplicated as "{new_name}"')
@@ -488,14 +684,9 @@ def playbook_delete(request, pk):
             f"for user {request.user.username}"
         )
         
-        # CASCADE DELETE: Django will automatically delete related:
-        # - Workflows (via foreign key with on_delete=CASCADE)
-        # - Activities (via workflow cascade)
-        # - Playbook versions
-        # - Artifacts
-        # - Roles
-        # - Howtos
-        playbook.delete()
+        # Marks the playbook deleted; workflows, activities, artifacts and
+        # versions are purged in the background after this request commits
+        PlaybookService.delete_playbook(pk)
         
         logger.info(f"Successfully deleted playbook '{playbook_name}' (id={pk})")
         messages.success(request, f"Playbook '{playbook_name}' deleted successfully.")
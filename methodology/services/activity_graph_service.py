@@ -6,6 +6,8 @@ Supports phase grouping, clickable nodes, and status-based styling.
 """
 
 import logging
+import subprocess
+
 import graphviz
 from django.urls import reverse
 from methodology.models import Activity
@@ -27,7 +29,7 @@ class ActivityGraphService:
     No status tracking - work tracking happens in external systems.
     """
     
-    def generate_activities_graph(self, workflow, playbook):
+    def generate_activities_graph(self, workflow, playbook, timeout=None, activities=None):
         """
         Generate Graphviz flow diagram of activities in a workflow.
         
@@ -41,9 +43,16 @@ class ActivityGraphService:
         :type workflow: methodology.models.Workflow
         :param playbook: Playbook instance (parent of workflow, used for URL generation)
         :type playbook: methodology.models.Playbook
+        :param timeout: seconds to let Graphviz run, or None for no limit. Example: 10
+        :type timeout: float or None
+        :param activities: pre-fetched activities ordered by order, with workflow and
+            successor__workflow selected; None to query them. Passing them keeps this
+            method free of database access so async views can run it in the render pool.
+        :type activities: list or None
         :return: SVG markup as string, or None if no activities exist
         :rtype: str or None
         :raises graphviz.backend.ExecutableNotFound: If Graphviz is not installed on system
+        :raises subprocess.TimeoutExpired: If layout takes longer than timeout
         
         Example usage:
             >>> service = ActivityGraphService()
@@ -56,10 +65,11 @@ class ActivityGraphService:
         """
         logger.info(f"Generating activity graph for workflow {workflow.pk}")
         
-        # Fetch activities for workflow
-        activities = Activity.objects.filter(workflow=workflow).order_by('order')
+        # Fetch activities once; node labels and edges read workflow and successor
+        if activities is None:
+            activities = list(self.get_graph_activities(workflow))
         
-        if not activities.exists():
+        if not activities:
             logger.info(f"No activities found for workflow {workflow.pk}")
             return None
         
@@ -105,10 +115,9 @@ class ActivityGraphService:
                     logger.debug(f"Added edge: {activity.reference_name} -> {activity.successor.reference_name}")
             
             # Generate SVG
-            svg_bytes = dot.pipe(format='svg')
-            svg_str = svg_bytes.decode('utf-8')
+            svg_str = self._render_svg(dot, timeout)
             
-            logger.info(f"Generated SVG graph for workflow {workflow.pk} with {activities.count()} activities")
+            logger.info(f"Generated SVG graph for workflow {workflow.pk} with {len(activities)} activities")
             return svg_str
             
         except Exception as e:
@@ -116,6 +125,52 @@ class ActivityGraphService:
             raise
     
     
+    @staticmethod
+    def get_graph_activities(workflow):
+        """
+        Get the activities of a workflow with the relations the graph reads.
+        
+        :param workflow: Workflow instance
+        :type workflow: methodology.models.Workflow
+        :return: QuerySet of Activity ordered by order
+        :rtype: django.db.models.QuerySet
+        
+        Example:
+            >>> activities = [a async for a in ActivityGraphService.get_graph_activities(workflow)]
+        """
+        return Activity.objects.filter(workflow=workflow).select_related(
+            'workflow', 'successor__workflow'
+        ).order_by('order')
+    
+    def _render_svg(self, dot, timeout=None):
+        """
+        Run the Graphviz layout engine on a graph and return SVG markup.
+        
+        The engine runs as a child process that is killed once the timeout
+        expires, so a huge workflow cannot tie up a worker indefinitely.
+        
+        :param dot: Graphviz graph to render
+        :type dot: graphviz.Digraph
+        :param timeout: seconds to wait, or None for no limit. Example: 10
+        :type timeout: float or None
+        :return: SVG markup
+        :rtype: str
+        :raises graphviz.backend.ExecutableNotFound: If Graphviz is not installed on system
+        :raises subprocess.TimeoutExpired: If layout takes longer than timeout
+        """
+        try:
+            result = subprocess.run(
+                [dot.engine, '-Tsvg'],
+                input=dot.source.encode('utf-8'),
+                capture_output=True,
+                timeout=timeout,
+                check=True,
+            )
+        except FileNotFoundError as e:
+            raise graphviz.ExecutableNotFound([dot.engine]) from e
+        return result.stdout.decode('utf-8')
+    
+    
     def _create_activity_node_label(self, activity):
         """
         Create formatted label for activity node.
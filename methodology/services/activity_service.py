@@ -289,7 +289,7 @@ class ActivityService:
         Example:
             >>> predecessors = ActivityService.get_available_predecessors(wf, exclude_activity_id=123)
         """
-        qs = Activity.objects.filter(workflow=workflow).order_by('order')
+        qs = Activity.objects.filter(workflow=workflow).select_related('workflow').order_by('order')
         if exclude_activity_id:
             qs = qs.exclude(pk=exclude_activity_id)
         return qs
@@ -306,7 +306,7 @@ class ActivityService:
         Example:
             >>> successors = ActivityService.get_available_successors(wf, exclude_activity_id=123)
         """
-        qs = Activity.objects.filter(workflow=workflow).order_by('order')
+        qs = Activity.objects.filter(workflow=workflow).select_related('workflow').order_by('order')
         if exclude_activity_id:
             qs = qs.exclude(pk=exclude_activity_id)
         return qs
@@ -357,7 +357,8 @@ class ActivityService:
         
         try:
             return Activity.objects.filter(
-                workflow__playbook__author=user
+                workflow__playbook__author=user,
+                workflow__playbook__deleted_at__isnull=True
             ).annotate(
                 recent_time=Greatest(
                     Coalesce('last_accessed_at', 'updated_at'),
@@ -369,3 +370,115 @@ class ActivityService:
         except Exception as e:
             logger.error(f"Error fetching recent activities for user {user.username}: {e}")
             raise  # Propagate to caller for proper handling
+    
+    # Sort key of the global activities list; keyset cursors carry these values
+    GLOBAL_LIST_ORDERING = ['phase_label', 'workflow__playbook__name', 'workflow__order', 'order', 'pk']
+    
+    @staticmethod
+    def _global_activities(user):
+        """
+        Base queryset for the global activities list with a phase_label annotation.
+        
+        :param user: User instance
+        :returns: QuerySet of Activity instances annotated with phase_label
+        """
+        from django.db.models import Value
+        from django.db.models.functions import Coalesce, NullIf
+        
+        return Activity.objects.filter(
+            workflow__playbook__author=user,
+            workflow__playbook__source='owned',
+            workflow__playbook__deleted_at__isnull=True
+        ).annotate(
+            phase_label=Coalesce(NullIf('phase', Value('')), Value('Unassigned'))
+        )
+    
+    @staticmethod
+    def get_global_activity_page(user, after=None, limit=50):
+        """
+        Get one keyset page of the user's activities ordered by phase.
+        
+        Rows are ordered by (phase, playbook name, workflow order, activity
+        order, id); the next page starts strictly after the last row, so
+        every page costs the same regardless of depth.
+        
+        :param user: User instance
+        :param after: cursor token from a previous page or None for the first page.
+            Example: "WyJQbGFubmluZyIsIkZERCIsMSwyLDU3XQ"
+        :param limit: page size. Example: 50
+        :returns: tuple of (list of Activity, next cursor or None)
+        :raises ValueError: If the cursor is malformed
+        
+        Example:
+            >>> activities, cursor = ActivityService.get_global_activity_page(user)
+            >>> more, cursor = ActivityService.get_global_activity_page(user, after=cursor)
+        """
+        from methodology.utils.keyset import encode_cursor, decode_cursor, keyset_after
+        
+        ordering = ActivityService.GLOBAL_LIST_ORDERING
+        queryset = ActivityService._global_activities(user)
+        if after:
+            queryset = queryset.filter(keyset_after(ordering, decode_cursor(after, len(ordering))))
+        
+        page = list(
+            queryset.select_related('workflow', 'workflow__playbook').order_by(*ordering)[:limit + 1]
+        )
+        has_more = len(page) > limit
+        page = page[:limit]
+        
+        next_cursor = None
+        if has_more:
+            last = page[-1]
+            next_cursor = encode_cursor([
+                last.phase_label, last.workflow.playbook.name, last.workflow.order, last.order, last.pk
+            ])
+        logger.info(f"Global activity page for {user.username}: {len(page)} rows, more={has_more}")
+        return page, next_cursor
+    
+    @staticmethod
+    def get_global_activity_stats(user):
+        """
+        Compute global list totals and per-phase counts in one grouped query.
+        
+        Groups by (phase, workflow, playbook), so the result size is bounded
+        by the number of workflows rather than activities.
+        
+        :param user: User instance
+        :returns: dict with totals and phase counts. Example: {"activity_count": 120,
+            "workflow_count": 8, "playbook_count": 3, "phase_counts": {"Planning": 40, "Unassigned": 80}}
+        
+        Example:
+            >>> stats = ActivityService.get_global_activity_stats(user)
+        """
+        rows = ActivityService._global_activities(user).order_by().values(
+            'phase_label', 'workflow_id', 'workflow__playbook_id'
+        ).annotate(count=models.Count('pk'))
+        
+        phase_counts = {}
+        workflows = set()
+        playbooks = set()
+        for row in rows:
+            phase_counts[row['phase_label']] = phase_counts.get(row['phase_label'], 0) + row['count']
+            workflows.add(row['workflow_id'])
+            playbooks.add(row['workflow__playbook_id'])
+        
+        return {
+            'activity_count': sum(phase_counts.values()),
+            'workflow_count': len(workflows),
+            'playbook_count': len(playbooks),
+            'phase_counts': dict(sorted(phase_counts.items())),
+        }
+    
+    @staticmethod
+    def get_phase_counts(user, phases):
+        """
+        Count the user's activities in specific phases (for continuation pages).
+        
+        :param user: User instance
+        :param phases: phase labels. Example: ["Planning", "Unassigned"]
+        :returns: dict of phase label → count. Example: {"Planning": 40}
+        """
+        rows = ActivityService._global_activities(user).filter(phase_label__in=phases).order_by().values(
+            'phase_label'
+        ).annotate(count=models.Count('pk'))
+        return {row['phase_label']: row['count'] for row in rows}
@@ -0,0 +1,340 @@
+"""
+Auto Sync Service - scheduled background sync of playbooks with Homebase (SYNC-06).
+
+Every playbook with auto-sync on has a SyncState holding when its next
+run is due. A scheduler (``manage.py autosync --every``, run by
+supervisord next to the web server) picks up due playbooks, runs them
+grouped by owner so one owner's playbooks sync one after another, and
+reschedules each one:
+
+- after a success, one AUTO_SYNC_INTERVAL_MINUTES later, spread by
+  +/- AUTO_SYNC_JITTER so playbooks enabled together don't sync together
+- after a failure, AUTO_SYNC_RETRY_MINUTES later, doubling with every
+  consecutive failure up to AUTO_SYNC_MAX_BACKOFF_MINUTES
+
+A run claims its playbook with a lease, so two schedulers never sync the
+same playbook at once; a crashed run's lease expires after
+AUTO_SYNC_LEASE_MINUTES. Local edits are coalesced: a run looks at the
+change feed after the cursor stored by the last run, so any number of
+edits costs one sync, and a playbook unchanged on both sides costs one
+request for the Homebase Merkle root. The base of the three-way merge is
+stored with the state, so a restart resumes where the last run stopped.
+Pushes carry the Homebase root the run started from; if another device
+pushed in between, Homebase refuses the push and the next run merges.
+
+Usage:
+    AutoSyncService.enable(playbook, 'fdd')
+    AutoSyncService.run_due()
+"""
+
+import json
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import takewhile
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from methodology.models import ChangeLogEntry, Playbook, SyncState
+from methodology.services.change_feed_service import ChangeFeedService
+from methodology.services.homebase_client import HomebaseClient, HomebaseConflict, HomebaseError
+from methodology.services.merkle_service import MerkleTree
+from methodology.services.playbook_export_service import PlaybookExportService
+from methodology.services.sync_merge_service import MergeError, SyncMergeService
+from methodology.utils.json_patch import compress_json, decompress_json
+
+logger = logging.getLogger(__name__)
+
+OUTCOME_PUSHED = 'pushed'
+OUTCOME_MERGED = 'merged'
+OUTCOME_SKIPPED = 'skipped'
+OUTCOME_CONFLICTS = 'conflicts'
+OUTCOME_REMOTE_CHANGED = 'remote_changed'
+OUTCOME_FAILED = 'failed'
+
+
+def get_interval():
+    """
+    Get the time between successful runs from settings.
+
+    :return: timedelta. Example: timedelta(minutes=60)
+    """
+    return timedelta(minutes=getattr(settings, 'AUTO_SYNC_INTERVAL_MINUTES', 60))
+
+
+def get_lease():
+    """
+    Get how long a claimed run keeps other schedulers away, from settings.
+
+    :return: timedelta. Example: timedelta(minutes=15)
+    """
+    return timedelta(minutes=getattr(settings, 'AUTO_SYNC_LEASE_MINUTES', 15))
+
+
+def get_workers():
+    """
+    Get the number of owners synced in parallel from settings.
+
+    :return: worker count as int. Example: 4
+    """
+    return getattr(settings, 'AUTO_SYNC_WORKERS', 4)
+
+
+def _export_document(playbook):
+    """
+    Build the export of a playbook as sent to Homebase, without its version history.
+
+    :param playbook: Playbook instance
+    :return: export dict
+    """
+    # Sections are lazy: stopping at versions never runs its query
+    sections = takewhile(lambda section: section[0] != 'versions', PlaybookExportService.iter_sections(playbook))
+    return json.loads(''.join(PlaybookExportService.iter_json_document(playbook, sections)))
+
+
+class AutoSyncService:
+    """Service class for scheduling and running background syncs."""
+
+    @staticmethod
+    def enable(playbook, remote_name, auto_sync=True):
+        """
+        Turn auto-sync of a playbook on or off; the first run is due at once.
+
+        :param playbook: Playbook instance
+        :param remote_name: name of the playbook on Homebase. Example: "fdd"
+        :param auto_sync: whether to sync in the background. Example: True
+        :returns: SyncState instance
+        """
+        state, created = SyncState.objects.get_or_create(
+            playbook=playbook, defaults={'remote_name': remote_name},
+        )
+        if not created and state.remote_name != remote_name:
+            # Another Homebase copy: the stored base and root belong to the old one
+            state.remote_name = remote_name
+            state.base_data, state.cursor, state.remote_root = None, 0, ''
+            state.status = SyncState.STATUS_NEVER
+        state.auto_sync = auto_sync
+        if auto_sync and state.next_run_at is None:
+            state.next_run_at = timezone.now()
+        state.save()
+        logger.info(f"Auto-sync of playbook {playbook.pk} as {remote_name}: {'on' if auto_sync else 'off'}")
+        return state
+
+    @staticmethod
+    def request_sync(playbook_id, now=None):
+        """
+        Ask for a playbook to be synced on the scheduler's next pass.
+
+        Requests coalesce: the run is only ever moved earlier, so any number
+        of requests before it is picked up cost one sync.
+
+        :param playbook_id: Playbook ID as int. Example: 7
+        :param now: current time or None for timezone.now()
+        :returns: True if the run was moved earlier, False if one was already due
+        """
+        now = now or timezone.now()
+        moved = SyncState.objects.filter(playbook_id=playbook_id, auto_sync=True).filter(
+            Q(next_run_at__isnull=True) | Q(next_run_at__gt=now)
+        ).update(next_run_at=now)
+        return moved == 1
+
+    @staticmethod
+    def next_run(failures, now=None):
+        """
+        Get when a playbook is next due after a run.
+
+        :param failures: consecutive failed runs including this one, 0 after a success. Example: 2
+        :param now: current time or None for timezone.now()
+        :returns: datetime
+        """
+        now = now or timezone.now()
+        if failures:
+            retry = getattr(settings, 'AUTO_SYNC_RETRY_MINUTES', 1) * 2 ** (failures - 1)
+            return now + timedelta(minutes=min(retry, getattr(settings, 'AUTO_SYNC_MAX_BACKOFF_MINUTES', 360)))
+        jitter = getattr(settings, 'AUTO_SYNC_JITTER', 0.1)
+        return now + get_interval() * (1 + random.uniform(-jitter, jitter))
+
+    @staticmethod
+    def due_states(now=None):
+        """
+        Get the states whose run is due and not claimed by another scheduler.
+
+        :param now: current time or None for timezone.now()
+        :returns: QuerySet of SyncState with playbooks, oldest due first
+        """
+        now = now or timezone.now()
+        return SyncState.objects.filter(
+            Q(lease_until__isnull=True) | Q(lease_until__lte=now),
+            auto_sync=True,
+            next_run_at__lte=now,
+            playbook__deleted_at__isnull=True,
+        ).select_related('playbook').order_by('next_run_at')
+
+    @staticmethod
+    def claim(state, now=None):
+        """
+        Take the lease on a due playbook sync so no other scheduler runs it.
+
+        The state is reloaded after a successful claim: another scheduler
+        may have synced the playbook since it was read.
+
+        :param state: SyncState instance
+        :param now: current time or None for timezone.now()
+        :returns: True if this caller holds the lease now
+        """
+        now = now or timezone.now()
+        claimed = SyncState.objects.filter(pk=state.pk, next_run_at__lte=now).filter(
+            Q(lease_until__isnull=True) | Q(lease_until__lte=now)
+        ).update(lease_until=now + get_lease())
+        if claimed:
+            state.refresh_from_db()
+        return claimed == 1
+
+    @staticmethod
+    def run(state, client=None):
+        """
+        Claim, sync and reschedule one playbook.
+
+        :param state: SyncState instance with its playbook
+        :param client: HomebaseClient or None for one on HOMEBASE_URL
+        :returns: outcome as str, None if another scheduler holds the lease. Example: "merged"
+        """
+        if not AutoSyncService.claim(state):
+            logger.info(f"Auto-sync of playbook {state.playbook_id} was claimed by another scheduler")
+            return None
+
+        client = client or HomebaseClient(settings.HOMEBASE_URL)
+        try:
+            result = AutoSyncService.sync_playbook(state, client)
+        except Exception as e:
+            # Unexpected errors back off too, rather than retrying every pass
+            state.failures += 1
+            state.status = SyncState.STATUS_ERROR
+            state.last_error = str(e)
+            state.last_result = {'outcome': OUTCOME_FAILED, 'error': str(e)}
+            logger.warning(
+                f"Auto-sync of playbook {state.playbook_id} failed ({state.failures} in a row): {e}",
+                exc_info=not isinstance(e, (HomebaseError, MergeError)),
+            )
+        else:
+            state.failures = 0
+            state.last_error = ''
+            state.last_result = result
+        finally:
+            state.next_run_at = AutoSyncService.next_run(state.failures)
+            state.lease_until = None
+            state.save()
+        return state.last_result['outcome']
+
+    @staticmethod
+    def sync_playbook(state, client):
+        """
+        Sync one playbook with its Homebase copy and record the new base.
+
+        Pushes the local copy when only it changed, merges Homebase's copy in
+        when that changed, and does nothing when neither did. Conflicts are
+        left for the user: nothing is written or pushed and the state says why.
+        A push refused because Homebase changed meanwhile keeps the old base
+        and root, so the next run merges that change in.
+
+        :param state: SyncState instance with its playbook; the caller saves it
+        :param client: HomebaseClient
+        :returns: dict summarising the run. Example: {"outcome": "merged", "counts": {...}}
+        :raises HomebaseError: If Homebase cannot be reached
+        :raises MergeError: If the merged playbook cannot be saved
+        """
+        playbook = state.playbook
+        locally_changed = state.base_data is None or ChangeLogEntry.objects.filter(
+            playbook_id=playbook.pk, seq__gt=state.cursor,
+        ).exists()
+        remote_root = client.root(state.remote_name)
+        remotely_changed = remote_root is None or remote_root != state.remote_root
+
+        if not locally_changed and not remotely_changed:
+            logger.info(f"Auto-sync of playbook {playbook.pk}: nothing changed")
+            return {'outcome': OUTCOME_SKIPPED}
+
+        if remotely_changed and remote_root is not None:
+            theirs = client.fetch(state.remote_name)
+            if theirs is None:
+                raise HomebaseError(f"{state.remote_name} disappeared from Homebase during sync")
+            base = decompress_json(state.base_data) if state.base_data is not None else {}
+            merge = SyncMergeService.sync(playbook, base, theirs)
+            if merge.conflicts:
+                state.status = SyncState.STATUS_CONFLICTS
+                logger.info(f"Auto-sync of playbook {playbook.pk}: {len(merge.conflicts)} conflicts")
+                return {'outcome': OUTCOME_CONFLICTS, 'conflicts': [conflict.as_dict() for conflict in merge.conflicts]}
+            result = {'outcome': OUTCOME_MERGED, 'counts': merge.counts}
+            if merge.warnings:
+                result['warnings'] = merge.warnings
+            playbook = Playbook.objects.get(pk=playbook.pk)
+        else:
+            result = {'outcome': OUTCOME_PUSHED}
+
+        cursor = ChangeFeedService.latest_seq(playbook.pk)
+        document = _export_document(playbook)
+        root = MerkleTree.from_document(document).hash
+        if root != remote_root:
+            try:
+                client.push(state.remote_name, document, expected_root=remote_root or '')
+            except HomebaseConflict:
+                logger.info(f"Auto-sync of playbook {playbook.pk}: {state.remote_name} changed on Homebase during sync")
+                return {**result, 'outcome': OUTCOME_REMOTE_CHANGED}
+
+        state.base_data = compress_json(document)
+        state.cursor = cursor
+        state.remote_root = root
+        state.status = SyncState.STATUS_UP_TO_DATE
+        state.last_synced_at = timezone.now()
+        logger.info(f"Auto-sync of playbook {playbook.pk} as {state.remote_name}: {result['outcome']}")
+        return result
+
+    @staticmethod
+    def run_due(now=None, client=None, workers=None):
+        """
+        Run every due sync, one owner's playbooks after another, owners in parallel.
+
+        :param now: current time or None for timezone.now()
+        :param client: HomebaseClient or None for one on HOMEBASE_URL
+        :param workers: owners synced in parallel or None for AUTO_SYNC_WORKERS. Example: 4
+        :returns: dict of outcome -> number of playbooks. Example: {"pushed": 1, "skipped": 12}
+        """
+        client = client or HomebaseClient(settings.HOMEBASE_URL)
+        workers = workers or get_workers()
+        by_owner = {}
+        for state in AutoSyncService.due_states(now):
+            by_owner.setdefault(state.playbook.author_id, []).append(state)
+
+        outcomes = {}
+        if workers <= 1 or len(by_owner) <= 1:
+            results = [AutoSyncService._run_owner(states, client, close=False) for states in by_owner.values()]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='autosync') as pool:
+                results = list(pool.map(lambda states: AutoSyncService._run_owner(states, client), by_owner.values()))
+        for owner_outcomes in results:
+            for outcome in owner_outcomes:
+                if outcome is not None:
+                    outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        if outcomes:
+            logger.info(f"Auto-sync pass over {len(by_owner)} owners: {outcomes}")
+        return outcomes
+
+    @staticmethod
+    def _run_owner(states, client, close=True):
+        """
+        Run the due syncs of one owner in order; worker entry point.
+
+        :param states: list of SyncState of one owner's playbooks
+        :param client: HomebaseClient
+        :param close: whether to close this thread's connection afterwards. Example: True
+        :returns: list of outcomes
+        """
+        try:
+            return [AutoSyncService.run(state, client) for state in states]
+        finally:
+            if close:
+                connection.close()
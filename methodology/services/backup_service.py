@@ -0,0 +1,294 @@
+"""
+Backup Service - Online backup and restore of the live SQLite database.
+
+Uses the SQLite online backup API, copying a bounded number of pages per
+step and sleeping between steps so gunicorn and the MCP server can keep
+writing while a backup runs. Snapshots are integrity-checked, gzip
+compressed, checksummed and rotated.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PREFIX = 'mimir-'
+BACKUP_SUFFIX = '.db.gz'
+MANIFEST_SUFFIX = '.json'
+
+
+class BackupError(Exception):
+    """Raised when a backup or restore fails verification."""
+
+
+def get_database_path():
+    """
+    Get filesystem path of the default SQLite database.
+
+    :return: database path as Path. Example: Path("/app/data/mimir.db")
+    """
+    return Path(settings.DATABASES['default']['NAME'])
+
+
+def get_backup_dir():
+    """
+    Get configured backup directory.
+
+    :return: backup directory as Path. Example: Path("/app/data/backups")
+    """
+    return Path(getattr(settings, 'BACKUP_DIR', get_database_path().parent / 'backups'))
+
+
+def _sha256_file(path):
+    """
+    Compute SHA-256 of a file in streaming fashion.
+
+    :param path: file path as Path. Example: Path("/app/data/backups/mimir-20250101-120000.db.gz")
+    :return: hex digest as str. Example: "9f86d081..."
+    """
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _integrity_check(path):
+    """
+    Run PRAGMA integrity_check on a database file.
+
+    :param path: database file path as Path. Example: Path("/tmp/restore.db")
+    :return: None
+    :raises BackupError: If the check does not report 'ok'
+    """
+    conn = sqlite3.connect(str(path))
+    try:
+        result = conn.execute('PRAGMA integrity_check').fetchone()[0]
+    finally:
+        conn.close()
+    if result != 'ok':
+        raise BackupError(f"Integrity check failed for {path}: {result}")
+
+
+def _check_is_mimir_database(path):
+    """
+    Ensure a database looks like a migrated Mimir database.
+
+    :param path: database file path as Path. Example: Path("/tmp/restore.db")
+    :return: None
+    :raises BackupError: If the django_migrations table is missing
+    """
+    conn = sqlite3.connect(str(path))
+    try:
+        found = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='django_migrations'"
+        ).fetchone()
+    finally:
+        conn.close()
+    if not found:
+        raise BackupError(f"{path} is not a Mimir database (django_migrations table missing)")
+
+
+def _online_copy(source_path, target_path, pages, sleep):
+    """
+    Copy a live database with the SQLite online backup API.
+
+    :param source_path: database to copy as Path. Example: Path("/app/data/mimir.db")
+    :param target_path: destination database as Path. Example: Path("/tmp/copy.db")
+    :param pages: pages copied per step as int. Example: 256
+    :param sleep: seconds to sleep between steps as float. Example: 0.05
+    :return: total page count copied as int. Example: 1840
+    """
+    steps = {'count': 0, 'total': 0}
+
+    def progress(status, remaining, total):
+        steps['count'] += 1
+        steps['total'] = total
+
+    source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+    target = sqlite3.connect(str(target_path))
+    try:
+        source.backup(target, pages=pages, progress=progress, sleep=sleep)
+    finally:
+        target.close()
+        source.close()
+
+    logger.info(f"Copied {steps['total']} pages from {source_path} in {steps['count']} steps")
+    return steps['total']
+
+
+class BackupService:
+    """Service class for SQLite online backup, verification, rotation and restore."""
+
+    @staticmethod
+    def create_backup(source_path=None, backup_dir=None, keep=None, pages=None, sleep=None):
+        """
+        Take a compressed, verified snapshot of the live database.
+
+        :param source_path: database to back up or None for default. Example: Path("/app/data/mimir.db")
+        :param backup_dir: output directory or None for BACKUP_DIR. Example: Path("/app/data/backups")
+        :param keep: number of snapshots to retain or None for BACKUP_KEEP. Example: 7
+        :param pages: pages per backup step or None for BACKUP_PAGES_PER_STEP. Example: 256
+        :param sleep: seconds between steps or None for BACKUP_STEP_SLEEP. Example: 0.05
+        :return: manifest dict. Example: {"file": "mimir-20250101-120000.db.gz", "sha256": "...",
+            "pages": 1840, "db_bytes": 7536640, "compressed_bytes": 1204331}
+        :raises BackupError: If the copy fails integrity verification
+        """
+        source_path = Path(source_path or get_database_path())
+        backup_dir = Path(backup_dir or get_backup_dir())
+        keep = keep if keep is not None else getattr(settings, 'BACKUP_KEEP', 7)
+        pages = pages or getattr(settings, 'BACKUP_PAGES_PER_STEP', 256)
+        sleep = sleep if sleep is not None else getattr(settings, 'BACKUP_STEP_SLEEP', 0.05)
+
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S-%f')
+        archive_path = backup_dir / f"{BACKUP_PREFIX}{stamp}{BACKUP_SUFFIX}"
+
+        started = time.monotonic()
+        logger.info(f"Starting online backup of {source_path} to {archive_path}")
+
+        with tempfile.TemporaryDirectory(dir=backup_dir) as tmp_dir:
+            copy_path = Path(tmp_dir) / 'snapshot.db'
+            page_count = _online_copy(source_path, copy_path, pages, sleep)
+            _integrity_check(copy_path)
+
+            with open(copy_path, 'rb') as raw, gzip.open(archive_path, 'wb', compresslevel=6) as packed:
+                shutil.copyfileobj(raw, packed, 1024 * 1024)
+            db_bytes = copy_path.stat().st_size
+
+        manifest = {
+            'file': archive_path.name,
+            'source': str(source_path),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'sha256': _sha256_file(archive_path),
+            'pages': page_count,
+            'db_bytes': db_bytes,
+            'compressed_bytes': archive_path.stat().st_size,
+            'duration_seconds': round(time.monotonic() - started, 3),
+        }
+        manifest_path = archive_path.with_name(archive_path.name + MANIFEST_SUFFIX)
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+
+        logger.info(
+            f"Backup {archive_path.name} complete: {db_bytes} bytes → {manifest['compressed_bytes']} bytes "
+            f"in {manifest['duration_seconds']}s"
+        )
+        BackupService.rotate(backup_dir, keep)
+        return manifest
+
+    @staticmethod
+    def list_backups(backup_dir=None):
+        """
+        List snapshots in a backup directory, newest first.
+
+        :param backup_dir: directory or None for BACKUP_DIR. Example: Path("/app/data/backups")
+        :return: list of archive paths. Example: [Path(".../mimir-20250102-120000-000000.db.gz")]
+        """
+        backup_dir = Path(backup_dir or get_backup_dir())
+        if not backup_dir.exists():
+            return []
+        archives = backup_dir.glob(f"{BACKUP_PREFIX}*{BACKUP_SUFFIX}")
+        return sorted(archives, key=lambda path: path.name, reverse=True)
+
+    @staticmethod
+    def rotate(backup_dir=None, keep=7):
+        """
+        Delete all but the newest snapshots.
+
+        :param backup_dir: directory or None for BACKUP_DIR. Example: Path("/app/data/backups")
+        :param keep: number of snapshots to retain as int. Example: 7
+        :return: list of removed archive names. Example: ["mimir-20241201-120000-000000.db.gz"]
+        """
+        removed = []
+        for archive in BackupService.list_backups(backup_dir)[keep:]:
+            archive.unlink()
+            manifest = archive.with_name(archive.name + MANIFEST_SUFFIX)
+            if manifest.exists():
+                manifest.unlink()
+            removed.append(archive.name)
+
+        if removed:
+            logger.info(f"Rotated out {len(removed)} old backups: {', '.join(removed)}")
+        return removed
+
+    @staticmethod
+    def verify_backup(archive_path):
+        """
+        Verify an archive's checksum against its manifest.
+
+        :param archive_path: snapshot path as Path. Example: Path(".../mimir-20250101-120000-000000.db.gz")
+        :return: manifest dict (empty if no manifest exists). Example: {"sha256": "...", "pages": 1840}
+        :raises BackupError: If the checksum does not match
+        """
+        archive_path = Path(archive_path)
+        manifest_path = archive_path.with_name(archive_path.name + MANIFEST_SUFFIX)
+        if not manifest_path.exists():
+            logger.warning(f"No manifest for {archive_path.name}, skipping checksum verification")
+            return {}
+
+        manifest = json.loads(manifest_path.read_text())
+        actual = _sha256_file(archive_path)
+        if actual != manifest.get('sha256'):
+            raise BackupError(
+                f"Checksum mismatch for {archive_path.name}: expected {manifest.get('sha256')}, got {actual}"
+            )
+        return manifest
+
+    @staticmethod
+    def restore_backup(archive_path, target_path=None, pages=None, sleep=None):
+        """
+        Restore a snapshot into the live database after verification.
+
+        The archive checksum and the decompressed database integrity are
+        verified before anything is written; the restore itself also uses
+        the online backup API so open connections see a consistent database.
+
+        :param archive_path: snapshot path as Path. Example: Path(".../mimir-20250101-120000-000000.db.gz")
+        :param target_path: database to overwrite or None for default. Example: Path("/app/data/mimir.db")
+        :param pages: pages per step or None for BACKUP_PAGES_PER_STEP. Example: 256
+        :param sleep: seconds between steps or None for BACKUP_STEP_SLEEP. Example: 0.05
+        :return: pages restored as int. Example: 1840
+        :raises BackupError: If verification fails
+        """
+        archive_path = Path(archive_path)
+        target_path = Path(target_path or get_database_path())
+        pages = pages or getattr(settings, 'BACKUP_PAGES_PER_STEP', 256)
+        sleep = sleep if sleep is not None else getattr(settings, 'BACKUP_STEP_SLEEP', 0.05)
+
+        BackupService.verify_backup(archive_path)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            restored_path = Path(tmp_dir) / 'restore.db'
+            try:
+                with gzip.open(archive_path, 'rb') as packed, open(restored_path, 'wb') as raw:
+                    shutil.copyfileobj(packed, raw, 1024 * 1024)
+            except (OSError, EOFError) as e:
+                raise BackupError(f"Cannot decompress {archive_path.name}: {e}") from e
+
+            _integrity_check(restored_path)
+            _check_is_mimir_database(restored_path)
+
+            logger.info(f"Restoring {archive_path.name} into {target_path}")
+            source = sqlite3.connect(str(restored_path))
+            target = sqlite3.connect(str(target_path))
+            try:
+                source.backup(target, pages=pages, sleep=sleep)
+                page_count = target.execute('PRAGMA page_count').fetchone()[0]
+            finally:
+                target.close()
+                source.close()
+
+        _integrity_check(target_path)
+        logger.info(f"Restored {page_count} pages from {archive_path.name}")
+        return page_count
+
@@ -0,0 +1,213 @@
+"""
+Change Feed Service - Incremental sync of playbook content.
+
+Model signals append a ChangeLogEntry for every saved or deleted
+Playbook, Workflow, Activity, Artifact and ArtifactInput; bulk writers
+(import, duplication, soft delete) record their rows with record_rows().
+
+A sync pass asks for the changes after its cursor. Entries in the page
+are compacted: each row appears once with its last operation, upserts
+carry the row as it is now (same fields as the JSON export), and the
+children of a playbook deleted in the page are left out. Example:
+
+    {"cursor": 812, "has_more": false, "changes": [
+        {"seq": 790, "kind": "activity", "op": "upsert", "id": 9, "playbook_id": 3,
+         "data": {"id": 9, "workflow_id": 3, "name": "Model Domain", ...}},
+        {"seq": 812, "kind": "playbook", "op": "delete", "id": 5, "playbook_id": 5}]}
+
+Usage:
+    page = ChangeFeedService.changes_since(user.pk, cursor=790)
+"""
+
+import logging
+
+from django.conf import settings
+
+from methodology.models import ChangeLogEntry, Playbook, Workflow, Activity, Artifact, ArtifactInput
+from methodology.services.playbook_export_service import (
+    PLAYBOOK_FIELDS, WORKFLOW_FIELDS, ACTIVITY_FIELDS, ARTIFACT_FIELDS, ARTIFACT_INPUT_FIELDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# kind -> (model, fields served for upserts)
+FEED_MODELS = {
+    'playbook': (Playbook, ('id',) + PLAYBOOK_FIELDS),
+    'workflow': (Workflow, WORKFLOW_FIELDS),
+    'activity': (Activity, ACTIVITY_FIELDS),
+    'artifact': (Artifact, ARTIFACT_FIELDS),
+    'artifact_input': (ArtifactInput, ARTIFACT_INPUT_FIELDS),
+}
+
+# kind -> (path of cached relations to the playbook, lookup finding the playbook by the row's parent id)
+_PLAYBOOK_PATHS = {
+    'workflow': (('playbook',), 'pk', 'playbook_id'),
+    'activity': (('workflow', 'playbook'), 'workflows', 'workflow_id'),
+    'artifact': (('playbook',), 'pk', 'playbook_id'),
+    'artifact_input': (('artifact', 'playbook'), 'artifacts', 'artifact_id'),
+}
+
+_KINDS = {model: kind for kind, (model, _) in FEED_MODELS.items()}
+
+
+def get_page_size():
+    """
+    Get maximum number of log entries read per change feed page.
+
+    :returns: page size as int. Example: 1000
+    """
+    return getattr(settings, 'CHANGE_FEED_PAGE_SIZE', 1000)
+
+
+def _locate(instance):
+    """
+    Find the playbook and owner of a feed row.
+
+    Relations already loaded on the instance are used first; otherwise
+    one query looks the playbook up through the row's parent.
+
+    :param instance: Playbook, Workflow, Activity, Artifact or ArtifactInput
+    :returns: (playbook_id, owner_id), or None if the playbook is gone. Example: (7, 3)
+    """
+    if isinstance(instance, Playbook):
+        return instance.pk, instance.author_id
+
+    path, lookup, parent_attr = _PLAYBOOK_PATHS[_KINDS[type(instance)]]
+    current = instance
+    for name in path:
+        if not current._meta.get_field(name).is_cached(current):
+            break
+        current = getattr(current, name)
+    if isinstance(current, Playbook):
+        return current.pk, current.author_id
+
+    return Playbook.all_objects.filter(**{lookup: getattr(instance, parent_attr)}).values_list(
+        'pk', 'author_id'
+    ).first()
+
+
+class ChangeFeedService:
+    """Service class for the playbook change log."""
+
+    @staticmethod
+    def record(instance, op):
+        """
+        Append one change for a saved or deleted row.
+
+        :param instance: Playbook, Workflow, Activity, Artifact or ArtifactInput
+        :param op: ChangeLogEntry.OP_UPSERT or ChangeLogEntry.OP_DELETE
+        :returns: ChangeLogEntry, or None when the row's playbook no longer exists
+        """
+        located = _locate(instance)
+        if located is None:
+            # Children removed after their playbook are covered by its delete
+            return None
+        playbook_id, owner_id = located
+        return ChangeLogEntry.objects.create(
+            kind=_KINDS[type(instance)], object_id=instance.pk, op=op,
+            playbook_id=playbook_id, owner_id=owner_id,
+        )
+
+    @staticmethod
+    def record_rows(playbook, ids_by_kind, op=ChangeLogEntry.OP_UPSERT):
+        """
+        Append changes for rows written without signals, in one bulk insert.
+
+        :param playbook: Playbook the rows belong to
+        :param ids_by_kind: dict of feed kind -> primary keys. Example: {"activity": [9, 10], "artifact": [4]}
+        :param op: ChangeLogEntry.OP_UPSERT or ChangeLogEntry.OP_DELETE
+        :returns: None
+        """
+        ChangeLogEntry.objects.bulk_create([
+            ChangeLogEntry(kind=kind, object_id=object_id, op=op, playbook_id=playbook.pk, owner_id=playbook.author_id)
+            for kind, object_ids in ids_by_kind.items()
+            for object_id in object_ids
+        ])
+
+    @staticmethod
+    def latest_cursor(owner_id):
+        """
+        Get the newest sequence number visible to a user.
+
+        :param owner_id: User ID as int. Example: 3
+        :returns: cursor as int, 0 if the user has no changes. Example: 812
+        """
+        return ChangeLogEntry.objects.filter(owner_id=owner_id).order_by('-seq').values_list(
+            'seq', flat=True
+        ).first() or 0
+
+    @staticmethod
+    def latest_seq(playbook_id):
+        """
+        Get the newest sequence number of one playbook's changes.
+
+        :param playbook_id: Playbook ID as int. Example: 7
+        :returns: sequence number as int, 0 if it has no changes. Example: 812
+        """
+        return ChangeLogEntry.objects.filter(playbook_id=playbook_id).order_by('-seq').values_list(
+            'seq', flat=True
+        ).first() or 0
+
+    @staticmethod
+    def changes_since(owner_id, cursor=0, limit=None):
+        """
+        Get the compacted changes to a user's playbooks after a cursor.
+
+        Reads one page of the log plus one query per kind with upserts.
+        Pass the returned cursor to the next call; repeat while has_more.
+
+        :param owner_id: User ID as int. Example: 3
+        :param cursor: last sequence number already applied. Example: 790
+        :param limit: log entries per page or None for CHANGE_FEED_PAGE_SIZE. Example: 1000
+        :returns: dict with cursor, has_more and changes. Example:
+            {"cursor": 812, "has_more": False, "changes": [{"seq": 812, "kind": "playbook", "op": "delete", ...}]}
+        """
+        limit = limit or get_page_size()
+        entries = list(
+            ChangeLogEntry.objects.filter(owner_id=owner_id, seq__gt=cursor).order_by('seq').values(
+                'seq', 'kind', 'object_id', 'op', 'playbook_id'
+            )[:limit]
+        )
+
+        # Last operation per row wins
+        latest = {}
+        for entry in entries:
+            latest.pop((entry['kind'], entry['object_id']), None)
+            latest[(entry['kind'], entry['object_id'])] = entry
+        deleted_playbooks = {
+            object_id for (kind, object_id), entry in latest.items()
+            if kind == 'playbook' and entry['op'] == ChangeLogEntry.OP_DELETE
+        }
+
+        wanted = {}
+        for (kind, object_id), entry in latest.items():
+            if entry['op'] == ChangeLogEntry.OP_UPSERT:
+                wanted.setdefault(kind, []).append(object_id)
+        rows = {}
+        for kind, ids in wanted.items():
+            model, fields = FEED_MODELS[kind]
+            manager = model.all_objects if model is Playbook else model.objects
+            rows[kind] = {row['id']: row for row in manager.filter(pk__in=ids).values(*fields)}
+
+        changes = []
+        for (kind, object_id), entry in latest.items():
+            if kind != 'playbook' and entry['playbook_id'] in deleted_playbooks:
+                continue
+            change = {
+                'seq': entry['seq'], 'kind': kind, 'op': entry['op'], 'id': object_id,
+                'playbook_id': entry['playbook_id'],
+            }
+            if entry['op'] == ChangeLogEntry.OP_UPSERT:
+                row = rows[kind].get(object_id)
+                if row is None:
+                    # Deleted after this page; its delete entry comes later
+                    continue
+                change['data'] = row
+            changes.append(change)
+
+        next_cursor = entries[-1]['seq'] if entries else cursor
+        logger.info(
+            f"Change feed for user {owner_id}: {len(entries)} entries after {cursor} "
+            f"compacted to {len(changes)} changes"
+        )
+        return {'cursor': next_cursor, 'has_more': len(entries) == limit, 'changes': changes}
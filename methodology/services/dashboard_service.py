@@ -0,0 +1,259 @@
+"""
+Dashboard Service - Per-user dashboard snapshot held in cache.
+
+The dashboard shows playbook/activity counts plus the most recent
+playbooks and activities. Computing those takes an annotated sort over all
+of a user's activities and two COUNTs across joins, so the result is kept
+as a small snapshot of plain dicts in the 'dashboard' cache. Save/delete
+signals (including activity access tracking) patch the snapshot in place;
+changes that cannot be patched cheaply drop it and the next dashboard load
+rebuilds it.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+
+from methodology.models import Playbook, Activity
+
+logger = logging.getLogger(__name__)
+
+RECENT_PLAYBOOKS_LIMIT = 5
+RECENT_ACTIVITIES_LIMIT = 10
+
+
+def _cache():
+    """
+    Get the cache holding dashboard snapshots.
+
+    :return: cache backend instance
+    """
+    return caches['dashboard']
+
+
+def _key(user_id):
+    """
+    Build the cache key of a user's snapshot.
+
+    :param user_id: User ID as int. Example: 7
+    :return: cache key as str. Example: "dashboard:7"
+    """
+    return f"dashboard:{user_id}"
+
+
+def _timeout():
+    """
+    Get the snapshot lifetime; expiry bounds drift from writes that skip signals.
+
+    :return: seconds as int. Example: 600
+    """
+    return getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 600)
+
+
+def _playbook_row(playbook):
+    """
+    Flatten a playbook into the fields the dashboard renders.
+
+    :param playbook: Playbook instance
+    :return: dict. Example: {"id": 3, "name": "FDD", "version": 0.3, ...}
+    """
+    return {
+        'id': playbook.pk,
+        'name': playbook.name,
+        'description': playbook.description,
+        'category_display': playbook.get_category_display(),
+        'status': playbook.status,
+        'status_display': playbook.get_status_display(),
+        'version': playbook.version,
+        'updated_at': playbook.updated_at,
+    }
+
+
+def _activity_row(activity):
+    """
+    Flatten an activity into the fields the activity feed renders.
+
+    :param activity: Activity instance with workflow and playbook loaded
+    :return: dict. Example: {"id": 12, "description": "Design in Planning workflow", ...}
+    """
+    playbook = activity.workflow.playbook
+    return {
+        'id': activity.pk,
+        'workflow_id': activity.workflow_id,
+        'description': activity.description,
+        'icon_class': activity.get_icon_class(),
+        'playbook': {'id': playbook.pk, 'name': playbook.name},
+        'timestamp': activity.timestamp,
+    }
+
+
+class DashboardService:
+    """Service class for the cached per-user dashboard snapshot."""
+
+    @staticmethod
+    def build_snapshot(user):
+        """
+        Compute a user's dashboard snapshot from the database.
+
+        :param user: User instance
+        :returns: dict with playbook_count, activity_count, recent_playbooks
+            and recent_activities. Example: {"playbook_count": 4, "activity_count": 31,
+            "recent_playbooks": [...], "recent_activities": [...]}
+        """
+        from methodology.services.activity_service import ActivityService
+
+        recent_playbooks = Playbook.objects.filter(author=user).order_by('-updated_at')[:RECENT_PLAYBOOKS_LIMIT]
+        recent_activities = ActivityService.get_recent_activities(user, limit=RECENT_ACTIVITIES_LIMIT)
+        return {
+            'playbook_count': Playbook.objects.filter(author=user).count(),
+            'activity_count': Activity.objects.filter(
+                workflow__playbook__author=user,
+                workflow__playbook__deleted_at__isnull=True,
+            ).count(),
+            'recent_playbooks': [_playbook_row(playbook) for playbook in recent_playbooks],
+            'recent_activities': [_activity_row(activity) for activity in recent_activities],
+        }
+
+    @staticmethod
+    def get_snapshot(user):
+        """
+        Get a user's dashboard snapshot, building it on a cache miss.
+
+        :param user: User instance
+        :returns: snapshot dict (see build_snapshot)
+
+        Example:
+            >>> DashboardService.get_snapshot(request.user)['playbook_count']
+            4
+        """
+        snapshot = _cache().get(_key(user.pk))
+        if snapshot is None:
+            snapshot = DashboardService.build_snapshot(user)
+            _cache().set(_key(user.pk), snapshot, _timeout())
+            logger.info(f"Built dashboard snapshot for user {user.pk}")
+        return snapshot
+
+    @staticmethod
+    def invalidate(user_id):
+        """
+        Drop a user's snapshot so the next dashboard load rebuilds it.
+
+        Call after writes that bypass model signals (queryset.update,
+        bulk_create, raw SQL).
+
+        :param user_id: User ID as int. Example: 7
+        :returns: None
+        """
+        _cache().delete(_key(user_id))
+
+    @staticmethod
+    def _update(user_id, patch):
+        """
+        Apply patch(snapshot) to a cached snapshot, if there is one.
+
+        The patch returns False when it cannot keep the snapshot exact;
+        the snapshot is then dropped instead.
+
+        :param user_id: User ID as int. Example: 7
+        :param patch: callable(snapshot) -> bool
+        :returns: None
+        """
+        snapshot = _cache().get(_key(user_id))
+        if snapshot is None:
+            return
+        if patch(snapshot):
+            _cache().set(_key(user_id), snapshot, _timeout())
+        else:
+            DashboardService.invalidate(user_id)
+
+    @staticmethod
+    def playbook_saved(playbook, created):
+        """
+        Move a saved playbook to its place in the owner's snapshot.
+
+        :param playbook: Playbook instance that was saved
+        :param created: True if the playbook was just created
+        :returns: None
+        """
+        if playbook.is_deleted:
+            DashboardService.invalidate(playbook.author_id)
+            return
+
+        row = _playbook_row(playbook)
+
+        def patch(snapshot):
+            if created:
+                snapshot['playbook_count'] += 1
+            recent = [row] + [p for p in snapshot['recent_playbooks'] if p['id'] != playbook.pk]
+            recent.sort(key=lambda p: p['updated_at'], reverse=True)
+            snapshot['recent_playbooks'] = recent[:RECENT_PLAYBOOKS_LIMIT]
+            for activity in snapshot['recent_activities']:
+                if activity['playbook']['id'] == playbook.pk:
+                    activity['playbook']['name'] = playbook.name
+            return True
+
+        DashboardService._update(playbook.author_id, patch)
+
+    @staticmethod
+    def workflow_saved(workflow):
+        """
+        Refresh activity descriptions after a workflow is renamed.
+
+        :param workflow: Workflow instance that was saved
+        :returns: None
+        """
+        def patch(snapshot):
+            # Descriptions embed the workflow name; rebuild if any are shown
+            return not any(a['workflow_id'] == workflow.pk for a in snapshot['recent_activities'])
+
+        DashboardService._update(workflow.playbook.author_id, patch)
+
+    @staticmethod
+    def activity_saved(activity, created):
+        """
+        Move a saved or accessed activity to the top of the owner's feed.
+
+        :param activity: Activity instance that was saved
+        :param created: True if the activity was just created
+        :returns: None
+        """
+        playbook = activity.workflow.playbook
+        if playbook.is_deleted:
+            return
+
+        row = _activity_row(activity)
+
+        def patch(snapshot):
+            if created:
+                snapshot['activity_count'] += 1
+            recent = [row] + [a for a in snapshot['recent_activities'] if a['id'] != activity.pk]
+            recent.sort(key=lambda a: a['timestamp'], reverse=True)
+            snapshot['recent_activities'] = recent[:RECENT_ACTIVITIES_LIMIT]
+            return True
+
+        DashboardService._update(playbook.author_id, patch)
+
+    @staticmethod
+    def activity_deleted(activity):
+        """
+        Remove a deleted activity from the owner's snapshot.
+
+        :param activity: Activity instance that was deleted
+        :returns: None
+        """
+        author_id = Playbook.all_objects.filter(
+            workflows__pk=activity.workflow_id
+        ).values_list('author_id', flat=True).first()
+        if author_id is None:
+            return
+
+        def patch(snapshot):
+            snapshot['activity_count'] -= 1
+            recent = snapshot['recent_activities']
+            remaining = [a for a in recent if a['id'] != activity.pk]
+            snapshot['recent_activities'] = remaining
+            # A shortened feed would need the next most recent activity
+            return len(remaining) == len(recent) or len(remaining) >= snapshot['activity_count']
+
+        DashboardService._update(author_id, patch)
@@ -0,0 +1,124 @@
+"""
+Homebase Client - HTTP access to playbook copies on a Homebase server.
+
+Homebase keeps one JSON export per playbook name:
+
+    GET  /playbooks/<name>/          the export, 404 if there is none
+    PUT  /playbooks/<name>/          replace the export; with If-Match: "<root>" only
+                                     if its Merkle root is still <root> ("" for none),
+                                     412 otherwise
+    GET  /playbooks/<name>/merkle/   Merkle diff protocol (see MerkleService)
+
+``manage.py homebase_standin`` serves the same API from a local directory.
+
+Usage:
+    client = HomebaseClient(settings.HOMEBASE_URL)
+    root = client.root('fdd')
+    document = client.fetch('fdd')
+    client.push('fdd', document, expected_root=root or '')
+"""
+
+import json
+import logging
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from methodology.services.merkle_service import MerkleError, RemoteMerkleTree
+
+logger = logging.getLogger(__name__)
+
+
+class HomebaseError(Exception):
+    """Raised when Homebase cannot be reached or rejects a request."""
+
+
+class HomebaseConflict(HomebaseError):
+    """Raised when a push is refused because the copy on Homebase changed since it was read."""
+
+
+class HomebaseClient:
+    """Client for one Homebase server."""
+
+    def __init__(self, base_url, timeout=10):
+        """
+        :param base_url: server root URL. Example: "http://127.0.0.1:8765/"
+        :param timeout: seconds per request. Example: 10
+        """
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.timeout = timeout
+
+    def _url(self, name, suffix=''):
+        return f"{self.base_url}playbooks/{urllib.parse.quote(name)}/{suffix}"
+
+    def tree(self, name):
+        """
+        Get the Merkle tree of a playbook on Homebase.
+
+        :param name: playbook name on Homebase. Example: "fdd"
+        :returns: RemoteMerkleTree
+        """
+        return RemoteMerkleTree(self._url(name, 'merkle/'), timeout=self.timeout)
+
+    def root(self, name):
+        """
+        Get the Merkle root of a playbook on Homebase in one request.
+
+        :param name: playbook name on Homebase. Example: "fdd"
+        :returns: hex SHA-256 as str, or None if Homebase has no such playbook
+        :raises HomebaseError: If Homebase cannot be reached
+        """
+        try:
+            return self.tree(name).summary([])['hash']
+        except MerkleError as e:
+            if isinstance(e.__cause__, urllib.error.HTTPError) and e.__cause__.code == 404:
+                return None
+            raise HomebaseError(str(e)) from e
+
+    def fetch(self, name):
+        """
+        Download a playbook export from Homebase.
+
+        :param name: playbook name on Homebase. Example: "fdd"
+        :returns: export dict, or None if Homebase has no such playbook
+        :raises HomebaseError: If Homebase cannot be reached or returns bad JSON
+        """
+        try:
+            with urllib.request.urlopen(self._url(name), timeout=self.timeout) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise HomebaseError(f"Fetching {name} from Homebase failed: {e}") from e
+        except (OSError, ValueError) as e:
+            raise HomebaseError(f"Fetching {name} from Homebase failed: {e}") from e
+
+    def push(self, name, document, expected_root=None):
+        """
+        Upload a playbook export to Homebase, replacing its copy.
+
+        :param name: playbook name on Homebase. Example: "fdd"
+        :param document: export dict
+        :param expected_root: Merkle root the copy on Homebase must still have, "" if it must not
+            exist yet, or None to replace it unconditionally. Example: "9f86d081..."
+        :returns: None
+        :raises HomebaseConflict: If the copy on Homebase no longer has the expected root
+        :raises HomebaseError: If the upload fails
+        """
+        data = json.dumps(document, cls=DjangoJSONEncoder).encode()
+        headers = {'Content-Type': 'application/json'}
+        if expected_root is not None:
+            headers['If-Match'] = f'"{expected_root}"'
+        request = urllib.request.Request(self._url(name), data=data, method='PUT', headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except urllib.error.HTTPError as e:
+            if e.code == 412:
+                raise HomebaseConflict(f"{name} changed on Homebase since it was read") from e
+            raise HomebaseError(f"Pushing {name} to Homebase failed: {e}") from e
+        except OSError as e:
+            raise HomebaseError(f"Pushing {name} to Homebase failed: {e}") from e
+        logger.info(f"Pushed {name} to Homebase ({len(data)} bytes)")
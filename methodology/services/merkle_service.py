@@ -0,0 +1,482 @@
+"""
+Merkle Service - Content hashes for finding what differs between two copies of a playbook.
+
+A playbook is hashed as a tree keyed by names, never by database ids, so
+two installations holding the same content get the same hashes:
+
+    playbook                     children: workflows by name
+      workflow                   children: activities by name
+        activity                 children: artifacts it produces, by name
+          artifact               leaf
+
+Every interior node also has a child under the empty key holding the
+hash of its own fields (for an activity: guidance, phase, predecessor and
+successor names and its artifact inputs). Versions, status, visibility
+and timestamps are not content and are left out.
+
+Two peers diff their trees by comparing hashes top-down. Children are
+bucketed by the hex digits of sha256(key), so a node with many children
+is narrowed down 16 ways per roundtrip; finding k differing nodes costs
+O(k * log16 n) roundtrips rather than one per node. Example:
+
+    remote = RemoteMerkleTree('http://homebase.local/playbooks/fdd/merkle/')
+    changes = MerkleService.diff(MerkleService.tree(playbook), remote)
+    # [{"path": ["Design", "Model Domain"], "kind": "activity", "status": "changed"}, ...]
+
+Activity hashes (the costly part: guidance text, dependencies, inputs)
+and the playbook root are cached in ``merkle_hash`` columns. Signals
+clear them on write (see methodology.signals); tree() recomputes only the
+cleared ones.
+
+Usage:
+    MerkleService.root_hash(playbook)
+    tree = MerkleService.tree(playbook)
+    tree = MerkleTree.from_document(json.load(export_file))
+"""
+
+import hashlib
+import json
+import logging
+import urllib.parse
+import urllib.request
+
+from methodology.models import Playbook, Workflow, Activity, Artifact, ArtifactInput
+from methodology.storage import parse_cas_name
+
+logger = logging.getLogger(__name__)
+
+# Node kind by depth in the tree
+NODE_KINDS = ('playbook', 'workflow', 'activity', 'artifact')
+
+# Key of the child holding a node's own fields
+SELF_KEY = ''
+
+# Nodes with at most this many children are compared child by child
+BUCKET_SIZE = 16
+
+
+class MerkleError(Exception):
+    """Raised for unknown tree paths, malformed queries or unreachable peers."""
+
+
+def _digest(value):
+    """
+    Hash a JSON-serializable value canonically.
+
+    :param value: list, dict or scalar. Example: ["workflow", "Design", "", 1]
+    :returns: hex SHA-256 as str. Example: "9f86d081..."
+    """
+    encoded = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _key_digest(key):
+    """
+    Get the bucket digits of a child key.
+
+    :param key: child name as str. Example: "Model Domain"
+    :returns: hex SHA-256 as str
+    """
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def playbook_self_hash(row):
+    """
+    Hash a playbook's own fields.
+
+    :param row: dict with name, description, category and tags
+    :returns: hex SHA-256 as str
+    """
+    return _digest([
+        'playbook', row['name'], row.get('description') or '', row.get('category') or '', list(row.get('tags') or []),
+    ])
+
+
+def workflow_self_hash(row):
+    """
+    Hash a workflow's own fields.
+
+    :param row: dict with name, description and order
+    :returns: hex SHA-256 as str
+    """
+    return _digest(['workflow', row['name'], row.get('description') or '', row.get('order')])
+
+
+def activity_self_hash(row, predecessor, successor, inputs):
+    """
+    Hash an activity's own fields, dependencies and inputs.
+
+    :param row: dict with name, guidance, order and phase
+    :param predecessor: predecessor activity name or None. Example: "Gather Requirements"
+    :param successor: successor activity name or None
+    :param inputs: iterable of (artifact name, is_required). Example: [("Spec", True)]
+    :returns: hex SHA-256 as str
+    """
+    return _digest([
+        'activity', row['name'], row.get('guidance') or '', row.get('order'), row.get('phase') or '',
+        predecessor, successor, sorted([name, bool(required)] for name, required in inputs),
+    ])
+
+
+def artifact_hash(row):
+    """
+    Hash an artifact; template files compare by content digest.
+
+    :param row: dict with name, description, type, is_required, template_file
+        and optionally template_digest (.mpa records)
+    :returns: hex SHA-256 as str
+    """
+    template = row.get('template_file') or ''
+    template = row.get('template_digest') or parse_cas_name(template)[0] or template
+    return _digest([
+        'artifact', row['name'], row.get('description') or '', row.get('type') or '',
+        bool(row.get('is_required')), template,
+    ])
+
+
+class MerkleNode:
+    """One node of a Merkle tree: its hash and its children by key."""
+
+    __slots__ = ('hash', 'children')
+
+    def __init__(self, kind, self_hash=None, children=None, leaf_hash=None):
+        """
+        Build a node; interior nodes hash their own fields with their children.
+
+        :param kind: node kind from NODE_KINDS. Example: "workflow"
+        :param self_hash: hash of the node's own fields, or None for leaves
+        :param children: dict of key -> MerkleNode, or None
+        :param leaf_hash: hash of a leaf node, or None for interior nodes
+        """
+        self.children = dict(children or {})
+        if leaf_hash is not None:
+            self.hash = leaf_hash
+            return
+        self.children[SELF_KEY] = MerkleNode(kind, leaf_hash=self_hash)
+        self.hash = _digest([kind, sorted([key, child.hash] for key, child in self.children.items())])
+
+
+class MerkleTree:
+    """
+    In-memory Merkle tree of one playbook, answering the diff protocol.
+
+    summary() and children() are what a peer serves over HTTP (see
+    query()); RemoteMerkleTree offers the same two methods for a peer.
+    """
+
+    def __init__(self, root):
+        """
+        :param root: MerkleNode of the playbook
+        """
+        self.root = root
+        self.hash = root.hash
+
+    @classmethod
+    def from_rows(cls, playbook_row, workflows, activities, artifacts):
+        """
+        Assemble a tree from precomputed self hashes.
+
+        :param playbook_row: dict with the playbook's own fields
+        :param workflows: list of dicts with id and self_hash, plus name
+        :param activities: list of dicts with workflow_id, name and self_hash
+        :param artifacts: list of dicts with produced_by_id, name and hash
+        :returns: MerkleTree
+        """
+        artifacts_by_activity = {}
+        for artifact in artifacts:
+            artifacts_by_activity.setdefault(artifact['produced_by_id'], {})[artifact['name']] = MerkleNode(
+                'artifact', leaf_hash=artifact['hash']
+            )
+        activities_by_workflow = {}
+        for activity in activities:
+            activities_by_workflow.setdefault(activity['workflow_id'], {})[activity['name']] = MerkleNode(
+                'activity', activity['self_hash'], artifacts_by_activity.get(activity['id'])
+            )
+        root = MerkleNode('playbook', playbook_self_hash(playbook_row), {
+            workflow['name']: MerkleNode('workflow', workflow['self_hash'], activities_by_workflow.get(workflow['id']))
+            for workflow in workflows
+        })
+        return cls(root)
+
+    @classmethod
+    def from_document(cls, document):
+        """
+        Build a tree from a JSON export (or its parsed .mpa records).
+
+        :param document: dict in the mimir.playbook export format
+        :returns: MerkleTree
+        """
+        activity_names = {row['id']: row['name'] for row in document.get('activities', [])}
+        artifact_names = {row['id']: row['name'] for row in document.get('artifacts', [])}
+        inputs = {}
+        for row in document.get('artifact_inputs', []):
+            inputs.setdefault(row['activity_id'], []).append((artifact_names[row['artifact_id']], row['is_required']))
+
+        workflows = [{**row, 'self_hash': workflow_self_hash(row)} for row in document.get('workflows', [])]
+        activities = [
+            {
+                **row,
+                'self_hash': activity_self_hash(
+                    row, activity_names.get(row.get('predecessor_id')), activity_names.get(row.get('successor_id')),
+                    inputs.get(row['id'], ()),
+                ),
+            }
+            for row in document.get('activities', [])
+        ]
+        artifacts = [{**row, 'hash': artifact_hash(row)} for row in document.get('artifacts', [])]
+        return cls.from_rows(document, workflows, activities, artifacts)
+
+    def _node(self, path):
+        node = self.root
+        for key in path:
+            if key not in node.children or key == SELF_KEY:
+                raise MerkleError(f"No node at path {list(path)}")
+            node = node.children[key]
+        return node
+
+    def _entries(self, path, prefix):
+        return [
+            (key, child.hash, _key_digest(key))
+            for key, child in self._node(path).children.items()
+            if _key_digest(key).startswith(prefix)
+        ]
+
+    def summary(self, path, prefix=''):
+        """
+        Describe a node's children whose key digest starts with prefix.
+
+        :param path: list of keys from the root. Example: ["Design"]
+        :param prefix: hex prefix of key digests, '' for all children. Example: "a3"
+        :returns: dict with hash (the node hash when prefix is ''), count and
+            per next-digit bucket hashes. Example: {"hash": "...", "count": 40, "buckets": {"0": "...", ...}}
+        :raises MerkleError: If there is no node at path
+        """
+        entries = self._entries(path, prefix)
+        buckets = {}
+        for key, child_hash, key_digest in entries:
+            if len(key_digest) > len(prefix):
+                buckets.setdefault(key_digest[len(prefix)], []).append([key, child_hash])
+        return {
+            'hash': self._node(path).hash if not prefix else _digest(sorted([key, h] for key, h, _ in entries)),
+            'count': len(entries),
+            'buckets': {digit: _digest(sorted(items)) for digit, items in buckets.items()},
+        }
+
+    def children(self, path, prefix=''):
+        """
+        List a node's children whose key digest starts with prefix.
+
+        :param path: list of keys from the root. Example: ["Design"]
+        :param prefix: hex prefix of key digests. Example: "a3"
+        :returns: dict of key -> hash. Example: {"": "...", "Model Domain": "..."}
+        :raises MerkleError: If there is no node at path
+        """
+        return {key: child_hash for key, child_hash, _ in self._entries(path, prefix)}
+
+    def query(self, params):
+        """
+        Answer one diff protocol request.
+
+        :param params: mapping with op ("summary" or "children"), path (JSON list) and prefix
+        :returns: response dict
+        :raises MerkleError: If the request is malformed or the path is unknown
+        """
+        op, prefix = params.get('op', 'summary'), params.get('prefix', '')
+        try:
+            path = json.loads(params.get('path', '[]'))
+        except ValueError:
+            raise MerkleError("path must be a JSON list of keys")
+        if not isinstance(path, list) or not all(isinstance(key, str) for key in path):
+            raise MerkleError("path must be a JSON list of keys")
+        if any(digit not in '0123456789abcdef' for digit in prefix):
+            raise MerkleError("prefix must be lowercase hex")
+        if op == 'summary':
+            return self.summary(path, prefix)
+        if op == 'children':
+            return {'children': self.children(path, prefix)}
+        raise MerkleError(f"Unknown op {op!r}")
+
+
+class RemoteMerkleTree:
+    """
+    A peer's Merkle tree reached over HTTP; counts the roundtrips made.
+
+    Usage:
+        remote = RemoteMerkleTree('http://127.0.0.1:8765/playbooks/fdd/merkle/')
+        remote.summary([])['hash']
+    """
+
+    def __init__(self, url, timeout=10):
+        """
+        :param url: endpoint answering MerkleTree.query(). Example: "http://127.0.0.1:8765/playbooks/fdd/merkle/"
+        :param timeout: seconds per request. Example: 10
+        """
+        self.url = url
+        self.timeout = timeout
+        self.roundtrips = 0
+
+    def _get(self, op, path, prefix):
+        query = urllib.parse.urlencode({'op': op, 'path': json.dumps(list(path)), 'prefix': prefix})
+        self.roundtrips += 1
+        try:
+            with urllib.request.urlopen(f"{self.url}?{query}", timeout=self.timeout) as response:
+                return json.load(response)
+        except (OSError, ValueError) as e:
+            raise MerkleError(f"Merkle query {op} {list(path)} to {self.url} failed: {e}") from e
+
+    def summary(self, path, prefix=''):
+        return self._get('summary', path, prefix)
+
+    def children(self, path, prefix=''):
+        return self._get('children', path, prefix)['children']
+
+
+class MerkleService:
+    """Service class for playbook Merkle trees."""
+
+    @staticmethod
+    def tree(playbook):
+        """
+        Build the Merkle tree of a stored playbook.
+
+        Reads the rows' names and cached activity hashes (four queries);
+        activities whose hash was cleared are rehashed from two more reads
+        and saved, as is a changed root.
+
+        :param playbook: Playbook instance
+        :returns: MerkleTree
+        """
+        playbook_row = Playbook.all_objects.filter(pk=playbook.pk).values(
+            'name', 'description', 'category', 'tags', 'merkle_hash'
+        ).get()
+        workflows = [
+            {**row, 'self_hash': workflow_self_hash(row)}
+            for row in Workflow.objects.filter(playbook=playbook).values('id', 'name', 'description', 'order')
+        ]
+        activities = list(
+            Activity.objects.filter(workflow__playbook=playbook).values('id', 'workflow_id', 'name', 'merkle_hash')
+        )
+        artifacts = [
+            {**row, 'hash': artifact_hash(row)}
+            for row in Artifact.objects.filter(playbook=playbook).values(
+                'produced_by_id', 'name', 'description', 'type', 'is_required', 'template_file'
+            )
+        ]
+
+        stale = {activity['id']: activity for activity in activities if not activity['merkle_hash']}
+        if stale:
+            MerkleService._rehash_activities(stale)
+        for activity in activities:
+            activity['self_hash'] = activity['merkle_hash']
+
+        tree = MerkleTree.from_rows(playbook_row, workflows, activities, artifacts)
+        if playbook_row['merkle_hash'] != tree.hash:
+            Playbook.all_objects.filter(pk=playbook.pk).update(merkle_hash=tree.hash)
+        logger.info(f"Merkle tree of playbook {playbook.pk}: {len(activities)} activities, {len(stale)} rehashed")
+        return tree
+
+    @staticmethod
+    def _rehash_activities(stale):
+        """
+        Recompute and store the self hashes of activities.
+
+        :param stale: dict of activity id -> row dict; merkle_hash is filled in
+        :returns: None
+        """
+        inputs = {}
+        for row in ArtifactInput.objects.filter(activity_id__in=stale).values(
+            'activity_id', 'artifact__name', 'is_required'
+        ):
+            inputs.setdefault(row['activity_id'], []).append((row['artifact__name'], row['is_required']))
+        updated = []
+        for row in Activity.objects.filter(pk__in=stale).values(
+            'id', 'name', 'guidance', 'order', 'phase', 'predecessor__name', 'successor__name'
+        ):
+            digest = activity_self_hash(
+                row, row['predecessor__name'], row['successor__name'], inputs.get(row['id'], ())
+            )
+            stale[row['id']]['merkle_hash'] = digest
+            updated.append(Activity(pk=row['id'], merkle_hash=digest))
+        Activity.objects.bulk_update(updated, ['merkle_hash'])
+
+    @staticmethod
+    def root_hash(playbook):
+        """
+        Get a playbook's Merkle root, from the cache when it is current.
+
+        :param playbook: Playbook instance
+        :returns: hex SHA-256 as str
+        """
+        cached = Playbook.all_objects.filter(pk=playbook.pk).values_list('merkle_hash', flat=True).first()
+        return cached or MerkleService.tree(playbook).hash
+
+    @staticmethod
+    def invalidate(playbooks=None, activities=None):
+        """
+        Clear cached hashes after a write.
+
+        :param playbooks: Q selecting playbooks whose root is stale, or None. Example: Q(pk=7)
+        :param activities: Q selecting activities whose own hash is stale, or None.
+            Example: Q(predecessor_id=9) | Q(successor_id=9)
+        :returns: None
+        """
+        if activities is not None:
+            Activity.objects.filter(activities).exclude(merkle_hash='').update(merkle_hash='')
+        if playbooks is not None:
+            Playbook.all_objects.filter(playbooks).exclude(merkle_hash='').update(merkle_hash='')
+
+    @staticmethod
+    def diff(local, remote):
+        """
+        Find the nodes that differ between two trees.
+
+        Only subtrees and buckets whose hashes differ are visited; each
+        summary() or children() call on a RemoteMerkleTree is one roundtrip.
+
+        :param local: MerkleTree (or RemoteMerkleTree)
+        :param remote: RemoteMerkleTree (or MerkleTree)
+        :returns: list of dicts with path, kind and status ("changed",
+            "local_only" or "remote_only"), in key order.
+            Example: [{"path": ["Design", "Model Domain"], "kind": "activity", "status": "changed"}]
+        """
+        changes = []
+
+        def report(path, status):
+            changes.append({'path': list(path), 'kind': NODE_KINDS[min(len(path), 3)], 'status': status})
+
+        def diff_node(path):
+            mine, theirs = local.summary(path), remote.summary(path)
+            if mine['hash'] == theirs['hash']:
+                return
+            if not mine['count'] and not theirs['count']:
+                report(path, 'changed')
+                return
+            diff_bucket(path, '', mine, theirs)
+
+        def diff_bucket(path, prefix, mine, theirs):
+            if mine['hash'] == theirs['hash']:
+                return
+            if max(mine['count'], theirs['count']) <= BUCKET_SIZE or len(prefix) >= 64:
+                mine_children, their_children = local.children(path, prefix), remote.children(path, prefix)
+                for key in sorted(set(mine_children) | set(their_children)):
+                    if mine_children.get(key) == their_children.get(key):
+                        continue
+                    if key == SELF_KEY:
+                        report(path, 'changed')
+                    elif key not in their_children:
+                        report(path + [key], 'local_only')
+                    elif key not in mine_children:
+                        report(path + [key], 'remote_only')
+                    else:
+                        diff_node(path + [key])
+                return
+            for digit in sorted(set(mine['buckets']) | set(theirs['buckets'])):
+                if mine['buckets'].get(digit) != theirs['buckets'].get(digit):
+                    diff_bucket(
+                        path, prefix + digit, local.summary(path, prefix + digit), remote.summary(path, prefix + digit)
+                    )
+
+        diff_node([])
+        changes.sort(key=lambda change: change['path'])
+        logger.info(f"Merkle diff found {len(changes)} differing nodes")
+        return changes
@@ -0,0 +1,154 @@
+"""
+Playbook Copy Service - Set-based deep copies of playbook content.
+
+Copies workflows with their activities, artifacts, artifact inputs and
+activity dependencies using one read and one ``bulk_create`` per table.
+Old ids are mapped to the new rows in memory; predecessor/successor
+links point at rows of the same table, so they are written by a final
+``bulk_update`` once every copied activity has its id.
+
+bulk_create skips model save() overrides and signals: callers run inside
+``suspend_version_signals()`` and a transaction, and template blob
+references, change feed entries and the target's Merkle root are
+maintained here (copied activities start without a cached hash).
+
+Usage:
+    counts = PlaybookCopyService.copy_workflows(original.workflows.all(), duplicate)
+    counts = PlaybookCopyService.copy_workflows(
+        Workflow.objects.filter(pk=workflow.pk), workflow.playbook,
+        workflow_fields={workflow.pk: {'name': 'Design (Copy)', 'order': 4, 'abbreviation': ''}},
+        artifact_names={'Spec': 'Spec (Copy)'},
+    )
+"""
+
+import logging
+
+from django.db.models import Q
+
+from methodology.models import Workflow, Activity, Artifact, ArtifactInput
+from methodology.services.change_feed_service import ChangeFeedService
+from methodology.services.merkle_service import MerkleService
+from methodology.services.template_blob_service import TemplateBlobService
+
+logger = logging.getLogger(__name__)
+
+WORKFLOW_COPY_FIELDS = ('id', 'playbook_id', 'name', 'description', 'abbreviation', 'order')
+ACTIVITY_COPY_FIELDS = ('id', 'workflow_id', 'name', 'guidance', 'order', 'phase', 'predecessor_id', 'successor_id')
+ARTIFACT_COPY_FIELDS = ('id', 'produced_by_id', 'name', 'description', 'type', 'is_required', 'template_file')
+ARTIFACT_INPUT_COPY_FIELDS = ('artifact_id', 'activity_id', 'is_required')
+
+
+class PlaybookCopyService:
+    """Service class for bulk copying playbook content."""
+
+    @staticmethod
+    def copy_workflows(workflows, target, workflow_fields=None, artifact_names=None):
+        """
+        Deep copy workflows and everything they contain into a playbook.
+
+        Artifacts produced in the copied workflows are copied. Artifact
+        inputs of copied activities are copied too: they point at the
+        copied artifact, or at the original one when copying within the
+        same playbook. Runs four reads and one write per table (batched
+        by the database's bulk size) regardless of the number of rows.
+
+        :param workflows: Workflow queryset to copy. Example: original.workflows.all()
+        :param target: saved Playbook receiving the copies
+        :param workflow_fields: dict of workflow id -> field overrides, or None.
+            An empty abbreviation is regenerated. Example: {7: {"name": "Design (Copy)", "order": 4}}
+        :param artifact_names: dict of artifact name -> name of its copy, or None to keep names.
+            Example: {"Spec": "Spec (Copy)"}
+        :returns: dict of copied row counts. Example: {"workflows": 3, "activities": 40, ...}
+        """
+        workflow_fields = workflow_fields or {}
+        artifact_names = artifact_names or {}
+
+        workflow_rows = list(workflows.order_by('order', 'id').values(*WORKFLOW_COPY_FIELDS))
+        workflow_ids = [row['id'] for row in workflow_rows]
+        same_playbook = all(row['playbook_id'] == target.pk for row in workflow_rows)
+        activity_rows = list(
+            Activity.objects.filter(workflow_id__in=workflow_ids).order_by('workflow_id', 'order', 'id')
+            .values(*ACTIVITY_COPY_FIELDS)
+        )
+        artifact_rows = list(
+            Artifact.objects.filter(produced_by__workflow_id__in=workflow_ids).order_by('id')
+            .values(*ARTIFACT_COPY_FIELDS)
+        )
+        input_rows = list(
+            ArtifactInput.objects.filter(activity__workflow_id__in=workflow_ids).order_by('id')
+            .values(*ARTIFACT_INPUT_COPY_FIELDS)
+        )
+
+        workflow_map = {}
+        for row in workflow_rows:
+            fields = {key: row[key] for key in ('name', 'description', 'abbreviation', 'order')}
+            fields.update(workflow_fields.get(row['id'], {}))
+            workflow = Workflow(playbook=target, **fields)
+            # bulk_create skips Workflow.save(), which fills the abbreviation
+            workflow.abbreviation = workflow.abbreviation or workflow.generate_abbreviation()
+            workflow_map[row['id']] = workflow
+        Workflow.objects.bulk_create(workflow_map.values())
+
+        activity_map = {
+            row['id']: Activity(
+                workflow=workflow_map[row['workflow_id']], name=row['name'], guidance=row['guidance'],
+                order=row['order'], phase=row['phase'],
+            )
+            for row in activity_rows
+        }
+        Activity.objects.bulk_create(activity_map.values())
+
+        linked = []
+        for row in activity_rows:
+            if row['predecessor_id'] is None and row['successor_id'] is None:
+                continue
+            activity = activity_map[row['id']]
+            activity.predecessor = activity_map.get(row['predecessor_id'])
+            activity.successor = activity_map.get(row['successor_id'])
+            linked.append(activity)
+        if linked:
+            Activity.objects.bulk_update(linked, ['predecessor', 'successor'])
+
+        artifact_map = {
+            row['id']: Artifact(
+                playbook=target, produced_by=activity_map[row['produced_by_id']],
+                name=artifact_names.get(row['name'], row['name']),
+                description=row['description'], type=row['type'], is_required=row['is_required'],
+                template_file=row['template_file'] or None,
+            )
+            for row in artifact_rows
+        }
+        Artifact.objects.bulk_create(artifact_map.values())
+
+        inputs = []
+        for row in input_rows:
+            if row['artifact_id'] in artifact_map:
+                artifact = {'artifact': artifact_map[row['artifact_id']]}
+            elif same_playbook:
+                # Inputs produced outside the copied workflows stay shared
+                artifact = {'artifact_id': row['artifact_id']}
+            else:
+                continue
+            inputs.append(ArtifactInput(
+                activity=activity_map[row['activity_id']], is_required=row['is_required'], **artifact,
+            ))
+        ArtifactInput.objects.bulk_create(inputs)
+
+        # Copies share the original's content-addressed template blobs
+        TemplateBlobService.add_references(row['template_file'] for row in artifact_rows if row['template_file'])
+        ChangeFeedService.record_rows(target, {
+            'workflow': [workflow.pk for workflow in workflow_map.values()],
+            'activity': [activity.pk for activity in activity_map.values()],
+            'artifact': [artifact.pk for artifact in artifact_map.values()],
+            'artifact_input': [artifact_input.pk for artifact_input in inputs],
+        })
+        if same_playbook or target.merkle_hash:
+            # A freshly saved target's root is already empty
+            MerkleService.invalidate(playbooks=Q(pk=target.pk))
+
+        counts = {
+            'workflows': len(workflow_map), 'activities': len(activity_map), 'artifacts': len(artifact_map),
+            'artifact_inputs': len(inputs), 'dependencies': len(linked),
+        }
+        logger.info(f"Copied {counts} into playbook {target.pk}")
+        return counts
@@ -0,0 +1,278 @@
+"""
+Playbook Export Service - Deep JSON export of a playbook.
+
+The export is written incrementally: each table is read with
+``.iterator(chunk_size=...)`` and every row is encoded as soon as it is
+fetched, so memory use does not grow with the playbook and the first
+bytes are ready after the first query. Exports of many playbooks share
+one query per table (see iter_playbook_sections).
+
+Rows reference each other by their ``id`` in the export. Example:
+    {"format": "mimir.playbook", "format_version": 1, "name": "FDD", ...,
+     "workflows": [{"id": 3, "name": "Design", ...}],
+     "activities": [{"id": 9, "workflow_id": 3, "predecessor_id": null, ...}],
+     "artifacts": [{"id": 4, "produced_by_id": 9, ...}],
+     "artifact_inputs": [{"id": 2, "artifact_id": 4, "activity_id": 10, ...}],
+     "versions": [{"version_number": 1, "snapshot": {...}, ...}]}
+"""
+
+import json
+import logging
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+
+from methodology.models import Workflow, Activity, Artifact, ArtifactInput, PlaybookVersion
+from methodology.services.playbook_version_service import PlaybookVersionService
+from methodology.utils.json_patch import apply_patch
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMAT = 'mimir.playbook'
+EXPORT_FORMAT_VERSION = 1
+
+# Encoded JSON is handed to the response in pieces of about this size
+WRITE_BUFFER_SIZE = 64 * 1024
+
+PLAYBOOK_FIELDS = (
+    'name', 'description', 'category', 'tags', 'visibility', 'status', 'version', 'source',
+    'created_at', 'updated_at',
+)
+WORKFLOW_FIELDS = ('id', 'name', 'description', 'abbreviation', 'order', 'created_at', 'updated_at')
+ACTIVITY_FIELDS = (
+    'id', 'workflow_id', 'name', 'guidance', 'order', 'phase', 'predecessor_id', 'successor_id',
+    'created_at', 'updated_at',
+)
+ARTIFACT_FIELDS = (
+    'id', 'produced_by_id', 'name', 'description', 'type', 'is_required', 'template_file',
+    'created_at', 'updated_at',
+)
+ARTIFACT_INPUT_FIELDS = ('id', 'artifact_id', 'activity_id', 'is_required')
+
+
+def get_chunk_size():
+    """
+    Get number of rows fetched per database round trip during export.
+
+    :returns: Chunk size as int. Example: 500
+    """
+    return getattr(settings, 'EXPORT_CHUNK_SIZE', 500)
+
+
+def _encode(value):
+    """
+    Encode one value as compact JSON.
+
+    :param value: JSON-serializable value (datetimes and Decimals allowed)
+    :returns: JSON text as str. Example: '{"id": 3, "name": "Design"}'
+    """
+    return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+class PlaybookExportService:
+    """Service class for streaming playbook exports."""
+
+    @staticmethod
+    def export_filename(playbook, extension='json'):
+        """
+        Build the download filename for a playbook export.
+
+        :param playbook: Playbook instance
+        :param extension: file extension without dot. Example: "json"
+        :returns: Filename as str. Example: "product-discovery-v0.1.json"
+        """
+        safe_name = playbook.name.lower().replace(' ', '-').replace('_', '-')
+        return f"{safe_name}-v{playbook.version}.{extension}"
+
+    @staticmethod
+    def get_header(playbook):
+        """
+        Get the playbook-level fields of an export.
+
+        :param playbook: Playbook instance
+        :returns: Ordered dict of header fields. Example: {"format": "mimir.playbook", "name": "FDD", ...}
+        """
+        header = {
+            'format': EXPORT_FORMAT,
+            'format_version': EXPORT_FORMAT_VERSION,
+            'exported_at': timezone.now(),
+        }
+        header.update({field: getattr(playbook, field) for field in PLAYBOOK_FIELDS})
+        return header
+
+    @staticmethod
+    def iter_sections(playbook, chunk_size=None):
+        """
+        Get the row streams that make up a deep export, in dependency order.
+
+        Each stream is lazy and runs its query only when iterated.
+
+        :param playbook: Playbook instance
+        :param chunk_size: rows per fetch or None for EXPORT_CHUNK_SIZE. Example: 500
+        :returns: generator of (section name, iterator of row dicts). Example: ("workflows", <generator>)
+        """
+        for _, sections in PlaybookExportService.iter_playbook_sections([playbook], chunk_size):
+            yield from sections
+
+    @staticmethod
+    def iter_playbook_sections(playbooks, chunk_size=None):
+        """
+        Get the row streams of many playbooks with one query per section.
+
+        Every section is read by a single query over all playbooks, ordered
+        by playbook; the query for a section starts when its rows are first
+        needed and its cursor advances as each playbook's rows are consumed.
+        Consume each playbook's sections in order before moving to the next.
+
+        :param playbooks: iterable of Playbook instances
+        :param chunk_size: rows per fetch or None for EXPORT_CHUNK_SIZE. Example: 500
+        :returns: generator of (playbook, generator of (section name, iterator of row dicts)),
+            in primary key order
+        """
+        playbooks = sorted(playbooks, key=lambda playbook: playbook.pk)
+        chunk_size = chunk_size or get_chunk_size()
+        cursors = [
+            (section, _GroupedRows(rows))
+            for section, rows in _section_rows([playbook.pk for playbook in playbooks], chunk_size)
+        ]
+        for playbook in playbooks:
+            yield playbook, ((section, cursor.take(playbook.pk)) for section, cursor in cursors)
+
+    @staticmethod
+    def iter_json(playbook, chunk_size=None):
+        """
+        Stream a deep export of a playbook as JSON text.
+
+        :param playbook: Playbook instance
+        :param chunk_size: rows per fetch or None for EXPORT_CHUNK_SIZE. Example: 500
+        :returns: generator of str pieces that concatenate to one JSON document
+        """
+        sections = PlaybookExportService.iter_sections(playbook, chunk_size)
+        yield from PlaybookExportService.iter_json_document(playbook, sections)
+
+    @staticmethod
+    def iter_json_document(playbook, sections):
+        """
+        Encode a playbook header and its section rows as one JSON document.
+
+        :param playbook: Playbook instance
+        :param sections: iterable of (section name, iterator of row dicts)
+        :returns: generator of str pieces of about WRITE_BUFFER_SIZE characters
+        """
+        buffer, buffered = [], 0
+        counts = {}
+
+        def pieces():
+            header = _encode(PlaybookExportService.get_header(playbook))
+            yield header[:-1]
+            for section, rows in sections:
+                yield f', {_encode(section)}: ['
+                count = 0
+                for row in rows:
+                    yield (', ' if count else '') + _encode(row)
+                    count += 1
+                counts[section] = count
+                yield ']'
+            yield '}'
+
+        for piece in pieces():
+            buffer.append(piece)
+            buffered += len(piece)
+            if buffered >= WRITE_BUFFER_SIZE:
+                yield ''.join(buffer)
+                buffer, buffered = [], 0
+        yield ''.join(buffer)
+
+        logger.info(f"Exported playbook {playbook.pk} as JSON ({counts})")
+
+
+class _GroupedRows:
+    """
+    Cursor over one section's rows for many playbooks, ordered by playbook_id.
+    """
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._head = None
+
+    def take(self, playbook_id):
+        """
+        Yield the rows of one playbook, without their playbook_id key.
+
+        :param playbook_id: Playbook primary key, not lower than any previous call. Example: 42
+        :returns: generator of row dicts
+        """
+        while True:
+            if self._head is None:
+                self._head = next(self._rows, None)
+                if self._head is None:
+                    return
+            if self._head['playbook_id'] > playbook_id:
+                return
+            row, self._head = self._head, None
+            # Rows of earlier playbooks left unconsumed are skipped
+            if row.pop('playbook_id') == playbook_id:
+                yield row
+
+
+def _section_rows(playbook_ids, chunk_size):
+    """
+    Build the lazy per-section row iterators for a set of playbooks.
+
+    :param playbook_ids: list of Playbook primary keys. Example: [3, 7]
+    :param chunk_size: rows per fetch. Example: 500
+    :returns: list of (section name, iterator of row dicts carrying playbook_id)
+    """
+    return [
+        ('workflows', Workflow.objects.filter(playbook_id__in=playbook_ids).order_by(
+            'playbook_id', 'order', 'id'
+        ).values('playbook_id', *WORKFLOW_FIELDS).iterator(chunk_size=chunk_size)),
+        ('activities', Activity.objects.filter(workflow__playbook_id__in=playbook_ids).order_by(
+            'workflow__playbook_id', 'workflow__order', 'workflow_id', 'order', 'id'
+        ).values(*ACTIVITY_FIELDS, playbook_id=F('workflow__playbook_id')).iterator(chunk_size=chunk_size)),
+        ('artifacts', Artifact.objects.filter(playbook_id__in=playbook_ids).order_by(
+            'playbook_id', 'id'
+        ).values('playbook_id', *ARTIFACT_FIELDS).iterator(chunk_size=chunk_size)),
+        ('artifact_inputs', ArtifactInput.objects.filter(artifact__playbook_id__in=playbook_ids).order_by(
+            'artifact__playbook_id', 'id'
+        ).values(*ARTIFACT_INPUT_FIELDS, playbook_id=F('artifact__playbook_id')).iterator(chunk_size=chunk_size)),
+        ('versions', _iter_versions(playbook_ids, chunk_size)),
+    ]
+
+
+def _iter_versions(playbook_ids, chunk_size):
+    """
+    Yield every version of a set of playbooks with its reconstructed snapshot.
+
+    Versions are read oldest first per playbook and deltas are applied to
+    the previous snapshot as they stream past, so each row is decoded once.
+
+    :param playbook_ids: list of Playbook primary keys. Example: [3, 7]
+    :param chunk_size: rows per fetch. Example: 500
+    :returns: generator of version dicts. Example: {"playbook_id": 3, "version_number": 2, "snapshot": {...}, ...}
+    """
+    versions = PlaybookVersion.objects.filter(playbook_id__in=playbook_ids).select_related('created_by').only(
+        'playbook_id', 'version_number', 'storage', 'payload', 'snapshot_data', 'chain_length',
+        'change_summary', 'created_at', 'created_by__username',
+    ).order_by('playbook_id', 'version_number')
+
+    snapshot, previous = None, (None, None)
+    for version in versions.iterator(chunk_size=chunk_size):
+        if version.is_keyframe:
+            snapshot = version.decode_payload()
+        elif snapshot is not None and previous == (version.playbook_id, version.version_number - 1):
+            snapshot = apply_patch(snapshot, version.decode_payload())
+        else:
+            # Gap in the numbering: rebuild from the keyframe
+            snapshot = PlaybookVersionService.reconstruct(version)
+        previous = (version.playbook_id, version.version_number)
+        yield {
+            'playbook_id': version.playbook_id,
+            'version_number': version.version_number,
+            'change_summary': version.change_summary,
+            'created_at': version.created_at,
+            'created_by': version.created_by.username if version.created_by else None,
+            'snapshot': snapshot,
+        }
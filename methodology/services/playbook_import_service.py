@@ -0,0 +1,611 @@
+"""
+Playbook Import Service - Bulk import of exported playbooks.
+
+Imports the JSON export (PlaybookExportService), an .mpa package
+(PlaybookPackageService) or the playbooks of an .mpb library
+(PlaybookPackageService.iter_library). The whole document is validated up front and
+cross-references (workflow, predecessor, successor, produced_by, inputs)
+are resolved in memory against the ids used in the file. Rows are then
+written with one ``bulk_create`` per table inside a single transaction,
+with version signals suspended and one version bump for the playbook.
+
+Name conflicts with an existing playbook of the importing user are
+resolved by the conflict mode (IMPORT-05):
+
+    rename   import as "Name (2)", "Name (3)", ...
+    replace  delete the existing playbook and import under its name
+    cancel   import nothing
+    None     raise ImportConflict so the caller can ask the user
+
+Usage:
+    source = PlaybookImportService.load(uploaded_file)
+    playbook = PlaybookImportService.import_playbook(source, user, conflict='rename')
+    for source in PlaybookImportService.iter_library(library_file): ...
+"""
+
+import json
+import logging
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+
+from methodology.models import (
+    Playbook, PlaybookVersion, Workflow, Activity, Artifact, ArtifactInput, TemplateBlob,
+)
+from methodology.services.change_feed_service import ChangeFeedService
+from methodology.services.dashboard_service import DashboardService
+from methodology.services.playbook_export_service import EXPORT_FORMAT, EXPORT_FORMAT_VERSION
+from methodology.services.playbook_package_service import PlaybookPackage, PackageError, RECORD_KINDS
+from methodology.services.playbook_purge_service import PlaybookPurgeService
+from methodology.services.playbook_version_service import get_max_chain
+from methodology.services.template_blob_service import TemplateBlobService
+from methodology.signals import suspend_version_signals
+from methodology.storage import parse_cas_name, template_storage
+from methodology.utils.library_codec import (
+    MAGIC as LIBRARY_MAGIC, LibraryCodecError, LibraryLimitError, iter_documents,
+)
+from methodology.utils.snapshot_codec import encode_version
+
+logger = logging.getLogger(__name__)
+
+CONFLICT_RENAME = 'rename'
+CONFLICT_REPLACE = 'replace'
+CONFLICT_CANCEL = 'cancel'
+CONFLICT_MODES = (CONFLICT_RENAME, CONFLICT_REPLACE, CONFLICT_CANCEL)
+
+# Validation stops collecting after this many errors
+MAX_ERRORS = 50
+
+_ZIP_MAGIC = b'PK\x03\x04'
+
+
+def get_stash_dir():
+    """
+    Get directory holding uploads that wait for a conflict decision.
+
+    :returns: directory path as str. Example: "/tmp/mimir-imports"
+    """
+    return str(getattr(settings, 'IMPORT_STASH_DIR', os.path.join(tempfile.gettempdir(), 'mimir-imports')))
+
+
+class PlaybookImportError(Exception):
+    """
+    Raised when an import document is invalid.
+
+    :param errors: list of messages. Example: ["activities[3]: unknown workflow_id 9"]
+    """
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__('; '.join(self.errors))
+
+
+class ImportConflict(PlaybookImportError):
+    """Raised when the user already has a playbook with the imported name and no conflict mode was given."""
+
+    def __init__(self, existing):
+        self.existing = existing
+        super().__init__([f"A playbook named '{existing.name}' already exists"])
+
+
+@dataclass
+class ImportSource:
+    """
+    A parsed import document.
+
+    :param document: export dict with header fields and section lists
+    :param package: PlaybookPackage holding template blobs, or None for JSON imports
+    """
+
+    document: dict
+    package: PlaybookPackage = None
+    warnings: list = field(default_factory=list)
+
+
+class _Validator:
+    """Collects validation errors for one document."""
+
+    def __init__(self):
+        self.errors = []
+
+    def error(self, message):
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(message)
+
+    def text(self, where, row, key, model, required=True):
+        value = row.get(key)
+        if value is None and not required:
+            return
+        if not isinstance(value, str) or (required and not value.strip()):
+            self.error(f"{where}: {key} is required")
+            return
+        max_length = model._meta.get_field(key).max_length
+        if max_length and len(value) > max_length:
+            self.error(f"{where}: {key} is longer than {max_length} characters")
+
+    def choice(self, where, row, key, model):
+        choices = [value for value, _ in model._meta.get_field(key).choices]
+        if row.get(key) not in choices:
+            self.error(f"{where}: {key} must be one of {', '.join(choices)}")
+
+    def integer(self, where, row, key):
+        if not isinstance(row.get(key), int) or isinstance(row.get(key), bool):
+            self.error(f"{where}: {key} must be an integer")
+
+    def rows(self, document, section):
+        rows = document.get(section, [])
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            self.error(f"{section} must be a list of objects")
+            return []
+        return rows
+
+    def index(self, section, rows):
+        by_id = {}
+        for i, row in enumerate(rows):
+            if not isinstance(row.get('id'), (int, str)) or row.get('id') in by_id:
+                self.error(f"{section}[{i}]: id is missing or duplicated")
+            else:
+                by_id[row['id']] = row
+        return by_id
+
+
+def _validate(document):
+    """
+    Check an export document and resolve its cross-references.
+
+    :param document: export dict. Example: {"format": "mimir.playbook", "name": "FDD", ...}
+    :returns: dict of section name -> {id: row}
+    :raises PlaybookImportError: With every problem found (up to MAX_ERRORS)
+    """
+    try:
+        return _validate_sections(document)
+    except TypeError:
+        # Lists or objects where names or ids belong
+        raise PlaybookImportError(["Malformed export: a name or reference has the wrong type"])
+
+
+def _validate_sections(document):
+    """
+    Validate every section of a document; see _validate().
+
+    :param document: export dict
+    :returns: dict of section name -> {id: row}
+    """
+    v = _Validator()
+    if not isinstance(document, dict) or document.get('format') != EXPORT_FORMAT:
+        raise PlaybookImportError(["Not a Mimir playbook export"])
+    if not isinstance(document.get('format_version'), int) or document['format_version'] > EXPORT_FORMAT_VERSION:
+        raise PlaybookImportError([f"Unsupported export format version {document.get('format_version')!r}"])
+
+    v.text('playbook', document, 'name', Playbook)
+    v.text('playbook', document, 'description', Playbook)
+    for key in ('category', 'visibility', 'status'):
+        v.choice('playbook', document, key, Playbook)
+    if not isinstance(document.get('tags', []), list):
+        v.error("playbook: tags must be a list")
+    try:
+        Decimal(str(document.get('version')))
+    except InvalidOperation:
+        v.error("playbook: version must be a number")
+
+    workflows = v.index('workflows', v.rows(document, 'workflows'))
+    activities = v.index('activities', v.rows(document, 'activities'))
+    artifacts = v.index('artifacts', v.rows(document, 'artifacts'))
+    inputs = v.rows(document, 'artifact_inputs')
+    versions = v.rows(document, 'versions')
+
+    names = set()
+    for i, row in enumerate(workflows.values()):
+        where = f"workflows[{i}]"
+        v.text(where, row, 'name', Workflow)
+        v.text(where, row, 'description', Workflow, required=False)
+        v.text(where, row, 'abbreviation', Workflow, required=False)
+        v.integer(where, row, 'order')
+        if row.get('name') in names:
+            v.error(f"{where}: duplicate workflow name '{row.get('name')}'")
+        names.add(row.get('name'))
+
+    names = set()
+    for i, row in enumerate(activities.values()):
+        where = f"activities[{i}]"
+        v.text(where, row, 'name', Activity)
+        v.text(where, row, 'guidance', Activity, required=False)
+        v.text(where, row, 'phase', Activity, required=False)
+        v.integer(where, row, 'order')
+        if row.get('workflow_id') not in workflows:
+            v.error(f"{where}: unknown workflow_id {row.get('workflow_id')!r}")
+        if (row.get('workflow_id'), row.get('name')) in names:
+            v.error(f"{where}: duplicate activity name '{row.get('name')}' in workflow")
+        names.add((row.get('workflow_id'), row.get('name')))
+        for key in ('predecessor_id', 'successor_id'):
+            target = row.get(key)
+            if target is None:
+                continue
+            if target not in activities:
+                v.error(f"{where}: unknown {key} {target!r}")
+            elif target == row.get('id'):
+                v.error(f"{where}: activity cannot be its own {key[:-3]}")
+            elif activities[target].get('workflow_id') != row.get('workflow_id'):
+                v.error(f"{where}: {key[:-3]} must be in the same workflow")
+        if row.get('predecessor_id') is not None and row.get('predecessor_id') == row.get('successor_id'):
+            v.error(f"{where}: predecessor and successor cannot be the same activity")
+
+    names = set()
+    for i, row in enumerate(artifacts.values()):
+        where = f"artifacts[{i}]"
+        v.text(where, row, 'name', Artifact)
+        v.text(where, row, 'description', Artifact, required=False)
+        v.choice(where, row, 'type', Artifact)
+        if row.get('produced_by_id') not in activities:
+            v.error(f"{where}: unknown produced_by_id {row.get('produced_by_id')!r}")
+        if row.get('name') in names:
+            v.error(f"{where}: duplicate artifact name '{row.get('name')}'")
+        names.add(row.get('name'))
+
+    pairs = set()
+    for i, row in enumerate(inputs):
+        where = f"artifact_inputs[{i}]"
+        artifact, activity = row.get('artifact_id'), row.get('activity_id')
+        if artifact not in artifacts:
+            v.error(f"{where}: unknown artifact_id {artifact!r}")
+        elif activity not in activities:
+            v.error(f"{where}: unknown activity_id {activity!r}")
+        elif artifacts[artifact].get('produced_by_id') == activity:
+            v.error(f"{where}: artifact cannot be an input to the activity that produces it")
+        if (artifact, activity) in pairs:
+            v.error(f"{where}: duplicate input")
+        pairs.add((artifact, activity))
+
+    numbers = set()
+    for i, row in enumerate(versions):
+        where = f"versions[{i}]"
+        v.integer(where, row, 'version_number')
+        if not isinstance(row.get('snapshot'), dict):
+            v.error(f"{where}: snapshot must be an object")
+        if row.get('version_number') in numbers:
+            v.error(f"{where}: duplicate version_number")
+        numbers.add(row.get('version_number'))
+
+    if v.errors:
+        raise PlaybookImportError(v.errors)
+    return {'workflows': workflows, 'activities': activities, 'artifacts': artifacts,
+            'artifact_inputs': inputs, 'versions': versions}
+
+
+def _available_name(author, name):
+    """
+    Find the first free "Name (n)" for an author.
+
+    :param author: User instance
+    :param name: imported playbook name. Example: "FDD"
+    :returns: unused name as str. Example: "FDD (2)"
+    """
+    taken = set(Playbook.objects.filter(author=author, name__startswith=name).values_list('name', flat=True))
+    n = 2
+    while True:
+        suffix = f" ({n})"
+        candidate = name[:Playbook._meta.get_field('name').max_length - len(suffix)] + suffix
+        if candidate not in taken:
+            return candidate
+        n += 1
+
+
+class PlaybookImportService:
+    """Service class for importing playbook exports."""
+
+    @staticmethod
+    def load(uploaded):
+        """
+        Parse an uploaded JSON export, .mpa package or single-playbook .mpb library.
+
+        :param uploaded: binary file object. Example: request.FILES['file']
+        :returns: ImportSource
+        :raises PlaybookImportError: If the file is neither valid JSON nor a valid package or library
+        """
+        head = uploaded.read(len(LIBRARY_MAGIC))
+        uploaded.seek(0)
+        if head == LIBRARY_MAGIC:
+            # Stops at a second playbook's header instead of decoding it
+            try:
+                documents = list(iter_documents(uploaded, max_playbooks=1))
+            except LibraryLimitError:
+                raise PlaybookImportError([
+                    "The library holds more than one playbook; import it with manage.py import_playbooks"
+                ])
+            except LibraryCodecError as e:
+                raise PlaybookImportError([str(e)])
+            if not documents:
+                raise PlaybookImportError(["The library holds no playbooks"])
+            return ImportSource(documents[0])
+
+        if head.startswith(_ZIP_MAGIC):
+            document = {section: [] for section in RECORD_KINDS}
+            sections = {kind: section for section, kind in RECORD_KINDS.items()}
+            try:
+                package = PlaybookPackage(uploaded)
+                package.verify()
+                # Checksums are written by the uploader, so records are still checked as read
+                for record in package.iter_records():
+                    kind = record.pop('record', None)
+                    if kind == 'playbook':
+                        document.update(record)
+                    elif kind in sections:
+                        document[sections[kind]].append(record)
+            except PackageError as e:
+                raise PlaybookImportError([str(e)])
+            return ImportSource(document, package)
+
+        try:
+            return ImportSource(json.load(uploaded))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise PlaybookImportError([f"File is not valid JSON: {e}"])
+
+    @staticmethod
+    def iter_library(stream):
+        """
+        Parse the playbooks of an .mpb library one at a time.
+
+        The stream is read front to back, so it need not be seekable.
+
+        :param stream: readable binary file object. Example: sys.stdin.buffer
+        :returns: generator of ImportSource
+        :raises PlaybookImportError: If the stream is not a valid library
+        """
+        try:
+            for document in iter_documents(stream):
+                yield ImportSource(document)
+        except LibraryCodecError as e:
+            raise PlaybookImportError([str(e)])
+
+    @staticmethod
+    def stash(uploaded):
+        """
+        Keep an upload on disk until the user resolves a name conflict.
+
+        :param uploaded: binary file object. Example: request.FILES['file']
+        :returns: token as str. Example: "3f2a9c..."
+        """
+        os.makedirs(get_stash_dir(), exist_ok=True)
+        token = uuid.uuid4().hex
+        uploaded.seek(0)
+        with open(os.path.join(get_stash_dir(), token), 'wb') as handle:
+            for chunk in iter(lambda: uploaded.read(1024 * 1024), b''):
+                handle.write(chunk)
+        return token
+
+    @staticmethod
+    def open_stash(token):
+        """
+        Open a stashed upload.
+
+        :param token: token from stash(). Example: "3f2a9c..."
+        :returns: binary file object
+        :raises PlaybookImportError: If the upload is gone
+        """
+        if not token or not token.isalnum():
+            raise PlaybookImportError(["The uploaded file has expired, please upload it again"])
+        try:
+            return open(os.path.join(get_stash_dir(), token), 'rb')
+        except OSError:
+            raise PlaybookImportError(["The uploaded file has expired, please upload it again"])
+
+    @staticmethod
+    def discard_stash(token):
+        """
+        Delete a stashed upload if it still exists.
+
+        :param token: token from stash(). Example: "3f2a9c..."
+        :returns: None
+        """
+        if token and token.isalnum():
+            try:
+                os.unlink(os.path.join(get_stash_dir(), token))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def validate(source):
+        """
+        Validate an import document without writing anything.
+
+        :param source: ImportSource from load()
+        :returns: dict of record counts. Example: {"workflows": 3, "activities": 40, ...}
+        :raises PlaybookImportError: If the document is invalid
+        """
+        resolved = _validate(source.document)
+        return {section: len(rows) for section, rows in resolved.items()}
+
+    @staticmethod
+    def find_conflict(source, author):
+        """
+        Get the author's live playbook that has the imported name, if any.
+
+        :param source: ImportSource from load()
+        :param author: User instance
+        :returns: Playbook or None
+        """
+        return Playbook.objects.filter(author=author, name=source.document.get('name')).first()
+
+    @staticmethod
+    def import_playbook(source, author, conflict=None):
+        """
+        Import a playbook for an author with bulk inserts.
+
+        :param source: ImportSource from load()
+        :param author: User instance who will own the playbook
+        :param conflict: one of CONFLICT_MODES or None to raise on a name clash
+        :returns: created Playbook, or None when the import was cancelled
+        :raises PlaybookImportError: If the document is invalid
+        :raises ImportConflict: If the name is taken and conflict is None
+        """
+        document = source.document
+        resolved = _validate(document)
+        name = document['name']
+
+        existing = PlaybookImportService.find_conflict(source, author)
+        if existing is not None:
+            if conflict is None:
+                raise ImportConflict(existing)
+            if conflict == CONFLICT_CANCEL:
+                logger.info(f"Import of '{name}' for user {author.pk} cancelled on name conflict")
+                return None
+
+        # Template blobs are stored before the transaction; unreferenced ones are garbage collected
+        templates = PlaybookImportService._store_templates(source, resolved['artifacts'])
+
+        with transaction.atomic(), suspend_version_signals():
+            if existing is not None and conflict == CONFLICT_REPLACE:
+                PlaybookPurgeService.mark_deleted(existing.pk)
+            elif existing is not None:
+                name = _available_name(author, name)
+
+            playbook = Playbook(
+                name=name,
+                description=document['description'],
+                category=document['category'],
+                tags=document.get('tags', []),
+                visibility=document['visibility'],
+                status=document['status'],
+                version=Decimal(str(document['version'])),
+                source='owned',
+                author=author,
+            )
+            if playbook.is_draft:
+                # One bump for the whole import instead of one per row
+                playbook.increment_version()
+            playbook.save()
+
+            counts = PlaybookImportService._bulk_insert(playbook, author, resolved, templates)
+            TemplateBlobService.add_references(templates.values())
+
+        DashboardService.invalidate(author.pk)
+        logger.info(
+            f"Imported playbook {playbook.pk} '{playbook.name}' for user {author.pk} "
+            f"(conflict={conflict}, {counts})"
+        )
+        return playbook
+
+    @staticmethod
+    def _store_templates(source, artifacts):
+        """
+        Resolve artifact template files to stored content-addressed names.
+
+        Package blobs are written to template storage; JSON imports keep
+        a template only if its blob already exists on this server. Either
+        way a template that is not available is skipped with a warning.
+
+        :param source: ImportSource
+        :param artifacts: dict of artifact id -> row
+        :returns: dict of artifact id -> stored name. Example: {4: "cas/e3b0c442.../spec.md"}
+        """
+        stored, by_digest = {}, {}
+        for artifact_id, row in artifacts.items():
+            name = row.get('template_file') or ''
+            digest, filename = parse_cas_name(name)
+            filename = filename or name.rsplit('/', 1)[-1]
+            if source.package is not None and row.get('template_digest'):
+                digest = row['template_digest']
+                if digest not in by_digest:
+                    try:
+                        with source.package.open_blob(digest) as blob:
+                            by_digest[digest] = template_storage().save(filename or digest, File(blob, name=filename))
+                    except PackageError:
+                        by_digest[digest] = None
+                if by_digest[digest]:
+                    stored[artifact_id] = by_digest[digest]
+                else:
+                    source.warnings.append(f"Template for artifact '{row['name']}' is not in the package and was skipped")
+            elif digest and TemplateBlob.objects.filter(digest=digest).exists():
+                stored[artifact_id] = name
+            elif name:
+                source.warnings.append(f"Template for artifact '{row['name']}' is not available and was skipped")
+        return stored
+
+    @staticmethod
+    def _bulk_insert(playbook, author, resolved, templates):
+        """
+        Insert all child rows of an imported playbook, one bulk_create per table.
+
+        :param playbook: saved Playbook
+        :param author: importing User
+        :param resolved: validated sections from _validate()
+        :param templates: dict of artifact id -> stored template name
+        :returns: dict of inserted row counts. Example: {"workflows": 3, "activities": 40, ...}
+        """
+        workflows = {}
+        for key, row in resolved['workflows'].items():
+            workflow = Workflow(
+                playbook=playbook, name=row['name'], description=row.get('description') or '',
+                abbreviation=row.get('abbreviation') or '', order=row['order'],
+            )
+            # bulk_create skips Workflow.save(), which fills the abbreviation
+            workflow.abbreviation = workflow.abbreviation or workflow.generate_abbreviation()
+            workflows[key] = workflow
+        Workflow.objects.bulk_create(workflows.values())
+
+        activities = {
+            key: Activity(
+                workflow=workflows[row['workflow_id']], name=row['name'], guidance=row.get('guidance') or '',
+                order=row['order'], phase=row.get('phase') or None,
+            )
+            for key, row in resolved['activities'].items()
+        }
+        Activity.objects.bulk_create(activities.values())
+
+        # Dependencies point at rows of the same table, so they are set once every id exists
+        linked = []
+        for key, row in resolved['activities'].items():
+            if row.get('predecessor_id') is None and row.get('successor_id') is None:
+                continue
+            activity = activities[key]
+            activity.predecessor = activities.get(row.get('predecessor_id'))
+            activity.successor = activities.get(row.get('successor_id'))
+            linked.append(activity)
+        Activity.objects.bulk_update(linked, ['predecessor', 'successor'])
+
+        artifacts = {
+            key: Artifact(
+                playbook=playbook, produced_by=activities[row['produced_by_id']], name=row['name'],
+                description=row.get('description') or '', type=row['type'],
+                is_required=bool(row.get('is_required')), template_file=templates.get(key) or None,
+            )
+            for key, row in resolved['artifacts'].items()
+        }
+        Artifact.objects.bulk_create(artifacts.values())
+
+        inputs = ArtifactInput.objects.bulk_create([
+            ArtifactInput(
+                artifact=artifacts[row['artifact_id']], activity=activities[row['activity_id']],
+                is_required=bool(row.get('is_required')),
+            )
+            for row in resolved['artifact_inputs']
+        ])
+
+        # Rows written without signals are added to the change feed here
+        ChangeFeedService.record_rows(playbook, {
+            'workflow': [workflow.pk for workflow in workflows.values()],
+            'activity': [activity.pk for activity in activities.values()],
+            'artifact': [artifact.pk for artifact in artifacts.values()],
+            'artifact_input': [artifact_input.pk for artifact_input in inputs],
+        })
+
+        versions, previous, chain_length = [], None, 0
+        for row in sorted(resolved['versions'], key=lambda row: row['version_number']):
+            fields = encode_version(row['snapshot'], previous, chain_length, get_max_chain())
+            versions.append(PlaybookVersion(
+                playbook=playbook, version_number=row['version_number'],
+                change_summary=row.get('change_summary') or '', created_by=author, **fields,
+            ))
+            previous, chain_length = row['snapshot'], fields['chain_length']
+        PlaybookVersion.objects.bulk_create(versions)
+
+        return {
+            'workflows': len(workflows), 'activities': len(activities), 'artifacts': len(artifacts),
+            'artifact_inputs': len(resolved['artifact_inputs']), 'versions': len(versions),
+        }
@@ -0,0 +1,388 @@
+"""
+Playbook Package Service - .mpa playbook packages.
+
+An .mpa file is a zip archive:
+
+    playbook.jsonl      one JSON record per line: the playbook header first,
+                        then workflows, activities, artifacts, artifact
+                        inputs and versions ({"record": "activity", "id": 9, ...})
+    blobs/<digest>      artifact template files, stored once per SHA-256
+    manifest.json       format, playbook summary, record counts and the
+                        size and SHA-256 of every other entry
+
+The archive is written straight into the response stream: zipfile uses
+data descriptors on unseekable output, so no temporary file is needed.
+Reading goes through the zip central directory, so a preview only
+inflates manifest.json and validation checks entries one at a time.
+
+Bulk exports (iter_bulk_export) are zip archives of one JSON export per
+playbook plus a manifest.json listing them with their checksums. Library
+exports (iter_library) carry the same exports in the compact .mpb stream
+format of methodology.utils.library_codec, which can also be read back
+from an unseekable stream.
+
+Usage:
+    return streaming_response(request, PlaybookPackageService.iter_mpa(playbook))
+    return streaming_response(request, PlaybookPackageService.iter_bulk_export(playbooks))
+    return streaming_response(request, PlaybookPackageService.iter_library(playbooks))
+    with PlaybookPackage(uploaded_file) as package:
+        package.verify()
+"""
+
+import hashlib
+import io
+import json
+import logging
+import zipfile
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from methodology.services.playbook_export_service import (
+    PlaybookExportService, EXPORT_FORMAT_VERSION, WRITE_BUFFER_SIZE, get_chunk_size,
+)
+from methodology.storage import parse_cas_name, template_storage
+from methodology.utils.library_codec import encode_library
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_FORMAT = 'mimir.mpa'
+BULK_FORMAT = 'mimir.bulk'
+MANIFEST_NAME = 'manifest.json'
+RECORDS_NAME = 'playbook.jsonl'
+BLOB_PREFIX = 'blobs/'
+
+# Record kind written for each export section
+RECORD_KINDS = {
+    'workflows': 'workflow',
+    'activities': 'activity',
+    'artifacts': 'artifact',
+    'artifact_inputs': 'artifact_input',
+    'versions': 'version',
+}
+
+_COPY_CHUNK = 1024 * 1024
+
+
+class PackageError(Exception):
+    """Raised when an .mpa package is malformed or fails verification."""
+
+
+class _StreamSink(io.RawIOBase):
+    """Unseekable file object that collects zip output until it is drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._parts = []
+        self.pending = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self.pending += len(data)
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts, self.pending = [], 0
+        return data
+
+
+def _template_digest(name):
+    """
+    Get the SHA-256 of a stored template file.
+
+    Content-addressed names carry the digest; legacy files are hashed.
+    Either way the file is opened, so a record never names a blob the
+    package will not contain.
+
+    :param name: stored template name. Example: "cas/e3b0c442.../spec.md"
+    :return: hex digest as str, or None if the file is missing. Example: "e3b0c442..."
+    """
+    digest, _ = parse_cas_name(name)
+    try:
+        with template_storage().open(name, 'rb') as handle:
+            if digest:
+                return digest
+            sha256 = hashlib.sha256()
+            for chunk in iter(lambda: handle.read(_COPY_CHUNK), b''):
+                sha256.update(chunk)
+            return sha256.hexdigest()
+    except OSError:
+        logger.warning(f"Template file {name} is missing, not packaged")
+        return None
+
+
+class PlaybookPackageService:
+    """Service class for writing .mpa playbook packages."""
+
+    @staticmethod
+    def iter_records(playbook, chunk_size=None):
+        """
+        Yield the playbook graph as typed records.
+
+        Artifact records get a ``template_digest`` naming their blob entry.
+
+        :param playbook: Playbook instance
+        :param chunk_size: rows per fetch or None for EXPORT_CHUNK_SIZE. Example: 500
+        :returns: generator of (record dict, template stored name or None)
+        """
+        yield {'record': 'playbook', **PlaybookExportService.get_header(playbook)}, None
+        digests = {}
+        for section, rows in PlaybookExportService.iter_sections(playbook, chunk_size):
+            for row in rows:
+                template = None
+                if section == 'artifacts' and row['template_file']:
+                    template = row['template_file']
+                    if template not in digests:
+                        digests[template] = _template_digest(template)
+                    row['template_digest'] = digests[template]
+                yield {'record': RECORD_KINDS[section], **row}, template
+
+    @staticmethod
+    def iter_mpa(playbook, chunk_size=None):
+        """
+        Stream an .mpa package of a playbook.
+
+        :param playbook: Playbook instance
+        :param chunk_size: rows per fetch or None for EXPORT_CHUNK_SIZE. Example: 500
+        :returns: generator of bytes chunks that concatenate to a zip archive
+        """
+        sink = _StreamSink()
+        entries, counts, templates = {}, {}, {}
+
+        with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            sha256, size = hashlib.sha256(), 0
+            with archive.open(RECORDS_NAME, 'w', force_zip64=True) as entry:
+                for record, template in PlaybookPackageService.iter_records(playbook, chunk_size):
+                    line = (json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n').encode()
+                    entry.write(line)
+                    sha256.update(line)
+                    size += len(line)
+                    counts[record['record']] = counts.get(record['record'], 0) + 1
+                    if template and record['template_digest']:
+                        templates.setdefault(record['template_digest'], template)
+                    if sink.pending >= WRITE_BUFFER_SIZE:
+                        yield sink.drain()
+            entries[RECORDS_NAME] = {'size': size, 'sha256': sha256.hexdigest()}
+
+            for digest, name in templates.items():
+                try:
+                    handle = template_storage().open(name, 'rb')
+                except OSError:
+                    logger.warning(f"Template blob {digest[:12]} for {name} is missing, not packaged")
+                    continue
+                sha256, size = hashlib.sha256(), 0
+                with handle, archive.open(BLOB_PREFIX + digest, 'w', force_zip64=True) as entry:
+                    for chunk in iter(lambda: handle.read(_COPY_CHUNK), b''):
+                        entry.write(chunk)
+                        sha256.update(chunk)
+                        size += len(chunk)
+                        if sink.pending >= WRITE_BUFFER_SIZE:
+                            yield sink.drain()
+                entries[BLOB_PREFIX + digest] = {'size': size, 'sha256': sha256.hexdigest()}
+
+            manifest = {
+                'format': PACKAGE_FORMAT,
+                'format_version': EXPORT_FORMAT_VERSION,
+                'created_at': timezone.now(),
+                'playbook': {
+                    'name': playbook.name,
+                    'description': playbook.description,
+                    'category': playbook.category,
+                    'version': playbook.version,
+                },
+                'counts': counts,
+                'entries': entries,
+            }
+            archive.writestr(MANIFEST_NAME, json.dumps(manifest, cls=DjangoJSONEncoder, indent=2))
+        yield sink.drain()
+
+        logger.info(f"Packaged playbook {playbook.pk} as .mpa ({counts}, {len(templates)} template blobs)")
+
+    @staticmethod
+    def iter_bulk_export(playbooks, chunk_size=None, progress=None):
+        """
+        Stream a zip of JSON exports of many playbooks.
+
+        All playbooks are read with one query per table; entries are
+        written in primary key order.
+
+        :param playbooks: iterable of Playbook instances
+        :param chunk_size: rows per fetch or None for EXPORT_CHUNK_SIZE. Example: 500
+        :param progress: callable(done, total, playbook, size) called after each playbook, or None
+        :returns: generator of bytes chunks that concatenate to a zip archive
+        """
+        playbooks = list(playbooks)
+        sink = _StreamSink()
+        entries = {}
+
+        with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            exports = PlaybookExportService.iter_playbook_sections(playbooks, chunk_size or get_chunk_size())
+            for done, (playbook, sections) in enumerate(exports, start=1):
+                name = PlaybookExportService.export_filename(playbook)
+                if name in entries:
+                    name = f"{playbook.pk}-{name}"
+                sha256, size = hashlib.sha256(), 0
+                with archive.open(name, 'w', force_zip64=True) as entry:
+                    for piece in PlaybookExportService.iter_json_document(playbook, sections):
+                        data = piece.encode()
+                        entry.write(data)
+                        sha256.update(data)
+                        size += len(data)
+                        if sink.pending >= WRITE_BUFFER_SIZE:
+                            yield sink.drain()
+                entries[name] = {'size': size, 'sha256': sha256.hexdigest(), 'playbook': playbook.name}
+                if progress is not None:
+                    progress(done, len(playbooks), playbook, size)
+
+            manifest = {
+                'format': BULK_FORMAT,
+                'format_version': EXPORT_FORMAT_VERSION,
+                'created_at': timezone.now(),
+                'entries': entries,
+            }
+            archive.writestr(MANIFEST_NAME, json.dumps(manifest, cls=DjangoJSONEncoder, indent=2))
+        yield sink.drain()
+
+        logger.info(f"Bulk exported {len(playbooks)} playbooks")
+
+    @staticmethod
+    def iter_library(playbooks, chunk_size=None, progress=None):
+        """
+        Stream deep exports of many playbooks as an .mpb library.
+
+        All playbooks are read with one query per table and written in
+        primary key order, with their version history.
+
+        :param playbooks: iterable of Playbook instances
+        :param chunk_size: rows per fetch or None for EXPORT_CHUNK_SIZE. Example: 500
+        :param progress: callable(done, total, playbook, size) called after each playbook, or None
+        :returns: generator of bytes chunks that concatenate to an .mpb stream
+        """
+        playbooks = list(playbooks)
+        written = 0
+
+        def exports():
+            started = 0
+            sections_by_playbook = PlaybookExportService.iter_playbook_sections(playbooks, chunk_size)
+            for done, (playbook, sections) in enumerate(sections_by_playbook, start=1):
+                yield PlaybookExportService.get_header(playbook), sections
+                # Resumed once every frame of this playbook has been written
+                if progress is not None:
+                    progress(done, len(playbooks), playbook, written - started)
+                started = written
+
+        buffer, buffered = [], 0
+        for frame in encode_library(exports(), info={'created_at': timezone.now()}):
+            buffer.append(frame)
+            buffered += len(frame)
+            written += len(frame)
+            if buffered >= WRITE_BUFFER_SIZE:
+                yield b''.join(buffer)
+                buffer, buffered = [], 0
+        yield b''.join(buffer)
+
+        logger.info(f"Exported {len(playbooks)} playbooks as an .mpb library ({written} bytes)")
+
+
+class PlaybookPackage:
+    """
+    Random-access reader for an .mpa package.
+
+    Usage:
+        with PlaybookPackage(path_or_file) as package:
+            package.manifest['playbook']['name']
+            package.verify()
+            for record in package.iter_records(): ...
+    """
+
+    def __init__(self, source):
+        """
+        Open a package and read its manifest.
+
+        :param source: path or seekable binary file object
+        :raises PackageError: If the file is not a zip archive or has no valid manifest
+        """
+        try:
+            self._archive = zipfile.ZipFile(source)
+            self.manifest = json.loads(self._archive.read(MANIFEST_NAME))
+        except (zipfile.BadZipFile, zlib.error, KeyError, OSError, ValueError) as e:
+            raise PackageError(f"Not a valid .mpa package: {e}")
+        if not isinstance(self.manifest, dict) or not isinstance(self.manifest.get('entries', {}), dict):
+            raise PackageError("Not a valid .mpa package: manifest is not a JSON object with entries")
+        if self.manifest.get('format') != PACKAGE_FORMAT:
+            raise PackageError(f"Unsupported package format: {self.manifest.get('format')!r}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying zip archive."""
+        self._archive.close()
+
+    def iter_records(self):
+        """
+        Yield the records of playbook.jsonl one line at a time.
+
+        :returns: generator of record dicts. Example: {"record": "workflow", "id": 3, ...}
+        :raises PackageError: If the records are missing, cannot be inflated or a line is not a JSON object
+        """
+        try:
+            with self._archive.open(RECORDS_NAME) as entry:
+                for number, line in enumerate(io.TextIOWrapper(entry, encoding='utf-8'), start=1):
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise PackageError(f"Package record on line {number} is not a JSON object")
+                    yield record
+        except KeyError:
+            raise PackageError(f"Package has no {RECORDS_NAME}")
+        except (zipfile.BadZipFile, zlib.error, OSError, ValueError) as e:
+            raise PackageError(f"Package records are corrupt: {e}")
+
+    def open_blob(self, digest):
+        """
+        Open a template blob stored in the package.
+
+        :param digest: hex SHA-256 as str. Example: "e3b0c442..."
+        :returns: readable binary file object
+        :raises PackageError: If the package has no such blob
+        """
+        try:
+            return self._archive.open(BLOB_PREFIX + digest)
+        except KeyError:
+            raise PackageError(f"Package has no template blob {digest[:12]}")
+
+    def verify(self):
+        """
+        Check every manifest entry's size and SHA-256 against the archive.
+
+        :returns: None
+        :raises PackageError: If an entry is missing, unlisted or corrupt
+        """
+        entries = self.manifest.get('entries', {})
+        unlisted = set(self._archive.namelist()) - set(entries) - {MANIFEST_NAME}
+        if unlisted:
+            raise PackageError(f"Package contains unlisted entries: {sorted(unlisted)}")
+
+        for name, expected in entries.items():
+            if not isinstance(expected, dict) or not {'size', 'sha256'} <= set(expected):
+                raise PackageError(f"Manifest entry for {name} has no size and checksum")
+            sha256, size = hashlib.sha256(), 0
+            try:
+                with self._archive.open(name) as entry:
+                    for chunk in iter(lambda: entry.read(_COPY_CHUNK), b''):
+                        sha256.update(chunk)
+                        size += len(chunk)
+            except KeyError:
+                raise PackageError(f"Package entry {name} is missing")
+            except (zipfile.BadZipFile, zlib.error, OSError, ValueError) as e:
+                raise PackageError(f"Package entry {name} is corrupt: {e}")
+            if size != expected['size'] or sha256.hexdigest() != expected['sha256']:
+                raise PackageError(f"Checksum mismatch for package entry {name}")
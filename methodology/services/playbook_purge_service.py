@@ -0,0 +1,236 @@
+"""
+Playbook Purge Service - Fast-path playbook deletion.
+
+Deleting a playbook only marks it deleted (one UPDATE) so the request
+returns immediately. Its workflows, activities, artifacts, inputs,
+versions and tag index rows are then removed in the background with chunked, set-based
+DELETE statements instead of Django's Python-side cascade collector,
+which loads every row and fires signals per object.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from methodology.models import (
+    Playbook, PlaybookVersion, PlaybookTag, Workflow, Activity, Artifact, ArtifactInput, ChangeLogEntry, SyncState,
+)
+from methodology.services.change_feed_service import ChangeFeedService
+from methodology.services.dashboard_service import DashboardService
+from methodology.signals import suspend_version_signals
+
+logger = logging.getLogger(__name__)
+
+
+def get_chunk_size():
+    """
+    Get number of rows deleted per statement during a purge.
+
+    :return: chunk size as int. Example: 500
+    """
+    return getattr(settings, 'PLAYBOOK_PURGE_CHUNK_SIZE', 500)
+
+
+def _delete_in_chunks(model, queryset, chunk_size, before_delete=None):
+    """
+    Delete rows matched by queryset in chunks, one short transaction each.
+
+    :param model: model class whose table is purged. Example: Activity
+    :param queryset: queryset selecting rows to delete. Example: Activity.objects.filter(workflow__playbook_id=7)
+    :param chunk_size: rows per DELETE as int. Example: 500
+    :param before_delete: optional callable receiving each chunk's id list
+    :return: number of rows deleted as int. Example: 1200
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk_column = connection.ops.quote_name(model._meta.pk.column)
+    ids_query = queryset.order_by().values_list('pk', flat=True)
+    deleted = 0
+
+    while True:
+        with transaction.atomic():
+            ids = list(ids_query[:chunk_size])
+            if not ids:
+                break
+            if before_delete:
+                before_delete(ids)
+            placeholders = ', '.join(['%s'] * len(ids))
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {table} WHERE {pk_column} IN ({placeholders})", ids)
+            deleted += len(ids)
+
+    return deleted
+
+
+def _release_template_references(artifact_ids):
+    """
+    Release template blob references held by artifacts about to be purged.
+
+    :param artifact_ids: list of Artifact ids. Example: [3, 4, 5]
+    :return: None
+    """
+    from methodology.services.template_blob_service import TemplateBlobService
+
+    names = Artifact.objects.filter(pk__in=artifact_ids).exclude(
+        template_file=''
+    ).exclude(template_file__isnull=True).values_list('template_file', flat=True)
+    TemplateBlobService.release_references(list(names))
+
+
+class PlaybookPurgeService:
+    """Service class for marking playbooks deleted and purging their rows."""
+
+    @staticmethod
+    def mark_deleted(playbook_id):
+        """
+        Hide a playbook immediately and schedule the purge after commit.
+
+        :param playbook_id: Playbook ID as int. Example: 42
+        :return: None
+        :raises Playbook.DoesNotExist: If playbook is missing or already deleted
+
+        Example:
+            >>> PlaybookPurgeService.mark_deleted(42)
+        """
+        playbook = Playbook.objects.filter(pk=playbook_id).only('pk', 'author_id').first()
+        updated = Playbook.objects.filter(pk=playbook_id).update(deleted_at=timezone.now())
+        if not updated:
+            raise Playbook.DoesNotExist(f"Playbook {playbook_id} does not exist")
+        # The update skips signals; one playbook delete covers all its rows in the change feed
+        ChangeFeedService.record_rows(playbook, {'playbook': [playbook_id]}, op=ChangeLogEntry.OP_DELETE)
+        DashboardService.invalidate(playbook.author_id)
+
+        logger.info(f"Playbook {playbook_id} marked deleted, purge scheduled")
+        transaction.on_commit(lambda: PlaybookPurgeService.schedule_purge(playbook_id))
+
+    @staticmethod
+    def schedule_purge(playbook_id):
+        """
+        Purge a deleted playbook in a background thread (or inline if disabled).
+
+        Controlled by the PLAYBOOK_PURGE_ASYNC setting. Purges interrupted
+        by a restart are finished by ``manage.py purge_deleted_playbooks``.
+
+        :param playbook_id: Playbook ID as int. Example: 42
+        :return: None
+        """
+        if not getattr(settings, 'PLAYBOOK_PURGE_ASYNC', True):
+            PlaybookPurgeService.purge_playbook(playbook_id)
+            return
+
+        thread = threading.Thread(
+            target=PlaybookPurgeService._purge_in_background,
+            args=(playbook_id,),
+            name=f"purge-playbook-{playbook_id}",
+            daemon=True,
+        )
+        thread.start()
+
+    @staticmethod
+    def _purge_in_background(playbook_id):
+        """
+        Thread entry point; logs failures and closes the thread's connection.
+
+        :param playbook_id: Playbook ID as int. Example: 42
+        :return: None
+        """
+        try:
+            PlaybookPurgeService.purge_playbook(playbook_id)
+        except Exception as e:
+            logger.error(f"Background purge of playbook {playbook_id} failed: {e}", exc_info=True)
+        finally:
+            connection.close()
+
+    @staticmethod
+    def purge_playbook(playbook_id, chunk_size=None):
+        """
+        Remove a deleted playbook and all rows beneath it.
+
+        Children are deleted leaf-first so each chunk commits with
+        consistent foreign keys; dependency links from other playbooks
+        into this one are cleared rather than deleted.
+
+        :param playbook_id: Playbook ID as int. Example: 42
+        :param chunk_size: rows per DELETE or None for PLAYBOOK_PURGE_CHUNK_SIZE. Example: 500
+        :return: dict of deleted row counts. Example: {"artifact_inputs": 30, "artifacts": 12,
+            "activities": 50, "workflows": 5, "versions": 9, "tags": 3, "sync_states": 1,
+            "playbooks": 1}
+        :raises ValueError: If the playbook is not marked deleted
+
+        Example:
+            >>> PlaybookPurgeService.purge_playbook(42)
+        """
+        chunk_size = chunk_size or get_chunk_size()
+        playbook = Playbook.all_objects.filter(pk=playbook_id).first()
+        if playbook is None:
+            logger.info(f"Playbook {playbook_id} already purged")
+            return {}
+        if not playbook.is_deleted:
+            raise ValueError(f"Playbook {playbook_id} is not marked deleted")
+
+        logger.info(f"Purging playbook {playbook_id} '{playbook.name}' in chunks of {chunk_size}")
+        activities = Activity.objects.filter(workflow__playbook_id=playbook_id)
+        counts = {}
+
+        with suspend_version_signals():
+            counts['artifact_inputs'] = _delete_in_chunks(
+                ArtifactInput,
+                ArtifactInput.objects.filter(artifact__playbook_id=playbook_id),
+                chunk_size,
+            ) + _delete_in_chunks(
+                ArtifactInput,
+                ArtifactInput.objects.filter(activity__workflow__playbook_id=playbook_id),
+                chunk_size,
+            )
+
+            # Dependency links may point into this playbook from anywhere
+            Activity.objects.filter(predecessor__workflow__playbook_id=playbook_id).update(predecessor=None)
+            Activity.objects.filter(successor__workflow__playbook_id=playbook_id).update(successor=None)
+
+            counts['artifacts'] = _delete_in_chunks(
+                Artifact,
+                Artifact.objects.filter(playbook_id=playbook_id),
+                chunk_size,
+                before_delete=_release_template_references,
+            ) + _delete_in_chunks(
+                Artifact,
+                Artifact.objects.filter(produced_by__workflow__playbook_id=playbook_id),
+                chunk_size,
+                before_delete=_release_template_references,
+            )
+            counts['activities'] = _delete_in_chunks(Activity, activities, chunk_size)
+            counts['workflows'] = _delete_in_chunks(
+                Workflow, Workflow.objects.filter(playbook_id=playbook_id), chunk_size
+            )
+            counts['versions'] = _delete_in_chunks(
+                PlaybookVersion, PlaybookVersion.objects.filter(playbook_id=playbook_id), chunk_size
+            )
+            counts['tags'] = _delete_in_chunks(
+                PlaybookTag, PlaybookTag.objects.filter(playbook_id=playbook_id), chunk_size
+            )
+            counts['sync_states'] = _delete_in_chunks(
+                SyncState, SyncState.objects.filter(playbook_id=playbook_id), chunk_size
+            )
+            counts['playbooks'] = _delete_in_chunks(
+                Playbook, Playbook.all_objects.filter(pk=playbook_id), chunk_size
+            )
+
+        logger.info(f"Purged playbook {playbook_id}: {counts}")
+        return counts
+
+    @staticmethod
+    def purge_pending(chunk_size=None):
+        """
+        Purge every playbook still marked deleted.
+
+        :param chunk_size: rows per DELETE or None for PLAYBOOK_PURGE_CHUNK_SIZE. Example: 500
+        :return: list of purged playbook ids. Example: [42, 57]
+        """
+        pending = list(
+            Playbook.all_objects.filter(deleted_at__isnull=False).order_by('deleted_at').values_list('pk', flat=True)
+        )
+        for playbook_id in pending:
+            PlaybookPurgeService.purge_playbook(playbook_id, chunk_size=chunk_size)
+        return pending
@@ -84,22 +84,28 @@ class PlaybookService:
         return Playbook.objects.get(pk=playbook_id)
     
     @staticmethod
-    def list_playbooks(author, status=None):
+    def list_playbooks(author, status=None, tag=None):
         """
-        List playbooks for author, optionally filtered by status.
+        List playbooks for author, optionally filtered by status and tag.
         
         :param author: User instance
         :param status: Optional status filter (draft/released/active/disabled)
+        :param tag: Optional tag filter, case-insensitive (answered from the tag index)
         :returns: QuerySet of Playbook instances
         
         Example:
             >>> draft_playbooks = PlaybookService.list_playbooks(user, status='draft')
+            >>> agile = PlaybookService.list_playbooks(user, tag='agile')
         """
-        logger.info(f"Listing playbooks for author {author.id}, status_filter={status}")
+        from methodology.services.playbook_tag_service import PlaybookTagService
+        
+        logger.info(f"Listing playbooks for author {author.id}, status_filter={status}, tag_filter={tag}")
         
         queryset = Playbook.objects.filter(author=author)
         if status:
             queryset = queryset.filter(status=status)
+        if tag:
+            queryset = PlaybookTagService.filter_by_tag(queryset, tag)
         
         playbooks = list(queryset)
         logger.info(f"Found {len(playbooks)} playbooks")
@@ -146,18 +152,22 @@ class PlaybookService:
     @transaction.atomic
     def delete_playbook(playbook_id):
         """
-        Delete playbook (cascades to workflows and activities).
+        Delete playbook (workflows, activities and artifacts are purged in the background).
+        
+        The playbook disappears immediately; its rows are removed after the
+        transaction commits by PlaybookPurgeService using chunked deletes.
         
         :param playbook_id: Playbook ID
+        :raises Playbook.DoesNotExist: If playbook not found
         
         Example:
             >>> PlaybookService.delete_playbook(1)
         """
+        from methodology.services.playbook_purge_service import PlaybookPurgeService
+        
         logger.info(f"Deleting playbook {playbook_id}")
-        playbook = Playbook.objects.get(pk=playbook_id)
-        playbook_name = playbook.name
-        playbook.delete()
-        logger.info(f"Playbook '{playbook_name}' (id={playbook_id}) deleted")
+        PlaybookPurgeService.mark_deleted(playbook_id)
+        logger.info(f"Playbook id={playbook_id} deleted, purge scheduled")
     
     @staticmethod
     @transaction.atomic
@@ -165,6 +175,10 @@ class PlaybookService:
         """
         Duplicate playbook (deep copy with workflows and activities).
         
+        Copies workflows, activities, artifacts, artifact inputs and
+        dependency links with one bulk query per table (see
+        PlaybookCopyService), so large playbooks copy in constant queries.
+        
         :param playbook_id: Original playbook ID
         :param new_name: Name for duplicate
         :param author: User instance (owner of duplicate)
@@ -178,6 +192,10 @@ class PlaybookService:
             ...     author=user
             ... )
         """
+        from methodology.services.dashboard_service import DashboardService
+        from methodology.services.playbook_copy_service import PlaybookCopyService
+        from methodology.signals import suspend_version_signals
+        
         logger.info(f"Duplicating playbook {playbook_id} as '{new_name}'")
         
         original = Playbook.objects.get(pk=playbook_id)
@@ -187,19 +205,24 @@ class PlaybookService:
             logger.warning(f"Duplicate failed: name '{new_name}' already exists")
             raise ValidationError(f"Playbook '{new_name}' already exists")
         
-        # Create duplicate (workflows/activities handled by UI views currently)
-        duplicate = Playbook.objects.create(
-            name=new_name,
-            description=original.description,
-            category=original.category,
-            author=author,
-            status='draft',  # Always start as draft
-            version=Decimal('0.1'),  # Reset version
-            visibility=original.visibility,
-            source='owned'
-        )
-        
-        logger.info(f"Playbook duplicated as {duplicate.pk}")
+        with suspend_version_signals():
+            duplicate = Playbook.objects.create(
+                name=new_name,
+                description=original.description,
+                category=original.category,
+                tags=list(original.tags or []),
+                author=author,
+                status='draft',  # Always start as draft
+                version=Decimal('0.1'),  # Reset version
+                visibility='private',  # Duplicates are always private
+                source='owned'
+            )
+            counts = PlaybookCopyService.copy_workflows(original.workflows.all(), duplicate)
+        
+        # Bulk inserts bypass the signals that keep the dashboard snapshot current
+        transaction.on_commit(lambda: DashboardService.invalidate(author.pk))
+        
+        logger.info(f"Playbook duplicated as {duplicate.pk} ({counts})")
         return duplicate
     
     @staticmethod
@@ -0,0 +1,100 @@
+"""
+Playbook Tag Service - Maintains and queries the normalized tag index.
+
+Used by the playbook list view (tag filter and facets) and MCP
+list_playbooks(tag=...).
+"""
+
+import logging
+
+from django.db.models import Count
+
+from methodology.models import Playbook, PlaybookTag
+from methodology.models.playbook_tag import normalize_tag
+
+logger = logging.getLogger(__name__)
+
+
+class PlaybookTagService:
+    """Service class for the PlaybookTag index."""
+
+    @staticmethod
+    def sync_tags(playbook):
+        """
+        Bring a playbook's index rows in line with its tags list.
+
+        :param playbook: Playbook instance
+        :returns: tuple of (added, removed) tag sets. Example: ({"agile"}, {"legacy"})
+
+        Example:
+            >>> PlaybookTagService.sync_tags(playbook)
+        """
+        desired = {normalize_tag(tag) for tag in (playbook.tags or []) if normalize_tag(tag)}
+        existing = set(PlaybookTag.objects.filter(playbook=playbook).values_list('name', flat=True))
+
+        added = desired - existing
+        removed = existing - desired
+        if removed:
+            PlaybookTag.objects.filter(playbook=playbook, name__in=removed).delete()
+        if added:
+            PlaybookTag.objects.bulk_create(
+                [PlaybookTag(playbook=playbook, name=name) for name in sorted(added)],
+                ignore_conflicts=True,
+            )
+        if added or removed:
+            logger.info(f"Playbook {playbook.pk} tag index updated: +{sorted(added)} -{sorted(removed)}")
+        return added, removed
+
+    @staticmethod
+    def rebuild_index():
+        """
+        Rebuild the whole tag index from Playbook.tags.
+
+        Needed after writes that bypass signals (queryset.update, raw SQL).
+
+        :returns: number of index rows as int. Example: 42
+        """
+        PlaybookTag.objects.all().delete()
+        rows = []
+        for playbook_id, tags in Playbook.all_objects.values_list('pk', 'tags'):
+            names = {normalize_tag(tag) for tag in (tags or []) if normalize_tag(tag)}
+            rows.extend(PlaybookTag(playbook_id=playbook_id, name=name) for name in names)
+        PlaybookTag.objects.bulk_create(rows, batch_size=500)
+        logger.info(f"Rebuilt playbook tag index with {len(rows)} rows")
+        return len(rows)
+
+    @staticmethod
+    def filter_by_tag(queryset, tag):
+        """
+        Restrict a Playbook queryset to playbooks carrying a tag.
+
+        :param queryset: Playbook QuerySet. Example: Playbook.objects.filter(author=user)
+        :param tag: tag to match (case-insensitive) as str. Example: "Agile"
+        :returns: filtered QuerySet
+
+        Example:
+            >>> PlaybookTagService.filter_by_tag(Playbook.objects.all(), 'agile')
+        """
+        return queryset.filter(tag_index__name=normalize_tag(tag))
+
+    @staticmethod
+    def tag_counts(author, status=None):
+        """
+        Count live playbooks per tag for facet display.
+
+        :param author: User instance
+        :param status: optional playbook status filter. Example: "draft"
+        :returns: list of dicts ordered by count then name. Example: [{"name": "agile", "count": 3}]
+
+        Example:
+            >>> PlaybookTagService.tag_counts(user)
+        """
+        queryset = PlaybookTag.objects.filter(
+            playbook__author=author,
+            playbook__deleted_at__isnull=True,
+        )
+        if status:
+            queryset = queryset.filter(playbook__status=status)
+        return list(
+            queryset.values('name').annotate(count=Count('playbook')).order_by('-count', 'name')
+        )
@@ -0,0 +1,222 @@
+"""
+PlaybookVersion Service - Business logic for version snapshot storage.
+
+Snapshots are stored as a compressed keyframe followed by a chain of
+compressed JSON Patch deltas. Chain length is capped by the
+PLAYBOOK_VERSION_MAX_CHAIN setting so any version reconstructs by reading
+at most that many rows.
+"""
+
+import logging
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+
+from methodology.models import PlaybookVersion
+from methodology.utils.json_patch import apply_patch
+from methodology.utils.snapshot_codec import encode_version, DEFAULT_MAX_CHAIN
+
+logger = logging.getLogger(__name__)
+
+
+def get_max_chain():
+    """
+    Get configured maximum delta chain length.
+
+    :returns: Max chain length as int. Example: 16
+    """
+    return getattr(settings, 'PLAYBOOK_VERSION_MAX_CHAIN', DEFAULT_MAX_CHAIN)
+
+
+class PlaybookVersionService:
+    """Service class for playbook version snapshot storage."""
+
+    @staticmethod
+    @transaction.atomic
+    def record_version(playbook, snapshot, change_summary='', created_by=None, version_number=None):
+        """
+        Store a new version snapshot for a playbook.
+
+        :param playbook: Playbook instance
+        :param snapshot: Snapshot data as dict. Example: {"name": "React Dev", "status": "draft"}
+        :param change_summary: Summary as str. Example: "Initial version"
+        :param created_by: User instance or None
+        :param version_number: Explicit version number or None for next. Example: 1
+        :returns: Created PlaybookVersion instance
+        """
+        previous = (
+            PlaybookVersion.objects.filter(playbook=playbook)
+            .order_by('-version_number')
+            .first()
+        )
+
+        previous_snapshot = None
+        previous_chain_length = 0
+        if previous is not None:
+            previous_snapshot = PlaybookVersionService.reconstruct(previous)
+            previous_chain_length = previous.chain_length
+
+        if version_number is None:
+            version_number = (previous.version_number if previous else 0) + 1
+
+        fields = encode_version(snapshot, previous_snapshot, previous_chain_length, get_max_chain())
+        version = PlaybookVersion.objects.create(
+            playbook=playbook,
+            version_number=version_number,
+            change_summary=change_summary,
+            created_by=created_by,
+            **fields
+        )
+
+        logger.info(
+            f"Recorded version {version_number} for playbook {playbook.pk} as {version.storage} "
+            f"({version.raw_size} bytes raw, {version.stored_size} bytes stored, chain={version.chain_length})"
+        )
+        return version
+
+    @staticmethod
+    def get_snapshot(playbook_id, version_number):
+        """
+        Reconstruct the full snapshot of a playbook version.
+
+        :param playbook_id: Playbook ID. Example: 1
+        :param version_number: Version number. Example: 7
+        :returns: Snapshot dict. Example: {"name": "React Dev", "status": "draft"}
+        :raises PlaybookVersion.DoesNotExist: If version not found
+        """
+        version = PlaybookVersion.objects.get(playbook_id=playbook_id, version_number=version_number)
+        return PlaybookVersionService.reconstruct(version)
+
+    @staticmethod
+    def reconstruct(version):
+        """
+        Rebuild a snapshot by applying deltas on top of the nearest keyframe.
+
+        Reads at most chain_length + 1 rows in a single query.
+
+        :param version: PlaybookVersion instance
+        :returns: Snapshot dict. Example: {"name": "React Dev", "status": "draft"}
+        :raises ValueError: If the delta chain is broken
+        """
+        if version.is_keyframe:
+            return version.decode_payload()
+
+        chain = list(
+            PlaybookVersion.objects.filter(
+                playbook_id=version.playbook_id,
+                version_number__lte=version.version_number,
+            ).order_by('-version_number')[:version.chain_length + 1]
+        )
+        chain.reverse()
+
+        if not chain or not chain[0].is_keyframe:
+            logger.error(
+                f"Broken delta chain for playbook {version.playbook_id} v{version.version_number}"
+            )
+            raise ValueError(
+                f"Cannot reconstruct version {version.version_number}: keyframe missing"
+            )
+
+        snapshot = chain[0].decode_payload()
+        for link in chain[1:]:
+            snapshot = apply_patch(snapshot, link.decode_payload())
+        return snapshot
+
+    @staticmethod
+    def compact_versions(playbook_id=None, max_chain=None):
+        """
+        Re-encode stored versions as keyframes plus capped delta chains.
+
+        Used to convert legacy full snapshots and to re-chain rows after
+        changing PLAYBOOK_VERSION_MAX_CHAIN.
+
+        :param playbook_id: Limit to one playbook or None for all. Example: 1
+        :param max_chain: Chain cap or None for setting. Example: 16
+        :returns: Number of rows rewritten as int. Example: 120
+        """
+        max_chain = max_chain or get_max_chain()
+        playbooks = PlaybookVersion.objects.order_by().values_list('playbook_id', flat=True).distinct()
+        if playbook_id is not None:
+            playbooks = playbooks.filter(playbook_id=playbook_id)
+
+        rewritten = 0
+        for pid in list(playbooks):
+            with transaction.atomic():
+                rewritten += _compact_playbook(pid, max_chain)
+
+        logger.info(f"Compacted {rewritten} playbook versions (max_chain={max_chain})")
+        return rewritten
+
+    @staticmethod
+    def storage_report():
+        """
+        Summarize snapshot storage and bytes saved by delta compression.
+
+        :returns: Report dict. Example: {"versions": 120, "keyframes": 8, "deltas": 112,
+            "legacy": 0, "raw_bytes": 48000, "stored_bytes": 5200, "saved_bytes": 42800,
+            "max_chain_length": 15}
+        """
+        report = {
+            'versions': 0,
+            'keyframes': 0,
+            'deltas': 0,
+            'legacy': 0,
+            'raw_bytes': 0,
+            'stored_bytes': 0,
+        }
+        counters = {
+            PlaybookVersion.STORAGE_FULL: 'legacy',
+            PlaybookVersion.STORAGE_KEYFRAME: 'keyframes',
+            PlaybookVersion.STORAGE_DELTA: 'deltas',
+        }
+
+        rows = PlaybookVersion.objects.only(
+            'storage', 'payload', 'raw_size', 'snapshot_data'
+        ).iterator(chunk_size=500)
+        for version in rows:
+            report['versions'] += 1
+            report[counters[version.storage]] += 1
+            report['raw_bytes'] += version.raw_size
+            report['stored_bytes'] += version.stored_size
+
+        report['saved_bytes'] = report['raw_bytes'] - report['stored_bytes']
+        report['max_chain_length'] = (
+            PlaybookVersion.objects.aggregate(longest=Max('chain_length'))['longest'] or 0
+        )
+        return report
+
+
+def _compact_playbook(playbook_id, max_chain):
+    """
+    Re-encode all versions of one playbook in ascending order.
+
+    :param playbook_id: Playbook ID. Example: 1
+    :param max_chain: Chain cap as int. Example: 16
+    :returns: Number of rows rewritten as int. Example: 12
+    """
+    versions = list(
+        PlaybookVersion.objects.filter(playbook_id=playbook_id).order_by('version_number')
+    )
+
+    previous_snapshot = None
+    previous_chain_length = 0
+    for version in versions:
+        if version.is_keyframe:
+            snapshot = version.decode_payload()
+        else:
+            snapshot = apply_patch(previous_snapshot, version.decode_payload())
+
+        fields = encode_version(snapshot, previous_snapshot, previous_chain_length, max_chain)
+        for name, value in fields.items():
+            setattr(version, name, value)
+        version.snapshot_data = None
+
+        previous_snapshot = snapshot
+        previous_chain_length = version.chain_length
+
+    PlaybookVersion.objects.bulk_update(
+        versions,
+        ['storage', 'payload', 'chain_length', 'raw_size', 'snapshot_data'],
+        batch_size=500,
+    )
+    return len(versions)
@@ -0,0 +1,683 @@
+"""
+Sync Merge Service - Three-way merge of two copies of a playbook (SYNC-03, SYNC-04).
+
+A sync compares three versions of a playbook's entity graph: the base
+(this playbook as it was at the last sync), mine (the playbook now) and
+theirs (the peer's copy). Graphs hold the export sections as dicts of
+id -> row, with the header under id 0 of "playbook":
+
+    {"playbook": {0: {"name": "FDD", ...}},
+     "workflows": {3: {"name": "Design", ...}},
+     "activities": {9: {"workflow_id": 3, "predecessor_id": None, ...}}, ...}
+
+Base and mine share this database's ids. The peer's copy has its own
+ids, so align() maps its rows onto ours by natural key (workflow name,
+activity name in its workflow, artifact name, input edge) and gives rows
+that are new to us negative ids. A renamed row therefore shows up as
+one row deleted and another added.
+
+merge() compares rows field by field. A field changed on one side takes
+that side. A field changed differently on both sides is a MergeConflict.
+Activity guidance is merged line by line first (see utils.merge3), so it
+only conflicts when the same lines were edited. Deleting a row that the
+other side edited, or whose children it edited, is a conflict on the row.
+Predecessor/successor links are merged as a set of dependency edges, so
+both halves of a link are rewritten together. The result is checked for
+activities with two predecessors or successors and for cycles. Only rows
+that differ from the base are examined beyond an equality check, so a
+merge is linear in the size of the graphs.
+
+Conflicts are shown side by side and settled by passing resolutions
+("mine", "theirs" or {"value": ...}) to the next merge() call. apply()
+writes the merged graph in one transaction with bulk queries and, for
+drafts, a single version bump.
+
+Usage:
+    result = SyncMergeService.sync(playbook, base_document, their_document)
+    if result.conflicts:
+        result = SyncMergeService.sync(playbook, base_document, their_document,
+                                       resolutions={conflict.key: 'theirs' for conflict in result.conflicts})
+"""
+
+import logging
+from dataclasses import dataclass, field
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from methodology.models import Workflow, Activity, Artifact, ArtifactInput, TemplateBlob
+from methodology.services.change_feed_service import ChangeFeedService
+from methodology.services.merkle_service import MerkleService
+from methodology.services.playbook_export_service import PlaybookExportService
+from methodology.services.template_blob_service import TemplateBlobService
+from methodology.storage import parse_cas_name
+from methodology.utils.merge3 import merge_lines
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_KEEP_MINE = 'keep_mine'
+STRATEGY_TAKE_THEIRS = 'take_theirs'
+STRATEGY_MERGE = 'merge'
+STRATEGIES = (STRATEGY_KEEP_MINE, STRATEGY_TAKE_THEIRS, STRATEGY_MERGE)
+
+CHOICE_MINE = 'mine'
+CHOICE_THEIRS = 'theirs'
+
+HEADER_ID = 0
+
+# Sections in dependency order, with the model each is written to
+SECTIONS = ('workflows', 'activities', 'artifacts', 'artifact_inputs')
+SECTION_MODELS = {
+    'workflows': Workflow,
+    'activities': Activity,
+    'artifacts': Artifact,
+    'artifact_inputs': ArtifactInput,
+}
+SECTION_KINDS = {
+    'workflows': 'workflow',
+    'activities': 'activity',
+    'artifacts': 'artifact',
+    'artifact_inputs': 'artifact_input',
+}
+
+MERGE_FIELDS = {
+    'playbook': ('name', 'description', 'category', 'tags'),
+    'workflows': ('name', 'description', 'abbreviation', 'order'),
+    'activities': ('workflow_id', 'name', 'guidance', 'order', 'phase', 'predecessor_id', 'successor_id'),
+    'artifacts': ('produced_by_id', 'name', 'description', 'type', 'is_required', 'template_file'),
+    'artifact_inputs': ('artifact_id', 'activity_id', 'is_required'),
+}
+
+# Fields merged line by line
+TEXT_FIELDS = {('activities', 'guidance')}
+
+# Activity fields merged as dependency edges
+EDGE_FIELDS = ('predecessor_id', 'successor_id')
+
+# section -> {reference field: referenced section}
+REFERENCES = {
+    'workflows': {},
+    'activities': {'workflow_id': 'workflows', 'predecessor_id': 'activities', 'successor_id': 'activities'},
+    'artifacts': {'produced_by_id': 'activities'},
+    'artifact_inputs': {'artifact_id': 'artifacts', 'activity_id': 'activities'},
+}
+
+# section -> reference fields whose target owns the row (deleting it deletes the row)
+PARENTS = {
+    'workflows': (),
+    'activities': ('workflow_id',),
+    'artifacts': ('produced_by_id',),
+    'artifact_inputs': ('artifact_id', 'activity_id'),
+}
+
+
+class MergeError(Exception):
+    """Raised when a merge cannot be run or its result cannot be written."""
+
+
+@dataclass
+class MergeConflict:
+    """
+    One field (or whole row, when field is '') changed differently on both sides.
+
+    :param section: graph section. Example: "activities"
+    :param id: row id in this database, negative for rows new from the peer. Example: 9
+    :param field: conflicting field, or '' for an edit/delete conflict. Example: "guidance"
+    :param base: value at the last sync
+    :param mine: local value (None for a deleted row)
+    :param theirs: peer's value (None for a deleted row)
+    :param merged: proposed text with conflict markers for line-merged fields, else None
+    """
+
+    section: str
+    id: int
+    field: str
+    base: object
+    mine: object
+    theirs: object
+    merged: object = None
+
+    @property
+    def key(self):
+        """Resolution key. Example: "activities:9:guidance" """
+        return f"{self.section}:{self.id}:{self.field}"
+
+    def as_dict(self):
+        return {
+            'key': self.key, 'section': self.section, 'id': self.id, 'field': self.field,
+            'base': self.base, 'mine': self.mine, 'theirs': self.theirs, 'merged': self.merged,
+        }
+
+
+@dataclass
+class MergeResult:
+    """
+    Outcome of a merge.
+
+    :param graph: merged entity graph; conflicting values hold mine until resolved
+    :param conflicts: list of unresolved MergeConflict
+    :param changed: number of rows that differ from the base on either side
+    :param counts: rows created, updated and deleted by apply(), or None if not applied
+    :param warnings: messages about peer values apply() did not write. Example: ["Template for artifact 'Spec' ..."]
+    """
+
+    graph: dict
+    conflicts: list = field(default_factory=list)
+    changed: int = 0
+    counts: dict = None
+    warnings: list = field(default_factory=list)
+
+
+def graph_from_document(document):
+    """
+    Build an entity graph from a JSON export.
+
+    :param document: dict in the mimir.playbook export format
+    :returns: entity graph dict
+    """
+    graph = {'playbook': {HEADER_ID: {name: document.get(name) for name in MERGE_FIELDS['playbook']}}}
+    for section in SECTIONS:
+        graph[section] = {
+            row['id']: {name: row.get(name) for name in MERGE_FIELDS[section]}
+            for row in document.get(section, [])
+        }
+    return graph
+
+
+def graph_from_playbook(playbook):
+    """
+    Build the entity graph of a stored playbook (one query per section).
+
+    :param playbook: Playbook instance
+    :returns: entity graph dict
+    """
+    graph = {'playbook': {HEADER_ID: {name: getattr(playbook, name) for name in MERGE_FIELDS['playbook']}}}
+    for section, rows in PlaybookExportService.iter_sections(playbook):
+        if section not in SECTION_MODELS:
+            # Version history is not merged; its query never runs
+            break
+        graph[section] = {row['id']: {name: row[name] for name in MERGE_FIELDS[section]} for row in rows}
+    return graph
+
+
+def _natural_key(section, row):
+    """
+    Identify a row by content that both copies of a playbook share.
+
+    :param section: graph section. Example: "activities"
+    :param row: row dict with references already in this database's ids
+    :returns: hashable key. Example: (3, "Model Domain")
+    """
+    if section == 'activities':
+        return row['workflow_id'], row['name']
+    if section == 'artifact_inputs':
+        return row['artifact_id'], row['activity_id']
+    return row['name']
+
+
+def align(theirs, *references):
+    """
+    Re-key a peer's graph onto this database's ids by natural key.
+
+    :param theirs: entity graph of the peer's copy
+    :param references: entity graphs in this database's ids, earliest match wins. Example: (base, mine)
+    :returns: entity graph; rows without a match get their negated peer id
+    """
+    aligned = {'playbook': dict(theirs['playbook'])}
+    ids = {section: {} for section in SECTIONS}
+    for section in SECTIONS:
+        known = {}
+        for reference in reversed(references):
+            known.update((_natural_key(section, row), row_id) for row_id, row in reference[section].items())
+        aligned[section] = {}
+        for their_id, row in theirs[section].items():
+            row = dict(row)
+            for name, target in REFERENCES[section].items():
+                if target != section and row[name] is not None:
+                    row[name] = ids[target].get(row[name])
+            row_id = known.get(_natural_key(section, row), -their_id)
+            ids[section][their_id] = row_id
+            aligned[section][row_id] = row
+    for row in aligned['activities'].values():
+        for name in EDGE_FIELDS:
+            if row[name] is not None:
+                row[name] = ids['activities'].get(row[name])
+    return aligned
+
+
+class _Merge:
+    """State of one three-way merge run."""
+
+    def __init__(self, base, mine, theirs, resolutions):
+        self.base, self.mine, self.theirs = base, mine, theirs
+        self.resolutions = resolutions
+        self.conflicts = []
+        self.graph = {section: dict(rows) for section, rows in mine.items()}
+
+    def conflict(self, section, row_id, name, base, mine, theirs, merged=None):
+        """Apply a resolution if one was given, else record the conflict and keep mine."""
+        found = MergeConflict(section, row_id, name, base, mine, theirs, merged)
+        choice = self.resolutions.get(found.key)
+        if choice == CHOICE_MINE:
+            return mine
+        if choice == CHOICE_THEIRS:
+            return theirs
+        if isinstance(choice, dict) and 'value' in choice:
+            return choice['value']
+        self.conflicts.append(found)
+        return mine
+
+    def changed_rows(self, section):
+        """Rows of a section that differ from the base on either side: {id: (base, mine, theirs)}."""
+        base, mine, theirs = self.base[section], self.mine[section], self.theirs[section]
+        changed = {}
+        for row_id in base.keys() | mine.keys() | theirs.keys():
+            before = base.get(row_id)
+            after_mine, after_theirs = mine.get(row_id), theirs.get(row_id)
+            if after_mine != before or after_theirs != before:
+                changed[row_id] = (before, after_mine, after_theirs)
+        return changed
+
+    def ancestors(self, graph, section, row):
+        """Yield (section, id) of the rows owning a row, transitively."""
+        for name in PARENTS[section]:
+            target = REFERENCES[section][name]
+            parent_id = row[name]
+            parent = graph[target].get(parent_id)
+            yield target, parent_id
+            if parent is not None:
+                yield from self.ancestors(graph, target, parent)
+
+    def contested_deletes(self, changed):
+        """Find rows deleted on one side whose subtree the other side edited."""
+        deleted = {CHOICE_MINE: set(), CHOICE_THEIRS: set()}
+        for section, rows in changed.items():
+            for row_id, (before, after_mine, after_theirs) in rows.items():
+                if before is not None and after_mine is None and after_theirs == before:
+                    deleted[CHOICE_MINE].add((section, row_id))
+                elif before is not None and after_theirs is None and after_mine == before:
+                    deleted[CHOICE_THEIRS].add((section, row_id))
+
+        contested = set()
+        for side, graph, other in ((CHOICE_MINE, self.mine, CHOICE_THEIRS), (CHOICE_THEIRS, self.theirs, CHOICE_MINE)):
+            if not deleted[other]:
+                continue
+            for section, rows in changed.items():
+                for row_id, (before, after_mine, after_theirs) in rows.items():
+                    after = after_mine if side == CHOICE_MINE else after_theirs
+                    if after is not None and after != before:
+                        contested.update(
+                            ancestor for ancestor in self.ancestors(graph, section, after) if ancestor in deleted[other]
+                        )
+        return contested
+
+    def merge_row(self, section, row_id, before, after_mine, after_theirs, contested):
+        """Merge one changed row; returns the merged row or None if deleted."""
+        if (section, row_id) in contested:
+            return self.conflict(section, row_id, '', before, after_mine, after_theirs)
+        if after_mine == after_theirs or after_theirs == before:
+            return after_mine
+        if after_mine == before:
+            return after_theirs
+        if after_mine is None or after_theirs is None:
+            return self.conflict(section, row_id, '', before, after_mine, after_theirs)
+
+        merged = {}
+        for name in MERGE_FIELDS[section]:
+            original = (before or {}).get(name)
+            ours, others = after_mine[name], after_theirs[name]
+            if (section == 'activities' and name in EDGE_FIELDS) or ours == others or others == original:
+                merged[name] = ours
+            elif ours == original:
+                merged[name] = others
+            elif (section, name) in TEXT_FIELDS:
+                text, conflicting = merge_lines(original, ours, others)
+                merged[name] = text if not conflicting else self.conflict(
+                    section, row_id, name, original, ours, others, merged=text
+                )
+            else:
+                merged[name] = self.conflict(section, row_id, name, original, ours, others)
+        return merged
+
+    def cascade(self):
+        """Drop rows whose owning row is gone from the merged graph."""
+        for section in SECTIONS:
+            rows = self.graph[section]
+            orphans = [
+                row_id for row_id, row in rows.items()
+                if any(row[name] not in self.graph[REFERENCES[section][name]] for name in PARENTS[section])
+            ]
+            for row_id in orphans:
+                del rows[row_id]
+
+    def reconcile_edges(self):
+        """Merge predecessor/successor links as edge sets; check degree and cycles."""
+        activities = self.graph['activities']
+        edges_base, edges_mine, edges_theirs = (
+            _edges(graph['activities']) for graph in (self.base, self.mine, self.theirs)
+        )
+        edges = {
+            edge for edge in edges_mine | edges_theirs
+            if (edge not in edges_base or (edge in edges_mine and edge in edges_theirs))
+            and edge[0] in activities and edge[1] in activities
+        }
+        touched = {node for edge in edges ^ edges_mine for node in edge if node in activities}
+        for row_id, row in activities.items():
+            # Rows taken from theirs carry their links; rewrite them from the merged edges
+            if row is not self.mine['activities'].get(row_id):
+                touched.add(row_id)
+        if not touched:
+            return
+
+        incoming, outgoing = {}, {}
+        for source, target in edges:
+            if target in touched:
+                incoming.setdefault(target, []).append(source)
+            if source in touched:
+                outgoing.setdefault(source, []).append(target)
+
+        for row_id in touched:
+            row = activities[row_id] = dict(activities[row_id])
+            for name, candidates in (('predecessor_id', incoming), ('successor_id', outgoing)):
+                candidates = sorted(candidates.get(row_id, ()))
+                if len(candidates) <= 1:
+                    row[name] = candidates[0] if candidates else None
+                else:
+                    row[name] = self.conflict(
+                        'activities', row_id, name, *self.edge_values(row_id, name)
+                    )
+
+        done, walking = set(), set()
+        for start in touched:
+            node, path = start, []
+            while node is not None and node in activities and node not in done and node not in walking:
+                walking.add(node)
+                path.append(node)
+                node = activities[node]['successor_id']
+            if node in walking:
+                activities[node] = dict(activities[node])
+                activities[node]['successor_id'] = self.conflict(
+                    'activities', node, 'successor_id', *self.edge_values(node, 'successor_id')
+                )
+            walking.difference_update(path)
+            done.update(path)
+
+    def edge_values(self, row_id, name):
+        """Base, mine and theirs values of one dependency field."""
+        return tuple((graph['activities'].get(row_id) or {}).get(name) for graph in (self.base, self.mine, self.theirs))
+
+    def run(self):
+        changed = {section: self.changed_rows(section) for section in SECTIONS}
+        contested = self.contested_deletes(changed)
+
+        header = self.merge_row(
+            'playbook', HEADER_ID, self.base['playbook'][HEADER_ID], self.mine['playbook'][HEADER_ID],
+            self.theirs['playbook'][HEADER_ID], contested,
+        )
+        self.graph['playbook'] = {HEADER_ID: header}
+        for section in SECTIONS:
+            rows = self.graph[section]
+            for row_id, (before, after_mine, after_theirs) in changed[section].items():
+                merged = self.merge_row(section, row_id, before, after_mine, after_theirs, contested)
+                if merged is None:
+                    rows.pop(row_id, None)
+                else:
+                    rows[row_id] = merged
+        self.cascade()
+        self.reconcile_edges()
+        return MergeResult(
+            graph=self.graph, conflicts=self.conflicts, changed=sum(len(rows) for rows in changed.values()),
+        )
+
+
+def _edges(activities):
+    """
+    Collect the dependency edges of a set of activity rows.
+
+    :param activities: dict of id -> activity row
+    :returns: set of (predecessor id, successor id)
+    """
+    edges = set()
+    for row_id, row in activities.items():
+        if row['predecessor_id'] is not None:
+            edges.add((row['predecessor_id'], row_id))
+        if row['successor_id'] is not None:
+            edges.add((row_id, row['successor_id']))
+    return edges
+
+
+class SyncMergeService:
+    """Service class for merging a peer's copy of a playbook into ours."""
+
+    @staticmethod
+    def merge(base, mine, theirs, strategy=STRATEGY_MERGE, resolutions=None):
+        """
+        Three-way merge of entity graphs.
+
+        :param base: entity graph at the last sync, in this database's ids
+        :param mine: entity graph of the playbook now
+        :param theirs: entity graph of the peer's copy, aligned (see align())
+        :param strategy: STRATEGY_MERGE, or STRATEGY_KEEP_MINE / STRATEGY_TAKE_THEIRS to
+            take one side whole. Example: "merge"
+        :param resolutions: dict of MergeConflict.key -> "mine", "theirs" or {"value": ...}, or None
+        :returns: MergeResult
+        :raises MergeError: If the strategy is unknown
+        """
+        if strategy == STRATEGY_KEEP_MINE:
+            return MergeResult(graph=mine)
+        if strategy == STRATEGY_TAKE_THEIRS:
+            return MergeResult(graph=theirs)
+        if strategy != STRATEGY_MERGE:
+            raise MergeError(f"Unknown merge strategy {strategy!r}")
+
+        result = _Merge(base, mine, theirs, resolutions or {}).run()
+        logger.info(f"Merged {result.changed} changed rows with {len(result.conflicts)} conflicts")
+        return result
+
+    @staticmethod
+    def sync(playbook, base_document, their_document, strategy=STRATEGY_MERGE, resolutions=None):
+        """
+        Merge a peer's copy into a playbook and write it if nothing conflicts.
+
+        :param playbook: Playbook instance
+        :param base_document: JSON export of this playbook at the last sync
+        :param their_document: JSON export of the peer's copy
+        :param strategy: one of STRATEGIES. Example: "merge"
+        :param resolutions: dict of MergeConflict.key -> choice, or None
+        :returns: MergeResult; counts is set when the result was written
+        :raises MergeError: If the strategy is unknown or the result cannot be written
+        """
+        base = graph_from_document(base_document)
+        mine = graph_from_playbook(playbook)
+        theirs = align(graph_from_document(their_document), base, mine)
+
+        result = SyncMergeService.merge(base, mine, theirs, strategy, resolutions)
+        if not result.conflicts:
+            result.counts = SyncMergeService.apply(playbook, mine, result.graph, result.warnings)
+        return result
+
+    @staticmethod
+    def apply(playbook, mine, merged, warnings=None):
+        """
+        Write a merged graph over the playbook's current graph.
+
+        Rows are deleted, updated and created with one query per section
+        (plus a final pass for links to new rows) inside one transaction,
+        with version signals suspended and, for drafts, a single version bump.
+        Template files this server has no blob for are not written: an
+        updated artifact keeps its template, a new one gets none.
+
+        :param playbook: Playbook instance
+        :param mine: entity graph the merge started from (see graph_from_playbook)
+        :param merged: merged entity graph
+        :param warnings: list that messages about skipped templates are appended to, or None
+        :returns: dict of row counts. Example: {"created": 3, "updated": 1, "deleted": 0}
+        :raises MergeError: If the merged rows violate a uniqueness constraint
+        """
+        merged = _without_unknown_templates(mine, merged, warnings if warnings is not None else [])
+        try:
+            with transaction.atomic():
+                counts = _write_graph(playbook, mine, merged)
+        except IntegrityError as e:
+            raise MergeError(f"Merged playbook could not be saved: {e}")
+        logger.info(f"Applied merge to playbook {playbook.pk}: {counts}")
+        return counts
+
+
+def _without_unknown_templates(mine, merged, warnings):
+    """
+    Replace artifact template files whose blob is not stored on this server.
+
+    The peer's template names point at blobs in its own storage; a name is
+    only kept if this server has a TemplateBlob with the same digest.
+
+    :param mine: entity graph as stored
+    :param merged: entity graph to store
+    :param warnings: list that a message per replaced template is appended to
+    :returns: merged, or a copy with those template files reset to mine ('' for new artifacts)
+    """
+    changed = {
+        row_id: row for row_id, row in merged['artifacts'].items()
+        if row['template_file'] and row['template_file'] != mine['artifacts'].get(row_id, {}).get('template_file')
+    }
+    if not changed:
+        return merged
+    digests = {parse_cas_name(row['template_file'])[0] for row in changed.values()} - {None}
+    stored = set(TemplateBlob.objects.filter(digest__in=digests).values_list('digest', flat=True))
+    artifacts = dict(merged['artifacts'])
+    for row_id, row in changed.items():
+        if parse_cas_name(row['template_file'])[0] in stored:
+            continue
+        current = mine['artifacts'].get(row_id)
+        artifacts[row_id] = {**row, 'template_file': current['template_file'] if current else ''}
+        message = f"Template for artifact '{row['name']}' is not available on this server and was not synced"
+        logger.warning(message)
+        warnings.append(message)
+    return {**merged, 'artifacts': artifacts}
+
+
+def _write_graph(playbook, mine, merged):
+    """
+    Write the difference between two graphs; runs inside a transaction.
+
+    :param playbook: Playbook instance
+    :param mine: entity graph as stored
+    :param merged: entity graph to store
+    :returns: dict of row counts
+    """
+    from methodology.services.dashboard_service import DashboardService
+    from methodology.signals import suspend_version_signals
+
+    counts = {'created': 0, 'updated': 0, 'deleted': 0}
+    new_ids = {section: {} for section in SECTIONS}
+    written = {section: [] for section in SECTIONS}
+    relinked = {section: set() for section in SECTIONS}
+    templates_added, templates_released = [], []
+    now = timezone.now()
+
+    def resolve(section, name, value):
+        target = REFERENCES[section][name]
+        return new_ids[target].get(value, value) if value is not None else None
+
+    with suspend_version_signals():
+        # Children first; cascades and blob references are handled by delete signals
+        for section in reversed(SECTIONS):
+            gone = [row_id for row_id in mine[section] if row_id not in merged[section]]
+            if gone:
+                SECTION_MODELS[section].objects.filter(pk__in=gone).delete()
+                counts['deleted'] += len(gone)
+
+        for section in SECTIONS:
+            model, changed_fields, instances = SECTION_MODELS[section], set(), []
+            for row_id, row in merged[section].items():
+                current = mine[section].get(row_id)
+                if current is None or row == current:
+                    continue
+                values = dict(row)
+                for name in REFERENCES[section]:
+                    if values[name] is not None and values[name] not in mine[REFERENCES[section][name]]:
+                        # Points at a row created below; linked afterwards
+                        values[name] = current[name]
+                        relinked[section].add(row_id)
+                changed_fields.update(name for name in values if values[name] != current[name])
+                if section == 'artifacts' and row['template_file'] != current['template_file']:
+                    templates_added.append(row['template_file'])
+                    templates_released.append(current['template_file'])
+                instances.append(model(pk=row_id, updated_at=now, **values))
+            if instances:
+                fields = sorted(changed_fields) + ['updated_at']
+                if section == 'activities':
+                    for instance in instances:
+                        instance.merkle_hash = ''
+                    fields.append('merkle_hash')
+                model.objects.bulk_update(instances, fields)
+                written[section].extend(instance.pk for instance in instances)
+                counts['updated'] += len(instances)
+
+        for section in SECTIONS:
+            model, created = SECTION_MODELS[section], {}
+            for row_id, row in merged[section].items():
+                if row_id in mine[section]:
+                    continue
+                values = {
+                    name: (resolve(section, name, value) if name in REFERENCES[section] else value)
+                    for name, value in row.items()
+                }
+                if section == 'activities':
+                    values['predecessor_id'] = values['successor_id'] = None
+                    if row['predecessor_id'] is not None or row['successor_id'] is not None:
+                        relinked[section].add(row_id)
+                instance = model(**values)
+                if section == 'workflows':
+                    instance.playbook = playbook
+                    # bulk_create skips Workflow.save(), which fills the abbreviation
+                    instance.abbreviation = instance.abbreviation or instance.generate_abbreviation()
+                elif section == 'artifacts':
+                    instance.playbook = playbook
+                    instance.template_file = row['template_file'] or None
+                    templates_added.append(row['template_file'])
+                created[row_id] = instance
+            if created:
+                model.objects.bulk_create(created.values())
+                new_ids[section].update((row_id, instance.pk) for row_id, instance in created.items())
+                written[section].extend(instance.pk for instance in created.values())
+                counts['created'] += len(created)
+
+        for section, row_ids in relinked.items():
+            if not row_ids:
+                continue
+            names = list(REFERENCES[section])
+            SECTION_MODELS[section].objects.bulk_update([
+                SECTION_MODELS[section](
+                    pk=new_ids[section].get(row_id, row_id),
+                    **{name: resolve(section, name, merged[section][row_id][name]) for name in names},
+                )
+                for row_id in row_ids
+            ], names)
+
+        TemplateBlobService.add_references(name for name in templates_added if name)
+        TemplateBlobService.release_references(name for name in templates_released if name)
+        ChangeFeedService.record_rows(playbook, {
+            SECTION_KINDS[section]: row_ids for section, row_ids in written.items() if row_ids
+        })
+        # Activities naming an updated activity or input artifact hash those names
+        updated_activities = [row_id for row_id in written['activities'] if row_id in mine['activities']]
+        updated_artifacts = [row_id for row_id in written['artifacts'] if row_id in mine['artifacts']]
+        if updated_activities or updated_artifacts:
+            MerkleService.invalidate(activities=(
+                Q(predecessor_id__in=updated_activities) | Q(successor_id__in=updated_activities)
+                | Q(input_artifacts__artifact_id__in=updated_artifacts)
+            ))
+
+        header = merged['playbook'][HEADER_ID]
+        changed_header = header != mine['playbook'][HEADER_ID]
+        for name, value in header.items():
+            setattr(playbook, name, value)
+        if changed_header or any(counts.values()):
+            # One version bump for the whole merge, as for any draft edit
+            if playbook.is_draft:
+                playbook.increment_version()
+            playbook.save()
+            transaction.on_commit(lambda: DashboardService.invalidate(playbook.author_id))
+    return counts
@@ -0,0 +1,157 @@
+"""
+Template Blob Service - Reference counting and garbage collection for
+content-addressed artifact template files.
+"""
+
+import logging
+import os
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from methodology.models import Artifact, TemplateBlob
+from methodology.storage import parse_cas_name, blob_path, template_storage
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateBlobService:
+    """Service class for content-addressed template blob bookkeeping."""
+
+    @staticmethod
+    def register_blob(digest, size):
+        """
+        Ensure a TemplateBlob row exists for a stored digest.
+
+        A deduplicated upload restarts the garbage collection grace period,
+        so an orphan being reused is not deleted before its artifact is saved.
+
+        :param digest: hex SHA-256 as str. Example: "e3b0c442..."
+        :param size: blob size in bytes as int. Example: 2048
+        :returns: TemplateBlob instance
+        """
+        blob, created = TemplateBlob.objects.get_or_create(digest=digest, defaults={'size': size})
+        if created:
+            logger.info(f"Registered template blob {digest[:12]} ({size} bytes)")
+        else:
+            blob.created_at = timezone.now()
+            TemplateBlob.objects.filter(pk=blob.pk).update(created_at=blob.created_at)
+        return blob
+
+    @staticmethod
+    def add_references(names):
+        """
+        Increment reference counts for stored template names.
+
+        Legacy (non content-addressed) names are ignored.
+
+        :param names: iterable of stored names. Example: ["cas/e3b0c442.../spec.md"]
+        :returns: None
+        """
+        TemplateBlobService._adjust(names, 1)
+
+    @staticmethod
+    def release_references(names):
+        """
+        Decrement reference counts for stored template names.
+
+        :param names: iterable of stored names. Example: ["cas/e3b0c442.../spec.md"]
+        :returns: None
+        """
+        TemplateBlobService._adjust(names, -1)
+
+    @staticmethod
+    def _adjust(names, delta):
+        """
+        Apply a reference count delta per digest in one UPDATE per distinct count.
+
+        :param names: iterable of stored names. Example: ["cas/e3b0c442.../spec.md"]
+        :param delta: +1 or -1 as int. Example: 1
+        :returns: None
+        """
+        counts = {}
+        for name in names:
+            digest, _ = parse_cas_name(name)
+            if digest:
+                counts[digest] = counts.get(digest, 0) + 1
+
+        by_amount = {}
+        for digest, count in counts.items():
+            by_amount.setdefault(count, []).append(digest)
+
+        for count, digests in by_amount.items():
+            queryset = TemplateBlob.objects.filter(digest__in=digests)
+            if delta < 0:
+                queryset = queryset.filter(ref_count__gte=count)
+            queryset.update(ref_count=F('ref_count') + delta * count)
+
+    @staticmethod
+    @transaction.atomic
+    def recount():
+        """
+        Recompute every blob's reference count from Artifact rows.
+
+        :returns: Number of blobs whose count changed as int. Example: 2
+        """
+        actual = {}
+        names = (
+            Artifact.objects.filter(template_file__startswith='cas/')
+            .values_list('template_file', flat=True)
+            .iterator(chunk_size=1000)
+        )
+        for name in names:
+            digest, _ = parse_cas_name(name)
+            if digest:
+                actual[digest] = actual.get(digest, 0) + 1
+
+        changed = []
+        for blob in TemplateBlob.objects.select_for_update().iterator(chunk_size=1000):
+            count = actual.get(blob.digest, 0)
+            if blob.ref_count != count:
+                blob.ref_count = count
+                changed.append(blob)
+
+        TemplateBlob.objects.bulk_update(changed, ['ref_count'], batch_size=500)
+        logger.info(f"Recounted template blob references, {len(changed)} corrected")
+        return len(changed)
+
+    @staticmethod
+    def collect_garbage(grace=timedelta(hours=1), dry_run=False):
+        """
+        Delete unreferenced blobs older than the grace period.
+
+        The grace period protects blobs uploaded moments ago whose artifact
+        row has not been committed yet.
+
+        :param grace: minimum blob age as timedelta. Example: timedelta(hours=1)
+        :param dry_run: report without deleting as bool. Example: True
+        :returns: Result dict. Example: {"blobs": 3, "bytes": 10240}
+        """
+        TemplateBlobService.recount()
+
+        cutoff = timezone.now() - grace
+        orphans = list(TemplateBlob.objects.filter(ref_count=0, created_at__lt=cutoff))
+
+        if not dry_run:
+            storage = template_storage()
+            deleted = []
+            for blob in orphans:
+                # The row goes first: an upload that reused or re-registered the
+                # blob since it was listed keeps both the row and the file
+                count, _ = TemplateBlob.objects.filter(
+                    pk=blob.pk, ref_count=0, created_at__lt=cutoff
+                ).delete()
+                if count != 1:
+                    continue
+                path = storage.path(blob_path(blob.digest))
+                if os.path.exists(path):
+                    os.unlink(path)
+                deleted.append(blob)
+            orphans = deleted
+
+        freed = sum(blob.size for blob in orphans)
+        action = "Would delete" if dry_run else "Deleted"
+        logger.info(f"{action} {len(orphans)} orphaned template blobs ({freed} bytes)")
+        return {'blobs': len(orphans), 'bytes': freed}
@@ -4,7 +4,7 @@ import logging
 from typing import Optional, List
 from django.db import transaction, models
 from django.core.exceptions import ValidationError
-from methodology.models import Workflow, Playbook
+from methodology.models import Workflow, Playbook, Artifact
 
 logger = logging.getLogger(__name__)
 
@@ -46,9 +46,13 @@ class WorkflowService:
     
     @staticmethod
     def get_workflows_for_playbook(playbook_id):
-        """Get all workflows for playbook, ordered."""
+        """Get all workflows for playbook, ordered, with activity_count annotated."""
         logger.info(f"Retrieving workflows for playbook {playbook_id}")
-        return list(Workflow.objects.filter(playbook_id=playbook_id).order_by('order', 'created_at'))
+        return list(
+            Workflow.objects.filter(playbook_id=playbook_id)
+            .annotate(activity_count=models.Count('activities'))
+            .order_by('order', 'created_at')
+        )
     
     @staticmethod
     @transaction.atomic
@@ -83,28 +87,77 @@ class WorkflowService:
     @staticmethod
     @transaction.atomic
     def duplicate_workflow(workflow_id, new_name):
-        """Duplicate workflow (shallow copy)."""
+        """
+        Duplicate workflow (deep copy).
+        
+        Copies all activities with their predecessor/successor chain and
+        the artifacts they produce, renamed "Name (Copy)" to stay unique
+        in the playbook, together with their input edges. Rows are written
+        in bulk (see PlaybookCopyService) and the playbook version is
+        bumped once.
+        
+        :param workflow_id: Workflow ID to duplicate
+        :param new_name: Name for the duplicate
+        :returns: Duplicated Workflow instance
+        :raises ValidationError: If new name already exists in the playbook
+        """
+        from methodology.services.dashboard_service import DashboardService
+        from methodology.services.playbook_copy_service import PlaybookCopyService
+        from methodology.signals import suspend_version_signals
+        
         logger.info(f"Duplicating workflow {workflow_id} as '{new_name}'")
         
-        original = Workflow.objects.get(pk=workflow_id)
+        original = Workflow.objects.select_related('playbook').get(pk=workflow_id)
+        playbook = original.playbook
         
         # Check for duplicate name
-        if Workflow.objects.filter(playbook=original.playbook, name=new_name).exists():
+        if Workflow.objects.filter(playbook=playbook, name=new_name).exists():
             raise ValidationError(f"Workflow '{new_name}' already exists in this playbook")
         
         # Get next order
-        max_order = Workflow.objects.filter(playbook=original.playbook).aggregate(
+        max_order = Workflow.objects.filter(playbook=playbook).aggregate(
             max_order=models.Max('order')
         )['max_order']
         next_order = (max_order or 0) + 1
         
-        # Create duplicate
-        duplicate = Workflow.objects.create(
-            name=new_name,
-            description=original.description,
-            playbook=original.playbook,
-            order=next_order
-        )
+        taken = set(Artifact.objects.filter(playbook=playbook).values_list('name', flat=True))
+        artifact_names = {}
+        for name in Artifact.objects.filter(produced_by__workflow=original).values_list('name', flat=True):
+            artifact_names[name] = _copy_name(name, taken)
+            taken.add(artifact_names[name])
         
+        with suspend_version_signals():
+            PlaybookCopyService.copy_workflows(
+                Workflow.objects.filter(pk=original.pk),
+                playbook,
+                workflow_fields={original.pk: {'name': new_name, 'order': next_order, 'abbreviation': ''}},
+                artifact_names=artifact_names,
+            )
+        
+        # One version bump for the whole copy
+        if playbook.is_draft:
+            playbook.increment_version()
+            playbook.save()
+        transaction.on_commit(lambda: DashboardService.invalidate(playbook.author_id))
+        
+        duplicate = Workflow.objects.get(playbook=playbook, name=new_name)
         logger.info(f"Workflow duplicated as {duplicate.pk}")
         return duplicate
+
+
+def _copy_name(name, taken):
+    """
+    Find a free "Name (Copy)" / "Name (Copy n)" for a duplicated artifact.
+    
+    :param name: original artifact name. Example: "Spec"
+    :param taken: set of names already used in the playbook
+    :returns: unused name as str. Example: "Spec (Copy 2)"
+    """
+    max_length = Artifact._meta.get_field('name').max_length
+    n = 1
+    while True:
+        suffix = " (Copy)" if n == 1 else f" (Copy {n})"
+        candidate = name[:max_length - len(suffix)] + suffix
+        if candidate not in taken:
+            return candidate
+        n += 1
@@ -5,14 +5,55 @@ When workflows or activities are added/modified/deleted in a draft playbook,
 the playbook version is automatically incremented (0.1 → 0.2 → 0.3, etc.).
 
 Released playbooks cannot be modified directly and require PIP workflow.
+
+Artifact saves and deletes also maintain reference counts on the
+content-addressed template blobs (see methodology.storage), and
+playbook saves keep the PlaybookTag index in sync with Playbook.tags.
+Playbook, workflow and activity changes also patch the owner's cached
+dashboard snapshot (see DashboardService), and every content change is
+appended to the change feed (see ChangeFeedService). Writes also clear
+the cached Merkle hashes they make stale (see MerkleService).
+
+Bulk operations that manage versions themselves (purge, import,
+duplication) wrap their writes in ``suspend_version_signals()``.
 """
 
 import logging
-from django.db.models.signals import post_save, post_delete
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.db.models import Q
 from django.dispatch import receiver
 
 logger = logging.getLogger(__name__)
 
+_versioning_suspended = ContextVar('versioning_suspended', default=False)
+
+
+@contextmanager
+def suspend_version_signals():
+    """
+    Disable automatic playbook version bumps inside the block.
+
+    Example:
+        >>> with suspend_version_signals():
+        ...     Workflow.objects.create(playbook=playbook, name='Bulk', order=1)
+    """
+    token = _versioning_suspended.set(True)
+    try:
+        yield
+    finally:
+        _versioning_suspended.reset(token)
+
+
+def version_signals_suspended():
+    """
+    Check whether automatic version bumps are currently suspended.
+
+    :return: True inside suspend_version_signals(). Example: False
+    """
+    return _versioning_suspended.get()
+
 
 @receiver(post_save, sender='methodology.Workflow')
 def increment_playbook_version_on_workflow_change(sender, instance, created, **kwargs):
@@ -24,6 +65,9 @@ def increment_playbook_version_on_workflow_change(sender, instance, created, **k
     :param instance: Workflow instance that was saved
     :param created: Boolean indicating if workflow was newly created
     """
+    if version_signals_suspended():
+        return
+
     playbook = instance.playbook
     
     # Only auto-increment for draft playbooks
@@ -47,6 +91,9 @@ def increment_playbook_version_on_workflow_delete(sender, instance, **kwargs):
     
     :param instance: Workflow instance that was deleted
     """
+    if version_signals_suspended():
+        return
+
     playbook = instance.playbook
     
     # Only auto-increment for draft playbooks
@@ -70,6 +117,9 @@ def increment_playbook_version_on_activity_change(sender, instance, created, **k
     :param instance: Activity instance that was saved
     :param created: Boolean indicating if activity was newly created
     """
+    if version_signals_suspended():
+        return
+
     workflow = instance.workflow
     playbook = workflow.playbook if workflow else None
     
@@ -94,6 +144,9 @@ def increment_playbook_version_on_activity_delete(sender, instance, **kwargs):
     
     :param instance: Activity instance that was deleted
     """
+    if version_signals_suspended():
+        return
+
     workflow = instance.workflow
     playbook = workflow.playbook if workflow else None
     
@@ -106,3 +159,288 @@ def increment_playbook_version_on_activity_delete(sender, instance, **kwargs):
             f"Activity '{instance.name}' deleted from workflow '{workflow.name}' "
             f"of draft playbook '{playbook.name}' - version incremented to {playbook.version}"
         )
+
+
+@receiver(pre_save, sender='methodology.Artifact')
+def remember_previous_template_file(sender, instance, **kwargs):
+    """
+    Record the template file name stored before this save.
+
+    :param instance: Artifact instance about to be saved
+    """
+    previous = None
+    if instance.pk:
+        previous = sender.objects.filter(pk=instance.pk).values_list('template_file', flat=True).first()
+    instance._previous_template_name = previous or ''
+
+
+@receiver(post_save, sender='methodology.Artifact')
+def update_template_blob_refs_on_save(sender, instance, created, **kwargs):
+    """
+    Move the template blob reference when an artifact's file changes.
+
+    :param instance: Artifact instance that was saved
+    :param created: Boolean indicating if artifact was newly created
+    """
+    from methodology.services.template_blob_service import TemplateBlobService
+
+    previous = getattr(instance, '_previous_template_name', '')
+    current = instance.template_file.name or ''
+    if previous == current:
+        return
+
+    if current:
+        TemplateBlobService.add_references([current])
+    if previous:
+        TemplateBlobService.release_references([previous])
+    logger.info(f"Artifact {instance.pk} template reference moved from '{previous}' to '{current}'")
+
+
+@receiver(post_delete, sender='methodology.Artifact')
+def release_template_blob_ref_on_delete(sender, instance, **kwargs):
+    """
+    Release the template blob reference held by a deleted artifact.
+
+    :param instance: Artifact instance that was deleted
+    """
+    from methodology.services.template_blob_service import TemplateBlobService
+
+    if instance.template_file:
+        TemplateBlobService.release_references([instance.template_file.name])
+
+
+@receiver(post_save, sender='methodology.Playbook')
+def sync_playbook_tag_index(sender, instance, update_fields=None, **kwargs):
+    """
+    Keep the PlaybookTag index in sync with Playbook.tags.
+
+    :param instance: Playbook instance that was saved
+    :param update_fields: fields passed to save(), or None for all
+    """
+    if update_fields is not None and 'tags' not in update_fields:
+        return
+
+    from methodology.services.playbook_tag_service import PlaybookTagService
+
+    PlaybookTagService.sync_tags(instance)
+
+
+@receiver(post_save, sender='methodology.Playbook')
+def update_dashboard_on_playbook_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Patch the owner's cached dashboard snapshot with the saved playbook.
+
+    Fixture loading (raw saves) is skipped; snapshots expire on their own.
+
+    :param instance: Playbook instance that was saved
+    :param created: Boolean indicating if playbook was newly created
+    :param raw: True when saved by loaddata
+    """
+    if raw:
+        return
+
+    from methodology.services.dashboard_service import DashboardService
+
+    DashboardService.playbook_saved(instance, created)
+
+
+@receiver(post_save, sender='methodology.Workflow')
+def update_dashboard_on_workflow_save(sender, instance, raw=False, **kwargs):
+    """
+    Patch the owner's cached dashboard snapshot after a workflow change.
+
+    :param instance: Workflow instance that was saved
+    :param raw: True when saved by loaddata
+    """
+    if raw:
+        return
+
+    from methodology.services.dashboard_service import DashboardService
+
+    DashboardService.workflow_saved(instance)
+
+
+@receiver(post_save, sender='methodology.Activity')
+def update_dashboard_on_activity_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Patch the owner's cached dashboard snapshot with the saved or accessed activity.
+
+    :param instance: Activity instance that was saved
+    :param created: Boolean indicating if activity was newly created
+    :param raw: True when saved by loaddata
+    """
+    if raw:
+        return
+
+    from methodology.services.dashboard_service import DashboardService
+
+    DashboardService.activity_saved(instance, created)
+
+
+@receiver(post_delete, sender='methodology.Activity')
+def update_dashboard_on_activity_delete(sender, instance, **kwargs):
+    """
+    Remove a deleted activity from the owner's cached dashboard snapshot.
+
+    :param instance: Activity instance that was deleted
+    """
+    from methodology.services.dashboard_service import DashboardService
+
+    DashboardService.activity_deleted(instance)
+
+
+@receiver(post_save, sender='methodology.Playbook')
+@receiver(post_save, sender='methodology.Workflow')
+@receiver(post_save, sender='methodology.Activity')
+@receiver(post_save, sender='methodology.Artifact')
+@receiver(post_save, sender='methodology.ArtifactInput')
+def record_change_on_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Append an upsert (or a playbook soft delete) to the change feed.
+
+    Saves that only touch last_accessed_at are not content changes.
+
+    :param instance: saved Playbook, Workflow, Activity, Artifact or ArtifactInput
+    :param update_fields: fields passed to save(), or None for all
+    :param raw: True when saved by loaddata
+    """
+    if raw or (update_fields is not None and set(update_fields) <= {'last_accessed_at'}):
+        return
+
+    from methodology.models import ChangeLogEntry
+    from methodology.services.change_feed_service import ChangeFeedService
+
+    deleted = getattr(instance, 'deleted_at', None) is not None
+    ChangeFeedService.record(instance, ChangeLogEntry.OP_DELETE if deleted else ChangeLogEntry.OP_UPSERT)
+
+
+@receiver(post_delete, sender='methodology.Playbook')
+@receiver(post_delete, sender='methodology.Workflow')
+@receiver(post_delete, sender='methodology.Activity')
+@receiver(post_delete, sender='methodology.Artifact')
+@receiver(post_delete, sender='methodology.ArtifactInput')
+def record_change_on_delete(sender, instance, **kwargs):
+    """
+    Append a delete to the change feed.
+
+    :param instance: deleted Playbook, Workflow, Activity, Artifact or ArtifactInput
+    """
+    from methodology.models import ChangeLogEntry
+    from methodology.services.change_feed_service import ChangeFeedService
+
+    ChangeFeedService.record(instance, ChangeLogEntry.OP_DELETE)
+
+
+@receiver(pre_save, sender='methodology.Playbook')
+@receiver(pre_save, sender='methodology.Activity')
+def clear_merkle_hash_on_save(sender, instance, raw=False, **kwargs):
+    """
+    Mark a playbook's or activity's cached Merkle hash stale as it is saved.
+
+    The cleared hash is written by the save itself, so a hash read before
+    the change can never be saved back.
+
+    :param instance: Playbook or Activity instance being saved
+    :param raw: True when saved by loaddata
+    """
+    if not raw:
+        instance.merkle_hash = ''
+
+
+@receiver(post_save, sender='methodology.Playbook')
+def clear_playbook_merkle_hash(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Clear the Merkle root of a playbook saved with update_fields.
+
+    :param instance: Playbook instance that was saved
+    :param update_fields: fields passed to save(), or None for all
+    :param raw: True when saved by loaddata
+    """
+    if raw or update_fields is None or set(update_fields) <= {'last_accessed_at', 'merkle_hash'}:
+        return
+
+    from methodology.services.merkle_service import MerkleService
+
+    MerkleService.invalidate(playbooks=Q(pk=instance.pk))
+
+
+@receiver(post_save, sender='methodology.Workflow')
+@receiver(post_delete, sender='methodology.Workflow')
+def clear_merkle_hash_on_workflow_change(sender, instance, raw=False, **kwargs):
+    """
+    Clear the Merkle root of a saved or deleted workflow's playbook.
+
+    :param instance: Workflow instance
+    :param raw: True when saved by loaddata
+    """
+    if raw:
+        return
+
+    from methodology.services.merkle_service import MerkleService
+
+    MerkleService.invalidate(playbooks=Q(pk=instance.playbook_id))
+
+
+@receiver(post_save, sender='methodology.Activity')
+@receiver(pre_delete, sender='methodology.Activity')
+def clear_merkle_hash_on_activity_change(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Clear the Merkle hashes an activity save or delete makes stale.
+
+    Activities hash their predecessor's and successor's names, so the
+    activities pointing at this one are cleared too; on delete this runs
+    before SET_NULL drops those links.
+
+    :param instance: Activity instance
+    :param update_fields: fields passed to save(), or None for all
+    :param raw: True when saved by loaddata
+    """
+    if raw or (update_fields is not None and set(update_fields) <= {'last_accessed_at', 'merkle_hash'}):
+        return
+
+    from methodology.services.merkle_service import MerkleService
+
+    stale = Q(predecessor_id=instance.pk) | Q(successor_id=instance.pk)
+    if update_fields is not None:
+        stale |= Q(pk=instance.pk)
+    MerkleService.invalidate(playbooks=Q(workflows=instance.workflow_id), activities=stale)
+
+
+@receiver(post_save, sender='methodology.Artifact')
+@receiver(post_delete, sender='methodology.Artifact')
+def clear_merkle_hash_on_artifact_change(sender, instance, raw=False, **kwargs):
+    """
+    Clear the Merkle hashes of an artifact's playbook and consumers.
+
+    Consuming activities hash their inputs by artifact name.
+
+    :param instance: Artifact instance
+    :param raw: True when saved by loaddata
+    """
+    if raw:
+        return
+
+    from methodology.services.merkle_service import MerkleService
+
+    MerkleService.invalidate(
+        playbooks=Q(pk=instance.playbook_id), activities=Q(input_artifacts__artifact_id=instance.pk),
+    )
+
+
+@receiver(post_save, sender='methodology.ArtifactInput')
+@receiver(post_delete, sender='methodology.ArtifactInput')
+def clear_merkle_hash_on_input_change(sender, instance, raw=False, **kwargs):
+    """
+    Clear the Merkle hashes of the activity consuming an artifact input.
+
+    :param instance: ArtifactInput instance
+    :param raw: True when saved by loaddata
+    """
+    if raw:
+        return
+
+    from methodology.services.merkle_service import MerkleService
+
+    MerkleService.invalidate(
+        playbooks=Q(workflows__activities=instance.activity_id), activities=Q(pk=instance.activity_id),
+    )
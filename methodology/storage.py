@@ -0,0 +1,145 @@
+"""
+Content-addressed file storage for artifact templates.
+
+Uploaded files are hashed with SHA-256 while being streamed to disk and
+stored once per digest. The name saved on the model keeps the original
+filename for display, while the bytes live in a single shared blob:
+
+    name on model:  cas/<digest>/<original filename>
+    blob on disk:   MEDIA_ROOT/cas/<digest[:2]>/<digest>
+
+Names written before content addressing (e.g. 'artifacts/templates/x.md')
+are still served from their original location.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+logger = logging.getLogger(__name__)
+
+CAS_PREFIX = 'cas/'
+
+
+def parse_cas_name(name):
+    """
+    Split a content-addressed name into digest and display filename.
+
+    :param name: stored file name as str. Example: "cas/e3b0c442.../template.md"
+    :return: (digest, filename) tuple, or (None, None) for legacy names.
+        Example: ("e3b0c442...", "template.md")
+    """
+    if not name or not name.startswith(CAS_PREFIX):
+        return None, None
+    parts = name[len(CAS_PREFIX):].split('/', 1)
+    if len(parts) != 2 or len(parts[0]) != 64:
+        return None, None
+    return parts[0], parts[1]
+
+
+def blob_path(digest):
+    """
+    Get storage-relative path of the blob for a digest.
+
+    :param digest: hex SHA-256 as str. Example: "e3b0c442..."
+    :return: relative path as str. Example: "cas/e3/e3b0c442..."
+    """
+    return f"{CAS_PREFIX}{digest[:2]}/{digest}"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that deduplicates files by SHA-256 digest.
+
+    Blobs are never removed by delete(); their lifetime is managed by
+    TemplateBlob reference counts and TemplateBlobService.collect_garbage().
+    """
+
+    def get_available_name(self, name, max_length=None):
+        """
+        Keep the requested name; uniqueness comes from the digest.
+
+        :param name: requested name as str. Example: "artifacts/templates/spec.md"
+        :param max_length: max name length or None
+        :return: name unchanged as str. Example: "artifacts/templates/spec.md"
+        """
+        return name
+
+    def _save(self, name, content):
+        """
+        Stream content to a temp file while hashing, then publish it by digest.
+
+        :param name: requested name as str. Example: "artifacts/templates/spec.md"
+        :param content: Django File being uploaded
+        :return: content-addressed name as str. Example: "cas/e3b0c442.../spec.md"
+        """
+        tmp_dir = self.path(f"{CAS_PREFIX}tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        sha256 = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                if hasattr(content, 'seek') and content.seekable():
+                    content.seek(0)
+                for chunk in content.chunks():
+                    sha256.update(chunk)
+                    size += len(chunk)
+                    tmp.write(chunk)
+
+            digest = sha256.hexdigest()
+            final_path = self.path(blob_path(digest))
+            if os.path.exists(final_path):
+                os.unlink(tmp_path)
+                logger.info(f"Template blob {digest[:12]} already stored, deduplicated {size} bytes")
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(tmp_path, final_path)
+                logger.info(f"Stored new template blob {digest[:12]} ({size} bytes)")
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        from methodology.services.template_blob_service import TemplateBlobService
+        TemplateBlobService.register_blob(digest, size)
+
+        filename = os.path.basename(name) or digest
+        return f"{CAS_PREFIX}{digest}/{filename}"
+
+    def path(self, name):
+        """
+        Resolve a stored name to the absolute path of its blob.
+
+        :param name: stored name as str. Example: "cas/e3b0c442.../spec.md"
+        :return: absolute filesystem path as str. Example: "/app/data/media/cas/e3/e3b0c442..."
+        """
+        digest, _ = parse_cas_name(name)
+        if digest:
+            name = blob_path(digest)
+        return super().path(name)
+
+    def delete(self, name):
+        """
+        Delete legacy files only; shared blobs are removed by garbage collection.
+
+        :param name: stored name as str. Example: "artifacts/templates/spec.md"
+        :return: None
+        """
+        digest, _ = parse_cas_name(name)
+        if digest:
+            return
+        super().delete(name)
+
+
+def template_storage():
+    """
+    Storage callable for Artifact.template_file.
+
+    :return: ContentAddressedStorage rooted at MEDIA_ROOT
+    """
+    return ContentAddressedStorage()
@@ -0,0 +1,119 @@
+"""
+Streaming file responses with HTTP Range support.
+
+Used for artifact template downloads so large files are streamed in
+chunks and clients can resume or fetch partial content.
+"""
+
+import re
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range_header(header, size):
+    """
+    Parse a single-range 'Range' header into inclusive byte offsets.
+
+    Multi-range requests are not supported and fall back to the full body.
+
+    :param header: Range header value as str or None. Example: "bytes=0-1023"
+    :param size: total content length as int. Example: 4096
+    :return: (start, end) tuple, None for full content, or False if unsatisfiable.
+        Example: (0, 1023)
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if first == '' and last == '':
+        return None
+    if first == '':
+        # Suffix range: last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, min(end, size - 1)
+
+
+def _iter_file(file_obj, start, length):
+    """
+    Yield chunks of a file between start and start + length.
+
+    :param file_obj: open binary file object
+    :param start: byte offset as int. Example: 0
+    :param length: number of bytes as int. Example: 1024
+    :return: generator of bytes chunks
+    """
+    try:
+        file_obj.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = file_obj.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file_obj.close()
+
+
+def ranged_file_response(request, file_obj, size, filename, content_type='application/octet-stream', etag=None):
+    """
+    Build a streaming download response honouring Range and If-None-Match.
+
+    :param request: Django request object
+    :param file_obj: open binary file object (closed when streaming ends)
+    :param size: file size in bytes as int. Example: 4096
+    :param filename: download filename as str. Example: "spec_template.md"
+    :param content_type: MIME type as str. Example: "text/markdown"
+    :param etag: strong validator without quotes or None. Example: "e3b0c442..."
+    :return: StreamingHttpResponse (200/206), or HttpResponse (304/416)
+    """
+    quoted_etag = f'"{etag}"' if etag else None
+
+    if quoted_etag and request.headers.get('If-None-Match') == quoted_etag:
+        file_obj.close()
+        response = HttpResponse(status=304)
+        response['ETag'] = quoted_etag
+        return response
+
+    byte_range = parse_range_header(request.headers.get('Range'), size)
+    if_range = request.headers.get('If-Range')
+    if byte_range and if_range and if_range != quoted_etag:
+        byte_range = None
+
+    if byte_range is False:
+        file_obj.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(_iter_file(file_obj, start, length), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    else:
+        length = size
+        response = StreamingHttpResponse(_iter_file(file_obj, 0, size), content_type=content_type)
+
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    if quoted_etag:
+        response['ETag'] = quoted_etag
+    return response
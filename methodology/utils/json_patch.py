@@ -0,0 +1,134 @@
+"""
+Minimal JSON Patch (RFC 6902) utilities for version snapshot deltas.
+
+Supports the subset of operations needed to diff two JSON documents:
+- add / remove / replace on object members (recursing into nested objects)
+- lists are replaced wholesale (playbook snapshots keep lists short)
+
+Also provides compact, deterministic zlib encoding of JSON payloads.
+"""
+
+import json
+import zlib
+
+
+def _escape(token):
+    """
+    Escape a key for use as a JSON Pointer reference token.
+
+    :param token: object key as str. Example: "a/b"
+    :return: escaped token as str. Example: "a~1b"
+    """
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(token):
+    """
+    Reverse JSON Pointer escaping of a reference token.
+
+    :param token: escaped token as str. Example: "a~1b"
+    :return: original key as str. Example: "a/b"
+    """
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def make_patch(source, target, path=''):
+    """
+    Compute JSON Patch operations turning source into target.
+
+    :param source: original JSON document. Example: {"name": "A", "tags": ["x"]}
+    :param target: new JSON document. Example: {"name": "B", "tags": ["x"]}
+    :param path: JSON Pointer prefix used while recursing. Example: "/meta"
+    :return: list of patch operations. Example: [{"op": "replace", "path": "/name", "value": "B"}]
+    """
+    if source == target:
+        return []
+
+    if not (isinstance(source, dict) and isinstance(target, dict)):
+        return [{'op': 'replace', 'path': path, 'value': target}]
+
+    ops = []
+    for key in source:
+        if key not in target:
+            ops.append({'op': 'remove', 'path': f"{path}/{_escape(key)}"})
+    for key, value in target.items():
+        member_path = f"{path}/{_escape(key)}"
+        if key not in source:
+            ops.append({'op': 'add', 'path': member_path, 'value': value})
+        else:
+            ops.extend(make_patch(source[key], value, member_path))
+    return ops
+
+
+def apply_patch(document, ops):
+    """
+    Apply JSON Patch operations produced by make_patch().
+
+    The input document is not mutated; a patched copy is returned.
+
+    :param document: JSON document to patch. Example: {"name": "A"}
+    :param ops: list of patch operations. Example: [{"op": "replace", "path": "/name", "value": "B"}]
+    :return: patched document. Example: {"name": "B"}
+    :raises ValueError: If an operation is unsupported or its path does not exist.
+    """
+    result = json.loads(json.dumps(document))
+
+    for op in ops:
+        path = op['path']
+        if path == '':
+            if op['op'] == 'remove':
+                raise ValueError("Cannot remove document root")
+            result = op['value']
+            continue
+
+        tokens = [_unescape(token) for token in path.split('/')[1:]]
+        parent = result
+        for token in tokens[:-1]:
+            if not isinstance(parent, dict) or token not in parent:
+                raise ValueError(f"Patch path not found: {path}")
+            parent = parent[token]
+
+        key = tokens[-1]
+        if not isinstance(parent, dict):
+            raise ValueError(f"Patch path not found: {path}")
+
+        if op['op'] in ('add', 'replace'):
+            parent[key] = op['value']
+        elif op['op'] == 'remove':
+            if key not in parent:
+                raise ValueError(f"Patch path not found: {path}")
+            del parent[key]
+        else:
+            raise ValueError(f"Unsupported patch operation: {op['op']}")
+
+    return result
+
+
+def dumps_compact(data):
+    """
+    Serialize JSON deterministically with no insignificant whitespace.
+
+    :param data: JSON-serializable value. Example: {"b": 1, "a": 2}
+    :return: UTF-8 encoded JSON as bytes. Example: b'{"a":2,"b":1}'
+    """
+    return json.dumps(data, separators=(',', ':'), sort_keys=True, default=str).encode('utf-8')
+
+
+def compress_json(data):
+    """
+    Serialize and zlib-compress a JSON value.
+
+    :param data: JSON-serializable value. Example: [{"op": "remove", "path": "/tags"}]
+    :return: compressed payload as bytes. Example: b'x\\xda...'
+    """
+    return zlib.compress(dumps_compact(data), 9)
+
+
+def decompress_json(payload):
+    """
+    Decompress and parse a payload produced by compress_json().
+
+    :param payload: compressed payload as bytes or memoryview. Example: b'x\\xda...'
+    :return: decoded JSON value. Example: [{"op": "remove", "path": "/tags"}]
+    """
+    return json.loads(zlib.decompress(bytes(payload)).decode('utf-8'))
@@ -0,0 +1,64 @@
+"""
+Keyset (seek) pagination helpers.
+
+Pages are addressed by the sort key of the last row shown instead of an
+OFFSET, so fetching page N costs the same as page 1. Cursors are opaque
+URL-safe tokens carrying the last row's key values.
+"""
+
+import base64
+import json
+
+from django.db.models import Q
+
+
+def encode_cursor(values):
+    """
+    Encode a row's sort key values as an opaque cursor token.
+
+    :param values: sort key values in ordering order. Example: ["Planning", "FDD", 1, 2, 57]
+    :return: URL-safe token as str. Example: "WyJQbGFubmluZyIsIkZERCIsMSwyLDU3XQ"
+    """
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, length):
+    """
+    Decode a cursor token back into sort key values.
+
+    :param token: cursor from encode_cursor as str. Example: "WyJQbGFubmluZyIsIkZERCIsMSwyLDU3XQ"
+    :param length: expected number of key values as int. Example: 5
+    :return: list of key values. Example: ["Planning", "FDD", 1, 2, 57]
+    :raises ValueError: If the token is malformed or a value is not a str or int
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError(f"Invalid cursor: {token!r}")
+    # Anything else (null, bool, float, list, object) would reach the query as a lookup value
+    if not all(isinstance(value, (str, int)) and not isinstance(value, bool) for value in values):
+        raise ValueError(f"Invalid cursor: {token!r}")
+    return values
+
+
+def keyset_after(fields, values):
+    """
+    Build a filter selecting rows that sort strictly after a key.
+
+    Expands the row-value comparison (f1, f2, ...) > (v1, v2, ...) into
+    OR-ed prefix equalities, which the database can satisfy from an
+    index on the same columns. All fields sort ascending.
+
+    :param fields: ordering field names. Example: ["phase_label", "order", "pk"]
+    :param values: key values of the last row seen. Example: ["Planning", 2, 57]
+    :return: Q object. Example: Q(phase_label__gt="Planning") | Q(phase_label="Planning", order__gt=2) | ...
+    """
+    condition = Q()
+    for index, field in enumerate(fields):
+        prefix = {name: value for name, value in zip(fields[:index], values[:index])}
+        condition |= Q(**prefix, **{f"{field}__gt": values[index]})
+    return condition
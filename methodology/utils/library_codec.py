@@ -0,0 +1,237 @@
+"""
+Compact binary interchange format for playbook libraries (.mpb).
+
+An .mpb stream carries any number of deep playbook exports as a magic
+number followed by length-prefixed, zlib-compressed frames:
+
+    magic       b'\\x89MPB\\r\\n\\x1a\\n'
+    frame       4-byte big-endian length, then that many bytes of zlib data
+    block       the inflated frame: one compact JSON array
+
+    ["library", {"format": "mimir.mpb", "format_version": 1, ...}]    first block
+    ["playbook", {"format": "mimir.playbook", "name": "FDD", ...}]    starts a playbook
+    ["rows", "activities", ["id", "name", ...], [[9, 10], ["Model", "Plan"], ...]]
+                                                                      up to ROWS_PER_BLOCK rows
+    ["end", {"playbooks": 12}]                                        last block
+
+Rows are stored column by column under one list of column names per
+block: keys are not repeated per row, and alike values (ids, timestamps,
+types) sit next to each other where zlib compresses them best. Each block
+is compressed on its own, so neither side holds more than one block.
+Decoded playbooks have the same shape as the JSON export
+(PlaybookExportService), datetimes and Decimals included as their JSON
+strings. Pure functions (no ORM access) so the benchmark can run them on
+synthetic data.
+
+Usage:
+    for piece in encode_library(playbooks):     # (header, sections) pairs
+        output.write(piece)
+    for document in iter_documents(input_file):
+        ...
+"""
+
+import json
+import struct
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+LIBRARY_FORMAT = 'mimir.mpb'
+LIBRARY_FORMAT_VERSION = 1
+MAGIC = b'\x89MPB\r\n\x1a\n'
+
+# Export sections a "rows" block may fill (PlaybookExportService.iter_sections)
+SECTIONS = ('workflows', 'activities', 'artifacts', 'artifact_inputs', 'versions')
+
+# Rows encoded and compressed together; bounds memory on both ends
+ROWS_PER_BLOCK = 1000
+# zlib's default; level 1 encodes about twice as fast into a quarter more
+# bytes (see manage.py benchmark_library_codecs)
+COMPRESS_LEVEL = 6
+# Frames above these sizes are rejected rather than inflated
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+MAX_BLOCK_BYTES = 256 * 1024 * 1024
+
+_LENGTH = struct.Struct('>I')
+_ENCODER = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+class LibraryCodecError(ValueError):
+    """Raised when an .mpb stream is truncated, corrupt or of another format."""
+
+
+class LibraryLimitError(LibraryCodecError):
+    """Raised when an .mpb stream holds more playbooks than the reader accepts."""
+
+
+def _frame(block, level=COMPRESS_LEVEL):
+    """
+    Encode and compress one block as a length-prefixed frame.
+
+    :param block: JSON-serializable list. Example: ["end", {"playbooks": 1}]
+    :param level: zlib compression level, 0-9. Example: 6
+    :return: frame as bytes
+    """
+    payload = zlib.compress(_ENCODER.encode(block).encode('utf-8'), level)
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def _rows_frame(section, columns, rows, level):
+    """
+    Encode rows with the same keys as one column-major frame.
+
+    :param section: export section name. Example: "activities"
+    :param columns: tuple of row keys. Example: ("id", "name")
+    :param rows: list of row dicts with those keys
+    :param level: zlib compression level, 0-9. Example: 6
+    :return: frame as bytes
+    """
+    return _frame(['rows', section, list(columns), [[row[column] for row in rows] for column in columns]], level)
+
+
+def encode_library(playbooks, rows_per_block=ROWS_PER_BLOCK, level=COMPRESS_LEVEL, info=None):
+    """
+    Stream playbook exports as an .mpb library.
+
+    :param playbooks: iterable of (header dict, iterable of (section name, iterable of row dicts)),
+        as built from PlaybookExportService.get_header() and iter_sections()
+    :param rows_per_block: rows per compressed block. Example: 1000
+    :param level: zlib compression level, 0-9. Example: 6
+    :param info: extra fields for the library block, or None. Example: {"created_at": "2025-01-01T00:00:00Z"}
+    :return: generator of bytes pieces, one frame each after the magic number
+    """
+    yield MAGIC + _frame(['library', {'format': LIBRARY_FORMAT, 'format_version': LIBRARY_FORMAT_VERSION,
+                                      **(info or {})}], level)
+    count = 0
+    for header, sections in playbooks:
+        yield _frame(['playbook', header], level)
+        for section, rows in sections:
+            columns, batch = None, []
+            for row in rows:
+                keys = tuple(row)
+                if keys != columns:
+                    # A row with other keys starts a block of its own
+                    if batch:
+                        yield _rows_frame(section, columns, batch, level)
+                    columns, batch = keys, []
+                batch.append(row)
+                if len(batch) >= rows_per_block:
+                    yield _rows_frame(section, columns, batch, level)
+                    batch = []
+            if batch or columns is None:
+                # Empty sections are kept so decoded exports have every section
+                yield _rows_frame(section, columns or (), batch, level)
+        count += 1
+    yield _frame(['end', {'playbooks': count}], level)
+
+
+def _read(stream, size):
+    """
+    Read exactly size bytes from a binary stream.
+
+    :param stream: readable binary file object
+    :param size: byte count. Example: 4
+    :return: bytes, or b'' at a clean end of stream
+    :raises LibraryCodecError: If the stream ends part-way
+    """
+    data = stream.read(size)
+    while data and len(data) < size:
+        more = stream.read(size - len(data))
+        if not more:
+            break
+        data += more
+    if data and len(data) < size:
+        raise LibraryCodecError("Library file is truncated")
+    return data
+
+
+def iter_blocks(stream):
+    """
+    Read the blocks of an .mpb stream one frame at a time.
+
+    :param stream: readable binary file object positioned at the magic number
+    :return: generator of blocks as lists. Example: ["rows", "workflows", ["id", "name"], [[3, "Design"]]]
+    :raises LibraryCodecError: If the stream is not an .mpb library or is corrupt
+    """
+    if _read(stream, len(MAGIC)) != MAGIC:
+        raise LibraryCodecError("Not an .mpb library file")
+    while True:
+        prefix = _read(stream, _LENGTH.size)
+        if not prefix:
+            return
+        (size,) = _LENGTH.unpack(prefix)
+        if size > MAX_FRAME_BYTES:
+            raise LibraryCodecError(f"Library frame of {size} bytes exceeds the limit")
+        payload = _read(stream, size)
+        if len(payload) != size:
+            raise LibraryCodecError("Library file is truncated")
+        inflater = zlib.decompressobj()
+        try:
+            data = inflater.decompress(payload, MAX_BLOCK_BYTES)
+        except zlib.error as e:
+            raise LibraryCodecError(f"Library block is corrupt: {e}")
+        if inflater.unconsumed_tail:
+            raise LibraryCodecError("Library block exceeds the size limit")
+        try:
+            block = json.loads(data)
+        except ValueError as e:
+            raise LibraryCodecError(f"Library block is corrupt: {e}")
+        if not isinstance(block, list) or not block or not isinstance(block[-1], (dict, list)):
+            raise LibraryCodecError("Library block is not a tagged array")
+        yield block
+
+
+def iter_documents(stream, max_playbooks=None):
+    """
+    Decode an .mpb stream into playbook exports, one playbook in memory at a time.
+
+    :param stream: readable binary file object positioned at the magic number
+    :param max_playbooks: playbooks accepted, or None for any number; reading stops
+        at the header of the next one. Example: 1
+    :return: generator of export dicts. Example: {"format": "mimir.playbook", "name": "FDD", "workflows": [...], ...}
+    :raises LibraryLimitError: If the stream holds more than max_playbooks playbooks
+    :raises LibraryCodecError: If the stream is not an .mpb library, is corrupt or truncated
+    """
+    blocks = iter_blocks(stream)
+    first = next(blocks, None)
+    if first is None or first[0] != 'library' or not isinstance(first[-1], dict) \
+            or first[-1].get('format') != LIBRARY_FORMAT:
+        raise LibraryCodecError("Library file has no library header")
+    version = first[-1].get('format_version', 0)
+    if not isinstance(version, int) or isinstance(version, bool):
+        raise LibraryCodecError(f"Library format version {version!r} is not a number")
+    if version > LIBRARY_FORMAT_VERSION:
+        raise LibraryCodecError(f"Unsupported library format version {version}")
+
+    document, count = None, 0
+    for block in blocks:
+        kind = block[0]
+        if kind == 'rows' and document is not None and len(block) == 4:
+            _, section, columns, values = block
+            if section not in SECTIONS:
+                raise LibraryCodecError(f"Library block has rows of unknown section {section!r}")
+            if not isinstance(columns, list) or not all(isinstance(column, str) for column in columns) \
+                    or not isinstance(values, list) or not all(isinstance(column, list) for column in values):
+                raise LibraryCodecError(f"Library block of {section} rows is not a list of named columns")
+            if len(columns) != len(values) or len({len(column) for column in values}) > 1:
+                raise LibraryCodecError(f"Library block of {section} rows has uneven columns")
+            rows = document.setdefault(section, [])
+            if not isinstance(rows, list):
+                raise LibraryCodecError(f"Library playbook header sets {section} to a non-list")
+            rows.extend(dict(zip(columns, row)) for row in zip(*values))
+        elif kind == 'playbook' and len(block) == 2 and isinstance(block[1], dict):
+            if max_playbooks is not None and count >= max_playbooks:
+                raise LibraryLimitError(f"Library holds more than {max_playbooks} playbooks")
+            if document is not None:
+                yield document
+            document = block[1]
+            count += 1
+        elif kind == 'end' and len(block) == 2 and isinstance(block[1], dict):
+            if document is not None:
+                yield document
+            if block[1].get('playbooks') != count:
+                raise LibraryCodecError(f"Library lists {block[1].get('playbooks')} playbooks but holds {count}")
+            return
+        else:
+            raise LibraryCodecError(f"Unexpected library block {kind!r}")
+    raise LibraryCodecError("Library file is truncated")
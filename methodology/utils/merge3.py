@@ -0,0 +1,95 @@
+"""
+Line-wise three-way merge of text (diff3).
+
+Lines unchanged on both sides since the base anchor the merge; between
+anchors a hunk changed on one side only takes that side, identical
+changes are taken once, and different changes are a conflict, written
+with git-style markers.
+
+Usage:
+    text, conflicts = merge_lines(base, mine, theirs)
+"""
+
+from difflib import SequenceMatcher
+
+MARKER_MINE = '<<<<<<< mine\n'
+MARKER_SEPARATOR = '=======\n'
+MARKER_THEIRS = '>>>>>>> theirs\n'
+
+
+def _stable_regions(base, mine, theirs):
+    """
+    Find the base line ranges left unchanged by both sides.
+
+    :param base: list of base lines
+    :param mine: list of lines of one side
+    :param theirs: list of lines of the other side
+    :return: list of (base start, base end, mine start, theirs start); the
+        last entry is an empty region at the end of all three
+    """
+    matches_mine = SequenceMatcher(None, base, mine, autojunk=False).get_matching_blocks()
+    matches_theirs = SequenceMatcher(None, base, theirs, autojunk=False).get_matching_blocks()
+
+    regions = []
+    i = j = 0
+    while i < len(matches_mine) and j < len(matches_theirs):
+        base_mine, at_mine, size_mine = matches_mine[i]
+        base_theirs, at_theirs, size_theirs = matches_theirs[j]
+        start = max(base_mine, base_theirs)
+        end = min(base_mine + size_mine, base_theirs + size_theirs)
+        if start < end:
+            regions.append((start, end, at_mine + start - base_mine, at_theirs + start - base_theirs))
+        if base_mine + size_mine < base_theirs + size_theirs:
+            i += 1
+        else:
+            j += 1
+    regions.append((len(base), len(base), len(mine), len(theirs)))
+    return regions
+
+
+def merge_lines(base, mine, theirs):
+    """
+    Merge two edits of a text against their common base, line by line.
+
+    :param base: common ancestor text as str or None. Example: "Step 1\\nStep 2\\n"
+    :param mine: local text as str or None
+    :param theirs: remote text as str or None
+    :return: (merged text, number of conflicting hunks). Conflicting hunks
+        are kept with both sides between markers. Example: ("Step 1\\nStep 2b\\n", 0)
+    """
+    base_lines = (base or '').splitlines(keepends=True)
+    mine_lines = (mine or '').splitlines(keepends=True)
+    theirs_lines = (theirs or '').splitlines(keepends=True)
+
+    merged, conflicts = [], 0
+    at_base = at_mine = at_theirs = 0
+    for start, end, mine_start, theirs_start in _stable_regions(base_lines, mine_lines, theirs_lines):
+        original = base_lines[at_base:start]
+        ours = mine_lines[at_mine:mine_start]
+        others = theirs_lines[at_theirs:theirs_start]
+        if ours == others or others == original:
+            merged.extend(ours)
+        elif ours == original:
+            merged.extend(others)
+        else:
+            conflicts += 1
+            merged.append(MARKER_MINE)
+            merged.extend(_terminated(ours))
+            merged.append(MARKER_SEPARATOR)
+            merged.extend(_terminated(others))
+            merged.append(MARKER_THEIRS)
+        merged.extend(base_lines[start:end])
+        at_base, at_mine, at_theirs = end, mine_start + end - start, theirs_start + end - start
+    return ''.join(merged), conflicts
+
+
+def _terminated(lines):
+    """
+    End the last of some lines with a newline so a marker can follow.
+
+    :param lines: list of lines. Example: ["a\\n", "b"]
+    :return: list of lines. Example: ["a\\n", "b\\n"]
+    """
+    if lines and not lines[-1].endswith('\n'):
+        return lines[:-1] + [lines[-1] + '\n']
+    return lines
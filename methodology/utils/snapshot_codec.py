@@ -0,0 +1,48 @@
+"""
+Keyframe/delta encoding for PlaybookVersion snapshots.
+
+Pure functions (no ORM access) so they can be shared by the version
+service and by data migrations working with historical models.
+"""
+
+from methodology.utils.json_patch import make_patch, compress_json, dumps_compact
+
+# Default cap on deltas between keyframes; bounds reconstruction cost.
+DEFAULT_MAX_CHAIN = 16
+
+
+def encode_version(snapshot, previous_snapshot=None, previous_chain_length=0, max_chain=DEFAULT_MAX_CHAIN):
+    """
+    Encode a snapshot as a keyframe or as a delta against the previous version.
+
+    A keyframe is written when there is no previous version, when the chain
+    would exceed max_chain, or when the compressed delta is not smaller than
+    a compressed keyframe.
+
+    :param snapshot: snapshot to store as dict. Example: {"name": "React Dev", "status": "draft"}
+    :param previous_snapshot: reconstructed previous snapshot or None. Example: {"name": "React", "status": "draft"}
+    :param previous_chain_length: chain length of previous version as int. Example: 3
+    :param max_chain: maximum number of deltas after a keyframe as int. Example: 16
+    :return: field values as dict. Example: {"storage": "delta", "payload": b"x\\xda...", "chain_length": 4, "raw_size": 120}
+    """
+    raw_size = len(dumps_compact(snapshot))
+    keyframe = {
+        'storage': 'keyframe',
+        'payload': compress_json(snapshot),
+        'chain_length': 0,
+        'raw_size': raw_size,
+    }
+
+    if previous_snapshot is None or previous_chain_length + 1 > max_chain:
+        return keyframe
+
+    delta_payload = compress_json(make_patch(previous_snapshot, snapshot))
+    if len(delta_payload) >= len(keyframe['payload']):
+        return keyframe
+
+    return {
+        'storage': 'delta',
+        'payload': delta_payload,
+        'chain_length': previous_chain_length + 1,
+        'raw_size': raw_size,
+    }
@@ -1,7 +1,10 @@
 """Views for the methodology app."""
 import logging
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
+from mimir.async_render import arender
+from mimir.query_budget import query_budget
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +20,8 @@ def index(request):
 
 
 @login_required
-def dashboard(request):
+@query_budget(10)
+async def dashboard(request):
     """
     Dashboard view with activity feed and recent playbooks (FOB-DASHBOARD-1).
     
@@ -26,10 +30,14 @@ def dashboard(request):
     - Recent Activity feed (10 most recent actions)
     - Quick Actions panel
     
+    Data comes from DashboardService's cached snapshot, so a load runs
+    no aggregate queries once the snapshot exists. Async: the snapshot
+    lookup and rendering run off the event loop.
+    
     Template: dashboard.html
     Context:
-        recent_playbooks: List of recent Playbook objects
-        recent_activities: QuerySet of recent Activity objects
+        recent_playbooks: List of recent playbook dicts
+        recent_activities: List of recent activity dicts
         activity_count: Number of recent activities
         playbook_count: Number of recent playbooks
     
@@ -37,40 +45,31 @@ def dashboard(request):
     :return: Rendered HTML response with dashboard data. Example: HttpResponse(status=200, content="<div>...</div>")
     :raises: None - handles all exceptions gracefully
     """
-    logger.info(f"User {request.user.username} accessing dashboard")
+    user = await request.auser()
+    logger.info(f"User {user.username} accessing dashboard")
     
     try:
-        from methodology.services.activity_service import ActivityService
-        from methodology.services.playbook_service import PlaybookService
-        from methodology.models import Playbook, Activity
-        
-        # Get recent playbooks (last 5 updated)
-        recent_playbooks = Playbook.objects.filter(
-            author=request.user
-        ).order_by('-updated_at')[:5]
+        from methodology.services.dashboard_service import DashboardService
         
-        # Get recent activities (last 10 updated)
-        recent_activities = ActivityService.get_recent_activities(request.user, limit=10)
+        # Counts and recent lists come from the cached per-user snapshot
+        snapshot = await sync_to_async(DashboardService.get_snapshot)(user)
         
-        # Get counts
-        playbook_count = Playbook.objects.filter(author=request.user).count()
-        activity_count = Activity.objects.filter(
-            workflow__playbook__author=request.user
-        ).count()
+        logger.info(
+            f"Dashboard loaded for {user.username}: {snapshot['playbook_count']} playbooks, "
+            f"{snapshot['activity_count']} activities"
+        )
         
-        logger.info(f"Dashboard loaded for {request.user.username}: {playbook_count} playbooks, {activity_count} activities")
-        
-        return render(request, 'dashboard.html', {
-            'recent_playbooks': recent_playbooks,
-            'recent_activities': recent_activities,
-            'activity_count': activity_count,
-            'playbook_count': playbook_count,
+        return await arender(request, 'dashboard.html', {
+            'recent_playbooks': snapshot['recent_playbooks'],
+            'recent_activities': snapshot['recent_activities'],
+            'activity_count': snapshot['activity_count'],
+            'playbook_count': snapshot['playbook_count'],
         })
         
     except Exception as e:
-        logger.error(f"Error loading dashboard for {request.user.username}: {e}")
+        logger.error(f"Error loading dashboard for {user.username}: {e}")
         # Return dashboard with empty data rather than error page
-        return render(request, 'dashboard.html', {
+        return await arender(request, 'dashboard.html', {
             'recent_playbooks': [],
             'recent_activities': [],
             'activity_count': 0,
@@ -80,7 +79,7 @@ def dashboard(request):
 
 
 @login_required
-def dashboard_activities(request):
+async def dashboard_activities(request):
     """
     HTMX endpoint for refreshing activity feed.
     
@@ -95,25 +94,27 @@ def dashboard_activities(request):
     Example:
         GET /dashboard/activities/?hours=24
     """
-    logger.info(f"User {request.user.username} requested activity feed refresh")
+    user = await request.auser()
+    logger.info(f"User {user.username} requested activity feed refresh")
     
     try:
-        from methodology.services.activity_service import ActivityService
+        from methodology.services.dashboard_service import DashboardService
         
         # Get hours parameter (default to 24)
         hours = int(request.GET.get('hours', 24))
         
-        # Get recent activities
-        recent_activities = ActivityService.get_recent_activities(request.user, limit=10)
+        # Get recent activities from the cached dashboard snapshot
+        snapshot = await sync_to_async(DashboardService.get_snapshot)(user)
+        recent_activities = snapshot['recent_activities']
         
-        logger.info(f"Returned {len(recent_activities)} activities for {request.user.username}")
+        logger.info(f"Returned {len(recent_activities)} activities for {user.username}")
         
-        return render(request, 'methodology/partials/activity_feed.html', {
+        return await arender(request, 'methodology/partials/activity_feed.html', {
             'recent_activities': recent_activities,
         })
         
     except Exception as e:
-        logger.error(f"Error refreshing activity feed for {request.user.username}: {e}")
-        return render(request, 'methodology/partials/activity_feed.html', {
+        logger.error(f"Error refreshing activity feed for {user.username}: {e}")
+        return await arender(request, 'methodology/partials/activity_feed.html', {
             'recent_activities': [],
         })
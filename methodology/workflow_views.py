@@ -1,18 +1,29 @@
 """Workflow views for CRUDV operations."""
 
 import logging
-from django.shortcuts import render, redirect, get_object_or_404
+import subprocess
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.exceptions import ValidationError
+from django.utils.cache import patch_cache_control
 
+from methodology.conditional import conditional_page, workflow_detail_validator
 from methodology.models import Playbook, Workflow
+from methodology.services.activity_graph_service import ActivityGraphService
+from methodology.services.activity_service import ActivityService
 from methodology.services.workflow_service import WorkflowService
+from mimir.async_render import arender, run_in_render_pool
+from mimir.query_budget import query_budget
 
 logger = logging.getLogger(__name__)
 
 
 @login_required
+@query_budget(10)
 def workflow_global_list(request):
     """
     Global workflows overview - all workflows across all playbooks.
@@ -91,19 +102,20 @@ def workflow_create(request, playbook_pk):
 
 
 @login_required
-def workflow_detail(request, playbook_pk, pk):
+@query_budget(14)
+@conditional_page(workflow_detail_validator)
+async def workflow_detail(request, playbook_pk, pk):
     """
-    View workflow details with activities flow diagram.
+    View workflow details.
     
-    Displays workflow information and generates Graphviz SVG visualization
-    of activities in sequential flow with phase grouping if applicable.
+    The activities flow diagram is not rendered here: the page shell
+    returns immediately and loads it from workflow_graph with HTMX.
     
     Template: workflows/detail.html
     Context:
         - playbook: Playbook instance
         - workflow: Workflow instance
         - can_edit: Boolean, True if user can edit workflow
-        - activities_svg: SVG string from Graphviz or None if no activities
         - activity_count: Integer count of activities in workflow
         - has_activities: Boolean, True if activity_count > 0
     
@@ -112,47 +124,97 @@ def workflow_detail(request, playbook_pk, pk):
     :param pk: Workflow primary key
     :return: Rendered template response
     """
-    playbook = get_object_or_404(Playbook, pk=playbook_pk)
-    workflow = get_object_or_404(Workflow, pk=pk, playbook=playbook)
+    user = await request.auser()
+    playbook = await aget_object_or_404(Playbook, pk=playbook_pk)
+    workflow = await aget_object_or_404(Workflow, pk=pk, playbook=playbook)
+    activity_count = await workflow.activities.acount()
+    
+    return await arender(request, 'workflows/detail.html', {
+        'playbook': playbook,
+        'workflow': workflow,
+        'can_edit': playbook.can_edit(user),
+        'activity_count': activity_count,
+        'has_activities': activity_count > 0,
+    })
+
+
+@login_required
+@query_budget(14)
+@conditional_page(workflow_detail_validator)
+async def workflow_graph(request, playbook_pk, pk):
+    """
+    Render the activities flow diagram fragment for a workflow (HTMX).
+    
+    Graphviz runs with WORKFLOW_GRAPH_TIMEOUT; if it times out or is not
+    installed, a text outline of the activities grouped by phase is
+    returned instead. Shares the workflow_detail validator, so browsers
+    revalidate the SVG with a 304 until the workflow changes; the outline
+    is sent with Cache-Control: no-store and no validators, so the SVG is
+    tried again next time.
     
-    # Fetch activities and generate graph
-    from methodology.services.activity_graph_service import ActivityGraphService
-    from methodology.models import Activity
+    Graphviz runs on the bounded render pool, so a slow layout holds one
+    pool thread rather than a server worker.
     
-    activities = Activity.objects.filter(workflow=workflow)
-    activity_count = activities.count()
+    Template: workflows/partials/activity_graph.html
+    Context:
+        - playbook: Playbook instance
+        - workflow: Workflow instance
+        - activities_svg: SVG string or None
+        - activities_by_phase: Dict of phase -> activities (fallback only)
+        - timed_out: Boolean, True if Graphviz exceeded the timeout
+    
+    :param request: Django HTTP request
+    :param playbook_pk: Playbook primary key
+    :param pk: Workflow primary key
+    :return: Rendered partial response
+    """
+    playbook = await aget_object_or_404(Playbook, pk=playbook_pk)
+    workflow = await aget_object_or_404(Workflow, pk=pk, playbook=playbook)
+    timeout = getattr(settings, 'WORKFLOW_GRAPH_TIMEOUT', 10)
+    activities = [activity async for activity in ActivityGraphService.get_graph_activities(workflow)]
     
-    # Generate SVG graph if activities exist
     activities_svg = None
-    if activity_count > 0:
-        try:
-            graph_service = ActivityGraphService()
-            activities_svg = graph_service.generate_activities_graph(workflow, playbook)
-            logger.info(f"Generated activity graph for workflow {pk} with {activity_count} activities")
-        except Exception as e:
-            logger.error(f"Failed to generate activity graph for workflow {pk}: {str(e)}")
-            # Continue without graph - template will show error or plain list
+    timed_out = False
+    try:
+        activities_svg = await run_in_render_pool(
+            ActivityGraphService().generate_activities_graph,
+            workflow, playbook, timeout=timeout, activities=activities,
+        )
+        logger.info(f"Generated activity graph for workflow {pk}")
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        logger.warning(f"Activity graph for workflow {pk} exceeded {timeout}s, serving text outline")
+    except Exception as e:
+        logger.error(f"Failed to generate activity graph for workflow {pk}: {str(e)}")
+    
+    activities_by_phase = {}
+    if activities_svg is None:
+        activities_by_phase = await sync_to_async(ActivityService.get_activities_grouped_by_phase)(workflow)
     
-    return render(request, 'workflows/detail.html', {
+    response = await arender(request, 'workflows/partials/activity_graph.html', {
         'playbook': playbook,
         'workflow': workflow,
-        'can_edit': workflow.can_edit(request.user),
         'activities_svg': activities_svg,
-        'activity_count': activity_count,
-        'has_activities': activity_count > 0,
+        'activities_by_phase': activities_by_phase,
+        'timed_out': timed_out,
     })
+    if activities_svg is None:
+        patch_cache_control(response, no_store=True)
+    return response
 
 
 @login_required
-def workflow_list(request, playbook_pk):
+@query_budget(10)
+async def workflow_list(request, playbook_pk):
     """List workflows for playbook."""
-    playbook = get_object_or_404(Playbook, pk=playbook_pk)
-    workflows = WorkflowService.get_workflows_for_playbook(playbook_pk)
+    user = await request.auser()
+    playbook = await aget_object_or_404(Playbook, pk=playbook_pk)
+    workflows = await sync_to_async(WorkflowService.get_workflows_for_playbook)(playbook_pk)
     
-    return render(request, 'workflows/list.html', {
+    return await arender(request, 'workflows/list.html', {
         'playbook': playbook,
         'workflows': workflows,
-        'can_edit': playbook.can_edit(request.user)
+        'can_edit': playbook.can_edit(user)
     })
 
 
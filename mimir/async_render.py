@@ -0,0 +1,121 @@
+"""
+Rendering helpers for async views.
+
+Graphviz layout and Markdown conversion are CPU- or subprocess-bound and
+do not touch the database. Async views hand them to a bounded thread pool
+so the event loop keeps serving other connections, and at most
+RENDER_POOL_SIZE of them run at once per process.
+
+Functions run in the pool must not use the ORM: pool threads do not share
+the request's database connection. Template rendering (arender), which
+reads the lazy user and session, stays on Django's thread-sensitive
+executor.
+
+Streamed downloads are built by sync generators that read the database
+with ``.iterator()``. streaming_response() hands them to Django as an
+async iterator under ASGI, pulling each chunk on the thread-sensitive
+executor, so uvicorn sends chunks as they are produced instead of
+buffering the whole body.
+
+Usage:
+    html = await run_in_render_pool(render_markdown, activity.guidance)
+    return await arender(request, 'activities/detail.html', context)
+    return streaming_response(request, PlaybookExportService.iter_json(playbook))
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.shortcuts import render
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_render_executor():
+    """
+    Get the process-wide render pool, creating it on first use.
+
+    :return: ThreadPoolExecutor with RENDER_POOL_SIZE workers
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                size = getattr(settings, 'RENDER_POOL_SIZE', 4)
+                _executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='mimir-render')
+                logger.info(f"Started render pool with {size} threads")
+    return _executor
+
+
+async def run_in_render_pool(func, *args, **kwargs):
+    """
+    Run a blocking, database-free callable on the render pool.
+
+    Context variables (request ID for logging) are copied into the worker.
+
+    :param func: callable to run. Example: render_markdown
+    :param args: positional arguments for func
+    :param kwargs: keyword arguments for func
+    :return: func's return value. Example: "<h2>Steps</h2>..."
+    """
+    return await sync_to_async(func, thread_sensitive=False, executor=get_render_executor())(*args, **kwargs)
+
+
+async def arender(request, template_name, context=None, status=None):
+    """
+    Render a template from an async view.
+
+    Runs on Django's thread-sensitive executor, so template access to lazy
+    querysets, request.user, the session and messages uses the request's
+    database connection.
+
+    :param request: Django request object
+    :param template_name: template path. Example: "workflows/detail.html"
+    :param context: template context dict or None
+    :param status: HTTP status code or None. Example: 404
+    :return: HttpResponse
+    """
+    return await sync_to_async(render)(request, template_name, context, status=status)
+
+
+async def _aiterate(iterator):
+    """
+    Drive a sync iterator from the event loop, one chunk per executor hop.
+
+    :param iterator: sync iterator of str or bytes chunks
+    :return: async generator yielding the same chunks
+    """
+    done = object()
+    pull = sync_to_async(next)
+    try:
+        while (chunk := await pull(iterator, done)) is not done:
+            yield chunk
+    finally:
+        if hasattr(iterator, 'close'):
+            await sync_to_async(iterator.close)()
+
+
+def streaming_response(request, chunks, **kwargs):
+    """
+    Build a StreamingHttpResponse that streams under both WSGI and ASGI.
+
+    Under ASGI Django would otherwise collect a sync iterator into a list
+    before sending it.
+
+    :param request: Django request object
+    :param chunks: sync iterable of str or bytes chunks. Example: PlaybookExportService.iter_json(playbook)
+    :param kwargs: StreamingHttpResponse arguments. Example: content_type="application/json"
+    :return: StreamingHttpResponse
+    """
+    iterator = iter(chunks)
+    if isinstance(request, ASGIRequest):
+        return StreamingHttpResponse(_aiterate(iterator), **kwargs)
+    return StreamingHttpResponse(iterator, **kwargs)
@@ -0,0 +1,86 @@
+"""
+Cache backends for Mimir.
+
+InstrumentedLocMemCache is a size-bounded local-memory cache that counts
+lookups and periodically logs its hit ratio, so the effectiveness of
+template fragment caching is visible in app.log.
+
+Usage:
+    Configure in settings.py:
+
+    CACHES = {
+        'template_fragments': {
+            'BACKEND': 'mimir.cache.InstrumentedLocMemCache',
+            'LOCATION': 'mimir-fragments',
+            'OPTIONS': {'MAX_ENTRIES': 2000, 'LOG_EVERY': 100},
+        },
+    }
+"""
+
+import logging
+from threading import Lock
+
+from django.core.cache.backends.locmem import LocMemCache
+
+logger = logging.getLogger(__name__)
+
+# Counters are shared by every instance with the same LOCATION, like the
+# LocMemCache storage itself (one cache instance is created per thread).
+_stats = {}
+_stats_lock = Lock()
+
+
+class InstrumentedLocMemCache(LocMemCache):
+    """LocMemCache that tracks hits and misses and logs the hit ratio."""
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self._name = name
+        self._log_every = int(params.get('OPTIONS', {}).get('LOG_EVERY', 100))
+        with _stats_lock:
+            self._stats = _stats.setdefault(name, {'hits': 0, 'misses': 0})
+
+    def get(self, key, default=None, version=None):
+        """
+        Look up a key, counting the result as a hit or a miss.
+
+        :param key: cache key as str. Example: "template.cache.playbook_workflows.3f2a..."
+        :param default: value returned on a miss. Example: None
+        :param version: optional key version. Example: None
+        :return: cached value or default
+        """
+        sentinel = object()
+        value = super().get(key, sentinel, version)
+        hit = value is not sentinel
+        with _stats_lock:
+            self._stats['hits' if hit else 'misses'] += 1
+            lookups = self._stats['hits'] + self._stats['misses']
+            hits = self._stats['hits']
+        if self._log_every and lookups % self._log_every == 0:
+            logger.info(
+                f"Cache '{self._name}': {hits}/{lookups} hits ({hits / lookups:.1%}), "
+                f"{len(self._cache)} entries"
+            )
+        return value if hit else default
+
+    def stats(self):
+        """
+        Get hit/miss counters for this cache location.
+
+        :return: dict with hits, misses and ratio. Example: {"hits": 87, "misses": 13, "ratio": 0.87}
+        """
+        with _stats_lock:
+            hits, misses = self._stats['hits'], self._stats['misses']
+        lookups = hits + misses
+        return {'hits': hits, 'misses': misses, 'ratio': hits / lookups if lookups else 0.0}
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters.
+
+        :return: None
+        """
+        super().clear()
+        with _stats_lock:
+            self._stats['hits'] = 0
+            self._stats['misses'] = 0
@@ -9,7 +9,7 @@ class RequestIDFilter(logging.Filter):
     """
     Logging filter that adds request ID to log records.
     
-    This filter extracts the request ID from thread-local storage
+    This filter extracts the request ID from context-local storage
     (set by RequestIDMiddleware) and adds it to each log record.
     
     If no request ID is available (e.g., background tasks, startup),
@@ -35,7 +35,7 @@ class RequestIDFilter(logging.Filter):
         Side effects:
             Adds 'request_id' attribute to record
         """
-        # Try to get request ID from thread-local storage
+        # Try to get request ID from context-local storage
         from mimir.request_local import get_current_request
         
         request = get_current_request()
@@ -36,7 +36,7 @@ class RequestIDMiddleware(MiddlewareMixin):
         
         Side effects:
             - Sets request.request_id attribute
-            - Stores request in thread-local storage
+            - Stores request in context-local storage
             - Logs request initiation with request ID
         """
         # Check if request ID provided by upstream system (e.g., load balancer, API gateway)
@@ -49,7 +49,7 @@ class RequestIDMiddleware(MiddlewareMixin):
         # Attach to request for use throughout the request lifecycle
         request.request_id = request_id
         
-        # Store in thread-local storage for logging filter access
+        # Store in context-local storage for logging filter access
         set_current_request(request)
         
         # Log request initiation
@@ -59,7 +59,7 @@ class RequestIDMiddleware(MiddlewareMixin):
     
     def process_response(self, request, response):
         """
-        Add request ID to response headers and clean up thread-local storage.
+        Add request ID to response headers and clean up context-local storage.
         
         :param request: Django request object
         :param response: Django response object
@@ -74,14 +74,14 @@ class RequestIDMiddleware(MiddlewareMixin):
                 f"[REQUEST_END] {request.method} {request.path} - Status: {response.status_code}"
             )
         
-        # Clean up thread-local storage
+        # Clean up context-local storage
         clear_current_request()
         
         return response
     
     def process_exception(self, request, exception):
         """
-        Clean up thread-local storage on exception.
+        Clean up context-local storage on exception.
         
         :param request: Django request object
         :param exception: Exception that occurred
@@ -94,7 +94,7 @@ class RequestIDMiddleware(MiddlewareMixin):
                 exc_info=True
             )
         
-        # Clean up thread-local storage
+        # Clean up context-local storage
         clear_current_request()
         
         # Let Django handle the exception normally
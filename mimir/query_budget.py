@@ -0,0 +1,268 @@
+"""
+Query budgets and N+1 detection.
+
+Every database query issued while a QueryRecorder is active is recorded,
+including queries run inside ``sync_to_async`` by MCP tools (the recorder
+lives in a ContextVar, which asgiref copies into its worker threads).
+A report flags SQL shapes repeated more than QUERY_BUDGET_REPEAT_THRESHOLD
+times (the signature of a per-row query) and compares the total against
+the budget declared with ``@query_budget``.
+
+Views are checked by QueryBudgetMiddleware and MCP tools by the
+``query_budget`` decorator itself, when QUERY_BUDGETS_ENABLED is set
+(DEBUG and the test suite). With QUERY_BUDGETS_STRICT violations raise
+QueryBudgetExceeded instead of logging a warning, which fails the test
+that triggered them.
+
+Usage:
+    @login_required
+    @query_budget(12)
+    def workflow_list(request, playbook_pk): ...
+
+    @query_budget(6)
+    async def list_workflows(playbook_id: int) -> list: ...
+"""
+
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+_current_recorder = ContextVar('query_recorder', default=None)
+
+# Transaction bookkeeping repeats legitimately and is not a per-row query
+_IGNORED_PREFIXES = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT', 'BEGIN', 'COMMIT')
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a view or tool exceeds its query budget or repeats a query shape."""
+
+
+def sql_shape(sql):
+    """
+    Normalize SQL so queries differing only in parameters compare equal.
+
+    Django passes parameters separately, so only IN lists of varying
+    length and whitespace need collapsing.
+
+    :param sql: SQL with placeholders. Example: 'SELECT ... WHERE "id" IN (%s, %s)'
+    :return: normalized SQL as str. Example: 'SELECT ... WHERE "id" IN (...)'
+    """
+    return _WHITESPACE.sub(' ', _IN_LIST.sub('IN (...)', sql)).strip()
+
+
+def _record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper that feeds the active recorder, if any.
+    """
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        recorder.record(sql)
+    return execute(sql, params, many, context)
+
+
+def install_execute_wrapper(sender=None, connection=None, **kwargs):
+    """
+    Attach the recording wrapper to a database connection (connection_created receiver).
+
+    :param connection: DatabaseWrapper that was just connected
+    :return: None
+    """
+    if connection is not None and _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+connection_created.connect(install_execute_wrapper, dispatch_uid='mimir.query_budget')
+
+
+def budgets_enabled():
+    """
+    Check whether query budgets are being recorded.
+
+    :return: bool. Example: True under DEBUG
+    """
+    return getattr(settings, 'QUERY_BUDGETS_ENABLED', settings.DEBUG)
+
+
+class QueryRecorder:
+    """
+    Context manager that records the SQL issued while it is active.
+
+    Example:
+        >>> with QueryRecorder('workflow_list') as recorder:
+        ...     client.get(url)
+        >>> recorder.count
+        7
+    """
+
+    def __init__(self, label, budget=None):
+        """
+        :param label: name used in reports. Example: "GET /playbooks/3/workflows/"
+        :param budget: maximum number of queries or None. Example: 12
+        """
+        self.label = label
+        self.budget = budget
+        self.queries = []
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_recorder.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_recorder.reset(self._token)
+        return False
+
+    def record(self, sql):
+        """
+        Record one executed statement.
+
+        :param sql: SQL with placeholders
+        :return: None
+        """
+        self.queries.append(sql)
+
+    @property
+    def count(self):
+        """
+        Number of statements recorded, excluding transaction bookkeeping.
+
+        :return: int. Example: 7
+        """
+        return sum(1 for sql in self.queries if not sql.startswith(_IGNORED_PREFIXES))
+
+    def repeated_shapes(self, threshold=None):
+        """
+        SQL shapes executed more than threshold times.
+
+        :param threshold: repeat limit or None for QUERY_BUDGET_REPEAT_THRESHOLD. Example: 5
+        :return: list of (shape, count) tuples, most repeated first. Example: [('SELECT ... "workflow_id" = %s', 20)]
+        """
+        if threshold is None:
+            threshold = getattr(settings, 'QUERY_BUDGET_REPEAT_THRESHOLD', 5)
+        shapes = Counter(sql_shape(sql) for sql in self.queries if not sql.startswith(_IGNORED_PREFIXES))
+        return [(shape, count) for shape, count in shapes.most_common() if count > threshold]
+
+    def problems(self):
+        """
+        Describe budget overruns and repeated query shapes.
+
+        :return: list of str. Example: ["20 queries, budget 12", "repeated 20x: SELECT ..."]
+        """
+        problems = []
+        if self.budget is not None and self.count > self.budget:
+            problems.append(f"{self.count} queries, budget {self.budget}")
+        for shape, count in self.repeated_shapes():
+            problems.append(f"repeated {count}x: {shape[:200]}")
+        return problems
+
+    def check(self):
+        """
+        Report problems: raise in strict mode, otherwise log a warning.
+
+        :return: list of problems found (empty when within budget)
+        :raises QueryBudgetExceeded: If QUERY_BUDGETS_STRICT and problems were found
+        """
+        problems = self.problems()
+        if problems:
+            message = f"Query budget check failed for {self.label}: " + '; '.join(problems)
+            if getattr(settings, 'QUERY_BUDGETS_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        else:
+            logger.debug(f"{self.label}: {self.count} queries (budget {self.budget})")
+        return problems
+
+
+def query_budget(max_queries):
+    """
+    Declare the maximum number of queries a view or MCP tool may run.
+
+    Views only get the ``query_budget`` attribute; QueryBudgetMiddleware
+    enforces it per request. Coroutine functions (MCP tools) are wrapped
+    and checked on every call; async views called inside a recorded
+    request are left to the middleware.
+
+    :param max_queries: query limit as int. Example: 12
+    :return: decorator
+    """
+    def decorator(func):
+        func.query_budget = max_queries
+        if not iscoroutinefunction(func):
+            return func
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not budgets_enabled() or _current_recorder.get() is not None:
+                return await func(*args, **kwargs)
+            with QueryRecorder(f"MCP tool {func.__name__}", max_queries) as recorder:
+                result = await func(*args, **kwargs)
+            recorder.check()
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """
+    Record queries per request and check them against the view's budget.
+
+    Usage:
+        Add 'mimir.query_budget.QueryBudgetMiddleware' to MIDDLEWARE right
+        after SecurityMiddleware so session and auth queries are counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not budgets_enabled():
+            return self.get_response(request)
+
+        with QueryRecorder(f"{request.method} {request.path}") as recorder:
+            request.query_recorder = recorder
+            response = self.get_response(request)
+        recorder.check()
+        return response
+
+    async def __acall__(self, request):
+        """
+        Async variant of __call__ used under ASGI.
+        """
+        if not budgets_enabled():
+            return await self.get_response(request)
+
+        with QueryRecorder(f"{request.method} {request.path}") as recorder:
+            request.query_recorder = recorder
+            response = await self.get_response(request)
+        recorder.check()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """
+        Pick up the budget declared on the resolved view.
+
+        :return: None
+        """
+        recorder = getattr(request, 'query_recorder', None)
+        if recorder is not None:
+            recorder.budget = getattr(view_func, 'query_budget', None)
+        return None
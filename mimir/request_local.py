@@ -1,38 +1,42 @@
 """
-Thread-local storage for the current request.
+Context-local storage for the current request.
 
 This module provides a way to access the current request from anywhere
 in the application, which is useful for logging and context propagation.
+
+The request is held in a ContextVar rather than a thread-local so it
+follows the request under ASGI: asgiref copies context into
+sync_to_async threads and back, and concurrent requests served by one
+event loop thread do not see each other's request.
 """
-import threading
+from contextvars import ContextVar
 
-_thread_locals = threading.local()
+_current_request = ContextVar('current_request', default=None)
 
 
 def set_current_request(request):
     """
-    Store the current request in thread-local storage.
-    
+    Store the current request in context-local storage.
+
     :param request: Django request object
     :return: None
     """
-    _thread_locals.request = request
+    _current_request.set(request)
 
 
 def get_current_request():
     """
-    Retrieve the current request from thread-local storage.
-    
+    Retrieve the current request from context-local storage.
+
     :return: Django request object or None if not set
     """
-    return getattr(_thread_locals, 'request', None)
+    return _current_request.get()
 
 
 def clear_current_request():
     """
-    Clear the current request from thread-local storage.
-    
+    Clear the current request from context-local storage.
+
     :return: None
     """
-    if hasattr(_thread_locals, 'request'):
-        del _thread_locals.request
+    _current_request.set(None)
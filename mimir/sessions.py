@@ -0,0 +1,81 @@
+"""
+Write-coalescing session backend.
+
+Sessions are read from the shared ``SESSION_CACHE_ALIAS`` cache and written
+through to ``django_session`` only when their data changes. With
+``SESSION_SAVE_EVERY_REQUEST`` the middleware saves every session on every
+response (page views, HTMX polls); for unchanged sessions this backend
+skips the database UPDATE and cache write until a fraction
+(``SESSION_REFRESH_FRACTION``) of the session's expiry age has passed
+since the last write, then refreshes the server-side expiry once.
+
+The cookie still slides on every response, so an idle session can expire
+on the server up to ``SESSION_REFRESH_FRACTION * SESSION_COOKIE_AGE``
+earlier than its cookie (about 1.4 days of the default two weeks with the
+default fraction of 0.1).
+
+Usage:
+    SESSION_ENGINE = "mimir.sessions"
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+
+logger = logging.getLogger(__name__)
+
+# Unix time of the last write-through, stored alongside the session data
+REFRESHED_AT_KEY = '_mimir_refreshed_at'
+
+
+def refresh_due(refreshed_at, expiry_age, now=None):
+    """
+    Decide whether an unchanged session needs its expiry pushed back.
+
+    :param refreshed_at: Unix time of the last write or None if never stamped. Example: 1760875200
+    :param expiry_age: session lifetime in seconds. Example: 1209600
+    :param now: current Unix time, defaults to time.time()
+    :return: True if the session should be written through
+    """
+    if refreshed_at is None:
+        return True
+    now = time.time() if now is None else now
+    fraction = getattr(settings, 'SESSION_REFRESH_FRACTION', 0.1)
+    return now - refreshed_at >= fraction * expiry_age
+
+
+class SessionStore(CachedDBStore):
+    """
+    Cached database sessions that only write when data changed or expiry is due.
+    """
+
+    def _should_write(self, must_create, session, expiry_age):
+        if must_create or self.modified:
+            return True
+        return refresh_due(session.get(REFRESHED_AT_KEY), expiry_age)
+
+    def save(self, must_create=False):
+        """
+        Write the session through to the database and cache if needed.
+
+        :param must_create: True when creating a new session key
+        """
+        session = self._get_session()
+        if not self._should_write(must_create, session, self.get_expiry_age()):
+            return
+        session[REFRESHED_AT_KEY] = int(time.time())
+        super().save(must_create)
+
+    async def asave(self, must_create=False):
+        """
+        Async variant of save().
+
+        :param must_create: True when creating a new session key
+        """
+        session = await self._aget_session()
+        if not self._should_write(must_create, session, await self.aget_expiry_age()):
+            return
+        session[REFRESHED_AT_KEY] = int(time.time())
+        await super().asave(must_create)
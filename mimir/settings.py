@@ -54,6 +54,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Static assets are answered here, before sessions or the database
+    "mimir.staticfiles.StaticFilesMiddleware",
+    # Per-request query recording and budgets (active when QUERY_BUDGETS_ENABLED)
+    "mimir.query_budget.QueryBudgetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -82,6 +86,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "mimir.wsgi.application"
+ASGI_APPLICATION = "mimir.asgi.application"
 
 
 # Database
@@ -149,6 +154,24 @@ STATIC_URL = "static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# Front-end libraries are vendored into static/vendor (manage.py vendor_assets)
+# and collected under content-hashed names with .gz/.br variants;
+# mimir.staticfiles.StaticFilesMiddleware serves them with immutable caching.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "mimir.staticfiles.PrecompressedManifestStaticFilesStorage",
+    },
+}
+
+# Uploaded files (artifact templates)
+# Stored next to the database so Docker deployments keep them on the data volume
+
+MEDIA_URL = "media/"
+MEDIA_ROOT = Path(os.getenv('MIMIR_MEDIA_ROOT', database_path.parent / "media"))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -170,6 +193,113 @@ SESSION_COOKIE_HTTPONLY = True  # Prevent JavaScript access
 SESSION_COOKIE_SECURE = False  # Set to True in production with HTTPS
 SESSION_COOKIE_SAMESITE = "Lax"  # CSRF protection
 
+# Sessions are served from the shared "sessions" cache and written to the
+# database only when their data changes; unchanged sessions get their
+# server-side expiry pushed back once this fraction of the cookie age has
+# passed since the last write (see mimir.sessions).
+SESSION_ENGINE = "mimir.sessions"
+SESSION_CACHE_ALIAS = "sessions"
+SESSION_REFRESH_FRACTION = float(os.getenv('MIMIR_SESSION_REFRESH_FRACTION', '0.1'))
+
+# Caching
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Template fragments are keyed by the owning playbook's version and its
+# latest change feed sequence (Playbook.change_seq), so edits invalidate
+# them without explicit deletes whatever the playbook status; stale
+# entries age out once MAX_ENTRIES is reached.
+# Dashboard snapshots are patched in place by signals, so they live in a
+# file cache shared by every uvicorn worker and the MCP server process.
+# Sessions use a file cache too, so a logout in one worker is seen by all.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'mimir-default',
+    },
+    'dashboard': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': Path(os.getenv('MIMIR_CACHE_DIR', database_path.parent / "cache")) / "dashboard",
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': Path(os.getenv('MIMIR_CACHE_DIR', database_path.parent / "cache")) / "sessions",
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'template_fragments': {
+        'BACKEND': 'mimir.cache.InstrumentedLocMemCache',
+        'LOCATION': 'mimir-fragments',
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('MIMIR_FRAGMENT_CACHE_ENTRIES', '2000')),
+            'LOG_EVERY': 100,
+        },
+    },
+}
+
+# Per-user dashboard snapshots (DashboardService) are patched by signals;
+# the timeout bounds drift from writes that bypass signals.
+DASHBOARD_CACHE_TIMEOUT = 600
+
+# Workflow activity graph
+# Loaded after the page shell; Graphviz is killed after this many seconds
+# and a text outline of the activities is shown instead.
+WORKFLOW_GRAPH_TIMEOUT = int(os.getenv('MIMIR_GRAPH_TIMEOUT', '10'))
+
+# Async views (served by mimir.asgi under uvicorn) run Graphviz and Markdown
+# on a bounded thread pool of this many threads per process.
+RENDER_POOL_SIZE = int(os.getenv('MIMIR_RENDER_THREADS', '4'))
+
+# Query budgets (mimir.query_budget)
+# Queries are recorded per request and per MCP tool call and checked against
+# the @query_budget declared on the view/tool; SQL shapes repeated more than
+# QUERY_BUDGET_REPEAT_THRESHOLD times are flagged as N+1. Violations are
+# logged, or raise QueryBudgetExceeded when strict (the test suite).
+QUERY_BUDGETS_ENABLED = os.getenv('MIMIR_QUERY_BUDGETS', str(DEBUG)) == 'True'
+QUERY_BUDGETS_STRICT = os.getenv('MIMIR_QUERY_BUDGETS_STRICT', 'False') == 'True'
+QUERY_BUDGET_REPEAT_THRESHOLD = 5
+
+# Playbook version history
+# Maximum number of compressed deltas stored after each keyframe snapshot.
+# Bounds the rows read to reconstruct any version.
+PLAYBOOK_VERSION_MAX_CHAIN = int(os.getenv('MIMIR_VERSION_MAX_CHAIN', '16'))
+
+# Online database backups (python manage.py backup / restore)
+# Pages are copied in small steps with a pause between them so writers
+# are only locked out for one step at a time.
+BACKUP_DIR = Path(os.getenv('MIMIR_BACKUP_DIR', database_path.parent / "backups"))
+BACKUP_KEEP = int(os.getenv('MIMIR_BACKUP_KEEP', '7'))
+BACKUP_INTERVAL_MINUTES = int(os.getenv('MIMIR_BACKUP_INTERVAL_MINUTES', '360'))
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.05
+
+# Playbook deletion
+# Deleted playbooks are hidden immediately and their rows purged in a
+# background thread with chunked DELETE statements of this size.
+PLAYBOOK_PURGE_ASYNC = os.getenv('MIMIR_PURGE_ASYNC', '1') == '1'
+PLAYBOOK_PURGE_CHUNK_SIZE = 500
+
+# Playbook export
+# Exports stream each table with .iterator(); rows fetched per round trip.
+EXPORT_CHUNK_SIZE = 500
+
+# Change feed
+# Sync readers page through the change log with this many entries per request.
+CHANGE_FEED_PAGE_SIZE = 1000
+
+# Auto-sync (SYNC-06)
+# Playbooks with auto-sync on are synced with Homebase every interval,
+# spread by +/- AUTO_SYNC_JITTER of it; failed runs retry after
+# AUTO_SYNC_RETRY_MINUTES, doubling up to AUTO_SYNC_MAX_BACKOFF_MINUTES.
+HOMEBASE_URL = os.getenv('MIMIR_HOMEBASE_URL', 'http://127.0.0.1:8765/')
+AUTO_SYNC_INTERVAL_MINUTES = int(os.getenv('MIMIR_AUTO_SYNC_INTERVAL_MINUTES', '60'))
+AUTO_SYNC_JITTER = 0.1
+AUTO_SYNC_RETRY_MINUTES = 1
+AUTO_SYNC_MAX_BACKOFF_MINUTES = 360
+AUTO_SYNC_LEASE_MINUTES = 15
+AUTO_SYNC_WORKERS = 4
+AUTO_SYNC_POLL_SECONDS = 30
+
 # Logging configuration
 # https://docs.djangoproject.com/en/5.2/topics/logging/
 
@@ -0,0 +1,229 @@
+"""
+Static asset storage and in-app serving.
+
+collectstatic stores every asset under a content-hashed name (manifest
+storage) and writes gzip and, when the optional ``brotli`` package is
+installed, brotli variants next to it. StaticFilesMiddleware serves
+STATIC_URL straight from STATIC_ROOT before sessions or the database are
+touched, picks the best precompressed variant the client accepts, and
+marks hashed names as immutable so repeat visits never revalidate.
+
+Before collectstatic has run (development, tests) ``{% static %}``
+falls back to the unhashed name and the middleware serves it through the
+staticfiles finders with a short cache lifetime.
+"""
+
+import gzip
+import logging
+import mimetypes
+import os
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # optional: gzip variants only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Text formats worth compressing; fonts (woff2) and images already are
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.mjs', '.svg', '.json', '.txt', '.html', '.xml', '.ttf', '.eot', '.map')
+
+# ManifestStaticFilesStorage inserts a 12 hex digit content hash: bootstrap.min.3f4a1c9e0b2d.css
+_HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+UNHASHED_CACHE_CONTROL = 'public, max-age=60'
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest storage that also writes .gz and .br variants of text assets.
+
+    Usage:
+        STORAGES = {"staticfiles": {"BACKEND": "mimir.staticfiles.PrecompressedManifestStaticFilesStorage"}}
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        """
+        Hash files as usual, then precompress every stored name.
+
+        :param paths: dict of path -> (storage, path) from collectstatic
+        :param dry_run: True to skip writing
+        :return: generator of (original_name, processed_name, processed) tuples
+        """
+        compressible = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if not isinstance(processed, Exception) and not dry_run:
+                compressible.add(name)
+                if hashed_name:
+                    compressible.add(hashed_name)
+            yield name, hashed_name, processed
+
+        if dry_run:
+            return
+        written = 0
+        for name in sorted(compressible):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                written += self._write_compressed(name)
+        logger.info(f"Precompressed {written} static file variants (brotli {'on' if brotli else 'off'})")
+
+    def _write_compressed(self, name):
+        """
+        Write .gz (and .br) variants of one stored file when they are smaller.
+
+        :param name: stored file name. Example: "vendor/bootstrap/bootstrap.min.3f4a1c9e0b2d.css"
+        :return: number of variants written as int. Example: 2
+        """
+        path = self.path(name)
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(data)))
+
+        written = 0
+        for suffix, compressed in variants:
+            if len(compressed) < len(data):
+                with open(path + suffix, 'wb') as f:
+                    f.write(compressed)
+                written += 1
+        return written
+
+    def stored_name(self, name):
+        """
+        Get the hashed name of an asset, or the plain name if it was never collected.
+
+        :param name: asset path. Example: "vendor/htmx/htmx.min.js"
+        :return: stored name as str. Example: "vendor/htmx/htmx.min.8a1d3b6c2f90.js"
+        """
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Not in the manifest or STATIC_ROOT: collectstatic has not run
+            return name
+
+
+def _accepted_encodings(request):
+    """
+    Parse the encodings a client accepts (q=0 means refused).
+
+    :param request: Django request object
+    :return: set of encoding names. Example: {"gzip", "br"}
+    """
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        token, _, params = part.partition(';')
+        quality = params.strip().removeprefix('q=')
+        try:
+            refused = bool(params.strip()) and float(quality) == 0
+        except ValueError:
+            refused = False
+        if token.strip() and not refused:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+def _find_asset(relative_path):
+    """
+    Locate a static asset in STATIC_ROOT, falling back to the finders.
+
+    :param relative_path: path below STATIC_URL. Example: "vendor/htmx/htmx.min.js"
+    :return: absolute file path or None
+    """
+    try:
+        if settings.STATIC_ROOT:
+            path = safe_join(str(settings.STATIC_ROOT), relative_path)
+            if os.path.isfile(path):
+                return path
+        found = finders.find(relative_path)
+    except SuspiciousFileOperation:
+        logger.warning(f"Rejected static path outside static roots: {relative_path}")
+        return None
+    return found if isinstance(found, str) and os.path.isfile(found) else None
+
+
+def serve_static(request, relative_path):
+    """
+    Build the response for one static asset.
+
+    :param request: Django request object
+    :param relative_path: path below STATIC_URL. Example: "vendor/htmx/htmx.min.8a1d3b6c2f90.js"
+    :return: FileResponse, HttpResponseNotModified, or None if no such asset
+    """
+    path = _find_asset(relative_path)
+    if path is None:
+        return None
+
+    stat = os.stat(path)
+    immutable = bool(_HASHED_NAME.search(relative_path))
+    if not immutable and not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        response = HttpResponseNotModified()
+        response['Cache-Control'] = UNHASHED_CACHE_CONTROL
+        return response
+
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    accepted = _accepted_encodings(request)
+    served_path, encoding = path, None
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if candidate in accepted and os.path.isfile(path + suffix):
+            served_path, encoding = path + suffix, candidate
+            break
+
+    response = FileResponse(open(served_path, 'rb'), content_type=content_type)
+    # FileResponse names the .gz/.br file; assets are shown inline under their URL
+    del response['Content-Disposition']
+    if encoding:
+        response['Content-Encoding'] = encoding
+    if relative_path.endswith(COMPRESSIBLE_EXTENSIONS):
+        patch_vary_headers(response, ('Accept-Encoding',))
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if immutable else UNHASHED_CACHE_CONTROL
+    return response
+
+
+class StaticFilesMiddleware:
+    """
+    Serve STATIC_URL from the application, ahead of sessions and auth.
+
+    Usage:
+        Add 'mimir.staticfiles.StaticFilesMiddleware' to MIDDLEWARE right
+        after SecurityMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = '/' + settings.STATIC_URL.lstrip('/')
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _static_response(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith(self.prefix):
+            return None
+        return serve_static(request, request.path[len(self.prefix):])
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._static_response(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        """
+        Async variant of __call__ used under ASGI.
+        """
+        return self._static_response(request) or await self.get_response(request)
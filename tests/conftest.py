@@ -1,7 +1,26 @@
 """Pytest configuration and fixtures for Mimir tests."""
 
+import tempfile
+from pathlib import Path
+
 import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.core.management import call_command
+from django.test import Client
+
+
+def pytest_configure(config):
+    """
+    Keep file-based caches out of the working tree during test runs and
+    fail any request or MCP tool call that breaks its query budget.
+    """
+    cache_root = Path(tempfile.mkdtemp(prefix='mimir-test-cache-'))
+    settings.CACHES['dashboard']['LOCATION'] = cache_root / 'dashboard'
+    settings.CACHES['sessions']['LOCATION'] = cache_root / 'sessions'
+    settings.QUERY_BUDGETS_ENABLED = True
+    settings.QUERY_BUDGETS_STRICT = True
 
 
 @pytest.fixture(scope='session')
@@ -22,3 +41,49 @@ def enable_db_access_for_all_tests(db):
     Enable database access for all tests by default.
     """
     pass
+
+
+@pytest.fixture(autouse=True)
+def purge_deleted_playbooks_inline(settings):
+    """
+    Run playbook purges in the test thread instead of a background thread.
+    """
+    settings.PLAYBOOK_PURGE_ASYNC = False
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Start every test with empty caches (fragments, dashboard snapshots).
+    """
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture
+def maria(db):
+    """Create Maria user for tests."""
+    return get_user_model().objects.create_user(username='maria', password='testpass123')
+
+
+@pytest.fixture
+def client_maria(maria):
+    """Authenticated client for Maria."""
+    client = Client()
+    client.login(username='maria', password='testpass123')
+    return client
+
+
+@pytest.fixture
+def workflow(maria):
+    """
+    Draft FDD playbook of Maria's with an empty Design workflow.
+
+    Test modules override this fixture to add the activities they need.
+    """
+    from methodology.models import Playbook, Workflow
+
+    playbook = Playbook.objects.create(
+        name='FDD', description='Feature driven', category='development', author=maria
+    )
+    return Workflow.objects.create(name='Design', playbook=playbook, order=1)
@@ -0,0 +1,117 @@
+"""Integration tests for the keyset-paginated global activities list."""
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from methodology.models import Playbook, Workflow, Activity
+from methodology.services.activity_service import ActivityService
+from methodology.utils.keyset import encode_cursor
+
+User = get_user_model()
+
+
+@pytest.fixture
+def maria(db):
+    """Create Maria user for tests."""
+    return User.objects.create_user(username='maria', password='testpass123')
+
+
+@pytest.fixture
+def library(maria):
+    """Two playbooks with 60 activities across three phases."""
+    phases = ['Planning', 'Execution', '']
+    for p in range(2):
+        playbook = Playbook.objects.create(
+            name=f'Playbook {p}', description='Test', category='development', author=maria, status='released'
+        )
+        for w in range(3):
+            workflow = Workflow.objects.create(name=f'Workflow {w}', playbook=playbook, order=w)
+            Activity.objects.bulk_create([
+                Activity(workflow=workflow, name=f'Activity {a}', order=a, phase=phases[a % 3])
+                for a in range(10)
+            ])
+    return maria
+
+
+@pytest.mark.django_db
+class TestActivityGlobalList:
+    """Keyset pagination, grouped stats and HTMX continuation."""
+
+    def test_pages_cover_every_activity_once_in_phase_order(self, library):
+        """Walking cursors returns each activity exactly once, grouped by phase."""
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = ActivityService.get_global_activity_page(library, after=cursor, limit=7)
+            seen.extend(page)
+            if not cursor:
+                break
+
+        assert len(seen) == 60
+        assert len({a.pk for a in seen}) == 60
+        labels = [a.phase_label for a in seen]
+        assert labels == sorted(labels)
+        assert labels[0] == 'Execution' and labels[-1] == 'Unassigned'
+
+    def test_stats_from_single_grouped_query(self, library, django_assert_num_queries):
+        """Totals and per-phase counts come from one query."""
+        with django_assert_num_queries(1):
+            stats = ActivityService.get_global_activity_stats(library)
+
+        assert stats == {
+            'activity_count': 60,
+            'workflow_count': 6,
+            'playbook_count': 2,
+            'phase_counts': {'Execution': 18, 'Planning': 24, 'Unassigned': 18},
+        }
+
+    def test_first_page_and_htmx_continuation(self, library):
+        """First page renders totals and a sentinel; continuation returns remaining rows."""
+        client = Client()
+        client.login(username='maria', password='testpass123')
+        url = reverse('activity_global_list')
+
+        response = client.get(url)
+        content = response.content.decode()
+
+        assert response.status_code == 200
+        assert len(response.context['activities']) == 50
+        assert content.count('data-testid="activity-row-') == 50
+        assert 'data-testid="phase-group-execution"' in content
+        assert 'hx-trigger="revealed"' in content
+
+        more = client.get(url, {'after': response.context['next_cursor']}, HTTP_HX_REQUEST='true')
+        more_content = more.content.decode()
+
+        assert more_content.count('data-testid="activity-row-') == 10
+        assert '<html' not in more_content
+        # Page 1 ended inside the Unassigned group, so no second header
+        assert 'data-testid="phase-group-unassigned"' not in more_content
+        assert 'data-testid="load-more"' not in more_content
+
+    def test_invalid_cursor_rejected(self, library):
+        """Garbage cursors return 400 instead of a server error."""
+        client = Client()
+        client.login(username='maria', password='testpass123')
+
+        response = client.get(reverse('activity_global_list'), {'after': 'not-a-cursor'})
+
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize('values', [
+        [None, 'FDD', 1, 2, 57],
+        ['Planning', {'a': 1}, 1, 2, 57],
+        ['Planning', 'FDD', [1], 2, 57],
+        ['Planning', 'FDD', 1, 2.5, 57],
+        ['Planning', 'FDD', 1, 2, True],
+    ])
+    def test_wrongly_typed_cursor_rejected(self, library, values):
+        """Well-formed cursors carrying non str/int values return 400."""
+        client = Client()
+        client.login(username='maria', password='testpass123')
+
+        response = client.get(reverse('activity_global_list'), {'after': encode_cursor(values)})
+
+        assert response.status_code == 400
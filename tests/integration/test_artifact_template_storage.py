@@ -0,0 +1,189 @@
+"""
+Integration tests for content-addressed artifact template storage.
+
+Tests deduplication by SHA-256, reference counting, garbage collection
+and streamed downloads with HTTP Range support.
+"""
+
+import hashlib
+import os
+from datetime import timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+
+from methodology.models import Playbook, Workflow, Activity, Artifact, TemplateBlob
+from methodology.services.template_blob_service import TemplateBlobService
+from methodology.storage import parse_cas_name
+
+User = get_user_model()
+
+TEMPLATE_BODY = b"# Component template\n" + b"export const Component = () => null;\n" * 200
+
+
+@pytest.mark.django_db
+class TestArtifactTemplateStorage:
+    """Integration tests for template blob storage and download."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, tmp_path):
+        """Set up isolated media root and test data for each test."""
+        settings.MEDIA_ROOT = tmp_path
+        self.media_root = tmp_path
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username="maria_test", email="maria@test.com", password="testpass123"
+        )
+        self.client.login(username="maria_test", password="testpass123")
+
+        self.playbook = Playbook.objects.create(
+            name="React Frontend Development",
+            description="A comprehensive methodology",
+            category="development",
+            status="active",
+            source="owned",
+            author=self.user,
+        )
+        self.workflow = Workflow.objects.create(
+            name="Component Development", playbook=self.playbook, order=1
+        )
+        self.activity = Activity.objects.create(
+            workflow=self.workflow, name="Design Component", guidance="Design", order=1
+        )
+
+    def _create_artifact(self, name, body=TEMPLATE_BODY, filename="component.tsx"):
+        return Artifact.objects.create(
+            playbook=self.playbook,
+            produced_by=self.activity,
+            name=name,
+            template_file=SimpleUploadedFile(filename, body),
+        )
+
+    def test_identical_uploads_share_one_blob(self):
+        """Test two uploads with the same bytes store one blob with two references."""
+        first = self._create_artifact("Spec A", filename="a.tsx")
+        second = self._create_artifact("Spec B", filename="b.tsx")
+
+        digest = hashlib.sha256(TEMPLATE_BODY).hexdigest()
+        assert parse_cas_name(first.template_file.name) == (digest, "a.tsx")
+        assert parse_cas_name(second.template_file.name) == (digest, "b.tsx")
+        assert first.get_template_filename() == "a.tsx"
+
+        blob = TemplateBlob.objects.get(digest=digest)
+        assert blob.size == len(TEMPLATE_BODY)
+        assert blob.ref_count == 2
+        blob_files = [f for _, _, files in os.walk(self.media_root / "cas") for f in files]
+        assert blob_files == [digest]
+
+    def test_copying_name_is_metadata_only(self):
+        """Test pointing another artifact at an existing name adds a reference, not bytes."""
+        original = self._create_artifact("Spec A")
+        copy = Artifact.objects.create(
+            playbook=self.playbook,
+            produced_by=self.activity,
+            name="Spec Copy",
+            template_file=original.template_file.name,
+        )
+
+        digest, _ = parse_cas_name(copy.template_file.name)
+        assert TemplateBlob.objects.get(digest=digest).ref_count == 2
+        assert copy.template_file.read() == TEMPLATE_BODY
+
+    def test_garbage_collection_removes_orphans_only(self):
+        """Test GC deletes blobs no artifact references and keeps shared ones."""
+        kept = self._create_artifact("Kept")
+        orphan = self._create_artifact("Orphan", body=b"orphaned bytes")
+        orphan_digest, _ = parse_cas_name(orphan.template_file.name)
+        orphan.delete()
+
+        assert TemplateBlob.objects.get(digest=orphan_digest).ref_count == 0
+
+        result = TemplateBlobService.collect_garbage(grace=timedelta(0))
+
+        assert result == {"blobs": 1, "bytes": len(b"orphaned bytes")}
+        assert not TemplateBlob.objects.filter(digest=orphan_digest).exists()
+        kept_digest, _ = parse_cas_name(kept.template_file.name)
+        assert TemplateBlob.objects.get(digest=kept_digest).ref_count == 1
+        assert kept.template_file.read() == TEMPLATE_BODY
+
+    def test_reused_orphan_survives_garbage_collection(self):
+        """Test a deduplicated upload restarts an orphan's grace period."""
+        orphan = self._create_artifact("Orphan", body=b"reused bytes")
+        digest, _ = parse_cas_name(orphan.template_file.name)
+        orphan.delete()
+        TemplateBlob.objects.filter(digest=digest).update(
+            created_at=timezone.now() - timedelta(hours=2)
+        )
+
+        reused = self._create_artifact("Reused", body=b"reused bytes")
+        reused.delete()
+        result = TemplateBlobService.collect_garbage()
+
+        assert result == {"blobs": 0, "bytes": 0}
+        assert TemplateBlob.objects.filter(digest=digest).exists()
+        assert os.path.exists(os.path.join(self.media_root, "cas", digest[:2], digest))
+
+    def test_download_streams_full_file(self):
+        """Test download returns whole file with digest ETag and Accept-Ranges."""
+        artifact = self._create_artifact("Spec A")
+        url = reverse("artifact_template_download", kwargs={"pk": artifact.pk})
+
+        response = self.client.get(url)
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert b"".join(response.streaming_content) == TEMPLATE_BODY
+        assert response["Accept-Ranges"] == "bytes"
+        assert response["ETag"] == f'"{hashlib.sha256(TEMPLATE_BODY).hexdigest()}"'
+        assert 'filename="component.tsx"' in response["Content-Disposition"]
+
+    def test_download_filename_is_escaped(self):
+        """Test non-ASCII template filenames are sent RFC 6266 encoded."""
+        artifact = self._create_artifact("Spec A", filename="Spécification.md")
+        url = reverse("artifact_template_download", kwargs={"pk": artifact.pk})
+
+        response = self.client.get(url)
+
+        assert response["Content-Disposition"] == "attachment; filename*=utf-8''Sp%C3%A9cification.md"
+
+    def test_download_honours_range(self):
+        """Test Range request returns 206 with the requested slice."""
+        artifact = self._create_artifact("Spec A")
+        url = reverse("artifact_template_download", kwargs={"pk": artifact.pk})
+
+        response = self.client.get(url, HTTP_RANGE="bytes=2-11")
+
+        assert response.status_code == 206
+        assert b"".join(response.streaming_content) == TEMPLATE_BODY[2:12]
+        assert response["Content-Range"] == f"bytes 2-11/{len(TEMPLATE_BODY)}"
+
+        suffix = self.client.get(url, HTTP_RANGE="bytes=-5")
+        assert b"".join(suffix.streaming_content) == TEMPLATE_BODY[-5:]
+
+        unsatisfiable = self.client.get(url, HTTP_RANGE=f"bytes={len(TEMPLATE_BODY)}-")
+        assert unsatisfiable.status_code == 416
+
+    def test_download_revalidates_with_etag(self):
+        """Test If-None-Match with the digest returns 304."""
+        artifact = self._create_artifact("Spec A")
+        url = reverse("artifact_template_download", kwargs={"pk": artifact.pk})
+        etag = f'"{hashlib.sha256(TEMPLATE_BODY).hexdigest()}"'
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    def test_download_denied_for_other_users(self):
+        """Test non-owners cannot download owned playbook templates."""
+        artifact = self._create_artifact("Spec A")
+        User.objects.create_user(username="alice", password="testpass123")
+        other = Client()
+        other.login(username="alice", password="testpass123")
+
+        response = other.get(reverse("artifact_template_download", kwargs={"pk": artifact.pk}))
+
+        assert response.status_code == 404
@@ -0,0 +1,89 @@
+"""Integration tests for the async read views served under ASGI.
+
+AsyncClient drives requests through Django's ASGI handler and async
+middleware chain, as uvicorn does in deployment.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import pytest
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.test import AsyncClient
+from django.urls import resolve, reverse
+from django.contrib.auth import get_user_model
+
+from methodology.models import Playbook, Workflow, Activity
+
+User = get_user_model()
+
+
+def _seed():
+    """User with a draft playbook, one workflow and two linked activities."""
+    maria = User.objects.create_user(username='maria', password='testpass123')
+    playbook = Playbook.objects.create(
+        name='FDD', description='Feature driven', category='development', author=maria
+    )
+    workflow = Workflow.objects.create(name='Design', playbook=playbook, order=1)
+    first = Activity.objects.create(
+        name='Model Domain', workflow=workflow, order=1, phase='Planning', guidance='## Steps\n1. Walk through'
+    )
+    second = Activity.objects.create(name='Build List', workflow=workflow, order=2, predecessor=first)
+    first.successor = second
+    first.save()
+    return maria, playbook, workflow, first
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsgiReadViews:
+    """Read-heavy pages run as coroutines end to end."""
+
+    def test_read_views_are_coroutines(self):
+        """Dashboard, lists and details resolve to async views."""
+        paths = ['/dashboard/', '/playbooks/', '/playbooks/1/', '/playbooks/1/workflows/',
+                 '/playbooks/1/workflows/1/', '/playbooks/1/workflows/1/graph/',
+                 '/playbooks/1/workflows/1/activities/1/']
+
+        for path in paths:
+            assert iscoroutinefunction(resolve(path).func), path
+
+    @pytest.mark.asyncio
+    async def test_async_client_renders_pages(self):
+        """Pages render through the ASGI handler with request IDs and Markdown intact."""
+        maria, playbook, workflow, activity = await sync_to_async(_seed)()
+        client = AsyncClient()
+        await client.aforce_login(maria)
+
+        urls = [
+            reverse('dashboard'),
+            reverse('playbook_list'),
+            reverse('playbook_detail', kwargs={'pk': playbook.pk}),
+            reverse('workflow_list', kwargs={'playbook_pk': playbook.pk}),
+            reverse('workflow_detail', kwargs={'playbook_pk': playbook.pk, 'pk': workflow.pk}),
+        ]
+        for url in urls:
+            response = await client.get(url)
+            assert response.status_code == 200, url
+            assert response.has_header('X-Request-ID')
+
+        response = await client.get(reverse('activity_detail', kwargs={
+            'playbook_pk': playbook.pk, 'workflow_pk': workflow.pk, 'activity_pk': activity.pk,
+        }))
+        assert response.status_code == 200
+        assert b'<h2>Steps</h2>' in response.content
+
+        response = await client.get(reverse('workflow_graph', kwargs={'playbook_pk': playbook.pk, 'pk': workflow.pk}))
+        assert response.status_code == 200
+        assert b'Model Domain' in response.content
+
+    @pytest.mark.asyncio
+    async def test_other_users_playbook_redirects(self):
+        """Ownership checks work without loading the author in the event loop."""
+        _, playbook, _, _ = await sync_to_async(_seed)()
+        other = await sync_to_async(User.objects.create_user)(username='bob', password='testpass123')
+        client = AsyncClient()
+        await client.aforce_login(other)
+
+        response = await client.get(reverse('playbook_detail', kwargs={'pk': playbook.pk}))
+
+        assert response.status_code == 302
+        assert response.url == reverse('playbook_list')
@@ -0,0 +1,264 @@
+"""Integration tests for background auto-sync with a Homebase stand-in (SYNC-06).
+
+The stand-in runs as a separate process (manage.py homebase_standin);
+Mike's edits on another device are made by pushing to it.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import socket
+import subprocess
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from methodology.models import Playbook, Workflow, Activity, SyncState
+from methodology.services.auto_sync_service import AutoSyncService
+from methodology.services.homebase_client import HomebaseClient, HomebaseConflict
+from methodology.services.merkle_service import MerkleService, MerkleTree
+from methodology.utils.json_patch import decompress_json
+
+User = get_user_model()
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture(scope='module')
+def homebase(tmp_path_factory):
+    """Start the Homebase stand-in on a free port; yields a client for it."""
+    data_dir = tmp_path_factory.mktemp('homebase')
+    process = subprocess.Popen(
+        [sys.executable, 'manage.py', 'homebase_standin', '--data-dir', str(data_dir), '--port', '0'],
+        cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        line = process.stdout.readline()
+        assert 'listening on' in line, f"Stand-in did not start: {line!r}"
+        yield HomebaseClient(line.rsplit(' ', 1)[1].strip())
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def row(document, section, name):
+    """Find a row of an export by name."""
+    return next(item for item in document[section] if item['name'] == name)
+
+
+def make_due(state):
+    """Bring a scheduled run forward to now."""
+    SyncState.objects.filter(pk=state.pk).update(next_run_at=timezone.now())
+
+
+class RacingClient(HomebaseClient):
+    """Client during whose sync Mike pushes an edit, right after the root was read."""
+
+    def __init__(self, homebase, edit):
+        super().__init__(homebase.base_url)
+        self.edit = edit
+
+    def root(self, name):
+        root = super().root(name)
+        if self.edit is not None:
+            theirs = self.fetch(name)
+            self.edit(theirs)
+            self.edit = None
+            super().push(name, theirs)
+        return root
+
+
+@pytest.mark.django_db
+class TestAutoSync:
+    """Maria's FDD playbook syncs with Homebase in the background."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, homebase, request):
+        """FDD playbook with auto-sync on, under a Homebase name unique to the test."""
+        self.homebase = homebase
+        self.maria = User.objects.create_user(username='maria', password='testpass123')
+        self.playbook = Playbook.objects.create(
+            name='Feature Driven', description='FDD', category='development', author=self.maria,
+        )
+        self.design = Workflow.objects.create(name='Design', playbook=self.playbook, order=1)
+        self.model = Activity.objects.create(
+            name='Model Domain', workflow=self.design, order=1, guidance='Gather experts.\nDraw the model.\n',
+        )
+        self.code = Activity.objects.create(name='Code', workflow=self.design, order=2)
+        self.name = request.node.name.replace('test_', 'fdd-')
+        self.state = AutoSyncService.enable(self.playbook, self.name)
+
+    def run_due(self):
+        return AutoSyncService.run_due(client=self.homebase, workers=1)
+
+    def test_first_run_pushes_and_unchanged_run_skips(self):
+        """The first run uploads the playbook; with nothing changed the next one only asks for the root."""
+        before = timezone.now()
+
+        assert self.run_due() == {'pushed': 1}
+
+        state = SyncState.objects.get(pk=self.state.pk)
+        remote = self.homebase.fetch(self.name)
+        assert [item['name'] for item in remote['activities']] == ['Model Domain', 'Code']
+        assert state.status == SyncState.STATUS_UP_TO_DATE
+        assert state.remote_root == self.homebase.root(self.name) == MerkleService.root_hash(self.playbook)
+        assert MerkleTree.from_document(decompress_json(state.base_data)).hash == state.remote_root
+        assert before + timedelta(minutes=54) <= state.next_run_at <= timezone.now() + timedelta(minutes=66)
+        assert self.run_due() == {}
+
+        make_due(state)
+        assert self.run_due() == {'skipped': 1}
+
+    def test_edits_on_both_sides_are_merged_and_pushed(self):
+        """Maria's and Mike's edits since the last sync end up on both sides."""
+        self.run_due()
+        self.code.guidance = 'Write the code'
+        self.code.save()
+        theirs = self.homebase.fetch(self.name)
+        row(theirs, 'activities', 'Model Domain')['guidance'] = 'Gather experts.\nDraw the class diagram.\n'
+        theirs['workflows'].append({'id': 900, 'name': 'Deploy', 'description': '', 'abbreviation': '', 'order': 2})
+        self.homebase.push(self.name, theirs)
+        make_due(self.state)
+
+        assert self.run_due() == {'merged': 1}
+
+        assert Activity.objects.get(pk=self.model.pk).guidance == 'Gather experts.\nDraw the class diagram.\n'
+        assert Workflow.objects.filter(playbook=self.playbook, name='Deploy').exists()
+        remote = self.homebase.fetch(self.name)
+        assert row(remote, 'activities', 'Code')['guidance'] == 'Write the code'
+        assert self.homebase.root(self.name) == MerkleService.root_hash(self.playbook)
+
+        make_due(self.state)
+        assert self.run_due() == {'skipped': 1}
+
+    def test_local_edits_and_requests_coalesce(self):
+        """Several edits and sync requests before a run cost one push."""
+        self.run_due()
+        assert AutoSyncService.request_sync(self.playbook.pk) is True
+        for order, name in enumerate(['Review', 'Inspect', 'Promote'], start=3):
+            Activity.objects.create(name=name, workflow=self.design, order=order)
+            assert AutoSyncService.request_sync(self.playbook.pk) is False
+
+        assert self.run_due() == {'pushed': 1}
+
+        remote = self.homebase.fetch(self.name)
+        assert {item['name'] for item in remote['activities']} >= {'Review', 'Inspect', 'Promote'}
+
+    def test_push_refused_unless_homebase_root_matches(self):
+        """A push names the root it was based on; Homebase refuses it once that root is gone."""
+        self.run_due()
+        document = self.homebase.fetch(self.name)
+        root = self.homebase.root(self.name)
+
+        with pytest.raises(HomebaseConflict):
+            self.homebase.push(self.name, document, expected_root='0' * 64)
+        with pytest.raises(HomebaseConflict):
+            self.homebase.push(self.name, document, expected_root='')
+        with pytest.raises(HomebaseConflict):
+            self.homebase.push(f'{self.name}-new', document, expected_root='*')
+        assert self.homebase.root(f'{self.name}-new') is None
+
+        document['description'] = 'Feature driven development'
+        self.homebase.push(self.name, document, expected_root=root)
+        self.homebase.push(f'{self.name}-new', document, expected_root='')
+        assert self.homebase.root(self.name) == self.homebase.root(f'{self.name}-new') != root
+
+    def test_push_racing_another_device_is_merged_next_run(self):
+        """Mike pushing between the root check and Maria's push is not overwritten; the next run merges."""
+        self.run_due()
+        state = SyncState.objects.get(pk=self.state.pk)
+        self.code.guidance = 'Write the code'
+        self.code.save()
+        make_due(state)
+
+        def mike(theirs):
+            row(theirs, 'activities', 'Model Domain')['guidance'] = 'Gather experts.\nDraw the class diagram.\n'
+
+        before = timezone.now()
+        assert AutoSyncService.run_due(client=RacingClient(self.homebase, mike), workers=1) == {'remote_changed': 1}
+
+        refused = SyncState.objects.get(pk=state.pk)
+        assert (refused.base_data, refused.cursor, refused.remote_root) == (
+            state.base_data, state.cursor, state.remote_root)
+        assert refused.failures == 0
+        assert before + timedelta(minutes=54) <= refused.next_run_at
+        remote = self.homebase.fetch(self.name)
+        assert row(remote, 'activities', 'Model Domain')['guidance'] == 'Gather experts.\nDraw the class diagram.\n'
+        assert row(remote, 'activities', 'Code')['guidance'] == ''
+
+        make_due(refused)
+        assert self.run_due() == {'merged': 1}
+        assert Activity.objects.get(pk=self.model.pk).guidance == 'Gather experts.\nDraw the class diagram.\n'
+        assert row(self.homebase.fetch(self.name), 'activities', 'Code')['guidance'] == 'Write the code'
+
+    def test_conflicts_are_left_for_the_user(self):
+        """Both sides editing the same line writes and pushes nothing."""
+        self.run_due()
+        self.model.guidance = 'Gather experts.\nSketch the model.\n'
+        self.model.save()
+        theirs = self.homebase.fetch(self.name)
+        row(theirs, 'activities', 'Model Domain')['guidance'] = 'Gather experts.\nPaint the model.\n'
+        self.homebase.push(self.name, theirs)
+        root = self.homebase.root(self.name)
+        make_due(self.state)
+
+        assert self.run_due() == {'conflicts': 1}
+
+        state = SyncState.objects.get(pk=self.state.pk)
+        assert state.status == SyncState.STATUS_CONFLICTS
+        assert [conflict['field'] for conflict in state.last_result['conflicts']] == ['guidance']
+        assert Activity.objects.get(pk=self.model.pk).guidance == 'Gather experts.\nSketch the model.\n'
+        assert self.homebase.root(self.name) == root
+
+    def test_unreachable_homebase_backs_off(self, settings):
+        """Failed runs retry after 1, 2, 4 minutes, capped at the maximum backoff."""
+        settings.AUTO_SYNC_MAX_BACKOFF_MINUTES = 4
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            dead = HomebaseClient(f'http://127.0.0.1:{probe.getsockname()[1]}/', timeout=2)
+
+        delays = []
+        for _ in range(4):
+            make_due(self.state)
+            start = timezone.now()
+            assert AutoSyncService.run_due(client=dead, workers=1) == {'failed': 1}
+            state = SyncState.objects.get(pk=self.state.pk)
+            delays.append(round((state.next_run_at - start) / timedelta(minutes=1)))
+
+        assert delays == [1, 2, 4, 4]
+        assert (state.failures, state.status, state.lease_until) == (4, SyncState.STATUS_ERROR, None)
+
+        make_due(state)
+        assert self.run_due() == {'pushed': 1}
+        assert SyncState.objects.get(pk=state.pk).failures == 0
+
+    def test_one_run_per_playbook(self):
+        """A second scheduler cannot claim a playbook while the first holds the lease."""
+        assert AutoSyncService.claim(SyncState.objects.get(pk=self.state.pk)) is True
+        assert AutoSyncService.claim(SyncState.objects.get(pk=self.state.pk)) is False
+        assert self.run_due() == {}
+
+        later = timezone.now() + timedelta(minutes=16)
+        assert AutoSyncService.claim(SyncState.objects.get(pk=self.state.pk), now=later) is True
+
+    def test_deleted_and_disabled_playbooks_are_not_due(self):
+        """Only live playbooks with auto-sync on are picked up."""
+        AutoSyncService.enable(self.playbook, self.name, auto_sync=False)
+        assert not AutoSyncService.due_states().exists()
+
+        AutoSyncService.enable(self.playbook, self.name)
+        self.playbook.deleted_at = timezone.now()
+        self.playbook.save()
+        assert not AutoSyncService.due_states().exists()
+
+
+def test_next_run_is_jittered(settings):
+    """Successful runs are rescheduled within +/- AUTO_SYNC_JITTER of the interval."""
+    settings.AUTO_SYNC_INTERVAL_MINUTES = 60
+    now = timezone.now()
+    delays = {AutoSyncService.next_run(0, now=now) - now for _ in range(50)}
+    assert all(timedelta(minutes=54) <= delay <= timedelta(minutes=66) for delay in delays)
+    assert len(delays) > 1
@@ -0,0 +1,116 @@
+"""Integration tests for streamed multi-playbook bulk export (IMPORT-06).
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import io
+import json
+import zipfile
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from methodology.models import Playbook, Workflow, Activity
+from methodology.services.playbook_package_service import PlaybookPackageService
+
+User = get_user_model()
+
+
+def _create_playbooks(author, count, activities=3, prefix='Playbook'):
+    """Playbooks with one workflow of linked activities each."""
+    playbooks = []
+    for i in range(count):
+        playbook = Playbook.objects.create(
+            name=f'{prefix} {i}', description='Bulk', category='development', author=author
+        )
+        workflow = Workflow.objects.create(name='Flow', playbook=playbook, order=1)
+        previous = None
+        for a in range(activities):
+            previous = Activity.objects.create(
+                name=f'Step {a}', workflow=workflow, order=a + 1, predecessor=previous
+            )
+        playbooks.append(playbook)
+    return playbooks
+
+
+def _read_zip(data):
+    """Map entry name to parsed JSON for every entry of a zip."""
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    return {name: json.loads(archive.read(name)) for name in archive.namelist()}
+
+
+@pytest.mark.django_db
+class TestBulkExport:
+    """Selected playbooks are streamed as one zip."""
+
+    def test_bulk_export_view(self):
+        """Owned selections are exported; other users' playbooks are skipped."""
+        maria = User.objects.create_user(username='maria', password='testpass123')
+        bob = User.objects.create_user(username='bob', password='testpass123')
+        first, second = _create_playbooks(maria, 2)
+        foreign = _create_playbooks(bob, 1)[0]
+        client = Client()
+        client.force_login(maria)
+
+        response = client.get(reverse('playbook_bulk_export'), {'ids': [first.pk, second.pk, foreign.pk]})
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/zip'
+        entries = _read_zip(b''.join(response.streaming_content))
+        manifest = entries.pop('manifest.json')
+        assert sorted(e['name'] for e in entries.values()) == ['Playbook 0', 'Playbook 1']
+        assert all(len(e['activities']) == 3 for e in entries.values())
+        assert set(manifest['entries']) == set(entries)
+
+    def test_queries_do_not_grow_with_playbook_count(self):
+        """One query per table, however many playbooks are exported."""
+        maria = User.objects.create_user(username='maria', password='testpass123')
+        few, many = _create_playbooks(maria, 2), _create_playbooks(maria, 12, prefix='Large')
+
+        counts = []
+        for playbooks in (few, many):
+            with CaptureQueriesContext(connection) as ctx:
+                b''.join(PlaybookPackageService.iter_bulk_export(playbooks))
+            counts.append(len(ctx.captured_queries))
+
+        assert counts[0] == counts[1] == 5
+
+    def test_empty_selection_redirects(self):
+        """Nothing selected sends the user back to the list."""
+        maria = User.objects.create_user(username='maria', password='testpass123')
+        client = Client()
+        client.force_login(maria)
+
+        response = client.get(reverse('playbook_bulk_export'))
+
+        assert response.status_code == 302
+        assert response.url == reverse('playbook_list')
+
+    def test_list_offers_selection(self):
+        """The playbook list has a checkbox per playbook and a Bulk Export button."""
+        maria = User.objects.create_user(username='maria', password='testpass123')
+        playbook = _create_playbooks(maria, 1)[0]
+        client = Client()
+        client.force_login(maria)
+
+        content = client.get(reverse('playbook_list')).content.decode()
+
+        assert 'data-testid="bulk-export"' in content
+        assert f'data-testid="select-playbook-{playbook.pk}"' in content
+
+    def test_management_command_reports_progress(self, tmp_path):
+        """The command writes the zip and prints one progress line per playbook."""
+        maria = User.objects.create_user(username='maria', password='testpass123')
+        _create_playbooks(maria, 3)
+        output = tmp_path / 'playbooks.zip'
+        stdout = io.StringIO()
+
+        call_command('export_playbooks', output=str(output), user='maria', stdout=stdout)
+
+        assert '[3/3] Playbook 2' in stdout.getvalue()
+        assert len(_read_zip(output.read_bytes())) == 4
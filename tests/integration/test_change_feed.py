@@ -0,0 +1,152 @@
+"""Integration tests for the incremental change feed.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import json
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+
+from methodology.models import Playbook, Workflow, Activity, Artifact, ChangeLogEntry
+from methodology.services.change_feed_service import ChangeFeedService
+from methodology.services.playbook_purge_service import PlaybookPurgeService
+from methodology.services.playbook_service import PlaybookService
+
+User = get_user_model()
+
+
+def _by_kind(page):
+    result = {}
+    for change in page['changes']:
+        result.setdefault(change['kind'], []).append(change)
+    return result
+
+
+@pytest.mark.django_db(transaction=True)
+class TestChangeFeed:
+    """Signals and bulk writers append to the log; the feed compacts it per row."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.PLAYBOOK_PURGE_ASYNC = False
+        self.maria = User.objects.create_user(username='maria', password='testpass123')
+        self.alex = User.objects.create_user(username='alex', password='testpass123')
+        self.playbook = Playbook.objects.create(
+            name='Feature Driven', description='FDD', category='development', author=self.maria
+        )
+        self.workflow = Workflow.objects.create(name='Design', playbook=self.playbook, order=1)
+        self.activity = Activity.objects.create(name='Model Domain', workflow=self.workflow, order=1)
+
+    def test_changes_since_cursor(self):
+        """Only changes after the cursor are returned, one per row with its current data."""
+        cursor = ChangeFeedService.latest_cursor(self.maria.pk)
+        self.activity.guidance = 'Draw the domain model'
+        self.activity.save()
+        self.activity.name = 'Model the Domain'
+        self.activity.save()
+        artifact = Artifact.objects.create(name='Spec', produced_by=self.activity, playbook=self.playbook)
+
+        page = ChangeFeedService.changes_since(self.maria.pk, cursor=cursor)
+        changes = _by_kind(page)
+
+        assert [c['data']['name'] for c in changes['activity']] == ['Model the Domain']
+        assert changes['artifact'][0]['id'] == artifact.pk
+        assert changes['artifact'][0]['data']['produced_by_id'] == self.activity.pk
+        assert page['cursor'] == ChangeFeedService.latest_cursor(self.maria.pk)
+        assert ChangeFeedService.changes_since(self.maria.pk, cursor=page['cursor'])['changes'] == []
+
+    def test_sequence_is_monotonic(self):
+        """Sequence numbers grow with every change."""
+        seqs = list(ChangeLogEntry.objects.values_list('seq', flat=True))
+        assert seqs == sorted(seqs)
+        assert len(set(seqs)) == len(seqs)
+
+    def test_delete_replaces_earlier_upserts(self):
+        """A row created and deleted after the cursor shows up only as a delete."""
+        cursor = ChangeFeedService.latest_cursor(self.maria.pk)
+        extra = Activity.objects.create(name='Scratch', workflow=self.workflow, order=2)
+        extra_id = extra.pk
+        extra.delete()
+
+        activity_changes = _by_kind(ChangeFeedService.changes_since(self.maria.pk, cursor=cursor))['activity']
+
+        assert [(c['id'], c['op']) for c in activity_changes] == [(extra_id, 'delete')]
+
+    def test_playbook_delete_covers_children(self):
+        """Deleting a playbook yields one delete, even after the purge removed its rows."""
+        cursor = ChangeFeedService.latest_cursor(self.maria.pk)
+        self.activity.save()
+        PlaybookPurgeService.mark_deleted(self.playbook.pk)
+
+        page = ChangeFeedService.changes_since(self.maria.pk, cursor=cursor)
+
+        assert [(c['kind'], c['id'], c['op']) for c in page['changes']] == [('playbook', self.playbook.pk, 'delete')]
+        assert not Workflow.objects.filter(pk=self.workflow.pk).exists()
+
+    def test_bulk_duplicate_is_recorded(self):
+        """Rows written by bulk duplication appear in the feed."""
+        cursor = ChangeFeedService.latest_cursor(self.maria.pk)
+        duplicate = PlaybookService.duplicate_playbook(self.playbook.pk, 'FDD Copy', self.maria)
+
+        changes = _by_kind(ChangeFeedService.changes_since(self.maria.pk, cursor=cursor))
+
+        assert [c['id'] for c in changes['playbook']] == [duplicate.pk]
+        assert changes['workflow'][0]['playbook_id'] == duplicate.pk
+        assert changes['activity'][0]['data']['name'] == 'Model Domain'
+
+    def test_feed_is_per_owner(self):
+        """Users only see changes to their own playbooks."""
+        assert ChangeFeedService.changes_since(self.alex.pk)['changes'] == []
+
+    def test_pagination(self):
+        """Pages follow the cursor until has_more is false."""
+        for order in range(2, 7):
+            Activity.objects.create(name=f'Step {order}', workflow=self.workflow, order=order)
+
+        cursor, seen = 0, []
+        while True:
+            page = ChangeFeedService.changes_since(self.maria.pk, cursor=cursor, limit=3)
+            seen.extend(c['id'] for c in page['changes'] if c['kind'] == 'activity')
+            cursor = page['cursor']
+            if not page['has_more']:
+                break
+
+        assert set(seen) == set(Activity.objects.values_list('pk', flat=True))
+
+    def test_api(self):
+        """The JSON endpoint serves the feed for the logged-in user."""
+        client = Client()
+        client.force_login(self.maria)
+
+        data = client.get(reverse('playbook_changes'), {'since': 0}).json()
+
+        assert {c['kind'] for c in data['changes']} >= {'playbook', 'workflow', 'activity'}
+        assert data['cursor'] == ChangeFeedService.latest_cursor(self.maria.pk)
+        assert client.get(reverse('playbook_changes'), {'since': 'x'}).status_code == 400
+
+    def test_api_limit_capped_at_page_size(self, settings):
+        """A limit above CHANGE_FEED_PAGE_SIZE reads one page of that size."""
+        settings.CHANGE_FEED_PAGE_SIZE = 2
+        client = Client()
+        client.force_login(self.maria)
+
+        data = client.get(reverse('playbook_changes'), {'since': 0, 'limit': 10 ** 9}).json()
+
+        seqs = ChangeLogEntry.objects.filter(owner_id=self.maria.pk).order_by('seq').values_list('seq', flat=True)
+        assert data['cursor'] == seqs[1]
+        assert data['has_more'] is True
+
+    def test_command(self):
+        """The command prints the feed as JSON."""
+        out, err = StringIO(), StringIO()
+        call_command('export_changes', '--user', 'maria', '--limit', '2', stdout=out, stderr=err)
+
+        data = json.loads(out.getvalue())
+        assert data['has_more'] is False
+        assert {c['kind'] for c in data['changes']} >= {'playbook', 'workflow', 'activity'}
+        assert f"next cursor {data['cursor']}" in err.getvalue()
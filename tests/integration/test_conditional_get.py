@@ -0,0 +1,89 @@
+"""Integration tests for conditional GET on detail pages."""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from methodology.models import Activity, Artifact
+
+User = get_user_model()
+
+
+@pytest.fixture
+def workflow(workflow):
+    """Design workflow with two linked activities."""
+    first = Activity.objects.create(name='Model Domain', workflow=workflow, order=1, guidance='# Model')
+    Activity.objects.create(name='Build List', workflow=workflow, order=2, predecessor=first)
+    return workflow
+
+
+def _urls(workflow):
+    activity = workflow.activities.first()
+    artifact = Artifact.objects.create(playbook=workflow.playbook, produced_by=activity, name='Domain Model')
+    return {
+        'playbook': reverse('playbook_detail', kwargs={'pk': workflow.playbook.pk}),
+        'workflow': reverse('workflow_detail', kwargs={'playbook_pk': workflow.playbook.pk, 'pk': workflow.pk}),
+        'activity': reverse('activity_detail', kwargs={
+            'playbook_pk': workflow.playbook.pk, 'workflow_pk': workflow.pk, 'activity_pk': activity.pk
+        }),
+        'artifact': reverse('artifact_detail', kwargs={'pk': artifact.pk}),
+    }
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """ETag/Last-Modified validators short-circuit unchanged pages."""
+
+    @pytest.mark.parametrize('page', ['playbook', 'workflow', 'activity', 'artifact'])
+    def test_unchanged_page_returns_304(self, client_maria, workflow, page):
+        """Repeating a request with the ETag returns 304 and revalidation headers."""
+        url = _urls(workflow)[page]
+
+        first = client_maria.get(url)
+        assert first.status_code == 200
+        assert 'no-cache' in first['Cache-Control'] and 'private' in first['Cache-Control']
+        assert first.has_header('Last-Modified')
+
+        second = client_maria.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        assert second.status_code == 304
+        assert second.content == b''
+
+    def test_304_skips_rendering(self, client_maria, workflow):
+        """A 304 runs only the validator queries, not the view."""
+        url = _urls(workflow)['workflow']
+        etag = client_maria.get(url)['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client_maria.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        # Playbook row, workflow row, activity aggregate; the rest is session/auth
+        assert len([q for q in queries if 'methodology_' in q['sql']]) == 3
+
+    def test_child_edit_changes_workflow_etag(self, client_maria, workflow):
+        """Editing an activity invalidates the workflow page (graph input)."""
+        url = _urls(workflow)['workflow']
+        etag = client_maria.get(url)['ETag']
+
+        activity = workflow.activities.last()
+        activity.name = 'Build Feature List'
+        activity.save()
+
+        assert client_maria.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_validator_is_per_user(self, client_maria, workflow):
+        """Another user's cached ETag never matches, and non-owners get no ETag."""
+        url = _urls(workflow)['playbook']
+        etag = client_maria.get(url)['ETag']
+        User.objects.create_user(username='alice', password='testpass123')
+        alice = Client()
+        alice.login(username='alice', password='testpass123')
+
+        response = alice.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 302
+        assert not response.has_header('ETag')
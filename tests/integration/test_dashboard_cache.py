@@ -0,0 +1,77 @@
+"""Integration tests for the cached per-user dashboard snapshot.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from methodology.models import Activity
+from methodology.services.activity_service import ActivityService
+from methodology.services.dashboard_service import DashboardService
+from methodology.services.playbook_service import PlaybookService
+
+
+@pytest.fixture
+def workflow(workflow):
+    """Design workflow with three activities."""
+    for order, name in enumerate(['Model Domain', 'Build List', 'Plan Feature'], start=1):
+        Activity.objects.create(name=name, workflow=workflow, order=order)
+    return workflow
+
+
+def _methodology_queries(client):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse('dashboard'))
+    assert response.status_code == 200
+    return [q for q in queries if 'methodology_' in q['sql']], response.content.decode()
+
+
+@pytest.mark.django_db
+class TestDashboardCache:
+    """Dashboards render from the snapshot; signals keep it current."""
+
+    def test_second_load_runs_no_methodology_queries(self, client_maria, workflow):
+        """The first load builds the snapshot, the second renders from cache."""
+        built, _ = _methodology_queries(client_maria)
+        cached, content = _methodology_queries(client_maria)
+
+        assert built
+        assert cached == []
+        assert 'FDD' in content
+        assert 'Plan Feature in Design workflow' in content
+
+    def test_signals_patch_snapshot(self, client_maria, maria, workflow):
+        """Creating and accessing activities updates counts and order in place."""
+        _methodology_queries(client_maria)
+
+        new = Activity.objects.create(name='Inspect Code', workflow=workflow, order=4)
+        first = workflow.activities.get(name='Model Domain')
+        ActivityService.touch_activity_access(first.pk)
+
+        snapshot = DashboardService.get_snapshot(maria)
+        assert snapshot['activity_count'] == 4
+        assert [a['id'] for a in snapshot['recent_activities'][:2]] == [first.pk, new.pk]
+        assert snapshot == DashboardService.build_snapshot(maria)
+
+    def test_activity_delete_updates_feed(self, maria, workflow):
+        """Deleting an activity removes it from the feed and the count."""
+        DashboardService.get_snapshot(maria)
+
+        workflow.activities.get(name='Build List').delete()
+
+        snapshot = DashboardService.get_snapshot(maria)
+        assert snapshot['activity_count'] == 2
+        assert 'Build List in Design workflow' not in [a['description'] for a in snapshot['recent_activities']]
+
+    def test_playbook_delete_drops_snapshot(self, client_maria, maria, workflow):
+        """Fast-path playbook delete bypasses signals, so the snapshot is dropped."""
+        _methodology_queries(client_maria)
+
+        PlaybookService.delete_playbook(workflow.playbook.pk)
+
+        _, content = _methodology_queries(client_maria)
+        assert 'Plan Feature' not in content
+        assert DashboardService.get_snapshot(maria)['playbook_count'] == 0
@@ -0,0 +1,85 @@
+"""Integration tests for change-keyed template fragment caching."""
+
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+
+from methodology.models import Playbook, Workflow, Activity
+
+
+@pytest.fixture
+def workflow(workflow):
+    """Design workflow with an activity whose guidance is Markdown."""
+    Activity.objects.create(name='Model Domain', workflow=workflow, order=1, guidance='Draw the **model**')
+    return workflow
+
+
+@pytest.mark.django_db
+class TestFragmentCache:
+    """Fragments are reused until the playbook or anything in it changes."""
+
+    def test_repeat_render_hits_cache(self, client_maria, workflow):
+        """Second view of the activity list is served from the fragment cache."""
+        url = reverse('activity_list', kwargs={'playbook_pk': workflow.playbook.pk, 'workflow_pk': workflow.pk})
+
+        first = client_maria.get(url)
+        second = client_maria.get(url)
+
+        assert first.content == second.content
+        assert b'Draw the model' in second.content
+        assert caches['template_fragments'].stats() == {'hits': 1, 'misses': 1, 'ratio': 0.5}
+
+    def test_edit_bumps_version_and_invalidates(self, client_maria, workflow):
+        """Adding an activity changes the playbook version, so lists re-render."""
+        urls = [
+            reverse('playbook_detail', kwargs={'pk': workflow.playbook.pk}),
+            reverse('workflow_list', kwargs={'playbook_pk': workflow.playbook.pk}),
+            reverse('activity_list', kwargs={'playbook_pk': workflow.playbook.pk, 'workflow_pk': workflow.pk}),
+        ]
+        for url in urls:
+            client_maria.get(url)
+
+        build = Workflow.objects.create(name='Build', playbook=workflow.playbook, order=2)
+        Activity.objects.create(name='Plan Feature', workflow=workflow, order=2)
+
+        assert b'<strong>Build</strong>' in client_maria.get(urls[0]).content
+        assert f'workflow-row-{build.pk}'.encode() in client_maria.get(urls[1]).content
+        assert b'Plan Feature' in client_maria.get(urls[2]).content
+        assert caches['template_fragments'].stats()['hits'] == 0
+
+    def test_active_playbook_edits_invalidate(self, client_maria, workflow):
+        """Edits to an active playbook, which keep its version, still re-render every list."""
+        playbook = workflow.playbook
+        playbook.status = 'active'
+        playbook.save()
+        urls = [
+            reverse('playbook_detail', kwargs={'pk': playbook.pk}),
+            reverse('workflow_list', kwargs={'playbook_pk': playbook.pk}),
+            reverse('activity_list', kwargs={'playbook_pk': playbook.pk, 'workflow_pk': workflow.pk}),
+        ]
+        for url in urls:
+            client_maria.get(url)
+        version = Playbook.objects.get(pk=playbook.pk).version
+
+        activity = Activity.objects.get(workflow=workflow, name='Model Domain')
+        activity.name = 'Model Overall Domain'
+        activity.save()
+        assert b'Model Overall Domain' in client_maria.get(urls[2]).content
+
+        Activity.objects.create(name='Plan Feature', workflow=workflow, order=2)
+        assert b'Plan Feature' in client_maria.get(urls[2]).content
+
+        build = Workflow.objects.create(name='Build', playbook=playbook, order=2)
+        assert b'<strong>Build</strong>' in client_maria.get(urls[0]).content
+        assert f'workflow-row-{build.pk}'.encode() in client_maria.get(urls[1]).content
+        assert Playbook.objects.get(pk=playbook.pk).version == version
+        assert caches['template_fragments'].stats()['hits'] == 0
+
+    def test_edit_buttons_not_shared_across_permissions(self, client_maria, workflow):
+        """Releasing the playbook re-renders rows without edit buttons."""
+        url = reverse('workflow_list', kwargs={'playbook_pk': workflow.playbook.pk})
+        assert b'Edit workflow' in client_maria.get(url).content
+
+        workflow.playbook.release()
+
+        assert b'Edit workflow' not in client_maria.get(url).content
@@ -0,0 +1,207 @@
+"""Integration tests for the compact .mpb playbook library format.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import io
+import json
+import os
+import struct
+import threading
+import zlib
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from methodology.models import Playbook, Workflow, Activity, Artifact, ArtifactInput
+from methodology.services.playbook_export_service import PlaybookExportService
+from methodology.services.playbook_import_service import PlaybookImportService, PlaybookImportError
+from methodology.services.playbook_package_service import PlaybookPackageService
+from methodology.utils.library_codec import MAGIC, LibraryCodecError, encode_library, iter_documents
+
+User = get_user_model()
+
+
+def _create_playbook(author, name, activities=4):
+    """Playbook with a chain of activities, an artifact and an input."""
+    playbook = Playbook.objects.create(name=name, description='Library', category='development', author=author)
+    workflow = Workflow.objects.create(name='Flow', playbook=playbook, order=1)
+    previous = None
+    for order in range(1, activities + 1):
+        previous = Activity.objects.create(
+            name=f'Step {order}', workflow=workflow, order=order, predecessor=previous, guidance=f'Do step {order}',
+        )
+    first, last = Activity.objects.filter(workflow=workflow).order_by('order')[::activities - 1]
+    artifact = Artifact.objects.create(name='Plan', produced_by=first, playbook=playbook, type='Document')
+    ArtifactInput.objects.create(artifact=artifact, activity=last)
+    return playbook
+
+
+def _raw_library(*blocks):
+    """Frame the given blocks as an .mpb stream, as a hand-made upload would."""
+    frames = []
+    for block in blocks:
+        payload = zlib.compress(json.dumps(block).encode())
+        frames.append(struct.pack('>I', len(payload)) + payload)
+    return io.BytesIO(MAGIC + b''.join(frames))
+
+
+def _export_document(playbook):
+    """Deep JSON export of a playbook, parsed, without its export timestamp."""
+    document = json.loads(''.join(PlaybookExportService.iter_json(playbook)))
+    document.pop('exported_at')
+    return document
+
+
+@pytest.mark.django_db
+class TestLibraryCodec:
+    """Maria moves her playbook library to another instance as one .mpb file."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.maria = User.objects.create_user(username='maria', password='testpass123')
+        self.playbooks = [_create_playbook(self.maria, f'Playbook {number}') for number in range(3)]
+
+    def library(self, playbooks=None):
+        return b''.join(PlaybookPackageService.iter_library(playbooks or self.playbooks))
+
+    def test_decodes_to_json_export(self):
+        """Every playbook decodes to the same document as its JSON export, with a fixed number of queries."""
+        with CaptureQueriesContext(connection) as one:
+            self.library(self.playbooks[:1])
+        with CaptureQueriesContext(connection) as three:
+            data = self.library()
+
+        assert data.startswith(MAGIC)
+        assert len(three.captured_queries) == len(one.captured_queries)
+        documents = list(iter_documents(io.BytesIO(data)))
+        for document in documents:
+            document.pop('exported_at')
+        assert documents == [_export_document(playbook) for playbook in self.playbooks]
+
+    def test_smaller_than_json(self):
+        """The library is a fraction of the size of the JSON exports."""
+        playbook = _create_playbook(self.maria, 'Large', activities=300)
+        json_size = len(''.join(PlaybookExportService.iter_json(playbook)).encode())
+
+        assert len(self.library([playbook])) < json_size / 4
+
+    def test_unseekable_stream_read_in_pieces(self):
+        """A library arriving through a pipe in short reads decodes the same."""
+        data = self.library()
+        read_fd, write_fd = os.pipe()
+
+        def feed():
+            with os.fdopen(write_fd, 'wb', buffering=0) as pipe:
+                for start in range(0, len(data), 7):
+                    pipe.write(data[start:start + 7])
+
+        writer = threading.Thread(target=feed)
+        writer.start()
+        with os.fdopen(read_fd, 'rb', buffering=0) as pipe:
+            names = [document['name'] for document in iter_documents(pipe)]
+        writer.join()
+
+        assert names == ['Playbook 0', 'Playbook 1', 'Playbook 2']
+
+    def test_truncated_or_corrupt_library_rejected(self):
+        """Cut-off and damaged files are errors, never partial libraries."""
+        data = self.library()
+
+        with pytest.raises(LibraryCodecError, match='truncated'):
+            list(iter_documents(io.BytesIO(data[:-10])))
+        with pytest.raises(LibraryCodecError, match='corrupt'):
+            list(iter_documents(io.BytesIO(data[:40] + b'\x00' * 8 + data[48:])))
+        with pytest.raises(LibraryCodecError, match='Not an .mpb'):
+            list(iter_documents(io.BytesIO(b'{"name": "FDD"}')))
+
+    def test_wrongly_typed_blocks_rejected(self):
+        """Well-formed JSON of the wrong shape is a codec error, which the web import lists."""
+        library = ['library', {'format': 'mimir.mpb', 'format_version': 1}]
+        playbook = ['playbook', {'name': 'FDD'}]
+        end = ['end', {'playbooks': 1}]
+        cases = [
+            ([['library', {'format': 'mimir.mpb', 'format_version': '1'}], playbook, end], 'not a number'),
+            ([library, playbook, ['rows', ['workflows'], ['id'], [[1]]], end], 'unknown section'),
+            ([library, playbook, ['rows', 'workflows', 5, [[1]]], end], 'named columns'),
+            ([library, playbook, ['rows', 'workflows', ['id'], [1]], end], 'named columns'),
+            ([library, ['playbook', {'name': 'FDD', 'workflows': 'abc'}], ['rows', 'workflows', ['id'], [[1]]], end],
+             'non-list'),
+        ]
+        for blocks, message in cases:
+            with pytest.raises(LibraryCodecError, match=message):
+                list(iter_documents(_raw_library(*blocks)))
+            with pytest.raises(PlaybookImportError, match=message):
+                PlaybookImportService.load(_raw_library(*blocks))
+
+    def test_rows_with_other_keys_get_their_own_block(self):
+        """Rows that do not share the first row's keys survive the column layout."""
+        header = {'name': 'Mixed'}
+        rows = [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b', 'extra': True}, {'id': 3, 'name': 'c'}]
+        data = b''.join(encode_library([(header, [('workflows', rows), ('versions', [])])], rows_per_block=2))
+
+        assert list(iter_documents(io.BytesIO(data))) == [{'name': 'Mixed', 'workflows': rows, 'versions': []}]
+
+    def test_import_command_copies_library(self, tmp_path):
+        """import_playbooks recreates every playbook with its dependencies for another user."""
+        path = tmp_path / 'library.mpb'
+        call_command('export_playbooks', output=str(path), format='mpb', stdout=StringIO())
+        User.objects.create_user(username='mike', password='testpass123')
+        out = StringIO()
+
+        call_command('import_playbooks', input=str(path), user='mike', stdout=out)
+
+        assert 'Imported 3 playbooks' in out.getvalue()
+        copies = Playbook.objects.filter(author__username='mike').order_by('name')
+        assert [playbook.name for playbook in copies] == ['Playbook 0', 'Playbook 1', 'Playbook 2']
+        for copy in copies:
+            steps = {activity.name: activity for activity in Activity.objects.filter(workflow__playbook=copy)}
+            assert steps['Step 2'].predecessor == steps['Step 1']
+            assert ArtifactInput.objects.get(artifact__playbook=copy).activity == steps['Step 4']
+
+    def test_single_playbook_library_imports_through_load(self):
+        """The export view's .mpb download is accepted by the web import; a whole library is not."""
+        client = Client()
+        client.force_login(self.maria)
+        response = client.get(reverse('playbook_export', kwargs={'pk': self.playbooks[0].pk}), {'format': 'mpb'})
+        assert response['Content-Disposition'].endswith('.mpb"')
+
+        source = PlaybookImportService.load(io.BytesIO(b''.join(response.streaming_content)))
+        assert source.document['name'] == 'Playbook 0'
+        assert PlaybookImportService.validate(source)['activities'] == 4
+
+        library = self.library()
+        stream = io.BytesIO(library)
+        with pytest.raises(PlaybookImportError, match='holds more than one playbook'):
+            PlaybookImportService.load(stream)
+        # Stopped at the second playbook's header, without reading the rest
+        assert stream.tell() < len(library) / 2
+
+    def test_bulk_export_view_as_library(self):
+        """Bulk export with format=mpb downloads one library of the selected playbooks."""
+        client = Client()
+        client.force_login(self.maria)
+
+        response = client.get(
+            reverse('playbook_bulk_export'), {'ids': [self.playbooks[0].pk, self.playbooks[2].pk], 'format': 'mpb'},
+        )
+
+        assert response['Content-Disposition'].endswith('.mpb"')
+        documents = iter_documents(io.BytesIO(b''.join(response.streaming_content)))
+        assert [document['name'] for document in documents] == ['Playbook 0', 'Playbook 2']
+
+
+def test_benchmark_command_reports_every_format():
+    """The benchmark round-trips a small synthetic library through every format."""
+    out = StringIO()
+
+    call_command('benchmark_library_codecs', playbooks=2, activities=100, repeat=1, stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert [line.split()[0] for line in lines[2:]] == ['json', 'json', 'zip', 'mpb']
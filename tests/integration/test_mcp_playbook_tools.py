@@ -71,6 +71,26 @@ class TestMCPPlaybookCreate:
             await create_playbook(name="React Component Development", description="Different", category="frontend")
 
 
+@pytest.mark.django_db(transaction=True)
+class TestMCPPlaybookList:
+    """List playbooks with tag filter."""
+    
+    @pytest.mark.asyncio
+    async def test_list_playbooks_filtered_by_tag(self, setup_user_context):
+        """Scenario: list_playbooks(tag=...) returns only tagged playbooks"""
+        await sync_to_async(Playbook.objects.create)(
+            name="Scrum", description="Agile", category="development", author=setup_user_context, tags=["Agile"]
+        )
+        await sync_to_async(Playbook.objects.create)(
+            name="Waterfall", description="Sequential", category="development", author=setup_user_context, tags=["sequential"]
+        )
+        
+        result = await list_playbooks(tag="agile")
+        
+        assert [p['name'] for p in result] == ["Scrum"]
+        assert result[0]['tags'] == ["Agile"]
+
+
 @pytest.mark.django_db(transaction=True)
 class TestMCPPlaybookUpdate:
     """MCP-PB-10 to MCP-PB-13: Update playbook scenarios."""
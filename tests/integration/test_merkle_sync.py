@@ -0,0 +1,177 @@
+"""Integration tests for Merkle-tree diffing of playbook copies against a Homebase stand-in.
+
+The stand-in runs as a separate process (manage.py homebase_standin)
+serving JSON exports; the local side is a playbook in the test database.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import reverse
+
+from methodology.models import Playbook, Workflow, Activity, Artifact, ArtifactInput
+from methodology.services.merkle_service import MerkleService, MerkleTree, RemoteMerkleTree
+from methodology.services.playbook_export_service import PlaybookExportService
+
+User = get_user_model()
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture(scope='module')
+def homebase(tmp_path_factory):
+    """Start the Homebase stand-in on a free port; yields (data dir, base URL)."""
+    data_dir = tmp_path_factory.mktemp('homebase')
+    process = subprocess.Popen(
+        [sys.executable, 'manage.py', 'homebase_standin', '--data-dir', str(data_dir), '--port', '0'],
+        cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        line = process.stdout.readline()
+        assert 'listening on' in line, f"Stand-in did not start: {line!r}"
+        yield data_dir, line.rsplit(' ', 1)[1].strip()
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def export_document(playbook):
+    """Deep JSON export of a playbook, parsed."""
+    return json.loads(''.join(PlaybookExportService.iter_json(playbook)))
+
+
+def publish(homebase, name, document):
+    """Store Mike's copy on the stand-in; returns a client for its tree."""
+    data_dir, base_url = homebase
+    (data_dir / f'{name}.json').write_text(json.dumps(document))
+    return RemoteMerkleTree(f'{base_url}playbooks/{name}/merkle/')
+
+
+@pytest.mark.django_db
+class TestMerkleSync:
+    """Maria's local playbook is diffed against Mike's copy on Homebase."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """FDD playbook with a dependency chain, an artifact and an input."""
+        self.maria = User.objects.create_user(username='maria', password='testpass123')
+        self.playbook = Playbook.objects.create(
+            name='Feature Driven', description='FDD', category='development', tags=['agile'],
+            visibility='family', author=self.maria,
+        )
+        self.design = Workflow.objects.create(name='Design', playbook=self.playbook, order=1)
+        self.build = Workflow.objects.create(name='Build', playbook=self.playbook, order=2)
+        self.model = Activity.objects.create(name='Model Domain', workflow=self.design, order=1, guidance='Model it')
+        self.listing = Activity.objects.create(
+            name='Build List', workflow=self.design, order=2, predecessor=self.model,
+        )
+        self.model.successor = self.listing
+        self.model.save()
+        self.code = Activity.objects.create(name='Code', workflow=self.build, order=1)
+        self.spec = Artifact.objects.create(
+            name='Spec', produced_by=self.model, playbook=self.playbook, type='Document',
+        )
+        ArtifactInput.objects.create(artifact=self.spec, activity=self.code)
+
+    def test_identical_copies_need_one_roundtrip(self, homebase):
+        """Same content under different ids hashes the same; the roots match at once."""
+        remote = publish(homebase, 'identical', export_document(self.playbook))
+
+        assert MerkleService.diff(MerkleService.tree(self.playbook), remote) == []
+        assert remote.roundtrips == 1
+
+    def test_diff_reports_changed_subtrees(self, homebase):
+        """Edits, additions and removals on Mike's side are located by path."""
+        document = export_document(self.playbook)
+        model = next(row for row in document['activities'] if row['name'] == 'Model Domain')
+        model['guidance'] = 'Model it with the domain experts'
+        listing = next(row for row in document['activities'] if row['name'] == 'Build List')
+        document['artifacts'].append({
+            'id': 900, 'produced_by_id': listing['id'], 'name': 'Glossary', 'description': '',
+            'type': 'Document', 'is_required': True, 'template_file': '',
+        })
+        code = next(row for row in document['activities'] if row['name'] == 'Code')
+        document['activities'].remove(code)
+        document['artifact_inputs'] = []
+        document['workflows'].append({'id': 901, 'name': 'Deploy', 'description': '', 'order': 3})
+        remote = publish(homebase, 'edited', document)
+
+        changes = MerkleService.diff(MerkleService.tree(self.playbook), remote)
+
+        assert changes == [
+            {'path': ['Build', 'Code'], 'kind': 'activity', 'status': 'local_only'},
+            {'path': ['Deploy'], 'kind': 'workflow', 'status': 'remote_only'},
+            {'path': ['Design', 'Build List', 'Glossary'], 'kind': 'artifact', 'status': 'remote_only'},
+            {'path': ['Design', 'Model Domain'], 'kind': 'activity', 'status': 'changed'},
+        ]
+
+    def test_roundtrips_grow_with_log_of_size(self, homebase):
+        """One changed activity among hundreds is found in a handful of roundtrips."""
+        Activity.objects.bulk_create([
+            Activity(name=f'Feature {number:03}', workflow=self.build, order=number + 2) for number in range(300)
+        ])
+        document = export_document(self.playbook)
+        feature = next(row for row in document['activities'] if row['name'] == 'Feature 123')
+        feature['phase'] = 'Construction'
+        remote = publish(homebase, 'large', document)
+
+        changes = MerkleService.diff(MerkleService.tree(self.playbook), remote)
+
+        assert changes == [{'path': ['Build', 'Feature 123'], 'kind': 'activity', 'status': 'changed'}]
+        assert remote.roundtrips <= 10
+
+    def test_hashes_cached_and_cleared_on_write(self, django_assert_max_num_queries):
+        """Reads reuse cached hashes; a write clears only what it makes stale."""
+        tree = MerkleService.tree(self.playbook)
+        assert not Activity.objects.filter(merkle_hash='').exists()
+        assert Playbook.objects.get(pk=self.playbook.pk).merkle_hash == tree.hash
+        with django_assert_max_num_queries(1):
+            assert MerkleService.root_hash(self.playbook) == tree.hash
+
+        self.model.name = 'Model the Domain'
+        self.model.save()
+
+        stale = set(Activity.objects.filter(merkle_hash='').values_list('name', flat=True))
+        # Build List names Model Domain as its predecessor
+        assert stale == {'Model the Domain', 'Build List'}
+        assert Playbook.objects.get(pk=self.playbook.pk).merkle_hash == ''
+        rebuilt = MerkleService.tree(self.playbook)
+        assert rebuilt.hash == MerkleTree.from_document(export_document(self.playbook)).hash
+        assert rebuilt.hash != tree.hash
+
+    def test_artifact_and_delete_clear_dependents(self):
+        """Renaming an input artifact or deleting a predecessor clears the activities that name it."""
+        MerkleService.tree(self.playbook)
+
+        self.spec.name = 'Specification'
+        self.spec.save()
+        assert set(Activity.objects.filter(merkle_hash='').values_list('name', flat=True)) == {'Code'}
+
+        MerkleService.tree(self.playbook)
+        self.model.delete()
+        # Build List loses its predecessor; Code loses the Spec input deleted with it
+        assert set(Activity.objects.filter(merkle_hash='').values_list('name', flat=True)) == {'Build List', 'Code'}
+        assert MerkleService.tree(self.playbook).hash == MerkleTree.from_document(export_document(self.playbook)).hash
+
+    def test_merkle_endpoint(self):
+        """Peers query a playbook's tree over HTTP; only the owner may."""
+        client = Client()
+        client.login(username='maria', password='testpass123')
+        url = reverse('playbook_merkle', kwargs={'pk': self.playbook.pk})
+
+        response = client.get(url, {'op': 'children', 'path': json.dumps(['Design'])})
+        assert response.status_code == 200
+        assert set(response.json()['children']) == {'', 'Model Domain', 'Build List'}
+        assert client.get(url).json()['hash'] == MerkleService.root_hash(self.playbook)
+        assert client.get(url, {'path': json.dumps(['Nope'])}).status_code == 400
+
+        User.objects.create_user(username='mike', password='testpass123')
+        client.login(username='mike', password='testpass123')
+        assert client.get(url).status_code == 403
@@ -92,15 +92,16 @@ class TestDeleteModal:
 class TestConfirmDeletion:
     """PB-DELETE-05 to PB-DELETE-08: Confirming deletion"""
     
-    def test_confirm_deletion(self, client_maria, playbook_old_patterns):
+    def test_confirm_deletion(self, client_maria, playbook_old_patterns, django_capture_on_commit_callbacks):
         """PB-DELETE-05: Confirm deletion"""
         url = reverse('playbook_delete', kwargs={'pk': playbook_old_patterns.pk})
         
         # Verify playbook exists
         assert Playbook.objects.filter(pk=playbook_old_patterns.pk).exists()
         
-        # DELETE the playbook
-        response = client_maria.post(url)
+        # DELETE the playbook (children are purged once the request commits)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client_maria.post(url)
         
         # Should redirect to list
         assert response.status_code == 302
@@ -0,0 +1,118 @@
+"""Integration tests for deep playbook duplication.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from methodology.models import Playbook, Workflow, Activity, Artifact, ArtifactInput, TemplateBlob
+from methodology.services.playbook_service import PlaybookService
+from methodology.signals import suspend_version_signals
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestPlaybookDuplicate:
+    """Duplicates copy the whole playbook graph with bulk queries."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, tmp_path):
+        """Playbook with two workflows, a dependency chain, an artifact and an input."""
+        settings.MEDIA_ROOT = tmp_path
+        self.maria = User.objects.create_user(username='maria', password='testpass123')
+        self.alex = User.objects.create_user(username='alex', password='testpass123')
+        self.playbook = Playbook.objects.create(
+            name='Feature Driven', description='FDD', category='development', tags=['agile'],
+            visibility='family', author=self.maria,
+        )
+        design = Workflow.objects.create(name='Design', playbook=self.playbook, order=1)
+        build = Workflow.objects.create(name='Build', playbook=self.playbook, order=2)
+        first = Activity.objects.create(name='Model Domain', workflow=design, order=1, phase='Inception')
+        second = Activity.objects.create(name='Build List', workflow=design, order=2, predecessor=first)
+        first.successor = second
+        first.save()
+        coding = Activity.objects.create(name='Code', workflow=build, order=1)
+        artifact = Artifact.objects.create(
+            name='Spec', produced_by=first, playbook=self.playbook, type='Document',
+            template_file=SimpleUploadedFile('spec.md', b'# Spec\n'),
+        )
+        ArtifactInput.objects.create(artifact=artifact, activity=coding, is_required=False)
+
+    def test_deep_copy(self):
+        """Every row is copied and references point at the copies."""
+        duplicate = PlaybookService.duplicate_playbook(self.playbook.pk, 'FDD Copy', self.alex)
+
+        assert duplicate.author == self.alex
+        assert duplicate.version == Decimal('0.1')
+        assert duplicate.visibility == 'private'
+        assert duplicate.tags == ['agile']
+        design, build = duplicate.workflows.order_by('order')
+        assert (design.name, design.abbreviation) == ('Design', self.playbook.workflows.get(name='Design').abbreviation)
+        first, second = design.activities.order_by('order')
+        assert first.phase == 'Inception'
+        assert second.predecessor == first
+        assert first.successor == second
+        artifact = duplicate.artifacts.get()
+        assert artifact.produced_by == first
+        assert artifact.template_file.name == self.playbook.artifacts.get().template_file.name
+        artifact_input = artifact.inputs.get()
+        assert artifact_input.activity == build.activities.get()
+        assert artifact_input.is_required is False
+        assert Activity.objects.filter(workflow__playbook=self.playbook).count() == 3
+
+    def test_template_blob_shared(self):
+        """The copy holds its own reference on the shared template blob."""
+        blob = TemplateBlob.objects.get()
+        before = blob.ref_count
+
+        PlaybookService.duplicate_playbook(self.playbook.pk, 'FDD Copy', self.maria)
+
+        blob.refresh_from_db()
+        assert blob.ref_count == before + 1
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """A 1,000-activity playbook copies in a handful of batched queries."""
+        def count_queries(name):
+            with CaptureQueriesContext(connection) as ctx:
+                PlaybookService.duplicate_playbook(self.playbook.pk, name, self.maria)
+            return len(ctx.captured_queries)
+
+        small = count_queries('Small Copy')
+        workflow = self.playbook.workflows.get(name='Build')
+        with suspend_version_signals():
+            previous = None
+            for order in range(2, 1001):
+                previous = Activity.objects.create(
+                    name=f'Step {order}', workflow=workflow, order=order, predecessor=previous
+                )
+        large = count_queries('Large Copy')
+
+        # Only the database's bulk batch size adds queries, never the row count
+        assert small < 20
+        assert large < 45
+        copy = Playbook.objects.get(name='Large Copy')
+        assert Activity.objects.filter(workflow__playbook=copy, predecessor__isnull=False).count() == 999
+
+    def test_duplicate_view(self):
+        """The duplicate action copies the graph and rejects taken names."""
+        client = Client()
+        client.force_login(self.maria)
+        url = reverse('playbook_duplicate', kwargs={'pk': self.playbook.pk})
+
+        response = client.post(url, {'new_name': 'FDD Copy'})
+        duplicate = Playbook.objects.get(name='FDD Copy')
+        assert response.url == reverse('playbook_detail', kwargs={'pk': duplicate.pk})
+        assert duplicate.workflows.count() == 2
+
+        response = client.post(url, {'new_name': 'FDD Copy'})
+        assert response.url == reverse('playbook_detail', kwargs={'pk': self.playbook.pk})
+        assert Playbook.objects.filter(name='FDD Copy').count() == 1
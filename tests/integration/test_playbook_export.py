@@ -0,0 +1,129 @@
+"""Integration tests for the streaming deep JSON export of a playbook.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import json
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from methodology.models import Playbook, Workflow, Activity, Artifact, ArtifactInput
+from methodology.services.playbook_export_service import PlaybookExportService
+from methodology.services.playbook_version_service import PlaybookVersionService
+
+User = get_user_model()
+
+
+def _seed(activities_per_workflow=2, workflows=1):
+    """Playbook with linked activities, an artifact consumed downstream and two versions."""
+    maria = User.objects.create_user(username='maria', password='testpass123')
+    playbook = Playbook.objects.create(
+        name='Feature Driven', description='FDD', category='development', author=maria, tags=['agile']
+    )
+    for w in range(workflows):
+        workflow = Workflow.objects.create(name=f'Workflow {w}', playbook=playbook, order=w + 1)
+        previous = None
+        for a in range(activities_per_workflow):
+            activity = Activity.objects.create(
+                name=f'Activity {w}.{a}', workflow=workflow, order=a + 1,
+                guidance='Walk through the domain. ' * 20, predecessor=previous,
+            )
+            if previous is not None:
+                previous.successor = activity
+                previous.save()
+            previous = activity
+    first, second = Activity.objects.filter(workflow__playbook=playbook).order_by('id')[:2]
+    artifact = Artifact.objects.create(name='Domain Model', produced_by=first, playbook=playbook)
+    ArtifactInput.objects.create(artifact=artifact, activity=second, is_required=True)
+    PlaybookVersionService.record_version(playbook, {'name': 'Feature Driven', 'status': 'draft'}, 'Initial')
+    PlaybookVersionService.record_version(playbook, {'name': 'Feature Driven', 'status': 'released'}, 'Release')
+    return maria, playbook
+
+
+@pytest.mark.django_db
+class TestPlaybookExport:
+    """The export contains the full structure and is streamed."""
+
+    def test_export_contains_full_structure(self):
+        """Workflows, activity dependencies, artifacts, inputs and versions are exported."""
+        maria, playbook = _seed()
+        client = Client()
+        client.force_login(maria)
+
+        response = client.get(reverse('playbook_export', kwargs={'pk': playbook.pk}))
+
+        assert response.status_code == 200
+        assert response.streaming
+        playbook.refresh_from_db()
+        assert response['Content-Disposition'] == f'attachment; filename="feature-driven-v{playbook.version}.json"'
+        data = json.loads(b''.join(response.streaming_content))
+        assert data['format'] == 'mimir.playbook'
+        assert data['name'] == 'Feature Driven'
+        assert data['tags'] == ['agile']
+        first, second = data['activities']
+        assert first['workflow_id'] == data['workflows'][0]['id']
+        assert first['successor_id'] == second['id']
+        assert second['predecessor_id'] == first['id']
+        assert data['artifacts'][0]['produced_by_id'] == first['id']
+        assert data['artifact_inputs'][0]['activity_id'] == second['id']
+        assert [v['snapshot'].get('status') for v in data['versions']][-2:] == ['draft', 'released']
+
+    def test_export_filename_is_escaped(self):
+        """Quotes and non-ASCII characters in the playbook name cannot break the header."""
+        maria, playbook = _seed()
+        playbook.name = 'Spé "quoted"'
+        playbook.save()
+        client = Client()
+        client.force_login(maria)
+
+        response = client.get(reverse('playbook_export', kwargs={'pk': playbook.pk}))
+
+        playbook.refresh_from_db()
+        assert response['Content-Disposition'] == (
+            f"attachment; filename*=utf-8''sp%C3%A9-%22quoted%22-v{playbook.version}.json"
+        )
+
+    def test_export_query_count_independent_of_size(self):
+        """Large playbooks are read in the same number of queries and emitted in several chunks."""
+        _, playbook = _seed(activities_per_workflow=150, workflows=4)
+
+        with CaptureQueriesContext(connection) as ctx:
+            chunks = list(PlaybookExportService.iter_json(playbook, chunk_size=50))
+
+        assert len(ctx.captured_queries) == 5
+        assert len(chunks) > 1
+        assert len(json.loads(''.join(chunks))['activities']) == 600
+
+    def test_only_owner_can_export(self):
+        """Other users are redirected back to the playbook."""
+        _, playbook = _seed()
+        client = Client()
+        client.force_login(User.objects.create_user(username='bob', password='testpass123'))
+
+        response = client.get(reverse('playbook_export', kwargs={'pk': playbook.pk}))
+
+        assert response.status_code == 302
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPlaybookExportAsgi:
+    """Under ASGI the export is served from an async iterator."""
+
+    @pytest.mark.asyncio
+    async def test_asgi_export_streams_asynchronously(self):
+        """The ASGI handler gets an async iterator instead of a list to buffer."""
+        maria, playbook = await sync_to_async(_seed)()
+        client = AsyncClient()
+        await client.aforce_login(maria)
+
+        response = await client.get(reverse('playbook_export', kwargs={'pk': playbook.pk}))
+
+        assert response.is_async
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        assert len(json.loads(body)['activities']) == 2
@@ -0,0 +1,284 @@
+"""Integration tests for bulk playbook import.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import hashlib
+import io
+import json
+import struct
+import zipfile
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from methodology.models import Playbook, Workflow, Activity, Artifact, ArtifactInput
+from methodology.services.playbook_export_service import PlaybookExportService
+from methodology.services.playbook_import_service import (
+    PlaybookImportService, PlaybookImportError, ImportConflict,
+)
+from methodology.services.playbook_package_service import (
+    BLOB_PREFIX, MANIFEST_NAME, RECORDS_NAME, PlaybookPackageService,
+)
+from methodology.services.playbook_version_service import PlaybookVersionService
+
+User = get_user_model()
+
+TEMPLATE_BODY = b"# Specification\n" + b"Describe the feature.\n" * 100
+
+
+def _json_upload(playbook):
+    data = ''.join(PlaybookExportService.iter_json(playbook)).encode()
+    return SimpleUploadedFile('export.json', data, content_type='application/json')
+
+
+def _mpa_upload(playbook):
+    data = b''.join(PlaybookPackageService.iter_mpa(playbook))
+    return SimpleUploadedFile('export.mpa', data, content_type='application/zip')
+
+
+def _malformed_mpa_upload(records, corrupt=False):
+    """
+    Package whose playbook.jsonl holds the given bytes, listed with matching checksums.
+
+    :param records: records entry content as bytes
+    :param corrupt: overwrite the start of the deflated records with an invalid block
+    :returns: SimpleUploadedFile
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(RECORDS_NAME, records)
+        archive.writestr(MANIFEST_NAME, json.dumps({'format': 'mimir.mpa', 'entries': {
+            RECORDS_NAME: {'size': len(records), 'sha256': hashlib.sha256(records).hexdigest()},
+        }}))
+    data = bytearray(buffer.getvalue())
+    if corrupt:
+        info = zipfile.ZipFile(io.BytesIO(bytes(data))).getinfo(RECORDS_NAME)
+        name_length, extra_length = struct.unpack('<HH', data[info.header_offset + 26:info.header_offset + 30])
+        data[info.header_offset + 30 + name_length + extra_length] = 0xFF
+    return SimpleUploadedFile('broken.mpa', bytes(data), content_type='application/zip')
+
+
+@pytest.mark.django_db
+class TestPlaybookImport:
+    """Imports recreate the playbook graph with remapped ids in a few bulk queries."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, tmp_path):
+        """Exported playbook owned by Maria, imported by Alex."""
+        settings.MEDIA_ROOT = tmp_path / 'media'
+        settings.IMPORT_STASH_DIR = tmp_path / 'stash'
+        self.maria = User.objects.create_user(username='maria', password='testpass123')
+        self.alex = User.objects.create_user(username='alex', password='testpass123')
+        self.playbook = Playbook.objects.create(
+            name='Feature Driven', description='FDD', category='development', author=self.maria
+        )
+        workflow = Workflow.objects.create(name='Design', playbook=self.playbook, order=1)
+        first = Activity.objects.create(name='Model Domain', workflow=workflow, order=1)
+        second = Activity.objects.create(name='Build List', workflow=workflow, order=2, predecessor=first)
+        artifact = Artifact.objects.create(
+            name='Spec', produced_by=first, playbook=self.playbook,
+            template_file=SimpleUploadedFile('spec.md', TEMPLATE_BODY),
+        )
+        ArtifactInput.objects.create(artifact=artifact, activity=second)
+        PlaybookVersionService.record_version(self.playbook, {'name': 'Feature Driven', 'status': 'draft'}, 'Initial')
+        PlaybookVersionService.record_version(self.playbook, {'name': 'Feature Driven', 'status': 'active'}, 'Release')
+        self.playbook.refresh_from_db()
+
+    def _assert_graph(self, imported):
+        assert imported.author == self.alex
+        assert imported.source == 'owned'
+        workflow = imported.workflows.get()
+        assert workflow.abbreviation
+        first, second = workflow.activities.order_by('order')
+        assert second.predecessor == first
+        assert first.pk not in Activity.objects.filter(workflow__playbook=self.playbook).values_list('pk', flat=True)
+        artifact = imported.artifacts.get()
+        assert artifact.produced_by == first
+        assert list(artifact.inputs.values_list('activity', flat=True)) == [second.pk]
+        assert imported.versions.exists()
+        return artifact
+
+    def test_json_round_trip(self):
+        """A JSON export imports as a copy with its dependencies remapped."""
+        source = PlaybookImportService.load(_json_upload(self.playbook))
+        imported = PlaybookImportService.import_playbook(source, self.alex)
+
+        artifact = self._assert_graph(imported)
+        assert artifact.template_file.read() == TEMPLATE_BODY
+        snapshots = [PlaybookVersionService.reconstruct(v) for v in imported.versions.order_by('version_number')]
+        assert snapshots[-1] == {'name': 'Feature Driven', 'status': 'active'}
+        assert imported.versions.count() == self.playbook.versions.count()
+
+    def test_mpa_round_trip(self):
+        """An .mpa package carries its template blobs into the import."""
+        source = PlaybookImportService.load(_mpa_upload(self.playbook))
+        imported = PlaybookImportService.import_playbook(source, self.alex)
+
+        artifact = self._assert_graph(imported)
+        assert artifact.template_file.read() == TEMPLATE_BODY
+        assert source.warnings == []
+
+    def test_mpa_without_blob_skips_template(self):
+        """A package whose records name a blob it does not contain imports without the template."""
+        original = zipfile.ZipFile(io.BytesIO(b''.join(PlaybookPackageService.iter_mpa(self.playbook))))
+        stripped = io.BytesIO()
+        with zipfile.ZipFile(stripped, 'w') as archive:
+            manifest = json.loads(original.read(MANIFEST_NAME))
+            manifest['entries'] = {name: entry for name, entry in manifest['entries'].items()
+                                   if not name.startswith(BLOB_PREFIX)}
+            for name in original.namelist():
+                if name == MANIFEST_NAME:
+                    archive.writestr(name, json.dumps(manifest))
+                elif not name.startswith(BLOB_PREFIX):
+                    archive.writestr(name, original.read(name))
+        stripped.seek(0)
+
+        source = PlaybookImportService.load(stripped)
+        imported = PlaybookImportService.import_playbook(source, self.alex)
+
+        artifact = self._assert_graph(imported)
+        assert not artifact.template_file
+        assert source.warnings == ["Template for artifact 'Spec' is not in the package and was skipped"]
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Rows are written per table, so more activities do not mean more queries."""
+        def count_queries(user):
+            source = PlaybookImportService.load(_json_upload(self.playbook))
+            with CaptureQueriesContext(connection) as ctx:
+                PlaybookImportService.import_playbook(source, user)
+            return len(ctx.captured_queries)
+
+        small = count_queries(self.alex)
+        workflow = self.playbook.workflows.get()
+        for order in range(3, 30):
+            Activity.objects.create(name=f'Step {order}', workflow=workflow, order=order)
+        large = count_queries(User.objects.create_user(username='sam', password='testpass123'))
+
+        assert large == small
+        assert large < 40
+
+    def test_validation_errors(self):
+        """Broken references are reported together and nothing is written."""
+        document = json.loads(''.join(PlaybookExportService.iter_json(self.playbook)))
+        document['activities'][1]['predecessor_id'] = 999
+        document['artifacts'][0]['type'] = 'Hologram'
+        del document['workflows'][0]['name']
+        source = PlaybookImportService.load(io.BytesIO(json.dumps(document).encode()))
+
+        with pytest.raises(PlaybookImportError) as error:
+            PlaybookImportService.import_playbook(source, self.alex)
+
+        assert len(error.value.errors) == 3
+        assert any('unknown predecessor_id 999' in message for message in error.value.errors)
+        assert not Playbook.objects.filter(author=self.alex).exists()
+
+    def test_not_an_export(self):
+        """Files that are not exports are rejected."""
+        with pytest.raises(PlaybookImportError):
+            PlaybookImportService.load(io.BytesIO(b'not json'))
+        source = PlaybookImportService.load(io.BytesIO(b'{"name": "x"}'))
+        with pytest.raises(PlaybookImportError, match='Not a Mimir playbook export'):
+            PlaybookImportService.validate(source)
+
+    def test_conflict_modes(self):
+        """Name clashes raise, rename, replace or cancel as asked."""
+        source = PlaybookImportService.load(_json_upload(self.playbook))
+
+        with pytest.raises(ImportConflict):
+            PlaybookImportService.import_playbook(source, self.maria)
+        assert PlaybookImportService.import_playbook(source, self.maria, conflict='cancel') is None
+
+        renamed = PlaybookImportService.import_playbook(source, self.maria, conflict='rename')
+        assert renamed.name == 'Feature Driven (2)'
+
+        replaced = PlaybookImportService.import_playbook(source, self.maria, conflict='replace')
+        assert replaced.name == 'Feature Driven'
+        assert not Playbook.objects.filter(pk=self.playbook.pk).exists()
+        assert Playbook.objects.filter(author=self.maria).count() == 2
+
+
+@pytest.mark.django_db
+class TestPlaybookImportView:
+    """The import page uploads, reports errors and resolves conflicts."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, tmp_path):
+        settings.IMPORT_STASH_DIR = tmp_path / 'stash'
+        self.user = User.objects.create_user(username='maria', password='testpass123')
+        self.playbook = Playbook.objects.create(
+            name='Feature Driven', description='FDD', category='development', author=self.user
+        )
+        Workflow.objects.create(name='Design', playbook=self.playbook, order=1)
+        self.client = Client()
+        self.client.login(username='maria', password='testpass123')
+        self.stash_dir = tmp_path / 'stash'
+
+    def test_get_shows_form(self):
+        response = self.client.get(reverse('playbook_import'))
+        assert response.status_code == 200
+        assert b'data-testid="import-form"' in response.content
+
+    def test_import_redirects_to_new_playbook(self):
+        """IMPORT-03: a file without a name clash is imported straight away."""
+        self.playbook.name = 'Renamed Original'
+        upload = _json_upload(self.playbook)
+        self.playbook.name = 'Feature Driven'
+
+        response = self.client.post(reverse('playbook_import'), {'file': upload, 'conflict': 'ask'})
+
+        imported = Playbook.objects.get(name='Renamed Original')
+        assert response.status_code == 302
+        assert response.url == reverse('playbook_detail', args=[imported.pk])
+
+    def test_invalid_file_lists_errors(self):
+        """IMPORT-04: validation errors are shown on the form."""
+        upload = SimpleUploadedFile('broken.json', b'{"format": "mimir.playbook", "format_version": 1}')
+
+        response = self.client.post(reverse('playbook_import'), {'file': upload})
+
+        assert response.status_code == 200
+        assert b'data-testid="import-errors"' in response.content
+        assert b'name is required' in response.content
+
+    def test_malformed_package_lists_errors(self):
+        """IMPORT-04: packages with undecodable records are reported on the form, not as a server error."""
+        header = b'{"record": "playbook", "name": "FDD"}\n'
+        uploads = [
+            (_malformed_mpa_upload(header + b'{not json\n'), b'Package records are corrupt'),
+            (_malformed_mpa_upload(header + b'[1, 2]\n'), b'line 2 is not a JSON object'),
+            (_malformed_mpa_upload(header * 50, corrupt=True), b'is corrupt'),
+        ]
+        for upload, message in uploads:
+            response = self.client.post(reverse('playbook_import'), {'file': upload})
+
+            assert response.status_code == 200
+            assert b'data-testid="import-errors"' in response.content
+            assert message in response.content
+
+    def test_conflict_dialog_then_rename(self):
+        """IMPORT-05: a clash shows the dialog and the chosen resolution finishes the import."""
+        response = self.client.post(reverse('playbook_import'), {'file': _json_upload(self.playbook)})
+        assert b'data-testid="import-conflict"' in response.content
+        assert len(list(self.stash_dir.iterdir())) == 1
+
+        response = self.client.post(reverse('playbook_import'), {'resolution': 'rename'})
+
+        imported = Playbook.objects.get(name='Feature Driven (2)')
+        assert response.url == reverse('playbook_detail', args=[imported.pk])
+        assert list(self.stash_dir.iterdir()) == []
+
+    def test_conflict_cancel(self):
+        """Cancelling the dialog imports nothing and removes the stashed upload."""
+        self.client.post(reverse('playbook_import'), {'file': _json_upload(self.playbook)})
+
+        response = self.client.post(reverse('playbook_import'), {'resolution': 'cancel'})
+
+        assert response.url == reverse('playbook_list')
+        assert Playbook.objects.filter(author=self.user).count() == 1
+        assert list(self.stash_dir.iterdir()) == []
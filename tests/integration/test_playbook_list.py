@@ -176,3 +176,17 @@ class TestPlaybookList:
         # Should redirect to login
         assert response.status_code == 302
         assert '/auth/user/login/' in response.url
+    
+    def test_pb_list_11_filter_by_tag_with_facets(self, test_user, test_playbooks):
+        """PB-LIST-11: Tag facets link to a filtered list."""
+        client = Client()
+        client.force_login(test_user)
+        
+        response = client.get(reverse('playbook_list'), {'tag': 'UX'})
+        content = response.content.decode('utf-8')
+        
+        assert response.context['total_count'] == 1
+        assert 'UX Research Methodology' in content
+        assert 'React Frontend Development' not in content
+        assert 'data-testid="tag-facet-react"' in content
+        assert {'name': 'ux', 'count': 1} in response.context['tag_facets']
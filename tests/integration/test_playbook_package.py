@@ -0,0 +1,158 @@
+"""Integration tests for .mpa playbook packages.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import hashlib
+import io
+import json
+import os
+import struct
+import zipfile
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.urls import reverse
+
+from methodology.models import Playbook, Workflow, Activity, Artifact, ArtifactInput
+from methodology.services.playbook_package_service import (
+    PlaybookPackage, PlaybookPackageService, PackageError, MANIFEST_NAME, RECORDS_NAME,
+)
+
+User = get_user_model()
+
+TEMPLATE_BODY = b"# Specification\n" + b"Describe the feature.\n" * 100
+
+
+def _raw_package(records, corrupt=False):
+    """
+    Build a package around the given playbook.jsonl bytes with a matching manifest.
+
+    :param records: records entry content as bytes
+    :param corrupt: overwrite the start of the deflated records with an invalid block
+    :returns: BytesIO
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(RECORDS_NAME, records)
+        archive.writestr(MANIFEST_NAME, json.dumps({'format': 'mimir.mpa', 'entries': {
+            RECORDS_NAME: {'size': len(records), 'sha256': hashlib.sha256(records).hexdigest()},
+        }}))
+    data = bytearray(buffer.getvalue())
+    if corrupt:
+        info = zipfile.ZipFile(io.BytesIO(bytes(data))).getinfo(RECORDS_NAME)
+        name_length, extra_length = struct.unpack('<HH', data[info.header_offset + 26:info.header_offset + 30])
+        data[info.header_offset + 30 + name_length + extra_length] = 0xFF
+    return io.BytesIO(bytes(data))
+
+
+@pytest.mark.django_db
+class TestPlaybookPackage:
+    """Packages bundle the playbook graph and template blobs with checksums."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, tmp_path):
+        """Playbook whose two artifacts share one template blob."""
+        settings.MEDIA_ROOT = tmp_path
+        self.user = User.objects.create_user(username='maria', password='testpass123')
+        self.playbook = Playbook.objects.create(
+            name='Feature Driven', description='FDD', category='development', author=self.user
+        )
+        workflow = Workflow.objects.create(name='Design', playbook=self.playbook, order=1)
+        first = Activity.objects.create(name='Model Domain', workflow=workflow, order=1)
+        second = Activity.objects.create(name='Build List', workflow=workflow, order=2, predecessor=first)
+        for name, activity in (('Spec', first), ('Spec Copy', second)):
+            artifact = Artifact.objects.create(
+                name=name, produced_by=activity, playbook=self.playbook,
+                template_file=SimpleUploadedFile(f'{name}.md', TEMPLATE_BODY),
+            )
+        ArtifactInput.objects.create(artifact=artifact, activity=first)
+
+    def _package(self):
+        return PlaybookPackage(io.BytesIO(b''.join(PlaybookPackageService.iter_mpa(self.playbook))))
+
+    def test_package_contents(self):
+        """Records come in dependency order and identical templates are stored once."""
+        with self._package() as package:
+            package.verify()
+            records = list(package.iter_records())
+            digest = hashlib.sha256(TEMPLATE_BODY).hexdigest()
+
+            assert [r['record'] for r in records[:4]] == ['playbook', 'workflow', 'activity', 'activity']
+            artifacts = [r for r in records if r['record'] == 'artifact']
+            assert {a['template_digest'] for a in artifacts} == {digest}
+            assert package.open_blob(digest).read() == TEMPLATE_BODY
+            assert package.manifest['counts']['artifact'] == 2
+            assert package.manifest['playbook']['name'] == 'Feature Driven'
+            assert sum(name.startswith('blobs/') for name in package.manifest['entries']) == 1
+
+    def test_missing_template_has_no_digest(self):
+        """An artifact whose template file is gone is packaged without a template digest."""
+        template = Artifact.objects.get(name='Spec').template_file
+        os.remove(template.storage.path(template.name))
+
+        with self._package() as package:
+            package.verify()
+            artifacts = [r for r in package.iter_records() if r['record'] == 'artifact']
+
+            assert [a['template_digest'] for a in artifacts] == [None, None]
+            assert not any(name.startswith('blobs/') for name in package.manifest['entries'])
+
+    def test_verify_detects_corruption(self):
+        """A package whose records were altered fails verification."""
+        original = zipfile.ZipFile(io.BytesIO(b''.join(PlaybookPackageService.iter_mpa(self.playbook))))
+        tampered = io.BytesIO()
+        with zipfile.ZipFile(tampered, 'w') as archive:
+            for name in original.namelist():
+                data = original.read(name)
+                if name == RECORDS_NAME:
+                    data = data.replace(b'Model Domain', b'Model Damain')
+                archive.writestr(name, data)
+
+        with PlaybookPackage(tampered) as package:
+            with pytest.raises(PackageError, match='Checksum mismatch'):
+                package.verify()
+
+    def test_malformed_records_raise_package_error(self):
+        """Records that are not JSON objects or cannot be inflated raise PackageError, not a decode error."""
+        records = b'{"record": "playbook", "name": "FDD"}\n' * 50
+        cases = [
+            (_raw_package(b'{"record": "playbook"}\n{not json\n'), 'corrupt'),
+            (_raw_package(b'{"record": "playbook"}\n[1, 2]\n'), 'line 2 is not a JSON object'),
+            (_raw_package(records, corrupt=True), 'corrupt'),
+        ]
+        for data, message in cases:
+            with PlaybookPackage(data) as package:
+                with pytest.raises(PackageError, match=message):
+                    list(package.iter_records())
+
+        with PlaybookPackage(_raw_package(records, corrupt=True)) as package:
+            with pytest.raises(PackageError, match='corrupt'):
+                package.verify()
+
+    def test_rejects_non_package(self):
+        """Zip files without a manifest and non-zip files are rejected."""
+        plain = io.BytesIO()
+        with zipfile.ZipFile(plain, 'w') as archive:
+            archive.writestr('readme.txt', 'hello')
+
+        with pytest.raises(PackageError):
+            PlaybookPackage(plain)
+        with pytest.raises(PackageError):
+            PlaybookPackage(io.BytesIO(b'not a zip'))
+
+    def test_export_view_streams_mpa(self):
+        """?format=mpa downloads a valid package."""
+        client = Client()
+        client.force_login(self.user)
+
+        response = client.get(reverse('playbook_export', kwargs={'pk': self.playbook.pk}), {'format': 'mpa'})
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/zip'
+        assert response['Content-Disposition'].endswith('.mpa"')
+        with PlaybookPackage(io.BytesIO(b''.join(response.streaming_content))) as package:
+            package.verify()
+            assert MANIFEST_NAME not in package.manifest['entries']
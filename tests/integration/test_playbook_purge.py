@@ -0,0 +1,115 @@
+"""Integration tests for fast-path playbook deletion and background purge.
+
+Run with: pytest tests/integration/test_playbook_purge.py
+"""
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from methodology.models import (
+    Playbook, PlaybookVersion, Workflow, Activity, Artifact, ArtifactInput, TemplateBlob
+)
+from methodology.services.playbook_purge_service import PlaybookPurgeService
+from methodology.services.playbook_service import PlaybookService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def maria(db):
+    """Create Maria user for tests."""
+    return User.objects.create_user(username='maria', password='testpass123')
+
+
+@pytest.fixture
+def big_playbook(maria, settings, tmp_path):
+    """Draft playbook with workflows, linked activities, artifacts and inputs."""
+    settings.MEDIA_ROOT = tmp_path
+    playbook = Playbook.objects.create(
+        name='Big Methodology', description='Lots of rows', category='development', author=maria
+    )
+    PlaybookVersion.objects.create(playbook=playbook, version_number=1, snapshot_data={})
+    for w in range(3):
+        workflow = Workflow.objects.create(name=f'Workflow {w}', playbook=playbook, order=w)
+        previous = None
+        for a in range(4):
+            activity = Activity.objects.create(
+                name=f'Activity {w}.{a}', workflow=workflow, order=a, predecessor=previous
+            )
+            artifact = Artifact.objects.create(
+                playbook=playbook, produced_by=activity, name=f'Artifact {w}.{a}',
+                template_file=SimpleUploadedFile('spec.md', b'shared template'),
+            )
+            if previous:
+                ArtifactInput.objects.create(artifact=artifact, activity=previous)
+            previous = activity
+    playbook.refresh_from_db()
+    return playbook
+
+
+@pytest.mark.django_db
+class TestPlaybookPurge:
+    """Fast-path delete hides immediately; purge removes rows set-based."""
+
+    def test_delete_hides_playbook_and_defers_purge(self, big_playbook, django_capture_on_commit_callbacks):
+        """Delete marks the playbook deleted and queues the purge on commit."""
+        with django_capture_on_commit_callbacks() as callbacks:
+            PlaybookService.delete_playbook(big_playbook.pk)
+
+        assert not Playbook.objects.filter(pk=big_playbook.pk).exists()
+        assert Playbook.all_objects.get(pk=big_playbook.pk).is_deleted
+        assert Activity.objects.filter(workflow__playbook=big_playbook).count() == 12
+        assert len(callbacks) == 1
+
+        callbacks[0]()
+
+        assert not Playbook.all_objects.filter(pk=big_playbook.pk).exists()
+
+    def test_purge_removes_all_children_without_version_bumps(self, big_playbook, maria):
+        """Purge deletes every child row in chunks; no signal bumps other playbooks."""
+        other = Playbook.objects.create(
+            name='Other', description='Links into big', category='development', author=maria
+        )
+        other_workflow = Workflow.objects.create(name='Other WF', playbook=other, order=1)
+        target = Activity.objects.filter(workflow__playbook=big_playbook).first()
+        linked = Activity.objects.create(
+            name='Linked', workflow=other_workflow, order=1, predecessor=target
+        )
+        ArtifactInput.objects.create(artifact=Artifact.objects.filter(playbook=big_playbook).first(), activity=linked)
+        other.refresh_from_db()
+        other_version = other.version
+
+        Playbook.objects.filter(pk=big_playbook.pk).update(deleted_at='2026-01-01T00:00:00Z')
+        counts = PlaybookPurgeService.purge_playbook(big_playbook.pk, chunk_size=5)
+
+        assert counts == {
+            'artifact_inputs': 10, 'artifacts': 12, 'activities': 12,
+            'workflows': 3, 'versions': 1, 'tags': 0, 'sync_states': 0, 'playbooks': 1,
+        }
+        linked.refresh_from_db()
+        assert linked.predecessor is None
+        other.refresh_from_db()
+        assert other.version == other_version
+        assert TemplateBlob.objects.get().ref_count == 0
+
+    def test_name_reusable_while_purge_pending(self, big_playbook, maria):
+        """A new playbook can take the name of one awaiting purge."""
+        PlaybookService.delete_playbook(big_playbook.pk)
+
+        replacement = Playbook.objects.create(
+            name='Big Methodology', description='Fresh start', category='development', author=maria
+        )
+
+        assert PlaybookPurgeService.purge_pending() == [big_playbook.pk]
+        assert Playbook.objects.get(name='Big Methodology') == replacement
+
+    def test_delete_view_uses_fast_path(self, client, big_playbook):
+        """The delete view redirects and the playbook is gone from the list."""
+        client.login(username='maria', password='testpass123')
+
+        response = client.post(reverse('playbook_delete', kwargs={'pk': big_playbook.pk}))
+
+        assert response.status_code == 302
+        assert client.get(reverse('playbook_detail', kwargs={'pk': big_playbook.pk})).status_code == 404
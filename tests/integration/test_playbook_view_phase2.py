@@ -70,7 +70,7 @@ class TestPlaybookViewPhase2:
         assert response['Content-Type'] == 'application/json'
         assert 'product-discovery-framework' in response['Content-Disposition'].lower()
         
-        data = json.loads(response.content)
+        data = json.loads(b''.join(response.streaming_content))
         assert data['name'] == 'Product Discovery Framework'
     
     def test_pb_view_19_duplicate_playbook(self, owned_playbook):
@@ -0,0 +1,146 @@
+"""Integration tests for per-view query budgets and N+1 detection.
+
+Each page is loaded against a small and a large playbook; the number of
+queries must not grow with the data. QueryBudgetMiddleware runs strict in
+the test suite, so a view repeating a query per row also fails here.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from methodology.models import Playbook, Workflow, Activity, Artifact, ArtifactInput
+from mcp_integration.context import set_current_user
+from mcp_integration.tools import list_playbooks, get_playbook, list_workflows, get_workflow, list_activities
+from mimir.query_budget import QueryRecorder, QueryBudgetExceeded, sql_shape
+
+SMALL, LARGE = 2, 8
+
+
+def _seed(author, size):
+    """
+    Draft playbook with size workflows of size chained activities, each producing an artifact.
+
+    :param author: User instance
+    :param size: number of workflows, activities per workflow and artifacts. Example: 8
+    :returns: dict of pks for building URLs
+    """
+    playbook = Playbook.objects.create(
+        name=f'Playbook {size}', description='Seeded', category='development', author=author
+    )
+    for w in range(size):
+        workflow = Workflow.objects.create(name=f'Workflow {w}', playbook=playbook, order=w + 1)
+        previous = None
+        for a in range(size):
+            activity = Activity.objects.create(
+                name=f'Activity {w}.{a}', workflow=workflow, order=a + 1,
+                phase=f'Phase {a % 2}', predecessor=previous,
+            )
+            if previous is not None:
+                previous.successor = activity
+                previous.save()
+            previous = activity
+    activity = workflow.activities.order_by('order').first()
+    for a in range(size):
+        artifact = Artifact.objects.create(
+            name=f'Artifact {a}', type='Document', playbook=playbook, produced_by=activity
+        )
+    for consumer in workflow.activities.all()[1:]:
+        ArtifactInput.objects.create(artifact=artifact, activity=consumer)
+    return {'playbook': playbook.pk, 'workflow': workflow.pk, 'activity': activity.pk, 'artifact': artifact.pk}
+
+
+PAGES = {
+    'playbook_list': lambda ids: reverse('playbook_list'),
+    'playbook_detail': lambda ids: reverse('playbook_detail', kwargs={'pk': ids['playbook']}),
+    'workflow_list': lambda ids: reverse('workflow_list', kwargs={'playbook_pk': ids['playbook']}),
+    'workflow_detail': lambda ids: reverse(
+        'workflow_detail', kwargs={'playbook_pk': ids['playbook'], 'pk': ids['workflow']}
+    ),
+    'workflow_graph': lambda ids: reverse(
+        'workflow_graph', kwargs={'playbook_pk': ids['playbook'], 'pk': ids['workflow']}
+    ),
+    'activity_list': lambda ids: reverse(
+        'activity_list', kwargs={'playbook_pk': ids['playbook'], 'workflow_pk': ids['workflow']}
+    ),
+    'activity_detail': lambda ids: reverse('activity_detail', kwargs={
+        'playbook_pk': ids['playbook'], 'workflow_pk': ids['workflow'], 'activity_pk': ids['activity'],
+    }),
+    'activity_create': lambda ids: reverse(
+        'activity_create', kwargs={'playbook_pk': ids['playbook'], 'workflow_pk': ids['workflow']}
+    ),
+    'activity_edit': lambda ids: reverse('activity_edit', kwargs={
+        'playbook_pk': ids['playbook'], 'workflow_pk': ids['workflow'], 'activity_pk': ids['activity'],
+    }),
+    'activity_global_list': lambda ids: reverse('activity_global_list'),
+    'workflow_global_list': lambda ids: reverse('workflow_global_list'),
+    'artifact_detail': lambda ids: reverse('artifact_detail', kwargs={'pk': ids['artifact']}),
+    'dashboard': lambda ids: reverse('dashboard'),
+}
+
+
+def _count_queries(client, url):
+    """Load url and return the number of queries it ran (transaction bookkeeping excluded)."""
+    client.get(url)  # warm sessions, caches and CSRF cookie
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200, url
+    return sum(1 for q in queries if not q['sql'].startswith(('SAVEPOINT', 'RELEASE')))
+
+
+@pytest.mark.django_db
+class TestViewQueryBudgets:
+    """Page query counts are constant in the size of the playbook."""
+
+    @pytest.mark.parametrize('page', sorted(PAGES))
+    def test_query_count_does_not_grow_with_data(self, client_maria, maria, page):
+        """The same page over a large playbook runs as many queries as over a small one."""
+        small = _count_queries(client_maria, PAGES[page](_seed(maria, SMALL)))
+        large = _count_queries(client_maria, PAGES[page](_seed(maria, LARGE)))
+
+        assert large == small, f"{page}: {small} queries for {SMALL} rows, {large} for {LARGE}"
+
+
+@pytest.mark.django_db(transaction=True)
+class TestToolQueryBudgets:
+    """MCP read tools stay within their budgets on a large playbook."""
+
+    @pytest.mark.asyncio
+    async def test_read_tools_within_budget(self, maria):
+        """Strict budgets raise from the tool itself if it runs a query per row."""
+        from asgiref.sync import sync_to_async
+
+        ids = await sync_to_async(_seed)(maria, LARGE)
+        set_current_user(maria)
+
+        assert len(await list_playbooks()) == 1
+        assert len((await get_playbook(ids['playbook']))['workflows']) == LARGE
+        assert len(await list_workflows(ids['playbook'])) == LARGE
+        assert len((await get_workflow(ids['workflow']))['activities']) == LARGE
+        assert len(await list_activities(ids['workflow'])) == LARGE
+
+
+class TestQueryRecorder:
+    """The recorder flags repeated query shapes and budget overruns."""
+
+    def test_sql_shape_collapses_in_lists(self):
+        """IN lists of different lengths have the same shape."""
+        assert sql_shape('SELECT * FROM t WHERE id IN (%s, %s)') == sql_shape('SELECT *\n FROM t WHERE id IN (%s)')
+
+    @pytest.mark.django_db
+    def test_strict_check_raises_on_n_plus_one(self, maria, settings):
+        """A query per row is reported as a repeated shape."""
+        settings.QUERY_BUDGETS_STRICT = True
+        ids = _seed(maria, LARGE)
+
+        with QueryRecorder('per-row activity count', budget=3) as recorder:
+            for workflow in Workflow.objects.filter(playbook_id=ids['playbook']):
+                workflow.get_activity_count()
+
+        assert recorder.count == LARGE + 1
+        assert recorder.repeated_shapes()[0][1] == LARGE
+        with pytest.raises(QueryBudgetExceeded, match='budget 3'):
+            recorder.check()
@@ -0,0 +1,94 @@
+"""Integration tests for the write-coalescing session backend.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from mimir.sessions import REFRESHED_AT_KEY, SessionStore, refresh_due
+
+User = get_user_model()
+
+
+def _session_writes(queries):
+    """SQL statements that wrote to django_session."""
+    return [q['sql'] for q in queries
+            if 'django_session' in q['sql'] and not q['sql'].lstrip().upper().startswith('SELECT')]
+
+
+@pytest.fixture
+def client_maria(db):
+    """Client logged in as Maria through the login view."""
+    User.objects.create_user(username='maria', password='testpass123')
+    client = Client()
+    client.post(reverse('login'), {'username': 'maria', 'password': 'testpass123'})
+    return client
+
+
+@pytest.mark.django_db
+class TestSessionBackend:
+    """Unchanged sessions are served from cache; changes and due refreshes write through."""
+
+    def test_page_views_do_not_write_session(self, client_maria):
+        """Repeated page views leave django_session untouched."""
+        client_maria.get(reverse('dashboard'))
+
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(3):
+                assert client_maria.get(reverse('dashboard')).status_code == 200
+                assert client_maria.get(reverse('playbook_list')).status_code == 200
+
+        assert _session_writes(ctx.captured_queries) == []
+        assert not any('django_session' in q['sql'] for q in ctx.captured_queries)
+
+    def test_data_change_writes_through(self, client_maria):
+        """Modified sessions are written to the database and cache."""
+        session = client_maria.session
+        session['theme'] = 'dark'
+        session.save()
+
+        reloaded = SessionStore(session.session_key)
+        reloaded._cache.clear()
+        assert reloaded['theme'] == 'dark'
+
+    def test_expiry_refreshed_after_fraction(self, client_maria, settings):
+        """An unchanged session gets a new expire_date once the refresh fraction has passed."""
+        key = client_maria.cookies[settings.SESSION_COOKIE_NAME].value
+        store = SessionStore(key)
+        data = store.load()
+        data[REFRESHED_AT_KEY] -= int(settings.SESSION_REFRESH_FRACTION * settings.SESSION_COOKIE_AGE) + 1
+        store._cache.set(store.cache_key, data, settings.SESSION_COOKIE_AGE)
+        Session.objects.filter(session_key=key).update(expire_date=timezone.now() + timedelta(days=1))
+
+        with CaptureQueriesContext(connection) as ctx:
+            client_maria.get(reverse('dashboard'))
+
+        assert len(_session_writes(ctx.captured_queries)) == 1
+        assert Session.objects.get(session_key=key).expire_date > timezone.now() + timedelta(days=13)
+
+    def test_logout_deletes_session(self, client_maria, settings):
+        """Logging out removes the session from cache and database."""
+        key = client_maria.cookies[settings.SESSION_COOKIE_NAME].value
+
+        client_maria.post(reverse('logout'))
+
+        assert not SessionStore().exists(key)
+        response = client_maria.get(reverse('dashboard'))
+        assert response.status_code == 302
+
+    def test_refresh_due(self, settings):
+        """Unstamped sessions are due; stamped ones only after the fraction of their age."""
+        settings.SESSION_REFRESH_FRACTION = 0.5
+
+        assert refresh_due(None, 100, now=1000)
+        assert not refresh_due(960, 100, now=1000)
+        assert refresh_due(950, 100, now=1000)
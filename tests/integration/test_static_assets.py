@@ -0,0 +1,95 @@
+"""Integration tests for self-hosted, fingerprinted, precompressed static assets.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import gzip
+import re
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.fixture
+def client_maria(db):
+    """Authenticated client for Maria."""
+    User.objects.create_user(username='maria', password='testpass123')
+    client = Client()
+    client.login(username='maria', password='testpass123')
+    return client
+
+
+@pytest.fixture
+def collected(tmp_path, settings):
+    """Run collectstatic over a small source tree into a temporary STATIC_ROOT."""
+    source = tmp_path / 'source'
+    (source / 'app').mkdir(parents=True)
+    (source / 'app' / 'logo.svg').write_text('<svg xmlns="http://www.w3.org/2000/svg"></svg>')
+    (source / 'app' / 'site.css').write_text('.logo { background: url("logo.svg"); }\n' + 'p { margin: 0; }\n' * 200)
+    settings.STATICFILES_DIRS = [source]
+    settings.STATIC_ROOT = tmp_path / 'collected'
+
+    call_command('collectstatic', interactive=False, verbosity=0)
+    return settings.STATIC_ROOT
+
+
+class TestStaticAssets:
+    """Pages reference only local assets; collected assets are served from the app."""
+
+    def test_pages_make_no_external_requests(self, client_maria):
+        """The base layout links vendored files instead of CDNs."""
+        content = client_maria.get(reverse('dashboard')).content.decode()
+
+        external = re.findall(r'<(?:script|link)[^>]+(?:src|href)="(https?://[^"]+)"', content)
+        assert external == []
+        assert '/static/vendor/htmx/htmx.min.js' in content
+
+    def test_collectstatic_writes_hashed_compressed_files(self, collected):
+        """Hashed names are in the manifest and have gzip variants that decode to the original."""
+        hashed_css = next((collected / 'app').glob('site.*.css'))
+        hashed_svg = next((collected / 'app').glob('logo.*.svg'))
+
+        assert re.fullmatch(r'site\.[0-9a-f]{12}\.css', hashed_css.name)
+        assert hashed_svg.name in hashed_css.read_text()
+        assert gzip.decompress((collected / 'app' / (hashed_css.name + '.gz')).read_bytes()) == hashed_css.read_bytes()
+
+    @pytest.mark.django_db
+    def test_middleware_serves_immutable_precompressed_asset(self, collected):
+        """A hashed URL gets the gzip variant and a far-future immutable lifetime."""
+        from django.templatetags.static import static
+
+        url = static('app/site.css')
+        assert re.search(r'/static/app/site\.[0-9a-f]{12}\.css$', url)
+
+        response = Client().get(url, HTTP_ACCEPT_ENCODING='br;q=0, gzip')
+
+        assert response.status_code == 200
+        assert response['Content-Encoding'] == 'gzip'
+        assert response['Content-Type'] == 'text/css'
+        assert 'immutable' in response['Cache-Control']
+        assert 'Accept-Encoding' in response['Vary']
+        assert b'url("logo.' in gzip.decompress(b''.join(response.streaming_content))
+
+    @pytest.mark.django_db
+    def test_unhashed_asset_is_revalidated(self, collected):
+        """Plain names get a short lifetime and answer If-Modified-Since with 304."""
+        response = Client().get('/static/app/logo.svg')
+
+        assert response.status_code == 200
+        assert 'immutable' not in response['Cache-Control']
+        assert 'Content-Encoding' not in response
+
+        response = Client().get('/static/app/logo.svg', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        assert response.status_code == 304
+
+    @pytest.mark.django_db
+    def test_path_traversal_is_not_served(self, collected):
+        """Paths escaping the static roots fall through to a 404."""
+        response = Client().get('/static/../../etc/passwd')
+
+        assert response.status_code == 404
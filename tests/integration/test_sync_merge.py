@@ -0,0 +1,266 @@
+"""Integration tests for the three-way sync merge (SYNC-03, SYNC-04).
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import copy
+import json
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from methodology.models import Playbook, Workflow, Activity, Artifact, ArtifactInput, TemplateBlob
+from methodology.services.merkle_service import MerkleService, MerkleTree
+from methodology.services.playbook_export_service import PlaybookExportService
+from methodology.services.sync_merge_service import (
+    SyncMergeService, STRATEGY_KEEP_MINE, STRATEGY_TAKE_THEIRS,
+)
+from methodology.services.template_blob_service import TemplateBlobService
+from methodology.utils.merge3 import merge_lines
+
+User = get_user_model()
+
+GUIDANCE = 'Gather the domain experts.\nWalk through the domain.\nDraw the object model.\n'
+
+
+def export_document(playbook):
+    """Deep JSON export of a playbook, parsed."""
+    return json.loads(''.join(PlaybookExportService.iter_json(playbook)))
+
+
+def as_peer(document, offset=1000):
+    """Mike's copy of an export: same content under his database's ids."""
+    peer = copy.deepcopy(document)
+    for section in ('workflows', 'activities', 'artifacts', 'artifact_inputs'):
+        for row in peer[section]:
+            for name in ('id', 'workflow_id', 'predecessor_id', 'successor_id', 'produced_by_id',
+                         'artifact_id', 'activity_id'):
+                if row.get(name) is not None:
+                    row[name] += offset
+    return peer
+
+
+def row(document, section, name):
+    """Find a row of an export by name."""
+    return next(item for item in document[section] if item['name'] == name)
+
+
+class TestMergeLines:
+    """Line-wise three-way merge of guidance text."""
+
+    def test_edits_to_different_lines_combine(self):
+        text, conflicts = merge_lines('a\nb\nc\nd\n', 'A\nb\nc\nd\n', 'a\nb\nc\nD\n')
+        assert (text, conflicts) == ('A\nb\nc\nD\n', 0)
+
+    def test_edits_to_same_line_conflict(self):
+        text, conflicts = merge_lines('a\nb\nc\n', 'a\nB\nc\n', 'a\nX\nc\n')
+        assert conflicts == 1
+        assert text == 'a\n<<<<<<< mine\nB\n=======\nX\n>>>>>>> theirs\nc\n'
+
+
+@pytest.mark.django_db
+class TestSyncMerge:
+    """Maria merges Mike's copy of her playbook into hers."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """FDD playbook with a dependency chain, an artifact and an input; base is its export."""
+        self.maria = User.objects.create_user(username='maria', password='testpass123')
+        self.playbook = Playbook.objects.create(
+            name='Feature Driven', description='FDD', category='development', author=self.maria,
+        )
+        self.design = Workflow.objects.create(name='Design', playbook=self.playbook, order=1)
+        self.build = Workflow.objects.create(name='Build', playbook=self.playbook, order=2)
+        self.model = Activity.objects.create(name='Model Domain', workflow=self.design, order=1, guidance=GUIDANCE)
+        self.listing = Activity.objects.create(name='Build List', workflow=self.design, order=2, predecessor=self.model)
+        self.model.successor = self.listing
+        self.model.save()
+        self.code = Activity.objects.create(name='Code', workflow=self.build, order=1)
+        self.spec = Artifact.objects.create(name='Spec', produced_by=self.model, playbook=self.playbook, type='Document')
+        ArtifactInput.objects.create(artifact=self.spec, activity=self.code)
+        self.base = export_document(self.playbook)
+        self.theirs = as_peer(self.base)
+
+    def version(self):
+        return Playbook.objects.get(pk=self.playbook.pk).version
+
+    def test_clean_merge_written_in_bulk(self):
+        """Non-overlapping edits from both sides are combined with one version bump."""
+        self.model.guidance = GUIDANCE.replace('Gather', 'Invite')
+        self.model.save()
+        model = row(self.theirs, 'activities', 'Model Domain')
+        model['guidance'] = GUIDANCE.replace('Draw the object model', 'Draw the class diagram')
+        listing = row(self.theirs, 'activities', 'Build List')
+        listing['successor_id'] = 5000
+        self.theirs['activities'].append({
+            'id': 5000, 'workflow_id': listing['workflow_id'], 'name': 'Review', 'guidance': '', 'order': 3,
+            'phase': 'Design', 'predecessor_id': listing['id'], 'successor_id': None,
+        })
+        self.theirs['artifacts'].append({
+            'id': 5001, 'produced_by_id': 5000, 'name': 'Glossary', 'description': '', 'type': 'Document',
+            'is_required': True, 'template_file': '',
+        })
+        self.theirs['artifact_inputs'].append(
+            {'id': 5002, 'artifact_id': 5001, 'activity_id': row(self.theirs, 'activities', 'Code')['id'],
+             'is_required': False}
+        )
+        before = self.version()
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = SyncMergeService.sync(self.playbook, self.base, self.theirs)
+
+        assert result.conflicts == []
+        assert result.counts == {'created': 3, 'updated': 2, 'deleted': 0}
+        assert len(ctx.captured_queries) < 40
+        assert self.version() == before + Decimal('0.1')
+        self.model.refresh_from_db()
+        assert self.model.guidance == 'Invite the domain experts.\nWalk through the domain.\nDraw the class diagram.\n'
+        review = Activity.objects.get(name='Review')
+        assert review.workflow == self.design
+        assert review.predecessor == self.listing
+        assert Activity.objects.get(pk=self.listing.pk).successor == review
+        glossary = Artifact.objects.get(name='Glossary')
+        assert glossary.produced_by == review
+        assert ArtifactInput.objects.get(artifact=glossary).activity == self.code
+
+    def test_active_playbook_keeps_version(self):
+        """Merging into an active playbook writes the changes without a version bump, like other edits."""
+        self.playbook.status = 'active'
+        self.playbook.save()
+        row(self.theirs, 'activities', 'Code')['guidance'] = 'Write the code'
+        self.theirs['name'] = 'Feature Driven Development'
+        before = self.version()
+
+        result = SyncMergeService.sync(self.playbook, self.base, self.theirs)
+
+        assert result.counts == {'created': 0, 'updated': 1, 'deleted': 0}
+        assert Activity.objects.get(pk=self.code.pk).guidance == 'Write the code'
+        playbook = Playbook.objects.get(pk=self.playbook.pk)
+        assert (playbook.name, playbook.version) == ('Feature Driven Development', before)
+
+    def test_peer_templates_kept_only_if_stored_here(self):
+        """Template names whose blob this server lacks are not written; the rest of the merge is."""
+        known, unknown = 'b' * 64, 'a' * 64
+        TemplateBlobService.register_blob(known, 120)
+        model_id = row(self.theirs, 'activities', 'Model Domain')['id']
+        row(self.theirs, 'artifacts', 'Spec')['template_file'] = f'cas/{unknown}/spec.md'
+        for row_id, name, digest in ((5001, 'Glossary', unknown), (5002, 'Checklist', known)):
+            self.theirs['artifacts'].append({
+                'id': row_id, 'produced_by_id': model_id, 'name': name, 'description': '', 'type': 'Document',
+                'is_required': True, 'template_file': f'cas/{digest}/{name.lower()}.md',
+            })
+
+        result = SyncMergeService.sync(self.playbook, self.base, self.theirs)
+
+        templates = dict(Artifact.objects.filter(playbook=self.playbook).values_list('name', 'template_file'))
+        assert templates == {'Spec': '', 'Glossary': '', 'Checklist': f'cas/{known}/checklist.md'}
+        assert TemplateBlob.objects.get(digest=known).ref_count == 1
+        assert result.warnings == [
+            f"Template for artifact '{name}' is not available on this server and was not synced"
+            for name in ('Spec', 'Glossary')
+        ]
+
+    def test_field_conflicts_resolved_on_second_pass(self):
+        """Overlapping edits are reported side by side and nothing is written until resolved."""
+        self.model.guidance = GUIDANCE.replace('Walk through', 'Present')
+        self.model.save()
+        self.code.order = 5
+        self.code.save()
+        row(self.theirs, 'activities', 'Model Domain')['guidance'] = GUIDANCE.replace('Walk through', 'Explain')
+        row(self.theirs, 'activities', 'Code')['order'] = 7
+        before = self.version()
+
+        result = SyncMergeService.sync(self.playbook, self.base, self.theirs)
+
+        conflicts = {conflict.key: conflict for conflict in result.conflicts}
+        assert set(conflicts) == {f'activities:{self.model.pk}:guidance', f'activities:{self.code.pk}:order'}
+        guidance = conflicts[f'activities:{self.model.pk}:guidance']
+        assert (guidance.mine, guidance.theirs) == (
+            GUIDANCE.replace('Walk through', 'Present'), GUIDANCE.replace('Walk through', 'Explain'),
+        )
+        assert '<<<<<<< mine\nPresent the domain.\n=======\nExplain the domain.\n>>>>>>> theirs\n' in guidance.merged
+        assert result.counts is None
+        assert self.version() == before
+
+        resolved = GUIDANCE.replace('Walk through', 'Present and explain')
+        result = SyncMergeService.sync(self.playbook, self.base, self.theirs, resolutions={
+            guidance.key: {'value': resolved}, f'activities:{self.code.pk}:order': 'theirs',
+        })
+
+        assert result.conflicts == []
+        assert Activity.objects.get(pk=self.model.pk).guidance == resolved
+        assert Activity.objects.get(pk=self.code.pk).order == 7
+        assert self.version() == before + Decimal('0.1')
+
+    def test_delete_conflicts_with_edit_below(self):
+        """Deleting a workflow whose activity the peer edited needs a decision."""
+        Workflow.objects.get(pk=self.build.pk).delete()
+        row(self.theirs, 'activities', 'Code')['guidance'] = 'Write the code'
+
+        result = SyncMergeService.sync(self.playbook, self.base, self.theirs)
+
+        # The edited activity went with the workflow, so both rows are contested
+        keys = {f'workflows:{self.build.pk}:', f'activities:{self.code.pk}:'}
+        assert {conflict.key for conflict in result.conflicts} == keys
+        assert all(conflict.mine is None for conflict in result.conflicts)
+
+        result = SyncMergeService.sync(
+            self.playbook, self.base, self.theirs, resolutions={key: 'mine' for key in keys},
+        )
+        assert result.conflicts == []
+        assert not Activity.objects.filter(name='Code').exists()
+
+    def test_dependency_edits_reconciled(self):
+        """An activity inserted into the chain and a link appended elsewhere are both kept, symmetrically."""
+        self.listing.successor = self.code
+        self.listing.save()
+        self.code.predecessor = self.listing
+        self.code.save()
+        model, listing = row(self.theirs, 'activities', 'Model Domain'), row(self.theirs, 'activities', 'Build List')
+        self.theirs['activities'].append({
+            'id': 6000, 'workflow_id': model['workflow_id'], 'name': 'Sketch', 'guidance': '', 'order': 2,
+            'phase': None, 'predecessor_id': model['id'], 'successor_id': listing['id'],
+        })
+        model['successor_id'] = 6000
+        listing['predecessor_id'] = 6000
+
+        result = SyncMergeService.sync(self.playbook, self.base, self.theirs)
+
+        assert result.conflicts == []
+        sketch = Activity.objects.get(name='Sketch')
+        chain = {activity.name: activity for activity in Activity.objects.filter(workflow__playbook=self.playbook)}
+        assert (chain['Model Domain'].successor, sketch.predecessor) == (sketch, chain['Model Domain'])
+        assert (sketch.successor, chain['Build List'].predecessor) == (chain['Build List'], sketch)
+        assert (chain['Build List'].successor, chain['Code'].predecessor) == (chain['Code'], chain['Build List'])
+
+    def test_competing_successors_conflict(self):
+        """Both sides giving an activity a different successor is a conflict."""
+        self.code.successor = self.listing
+        self.code.save()
+        row(self.theirs, 'activities', 'Code')['successor_id'] = row(self.theirs, 'activities', 'Model Domain')['id']
+
+        result = SyncMergeService.sync(self.playbook, self.base, self.theirs)
+
+        assert [conflict.key for conflict in result.conflicts] == [f'activities:{self.code.pk}:successor_id']
+        assert (result.conflicts[0].mine, result.conflicts[0].theirs) == (self.listing.pk, self.model.pk)
+
+    def test_keep_mine_and_take_theirs(self):
+        """Keep Mine writes nothing; Take Theirs leaves the playbook equal to the peer's copy."""
+        self.code.guidance = 'Mine'
+        self.code.save()
+        row(self.theirs, 'activities', 'Code')['guidance'] = 'Theirs'
+        self.theirs['workflows'].append({'id': 7000, 'name': 'Deploy', 'description': '', 'abbreviation': '',
+                                         'order': 3})
+        before = self.version()
+
+        result = SyncMergeService.sync(self.playbook, self.base, self.theirs, strategy=STRATEGY_KEEP_MINE)
+        assert result.counts == {'created': 0, 'updated': 0, 'deleted': 0}
+        assert self.version() == before
+
+        SyncMergeService.sync(self.playbook, self.base, self.theirs, strategy=STRATEGY_TAKE_THEIRS)
+        assert Activity.objects.get(pk=self.code.pk).guidance == 'Theirs'
+        assert MerkleService.tree(self.playbook).hash == MerkleTree.from_document(self.theirs).hash
+        assert self.version() == before + Decimal('0.1')
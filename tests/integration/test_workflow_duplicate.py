@@ -0,0 +1,81 @@
+"""Integration tests for deep workflow duplication.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import reverse
+
+from methodology.models import Playbook, Workflow, Activity, Artifact, ArtifactInput
+from methodology.services.workflow_service import WorkflowService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestWorkflowDuplicate:
+    """Duplicated workflows bring their activities, chain, artifacts and inputs."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Draft playbook with a three-step workflow consuming an artifact from another workflow."""
+        self.user = User.objects.create_user(username='maria', password='testpass123')
+        self.playbook = Playbook.objects.create(
+            name='Feature Driven', description='FDD', category='development', author=self.user
+        )
+        discovery = Workflow.objects.create(name='Discovery', playbook=self.playbook, order=1)
+        self.design = Workflow.objects.create(name='Design', playbook=self.playbook, order=2)
+        research = Activity.objects.create(name='Research', workflow=discovery, order=1)
+        self.brief = Artifact.objects.create(name='Brief', produced_by=research, playbook=self.playbook)
+        first = Activity.objects.create(name='Model', workflow=self.design, order=1)
+        second = Activity.objects.create(name='Review', workflow=self.design, order=2, predecessor=first)
+        Activity.objects.create(name='Sign Off', workflow=self.design, order=3, predecessor=second)
+        spec = Artifact.objects.create(name='Spec', produced_by=first, playbook=self.playbook)
+        Artifact.objects.create(name='Spec (Copy)', produced_by=research, playbook=self.playbook)
+        ArtifactInput.objects.create(artifact=spec, activity=second)
+        ArtifactInput.objects.create(artifact=self.brief, activity=first)
+        self.playbook.refresh_from_db()
+
+    def test_deep_copy(self):
+        """Activities, dependency chain, renamed artifacts and inputs are copied."""
+        duplicate = WorkflowService.duplicate_workflow(self.design.pk, 'Design (Copy)')
+
+        assert duplicate.order == 3
+        assert duplicate.abbreviation
+        model, review, sign_off = duplicate.activities.order_by('order')
+        assert review.predecessor == model
+        assert sign_off.predecessor == review
+        assert model.pk not in self.design.activities.values_list('pk', flat=True)
+
+        spec = Artifact.objects.get(produced_by=model)
+        assert spec.name == 'Spec (Copy 2)'
+        assert list(review.input_artifacts.values_list('artifact', flat=True)) == [spec.pk]
+        assert list(model.input_artifacts.values_list('artifact', flat=True)) == [self.brief.pk]
+        assert self.design.activities.count() == 3
+
+    def test_single_version_bump(self):
+        """The playbook version goes up once for the whole copy."""
+        before = self.playbook.version
+
+        WorkflowService.duplicate_workflow(self.design.pk, 'Design (Copy)')
+
+        self.playbook.refresh_from_db()
+        assert self.playbook.version == before + Decimal('0.1')
+
+    def test_duplicate_view(self):
+        """The duplicate action redirects to the deep copy."""
+        client = Client()
+        client.force_login(self.user)
+
+        response = client.post(
+            reverse('workflow_duplicate', kwargs={'playbook_pk': self.playbook.pk, 'pk': self.design.pk}),
+            {'new_name': 'Design v2'},
+        )
+
+        duplicate = Workflow.objects.get(playbook=self.playbook, name='Design v2')
+        assert response.url == reverse('workflow_detail', kwargs={'playbook_pk': self.playbook.pk, 'pk': duplicate.pk})
+        assert duplicate.activities.count() == 3
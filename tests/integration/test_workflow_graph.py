@@ -0,0 +1,54 @@
+"""Integration tests for the lazily loaded workflow activity graph.
+
+NO MOCKING per .windsurf/rules/do-not-mock-in-integration-tests.md
+"""
+
+import pytest
+from django.urls import reverse
+
+from methodology.models import Activity
+
+
+@pytest.fixture
+def workflow(workflow):
+    """Design workflow with two linked activities in one phase."""
+    first = Activity.objects.create(name='Model Domain', workflow=workflow, order=1, phase='Planning')
+    second = Activity.objects.create(name='Build List', workflow=workflow, order=2, phase='Planning', predecessor=first)
+    first.successor = second
+    first.save()
+    return workflow
+
+
+@pytest.mark.django_db
+class TestWorkflowGraph:
+    """Detail page returns without Graphviz; the graph loads from its own endpoint."""
+
+    def test_detail_page_defers_graph(self, client_maria, workflow):
+        """Detail page has an HTMX slot pointing at the graph endpoint and no SVG."""
+        graph_url = reverse('workflow_graph', kwargs={'playbook_pk': workflow.playbook.pk, 'pk': workflow.pk})
+
+        response = client_maria.get(
+            reverse('workflow_detail', kwargs={'playbook_pk': workflow.playbook.pk, 'pk': workflow.pk})
+        )
+
+        assert response.status_code == 200
+        assert f'hx-get="{graph_url}"'.encode() in response.content
+        assert b'data-testid="activities-graph"' not in response.content
+
+    def test_graph_falls_back_to_outline(self, client_maria, workflow, settings):
+        """When Graphviz cannot finish in time the fragment lists the activities, and is not cached."""
+        settings.WORKFLOW_GRAPH_TIMEOUT = 0.000001
+
+        response = client_maria.get(
+            reverse('workflow_graph', kwargs={'playbook_pk': workflow.playbook.pk, 'pk': workflow.pk})
+        )
+
+        assert response.status_code == 200
+        assert 'no-store' in response['Cache-Control']
+        assert not response.has_header('ETag')
+        assert not response.has_header('Last-Modified')
+        content = response.content.decode()
+        assert 'data-testid="activities-outline"' in content
+        assert 'Planning' in content
+        assert content.index('Model Domain') < content.index('Build List')
+        assert '<html' not in content
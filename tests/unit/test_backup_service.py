@@ -0,0 +1,106 @@
+"""
+Unit tests for BackupService.
+
+Tests online backup, verification, rotation and restore against real
+SQLite files in a temporary directory.
+"""
+
+import gzip
+import sqlite3
+
+import pytest
+
+from methodology.services.backup_service import BackupService, BackupError
+
+
+def _make_database(path, rows=500):
+    """Create a small Mimir-like database with a django_migrations table."""
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE django_migrations (id INTEGER PRIMARY KEY, app TEXT, name TEXT)")
+    conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany(
+        "INSERT INTO notes (body) VALUES (?)",
+        [(f"note {i} " + "x" * 200,) for i in range(rows)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def _count_notes(path):
+    conn = sqlite3.connect(str(path))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestBackupService:
+    """Test suite for BackupService."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.db_path = tmp_path / "mimir.db"
+        self.backup_dir = tmp_path / "backups"
+        _make_database(self.db_path)
+
+    def _backup(self, keep=7):
+        return BackupService.create_backup(
+            source_path=self.db_path, backup_dir=self.backup_dir, keep=keep, pages=4, sleep=0
+        )
+
+    def test_create_backup_writes_compressed_verified_snapshot(self):
+        """Test backup copies in steps and writes a gzip snapshot with manifest."""
+        manifest = self._backup()
+
+        archive = self.backup_dir / manifest["file"]
+        assert archive.exists()
+        assert manifest["pages"] > 4
+        assert manifest["compressed_bytes"] < manifest["db_bytes"]
+        assert BackupService.verify_backup(archive)["sha256"] == manifest["sha256"]
+        with gzip.open(archive, "rb") as packed:
+            assert packed.read(16) == b"SQLite format 3\x00"
+
+    def test_rotation_keeps_newest_snapshots(self):
+        """Test only the newest `keep` snapshots survive."""
+        names = [self._backup(keep=2)["file"] for _ in range(3)]
+
+        remaining = [path.name for path in BackupService.list_backups(self.backup_dir)]
+        assert remaining == [names[2], names[1]]
+        assert not (self.backup_dir / f"{names[0]}.json").exists()
+
+    def test_restore_round_trip(self):
+        """Test restore brings back data written before the backup."""
+        manifest = self._backup()
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute("DELETE FROM notes")
+        conn.commit()
+        conn.close()
+
+        BackupService.restore_backup(self.backup_dir / manifest["file"], target_path=self.db_path, sleep=0)
+
+        assert _count_notes(self.db_path) == 500
+
+    def test_restore_rejects_tampered_snapshot(self):
+        """Test restore refuses an archive whose checksum does not match."""
+        manifest = self._backup()
+        archive = self.backup_dir / manifest["file"]
+        archive.write_bytes(archive.read_bytes()[:-10] + b"0123456789")
+
+        with pytest.raises(BackupError, match="Checksum mismatch"):
+            BackupService.restore_backup(archive, target_path=self.db_path)
+        assert _count_notes(self.db_path) == 500
+
+    def test_restore_rejects_foreign_database(self, tmp_path):
+        """Test restore refuses a valid SQLite file that is not a Mimir database."""
+        other = tmp_path / "other.db"
+        conn = sqlite3.connect(str(other))
+        conn.execute("CREATE TABLE t (x)")
+        conn.commit()
+        conn.close()
+        archive = self.backup_dir / "mimir-foreign.db.gz"
+        self.backup_dir.mkdir()
+        with gzip.open(archive, "wb") as packed:
+            packed.write(other.read_bytes())
+
+        with pytest.raises(BackupError, match="not a Mimir database"):
+            BackupService.restore_backup(archive, target_path=self.db_path)
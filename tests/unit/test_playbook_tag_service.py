@@ -0,0 +1,72 @@
+"""
+Unit tests for PlaybookTagService.
+
+Tests the PlaybookTag index stays in sync with Playbook.tags and answers
+tag filters and facet counts.
+NO MOCKING - uses real database via pytest-django.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from methodology.models import Playbook, PlaybookTag
+from methodology.services.playbook_service import PlaybookService
+from methodology.services.playbook_tag_service import PlaybookTagService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def maria(db):
+    """Create test user maria."""
+    return User.objects.create_user(username='maria', email='maria@test.com')
+
+
+def _playbook(author, name, tags, status='draft'):
+    return Playbook.objects.create(
+        name=name, description='Test', category='development', author=author, tags=tags, status=status
+    )
+
+
+@pytest.mark.django_db
+class TestPlaybookTagIndex:
+    """Tests for tag index maintenance and queries."""
+
+    def test_save_syncs_index(self, maria):
+        """Test index rows follow tag edits, normalized to lower case."""
+        playbook = _playbook(maria, 'FDD', [' Agile', 'FDD', 'agile'])
+        assert set(playbook.tag_index.values_list('name', flat=True)) == {'agile', 'fdd'}
+
+        playbook.tags = ['fdd', 'iterative']
+        playbook.save()
+
+        assert set(playbook.tag_index.values_list('name', flat=True)) == {'fdd', 'iterative'}
+
+    def test_list_playbooks_filters_by_tag(self, maria):
+        """Test tag filter is case-insensitive and combines with status."""
+        agile = _playbook(maria, 'Scrum', ['agile'])
+        _playbook(maria, 'Waterfall', ['sequential'])
+        _playbook(maria, 'Kanban', ['Agile'], status='released')
+
+        assert {p.name for p in PlaybookService.list_playbooks(maria, tag='AGILE')} == {'Scrum', 'Kanban'}
+        assert PlaybookService.list_playbooks(maria, status='draft', tag='agile') == [agile]
+
+    def test_tag_counts_exclude_other_authors_and_deleted(self, maria):
+        """Test facet counts only cover the author's live playbooks."""
+        alice = User.objects.create_user(username='alice')
+        _playbook(maria, 'Scrum', ['agile', 'team'])
+        _playbook(maria, 'Kanban', ['agile'])
+        _playbook(alice, 'Alice Agile', ['agile'])
+        gone = _playbook(maria, 'Gone', ['agile'])
+        PlaybookService.delete_playbook(gone.pk)
+
+        assert PlaybookTagService.tag_counts(maria) == [
+            {'name': 'agile', 'count': 2},
+            {'name': 'team', 'count': 1},
+        ]
+
+    def test_rebuild_index_after_bulk_update(self, maria):
+        """Test rebuild repairs the index after a signal-bypassing update."""
+        playbook = _playbook(maria, 'Scrum', ['agile'])
+        Playbook.objects.filter(pk=playbook.pk).update(tags=['lean'])
+
+        assert PlaybookTagService.rebuild_index() == 1
+        assert list(PlaybookTag.objects.values_list('name', flat=True)) == ['lean']
@@ -0,0 +1,154 @@
+"""
+Unit tests for PlaybookVersionService.
+
+Tests keyframe/delta snapshot storage, bounded reconstruction,
+compaction of legacy rows and the storage report.
+NO MOCKING - uses real database via pytest-django.
+"""
+import pytest
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from methodology.models import Playbook, PlaybookVersion
+from methodology.services.playbook_version_service import PlaybookVersionService
+from methodology.utils.json_patch import make_patch, apply_patch
+
+User = get_user_model()
+
+
+@pytest.fixture
+def maria(db):
+    """Create test user maria."""
+    return User.objects.create_user(username='maria', email='maria@test.com')
+
+
+@pytest.fixture
+def playbook(db, maria):
+    """Create a draft playbook."""
+    return Playbook.objects.create(
+        name='Versioned Playbook',
+        description='Test Description',
+        category='development',
+        status='draft',
+        version=Decimal('0.1'),
+        author=maria
+    )
+
+
+def _snapshot(i):
+    """Build a realistic snapshot that changes slightly per version."""
+    return {
+        'name': 'Versioned Playbook',
+        'description': 'A long description that stays the same across versions. ' * 10,
+        'category': 'development',
+        'tags': ['agile', 'fdd'],
+        'visibility': 'private',
+        'status': 'draft',
+        'revision': i,
+    }
+
+
+class TestJsonPatch:
+    """Tests for the JSON Patch helpers."""
+
+    def test_roundtrip_nested_changes(self):
+        """Test patch turns source into target for nested add/remove/replace."""
+        source = {'a': 1, 'b': {'c': 2, 'd': 3}, 'e/f': [1, 2]}
+        target = {'a': 1, 'b': {'c': 5}, 'e/f': [1, 2, 3], 'g': None}
+
+        ops = make_patch(source, target)
+
+        assert apply_patch(source, ops) == target
+        assert source == {'a': 1, 'b': {'c': 2, 'd': 3}, 'e/f': [1, 2]}
+
+    def test_identical_documents_produce_empty_patch(self):
+        """Test no operations are emitted for equal documents."""
+        assert make_patch({'a': [1]}, {'a': [1]}) == []
+
+
+@pytest.mark.django_db
+class TestRecordVersion:
+    """Tests for PlaybookVersionService.record_version."""
+
+    def test_first_version_is_keyframe(self, playbook, maria):
+        """Test first snapshot is stored as compressed keyframe."""
+        version = PlaybookVersionService.record_version(
+            playbook, _snapshot(1), change_summary='Initial version', created_by=maria
+        )
+
+        assert version.version_number == 1
+        assert version.storage == PlaybookVersion.STORAGE_KEYFRAME
+        assert version.snapshot_data is None
+        assert version.get_snapshot() == _snapshot(1)
+
+    def test_subsequent_versions_are_small_deltas(self, playbook):
+        """Test near-identical snapshots are stored as deltas smaller than keyframe."""
+        first = PlaybookVersionService.record_version(playbook, _snapshot(1))
+        second = PlaybookVersionService.record_version(playbook, _snapshot(2))
+
+        assert second.version_number == 2
+        assert second.storage == PlaybookVersion.STORAGE_DELTA
+        assert second.chain_length == 1
+        assert second.stored_size < first.stored_size
+        assert second.get_snapshot() == _snapshot(2)
+
+    def test_chain_length_is_capped(self, playbook, settings):
+        """Test a new keyframe starts once the chain reaches the cap."""
+        settings.PLAYBOOK_VERSION_MAX_CHAIN = 3
+
+        versions = [PlaybookVersionService.record_version(playbook, _snapshot(i)) for i in range(1, 10)]
+
+        assert [v.chain_length for v in versions] == [0, 1, 2, 3, 0, 1, 2, 3, 0]
+        for i, version in enumerate(versions, start=1):
+            assert PlaybookVersionService.get_snapshot(playbook.pk, version.version_number) == _snapshot(i)
+
+    def test_reconstruction_reads_bounded_rows(self, playbook, settings):
+        """Test reconstruction uses a fixed number of queries regardless of history size."""
+        settings.PLAYBOOK_VERSION_MAX_CHAIN = 4
+        for i in range(1, 40):
+            PlaybookVersionService.record_version(playbook, _snapshot(i))
+
+        with CaptureQueriesContext(connection) as ctx:
+            snapshot = PlaybookVersionService.get_snapshot(playbook.pk, 39)
+
+        assert snapshot == _snapshot(39)
+        assert len(ctx.captured_queries) <= 2
+
+
+@pytest.mark.django_db
+class TestCompactionAndReport:
+    """Tests for compact_versions and storage_report."""
+
+    def test_compact_legacy_full_rows(self, playbook):
+        """Test legacy full JSON rows are rewritten as keyframe + deltas."""
+        for i in range(1, 6):
+            PlaybookVersion.objects.create(
+                playbook=playbook, version_number=i, snapshot_data=_snapshot(i)
+            )
+
+        rewritten = PlaybookVersionService.compact_versions(playbook_id=playbook.pk)
+
+        assert rewritten == 5
+        storages = list(
+            PlaybookVersion.objects.filter(playbook=playbook)
+            .order_by('version_number')
+            .values_list('storage', flat=True)
+        )
+        assert storages == ['keyframe', 'delta', 'delta', 'delta', 'delta']
+        for i in range(1, 6):
+            assert PlaybookVersionService.get_snapshot(playbook.pk, i) == _snapshot(i)
+
+    def test_storage_report_shows_bytes_saved(self, playbook):
+        """Test report sums raw and stored bytes."""
+        for i in range(1, 11):
+            PlaybookVersionService.record_version(playbook, _snapshot(i))
+
+        report = PlaybookVersionService.storage_report()
+
+        assert report['versions'] == 10
+        assert report['keyframes'] == 1
+        assert report['deltas'] == 9
+        assert report['saved_bytes'] > 0
+        assert report['stored_bytes'] < report['raw_bytes']